@@ -2,7 +2,7 @@
 Activities API Router - Unified endpoint for all user activities
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, Field
 from models.user import UserResponse
 from database import get_db, Database
@@ -15,6 +15,8 @@ from services.activity_service import (
     delete_activity,
     like_activity,
     get_activity_comments,
+    get_comment_previews,
+    COMMENT_PREVIEW_LIMIT,
     create_activity_comment,
     delete_activity_comment
 )
@@ -60,6 +62,7 @@ class ActivityResponse(BaseModel):
     likes_count: int = 0
     comments_count: int = 0
     user_liked: bool = False
+    user_bookmarked: bool = False
     is_my_activity: bool = False
 
     # Timestamps
@@ -71,7 +74,8 @@ class ActivityResponse(BaseModel):
 class ActivityListResponse(BaseModel):
     """Paginated activity list"""
     items: List[ActivityResponse]
-    total: int
+    total: Optional[int] = None  # None when the count was skipped (cursor pagination)
+    next_cursor: Optional[str] = None
 
 
 class ActivityCreate(BaseModel):
@@ -124,6 +128,8 @@ def get_activities_endpoint(
     following_only: bool = Query(False, description="Show only activities from followed users"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Count total matches (default: true for offset, false for cursor pagination)"),
     current_user: Optional[UserResponse] = Depends(get_current_user_optional),
     db: Database = Depends(get_db)
 ):
@@ -136,20 +142,30 @@ def get_activities_endpoint(
     - **following_only**: Show only activities from followed users (requires auth)
     - **limit**: Number of results per page
     - **offset**: Pagination offset
+    - **cursor**: Keyset cursor (constant cost per page, ignores offset)
+    - **include_total**: Whether to compute the total count
     """
 
     current_user_id = current_user.id if current_user else None
 
-    result = get_activities(
-        db=db,
-        activity_type=activity_type,
-        user_id=user_id,
-        item_id=item_id,
-        following_only=following_only,
-        current_user_id=current_user_id,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        result = get_activities(
+            db=db,
+            activity_type=activity_type,
+            user_id=user_id,
+            item_id=item_id,
+            following_only=following_only,
+            current_user_id=current_user_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     return ActivityListResponse(**result)
 
@@ -301,6 +317,19 @@ def get_comments_endpoint(
     return [CommentResponse(**comment) for comment in comments]
 
 
+@router.get("/comments/previews", response_model=Dict[int, List[CommentResponse]])
+def get_comment_previews_endpoint(
+    activity_ids: List[int] = Query(..., max_length=100, description="Activity IDs of the feed page"),
+    limit: int = Query(COMMENT_PREVIEW_LIMIT, ge=1, le=10)
+):
+    """Latest comments for a whole feed page in one request"""
+    previews = get_comment_previews(activity_ids, limit)
+    return {
+        activity_id: [CommentResponse(**comment) for comment in comments]
+        for activity_id, comments in previews.items()
+    }
+
+
 @router.post("/{activity_id}/comments", response_model=CommentResponse)
 def create_comment_endpoint(
     activity_id: int,
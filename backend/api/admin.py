@@ -342,159 +342,18 @@ def delete_all_rank_promotions():
 
 @router.post("/backfill-rank-promotions")
 def backfill_rank_promotions():
-    """Backfill past rank promotion activities"""
-    from datetime import datetime
-    import json
-
-    def get_rank_info(otaku_score: float):
-        """Get rank name and level from otaku score (matches frontend otakuLevels.js)"""
-        if otaku_score <= 49:
-            return "루키", 1
-        elif otaku_score <= 119:
-            return "헌터", 2
-        elif otaku_score <= 219:
-            return "워리어", 3
-        elif otaku_score <= 349:
-            return "나이트", 4
-        elif otaku_score <= 549:
-            return "마스터", 5
-        elif otaku_score <= 799:
-            return "하이마스터", 6
-        elif otaku_score <= 1099:
-            return "그랜드마스터", 7
-        elif otaku_score <= 1449:
-            return "오타쿠", 8
-        elif otaku_score <= 1799:
-            return "오타쿠 킹", 9
-        else:
-            return "오타쿠 갓", 10
-
+    """
+    Backfill past rank promotion activities
+    모든 사용자의 과거 승급 이력 중 누락된 레벨만 추가 (집합 연산 한 번)
+    """
     try:
-        # Get all users
-        users = db.execute_query("SELECT id, username, display_name, avatar_url FROM users")
-
-        total_promotions = 0
-        processed_users = []
-
-        for user in users:
-            user_id = user['id']
-            username = user['username']
-            display_name = user['display_name']
-            avatar_url = user['avatar_url']
-
-            # Get all activities from source tables in chronological order
-            activities = db.execute_query("""
-                SELECT 'anime_rating' as activity_type, updated_at as activity_time
-                FROM user_ratings
-                WHERE user_id = ? AND status = 'RATED' AND rating IS NOT NULL
-
-                UNION ALL
-
-                SELECT 'anime_review' as activity_type, created_at as activity_time
-                FROM user_reviews
-                WHERE user_id = ?
-
-                UNION ALL
-
-                SELECT 'character_rating' as activity_type, updated_at as activity_time
-                FROM character_ratings
-                WHERE user_id = ? AND rating IS NOT NULL
-
-                UNION ALL
-
-                SELECT 'character_review' as activity_type, created_at as activity_time
-                FROM character_reviews
-                WHERE user_id = ?
-
-                ORDER BY activity_time ASC
-            """, (user_id, user_id, user_id, user_id))
-
-            # Calculate otaku_score at each point in time
-            anime_ratings_count = 0
-            character_ratings_count = 0
-            reviews_count = 0
-
-            prev_rank = None
-            prev_level = None
-            user_promotions = 0
-
-            for activity in activities:
-                activity_time = activity['activity_time']
-                activity_type = activity['activity_type']
-
-                # Update counts
-                if activity_type == 'anime_rating':
-                    anime_ratings_count += 1
-                elif activity_type == 'character_rating':
-                    character_ratings_count += 1
-                elif activity_type in ('anime_review', 'character_review'):
-                    reviews_count += 1
-
-                # Calculate current otaku_score
-                otaku_score = (anime_ratings_count * 2) + (character_ratings_count * 1) + (reviews_count * 5)
-
-                # Get current rank
-                current_rank, current_level = get_rank_info(otaku_score)
-
-                # Check if rank changed
-                if prev_rank is not None:
-                    if (current_rank != prev_rank) or (current_rank == prev_rank and current_level > prev_level):
-                        # Check if this promotion already exists
-                        existing = db.execute_query("""
-                            SELECT id FROM activities
-                            WHERE activity_type = 'rank_promotion'
-                              AND user_id = ?
-                              AND activity_time = ?
-                        """, (user_id, activity_time))
-
-                        if not existing:
-                            # Create metadata
-                            metadata = json.dumps({
-                                'old_rank': prev_rank,
-                                'old_level': prev_level,
-                                'new_rank': current_rank,
-                                'new_level': current_level,
-                                'otaku_score': otaku_score
-                            })
-
-                            # Insert rank promotion activity
-                            db.execute_insert("""
-                                INSERT INTO activities (
-                                    activity_type, user_id, username, display_name, avatar_url,
-                                    item_id, metadata, activity_time, created_at, updated_at
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                'rank_promotion',
-                                user_id,
-                                username,
-                                display_name,
-                                avatar_url,
-                                None,
-                                metadata,
-                                activity_time,
-                                datetime.now().isoformat(),
-                                datetime.now().isoformat()
-                            ))
-
-                            user_promotions += 1
-                            total_promotions += 1
-
-                # Update previous rank
-                prev_rank = current_rank
-                prev_level = current_level
-
-            if user_promotions > 0:
-                processed_users.append({
-                    'user_id': user_id,
-                    'username': username,
-                    'display_name': display_name,
-                    'promotions': user_promotions
-                })
+        from scripts.create_rank_promotions import ensure_rank_promotions, backfill_rank_promotions as backfill
 
+        ensure_rank_promotions()
+        result = backfill()
         return {
             "success": True,
-            "total_promotions": total_promotions,
-            "processed_users": processed_users
+            "total_promotions": result['created'],
         }
 
     except Exception as e:
@@ -1013,168 +872,25 @@ def rebuild_activities_endpoint():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/backfill-rank-promotions")
-def backfill_rank_promotions_endpoint():
+@router.post("/regenerate-rank-promotions")
+def regenerate_rank_promotions_endpoint():
     """
-    Backfill rank promotion activities for all users
-    모든 사용자의 과거 승급 이력을 activities 테이블에 추가
+    Regenerate rank promotion activities for all users
+    모든 사용자의 과거 승급 이력 재계산 (기존 기록의 시각/metadata 갱신 + 누락 추가)
     """
-    import json
-    from datetime import datetime
-
-    def get_rank_info(otaku_score: float) -> tuple:
-        """Get rank name and level from otaku score"""
-        if otaku_score <= 49:
-            return "루키", 1
-        elif otaku_score <= 119:
-            return "헌터", 2
-        elif otaku_score <= 219:
-            return "워리어", 3
-        elif otaku_score <= 349:
-            return "나이트", 4
-        elif otaku_score <= 549:
-            return "마스터", 5
-        elif otaku_score <= 799:
-            return "하이마스터", 6
-        elif otaku_score <= 1099:
-            return "그랜드마스터", 7
-        elif otaku_score <= 1449:
-            return "오타쿠", 8
-        elif otaku_score <= 1799:
-            return "오타쿠 킹", 9
-        else:
-            return "오타쿠 갓", 10
-
     try:
-        # Get all users
-        users = db.execute_query("SELECT id, username, display_name, avatar_url FROM users")
-
-        total_promotions = 0
-
-        for user_row in users:
-            user_id = user_row[0]
-            username = user_row[1]
-            display_name = user_row[2]
-            avatar_url = user_row[3]
-
-            print(f"\n처리 중: {display_name or username} (ID: {user_id})")
-
-            # Get all activities in chronological order
-            activities = db.execute_query("""
-                SELECT 'anime_rating' as activity_type, updated_at as activity_time
-                FROM user_ratings
-                WHERE user_id = ? AND status = 'RATED' AND rating IS NOT NULL
-
-                UNION ALL
-
-                SELECT 'anime_review' as activity_type, created_at as activity_time
-                FROM user_reviews
-                WHERE user_id = ?
-
-                UNION ALL
-
-                SELECT 'character_rating' as activity_type, updated_at as activity_time
-                FROM character_ratings
-                WHERE user_id = ? AND rating IS NOT NULL
-
-                UNION ALL
-
-                SELECT 'character_review' as activity_type, created_at as activity_time
-                FROM character_reviews
-                WHERE user_id = ?
-
-                ORDER BY activity_time ASC
-            """, (user_id, user_id, user_id, user_id))
-
-            # Calculate otaku_score at each point in time
-            anime_ratings_count = 0
-            character_ratings_count = 0
-            reviews_count = 0
-
-            prev_rank = None
-            prev_level = None
-
-            for activity in activities:
-                activity_time = activity[1]
-                activity_type = activity[0]
-
-                # Update counts
-                if activity_type == 'anime_rating':
-                    anime_ratings_count += 1
-                elif activity_type == 'character_rating':
-                    character_ratings_count += 1
-                elif activity_type in ('anime_review', 'character_review'):
-                    reviews_count += 1
-
-                # Calculate current otaku_score
-                otaku_score = (anime_ratings_count * 2) + (character_ratings_count * 1) + (reviews_count * 5)
-
-                # Get current rank
-                current_rank, current_level = get_rank_info(otaku_score)
-
-                # Check if rank changed
-                if prev_rank is not None:
-                    if (current_rank != prev_rank) or (current_rank == prev_rank and current_level > prev_level):
-                        # Rank promotion detected!
-                        print(f"  승급: {prev_rank}-{prev_level} → {current_rank}-{current_level} at {activity_time}")
-
-                        # Check if already exists
-                        existing = db.execute_query("""
-                            SELECT id FROM activities
-                            WHERE activity_type = 'rank_promotion'
-                              AND user_id = ?
-                              AND activity_time = ?
-                        """, (user_id, activity_time), fetch_one=True)
-
-                        # Create metadata
-                        metadata = json.dumps({
-                            'old_rank': prev_rank,
-                            'old_level': prev_level,
-                            'new_rank': current_rank,
-                            'new_level': current_level,
-                            'otaku_score': otaku_score
-                        })
-
-                        # Use new_level as item_id to make each rank promotion unique
-                        # This prevents ID changes when rebuilding
-                        db.execute_query("""
-                            INSERT INTO activities (
-                                activity_type, user_id, username, display_name, avatar_url,
-                                item_id, metadata, activity_time, created_at, updated_at
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                            ON CONFLICT(activity_type, user_id, item_id) DO UPDATE SET
-                                username = excluded.username,
-                                display_name = excluded.display_name,
-                                avatar_url = excluded.avatar_url,
-                                metadata = excluded.metadata,
-                                activity_time = excluded.activity_time,
-                                updated_at = CURRENT_TIMESTAMP
-                        """, (
-                            'rank_promotion',
-                            user_id,
-                            username,
-                            display_name,
-                            avatar_url,
-                            current_level,  # Use new_level as item_id
-                            metadata,
-                            activity_time
-                        ))
-
-                        if not existing:
-                            total_promotions += 1
-
-                # Update previous rank
-                prev_rank = current_rank
-                prev_level = current_level
+        from scripts.create_rank_promotions import ensure_rank_promotions, backfill_rank_promotions
 
+        ensure_rank_promotions()
+        result = backfill_rank_promotions(regenerate=True)
         return {
             "success": True,
-            "total_promotions_created": total_promotions,
-            "users_processed": len(users)
+            "total_promotions_created": result['created'],
+            "total_promotions_updated": result['updated'],
         }
 
     except Exception as e:
-        print(f"Error backfilling rank promotions: {e}")
+        print(f"Error regenerating rank promotions: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -1313,6 +1029,10 @@ def patch_korean_names(payload: dict = Body(...)):
             except Exception as e:
                 failed.append({"id": char_id, "error": str(e)})
 
+        # 자동완성 인덱스 재생성 (이름 일괄 변경)
+        from services.autocomplete_service import build_autocomplete_index
+        build_autocomplete_index()
+
         # Also update activities table
         db.execute_update("""
             UPDATE activities
@@ -1441,6 +1161,10 @@ def patch_korean_names_from_json():
             except Exception as e:
                 failed.append({"id": char_id, "error": str(e)})
 
+        # 자동완성 인덱스 재생성 (이름 일괄 변경)
+        from services.autocomplete_service import build_autocomplete_index
+        build_autocomplete_index()
+
         # Update activities table
         db.execute_update("""
             UPDATE activities
@@ -2323,3 +2047,168 @@ def check_korean_titles():
     except Exception as e:
         import traceback
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-site-stats")
+def rebuild_site_stats_endpoint():
+    """
+    Recompute anime_site_stats / character_site_stats from the rating tables
+    사이트 평가 통계 전체 재계산 (트리거 누락/drift 보정)
+    """
+    try:
+        from scripts.create_site_stats import ensure_site_stats, rebuild_site_stats
+
+        ensure_site_stats()
+        result = rebuild_site_stats()
+        return {"success": True, "rebuilt": result}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.get("/verify-user-stats")
+def verify_user_stats_endpoint(sample_limit: int = 20):
+    """
+    Compare stored user_stats with a from-scratch recomputation
+    사용자 통계 drift 확인 (수정하지 않음)
+    """
+    try:
+        from scripts.create_user_stats_counters import verify_user_stats
+
+        return {"success": True, "report": verify_user_stats(sample_limit)}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-user-stats")
+def rebuild_user_stats_endpoint():
+    """
+    Recompute user_stats and user_genre_stats from the source tables
+    사용자 통계 전체 재계산 (drift 보정) - 재계산 전 drift 보고 포함
+    """
+    try:
+        from scripts.create_user_stats_counters import (
+            ensure_user_stats_counters, verify_user_stats, rebuild_user_stats
+        )
+
+        ensure_user_stats_counters()
+        report = verify_user_stats()
+        count = rebuild_user_stats()
+        return {"success": True, "users": count, "drift_before": report}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-r2-object-index")
+def rebuild_r2_object_index_endpoint():
+    """
+    Reload the R2 object existence index from a full bucket listing
+    R2 객체 존재 여부 인덱스 재적재 (스크립트 등으로 직접 업로드/삭제한 경우)
+    """
+    try:
+        from scripts.create_r2_object_index import ensure_r2_object_index, rebuild_r2_object_index
+        from utils import r2_object_index
+
+        ensure_r2_object_index()
+        count = rebuild_r2_object_index()
+        return {"success": True, "objects": count, "stats": r2_object_index.stats()}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-franchise-graph")
+def rebuild_franchise_graph_endpoint():
+    """
+    Rebuild the in-memory franchise graph from anime_relation
+    프랜차이즈 그래프 즉시 재생성 (크롤링 직후 확인 주기를 기다리지 않을 때)
+    """
+    try:
+        from services.series_service import build_franchise_graph
+
+        return {"success": True, "stats": build_franchise_graph()}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-leaderboard")
+def rebuild_leaderboard_endpoint():
+    """
+    Rebuild the in-memory leaderboard from user_stats
+    리더보드 즉시 재생성 (스크립트로 점수를 일괄 수정한 직후 확인 주기를 기다리지 않을 때)
+    """
+    try:
+        from services.leaderboard_service import build_leaderboard
+
+        return {"success": True, "stats": build_leaderboard()}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-recommendations")
+def rebuild_recommendations_endpoint():
+    """
+    Rebuild item similarities and every user's recommendation list (requires numpy)
+    유사도 + 전체 사용자 추천 재계산
+    """
+    from services.recommendation_service import REBUILD_AVAILABLE
+
+    if not REBUILD_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="numpy is not installed on this server - run "
+                   "'python scripts/create_recommendation_cache.py --rebuild' where numpy is available"
+        )
+
+    try:
+        from scripts.create_recommendation_cache import ensure_recommendation_cache
+        from services.recommendation_service import rebuild_recommendations
+
+        ensure_recommendation_cache()
+        return {"success": True, "stats": rebuild_recommendations()}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/refresh-recommendations")
+def refresh_recommendations_endpoint(limit: int = None):
+    """
+    Recompute recommendations only for users whose ratings changed since the last run
+    평가가 바뀐 사용자만 저장된 유사도로 추천 재계산
+    """
+    try:
+        from services.recommendation_service import refresh_stale_recommendations
+
+        return {"success": True, "stats": refresh_stale_recommendations(limit)}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
+
+
+@router.post("/rebuild-autocomplete")
+def rebuild_autocomplete_endpoint():
+    """
+    Rebuild the in-memory autocomplete index from the database
+    자동완성 인덱스 재생성 (인기도 변경, 일괄 수정 반영 - 요청을 받은 워커 프로세스만 해당)
+    """
+    try:
+        from services.autocomplete_service import build_autocomplete_index
+
+        return {"success": True, "stats": build_autocomplete_index()}
+
+    except Exception as e:
+        import traceback
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}\n{traceback.format_exc()}")
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from database import db
 from api.auth import get_current_user
+from services.autocomplete_service import refresh_anime, refresh_character
 from utils.r2_storage import upload_file_bytes_to_r2, is_r2_configured, delete_from_r2, extract_object_key_from_url
 import os
 import shutil
@@ -214,6 +215,9 @@ def update_anime(
 
     db.execute_update(query, tuple(values))
 
+    # 자동완성 인덱스 갱신 (제목/이미지)
+    refresh_anime(anime_id)
+
     return {"message": "Anime updated successfully", "updated_fields": list(updates.keys())}
 
 
@@ -311,6 +315,9 @@ def update_character(
 
     db.execute_update(query, tuple(values))
 
+    # 자동완성 인덱스 갱신 (이름/이미지)
+    refresh_character(character_id)
+
     # Verify update
     verify_result = db.execute_query(
         "SELECT image_url, image_local FROM character WHERE id = ?",
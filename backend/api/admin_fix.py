@@ -169,7 +169,7 @@ def fix_user_promotions(user_id: int, admin_key: str = Header(None)):
                             username,
                             display_name,
                             avatar_url,
-                            None,
+                            new_level,  # item_id = new_level (사용자별 레벨당 하나)
                             metadata,
                             activity_time
                         )
@@ -2,7 +2,7 @@
 Anime API Router
 애니메이션 조회, 검색
 """
-from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi import APIRouter, BackgroundTasks, Query, HTTPException, status, Depends
 from typing import Optional, List
 from models.anime import AnimeResponse, AnimeDetailResponse, AnimeListResponse
 from services.anime_service import (
@@ -13,7 +13,12 @@ from services.anime_service import (
     get_top_rated_anime,
     get_all_genres
 )
-from api.deps import get_current_user_optional
+from services.recommendation_service import (
+    get_recommendations,
+    is_recommendation_stale,
+    refresh_user_recommendations,
+)
+from api.deps import get_current_user, get_current_user_optional
 
 router = APIRouter()
 
@@ -28,7 +33,7 @@ def list_anime(
     year: Optional[int] = Query(None, ge=1960, le=2030, description="방영 연도"),
     format: Optional[str] = Query(None, description="포맷 (TV, MOVIE, OVA, etc.)"),
     status: Optional[str] = Query(None, description="상태 (FINISHED, RELEASING, etc.)"),
-    sort_by: str = Query("popularity", description="정렬 (popularity, score, trending, title, recent)"),
+    sort_by: str = Query("popularity", description="정렬 (popularity, score, site_rating, trending, title, recent)"),
     exclude_rated: bool = Query(False, description="이미 평가한 항목 제외"),
     current_user = Depends(get_current_user_optional)
 ):
@@ -106,6 +111,24 @@ def genres():
     return get_all_genres()
 
 
+@router.get("/recommendations")
+def recommendations(
+    background_tasks: BackgroundTasks,
+    limit: int = Query(20, ge=1, le=50),
+    current_user = Depends(get_current_user)
+):
+    """
+    개인화 추천 애니메이션
+
+    평가 기반 item-item 협업 필터링 결과 (predicted_rating 순)
+    평가 수가 MIN_RATINGS_FOR_RECOMMENDATION 미만이거나 아직 계산 전이면 빈 목록
+    마지막 계산 이후 평가가 바뀌었으면 응답 후 백그라운드에서 추천 목록 갱신 (다음 요청부터 반영)
+    """
+    if is_recommendation_stale(current_user.id):
+        background_tasks.add_task(refresh_user_recommendations, current_user.id)
+    return get_recommendations(current_user.id, limit=limit)
+
+
 @router.get("/{anime_id}", response_model=AnimeDetailResponse)
 def get_anime(anime_id: int, current_user = Depends(get_current_user_optional)):
     """
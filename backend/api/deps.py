@@ -8,6 +8,7 @@ from typing import Optional
 from database import get_db, Database, dict_from_row
 from utils.security import decode_access_token
 from utils.user_helpers import set_default_avatar
+from utils.user_cache import get_cached_user, cache_user
 from models.user import UserResponse
 
 security = HTTPBearer()
@@ -21,9 +22,14 @@ def get_current_user(
     """
     JWT 토큰에서 현재 사용자 정보 추출
     인증이 필요한 엔드포인트에서 사용
+    (토큰별 단기 캐시 적중 시 DB 조회 없음 - utils.user_cache)
     """
     token = credentials.credentials
 
+    cached = get_cached_user(token)
+    if cached is not None:
+        return cached
+
     # 토큰 디코드
     payload = decode_access_token(token)
     if payload is None:
@@ -56,7 +62,9 @@ def get_current_user(
     user_dict = dict_from_row(user_row)
     user_dict = set_default_avatar(user_dict, db)
 
-    return UserResponse(**user_dict)
+    user = UserResponse(**user_dict)
+    cache_user(token, user, payload.get("exp"))
+    return user
 
 
 def get_current_user_optional(
@@ -71,6 +79,10 @@ def get_current_user_optional(
 
     token = credentials.credentials
 
+    cached = get_cached_user(token)
+    if cached is not None:
+        return cached
+
     # 토큰 디코드
     payload = decode_access_token(token)
     if payload is None:
@@ -93,4 +105,6 @@ def get_current_user_optional(
     user_dict = dict_from_row(user_row)
     user_dict = set_default_avatar(user_dict, db)
 
-    return UserResponse(**user_dict)
+    user = UserResponse(**user_dict)
+    cache_user(token, user, payload.get("exp"))
+    return user
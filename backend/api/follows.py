@@ -3,7 +3,7 @@ Follows API Router
 팔로우 관련 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from typing import List, Dict
 from models.user import UserResponse
 from services.follow_service import (
     follow_user,
@@ -13,11 +13,25 @@ from services.follow_service import (
     get_following,
     get_follow_counts
 )
+from services.compatibility_service import get_compatibilities
 from api.deps import get_current_user
+from config import COMPATIBILITY_LIST_BATCH
 
 router = APIRouter()
 
 
+def _with_compatibility(viewer_id: int, users: List[Dict]) -> List[Dict]:
+    """
+    팔로우 목록 항목에 현재 사용자와의 취향 유사도 추가
+    페이지 앞쪽 COMPATIBILITY_LIST_BATCH 명만 계산 (평점 벡터는 캐시 + 한 번에 적재), 나머지는 None
+    """
+    batch = users[:COMPATIBILITY_LIST_BATCH]
+    compatibilities = get_compatibilities(viewer_id, [user['id'] for user in batch])
+    for user in users:
+        user['compatibility'] = compatibilities.get(user['id'])
+    return users
+
+
 @router.post("/{user_id}/follow")
 def follow(
     user_id: int,
@@ -74,9 +88,9 @@ def get_user_followers(
     offset: int = Query(0, ge=0)
 ):
     """
-    사용자의 팔로워 목록
+    사용자의 팔로워 목록 (compatibility: 현재 사용자와의 평점 취향 유사도 - 본인, 페이지 앞 COMPATIBILITY_LIST_BATCH 명 밖은 None)
     """
-    followers = get_followers(user_id, limit, offset)
+    followers = _with_compatibility(current_user.id, get_followers(user_id, limit, offset))
     return {
         'items': followers,
         'total': len(followers),
@@ -93,9 +107,9 @@ def get_user_following(
     offset: int = Query(0, ge=0)
 ):
     """
-    사용자가 팔로우하는 목록
+    사용자가 팔로우하는 목록 (compatibility: 현재 사용자와의 평점 취향 유사도 - 본인, 페이지 앞 COMPATIBILITY_LIST_BATCH 명 밖은 None)
     """
-    following = get_following(user_id, limit, offset)
+    following = _with_compatibility(current_user.id, get_following(user_id, limit, offset))
     return {
         'items': following,
         'total': len(following),
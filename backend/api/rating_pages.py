@@ -2,11 +2,12 @@
 Rating Pages API Router
 평가 페이지 전용 초고속 API (목표: 0.1초 이내)
 """
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, BackgroundTasks
 from typing import List, Dict
 from models.user import UserResponse
 from services.rating_page_service import (
     get_anime_for_rating,
+    refill_anime_candidate_queue,
     get_characters_for_rating,
     get_anime_for_rating_stats,
     get_characters_for_rating_stats,
@@ -14,36 +15,41 @@ from services.rating_page_service import (
     get_review_writing_stats
 )
 from api.deps import get_current_user
+from config import RATING_QUEUE_REFILL_AT
 
 router = APIRouter()
 
 
 @router.get("/anime")
 def get_anime_to_rate(
+    background_tasks: BackgroundTasks,
     limit: int = Query(50, ge=1, le=200, description="한 번에 가져올 개수"),
     current_user: UserResponse = Depends(get_current_user)
 ) -> Dict:
     """
-    애니메이션 평가 페이지 - 초고속 쿼리
+    애니메이션 평가 페이지 - 사용자별 후보 큐
 
     특징:
     - 미평가 + WANT_TO_WATCH 항목 반환
-    - 매번 다른 랜덤 순서 (가중치 기반)
-    - 서브쿼리 0개
-    - 목표: 0.1초 이내
-    - 프론트엔드에서 페이지네이션 처리
+    - 인기도 구간별로 섞은 순서, 요청마다 다음 페이지 (이전에 보여준 항목은 다시 나오지 않음)
+    - 페이지 비용 O(limit) - 전체 anime 조회 없음
+    - 남은 후보가 적으면 응답 후 백그라운드에서 큐 보충 (이번 바퀴에 새 후보가 남아 있을 때만)
 
     Returns:
         {
             "items": [...],
-            "total": 123
+            "total": 50,
+            "remaining": 1234
         }
     """
-    items = get_anime_for_rating(current_user.id, limit)
+    page = get_anime_for_rating(current_user.id, limit)
+    if page['remaining'] < RATING_QUEUE_REFILL_AT and not page['cycle_complete']:
+        background_tasks.add_task(refill_anime_candidate_queue, current_user.id)
 
     return {
-        'items': items,
-        'total': len(items)
+        'items': page['items'],
+        'total': len(page['items']),
+        'remaining': page['remaining']
     }
 
 
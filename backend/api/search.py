@@ -4,11 +4,28 @@ Unified Search API - Public search for anime and characters
 """
 from fastapi import APIRouter, Query
 from database import db
+from utils.search_index import title_search_clause, title_match_rank
+from services.autocomplete_service import autocomplete
+from typing import Optional
 import sqlite3
 
 router = APIRouter()
 
 
+@router.get("/autocomplete")
+def autocomplete_search(
+    q: str = Query(..., min_length=1, description="검색어 (조합 중인 음절, 초성 가능)"),
+    type: Optional[str] = Query(None, pattern="^(anime|character)$", description="anime / character"),
+    limit: int = Query(10, ge=1, le=20, description="결과 개수")
+):
+    """
+    타이핑 중 자동완성 - 메모리 인덱스 조회 (DB 미사용)
+
+    예: "귀며", "ㄱㅁㅇㅋㄴ", "칼날", "kimetsu"
+    """
+    return {"items": autocomplete(q, limit=limit, kind=type)}
+
+
 @router.get("")
 def unified_search(
     q: str = Query(..., min_length=1, description="검색어"),
@@ -23,11 +40,13 @@ def unified_search(
     - rating_desc: 평점 높은순
     - rating_asc: 평점 낮은순
     - title_asc: 제목순
+
+    3글자 이상이면 FTS5 trigram 인덱스(anime_search, character_search)로 검색하고,
+    인기순은 제목 일치 등급(일치 → 접두 → 부분) 다음에 인기도로 정렬
     """
     results = {"anime": [], "characters": []}
-    pattern = f"%{q}%"
 
-    # 애니메이션 검색 (with site ratings calculated via subquery)
+    # 애니메이션 검색 (site ratings from anime_site_stats)
     anime_order = {
         "popularity_desc": "a.popularity DESC",
         "rating_desc": "site_avg_rating DESC",
@@ -35,31 +54,31 @@ def unified_search(
         "title_asc": "COALESCE(a.title_korean, a.title_romaji, a.title_english) ASC",
     }.get(sort, "a.popularity DESC")
 
+    anime_columns = ['a.title_korean', 'a.title_romaji', 'a.title_english', 'a.title_native']
+    anime_where, anime_params = title_search_clause('a.id', 'anime_search', 'titles', anime_columns, q)
+    anime_rank_params = ()
+    if anime_order == "a.popularity DESC":
+        anime_rank, anime_rank_params = title_match_rank(anime_columns, q)
+        anime_order = f"{anime_rank}, {anime_order}"
+
     anime_query = f"""
         SELECT
             a.id, a.title_korean, a.title_romaji, a.title_english, a.title_native,
             COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image,
             a.format, a.episodes, a.status, a.season_year,
-            COALESCE(
-                (SELECT AVG(ur.rating) FROM user_ratings ur
-                 WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL),
-                a.average_score
-            ) as site_avg_rating,
-            (SELECT COUNT(*) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
+            COALESCE(ss.average_rating, a.average_score) as site_avg_rating,
+            COALESCE(ss.rating_count, 0) as site_rating_count,
             a.popularity
         FROM anime a
-        WHERE a.title_korean LIKE ?
-           OR a.title_romaji LIKE ?
-           OR a.title_english LIKE ?
-           OR a.title_native LIKE ?
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
+        WHERE {anime_where}
         ORDER BY {anime_order}
         LIMIT ?
     """
     try:
         anime_results = db.execute_query(
             anime_query,
-            (pattern, pattern, pattern, pattern, limit)
+            anime_params + anime_rank_params + (limit,)
         )
         results["anime"] = [
             {
@@ -82,7 +101,7 @@ def unified_search(
     except sqlite3.OperationalError:
         pass  # Table doesn't exist in local dev
 
-    # 캐릭터 검색 (with site ratings calculated via subquery)
+    # 캐릭터 검색 (site ratings from character_site_stats)
     char_order = {
         "popularity_desc": "c.favourites DESC",
         "rating_desc": "site_avg_rating DESC",
@@ -90,24 +109,28 @@ def unified_search(
         "title_asc": "COALESCE(c.name_korean, c.name_full) ASC",
     }.get(sort, "c.favourites DESC")
 
+    char_columns = ['c.name_korean', 'c.name_full', 'c.name_native']
+    char_where, char_params = title_search_clause('c.id', 'character_search', 'names', char_columns, q)
+    char_rank_params = ()
+    if char_order == "c.favourites DESC":
+        char_rank, char_rank_params = title_match_rank(char_columns, q)
+        char_order = f"{char_rank}, {char_order}"
+
     char_query = f"""
         SELECT
             c.id, c.name_korean, c.name_full, c.name_native,
             COALESCE('/' || c.image_local, c.image_url) as image_large,
             c.favourites,
-            (SELECT AVG(cr.rating) FROM character_ratings cr
-             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_avg_rating,
-            (SELECT COUNT(*) FROM character_ratings cr
-             WHERE cr.character_id = c.id AND cr.status = 'RATED' AND cr.rating IS NOT NULL) as site_rating_count,
+            cs.average_rating as site_avg_rating,
+            COALESCE(cs.rating_count, 0) as site_rating_count,
             a.id as anime_id,
             a.title_korean as anime_title_korean,
             a.title_romaji as anime_title_romaji
         FROM character c
+        LEFT JOIN character_site_stats cs ON cs.character_id = c.id
         LEFT JOIN anime_character ac ON c.id = ac.character_id
         LEFT JOIN anime a ON ac.anime_id = a.id
-        WHERE c.name_korean LIKE ?
-           OR c.name_full LIKE ?
-           OR c.name_native LIKE ?
+        WHERE {char_where}
         GROUP BY c.id
         ORDER BY {char_order}
         LIMIT ?
@@ -115,7 +138,7 @@ def unified_search(
     try:
         char_results = db.execute_query(
             char_query,
-            (pattern, pattern, pattern, limit)
+            char_params + char_rank_params + (limit,)
         )
         results["characters"] = [
             {
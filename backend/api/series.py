@@ -7,7 +7,7 @@ from typing import List
 from pydantic import BaseModel
 from models.user import UserResponse
 from services.series_service import get_series_info
-from services.rating_service import create_or_update_rating
+from services.rating_service import bulk_upsert_ratings
 from models.rating import RatingCreate, RatingStatus
 from api.deps import get_current_user
 
@@ -43,24 +43,21 @@ def bulk_rate_series(
 ):
     """
     시리즈 일괄 평가 처리
+    한 트랜잭션에서 일괄 UPSERT + 통계/승급 확인 한 번 (rating_service.bulk_upsert_ratings)
     """
-    results = []
-    errors = []
-
-    for anime_id in request.anime_ids:
-        try:
-            rating_data = RatingCreate(
+    result = bulk_upsert_ratings(
+        current_user.id,
+        [
+            RatingCreate(
                 anime_id=anime_id,
                 status=request.status,
                 rating=None  # 상태만 변경
             )
-            result = create_or_update_rating(current_user.id, rating_data)
-            results.append(result)
-        except Exception as e:
-            errors.append({
-                'anime_id': anime_id,
-                'error': str(e)
-            })
+            for anime_id in request.anime_ids
+        ]
+    )
+    results = result['items']
+    errors = result['errors']
 
     return {
         'success_count': len(results),
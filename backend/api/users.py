@@ -3,7 +3,7 @@ User API Router
 사용자 프로필, 통계
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 import shutil
 from pathlib import Path
@@ -23,7 +23,6 @@ from services.profile_service import (
     get_season_stats,
     get_genre_combination_stats,
     get_five_star_characters,
-    get_leaderboard,
     get_studio_preferences,
     get_hidden_gems,
     get_source_preferences,
@@ -31,7 +30,10 @@ from services.profile_service import (
     get_genre_radar_data
 )
 from services.auth_service import update_user_profile, update_user_password, update_user_avatar
-from api.deps import get_current_user
+from services.profile_analytics_service import get_profile_analytics
+from services.leaderboard_service import get_top_users, get_user_rank, get_level_counts
+from services.compatibility_service import get_compatibility
+from api.deps import get_current_user, get_current_user_optional
 
 router = APIRouter()
 
@@ -318,12 +320,27 @@ def get_my_genre_radar(
     return get_genre_radar_data(current_user.id)
 
 
+@router.get("/me/analytics", response_model=Dict)
+def get_my_analytics(current_user: UserResponse = Depends(get_current_user)):
+    """
+    프로필 통계 묶음
+
+    장르/평점/연도/포맷/에피소드 길이/스튜디오/시즌/장르 조합/숨겨진 보석/원작/감독/레이더 데이터를
+    한 번에 반환 (개별 통계 엔드포인트와 같은 형식, 평가/리뷰 변경 전까지 캐시)
+    """
+    return get_profile_analytics(current_user.id)
+
+
 @router.get("/{user_id}/profile", response_model=UserProfileResponse)
-def get_user_profile_by_id(user_id: int):
+def get_user_profile_by_id(
+    user_id: int,
+    current_user: Optional[UserResponse] = Depends(get_current_user_optional)
+):
     """
     다른 사용자 프로필 조회 (공개)
 
     사용자 정보 + 통계
+    로그인한 경우 compatibility: 현재 사용자와의 평점 취향 유사도
     """
     profile = get_user_profile(user_id)
     if profile is None:
@@ -331,6 +348,8 @@ def get_user_profile_by_id(user_id: int):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    if current_user is not None and current_user.id != user_id:
+        profile.compatibility = get_compatibility(current_user.id, user_id)
     return profile
 
 
@@ -345,6 +364,14 @@ def get_user_genre_preferences(
     return get_genre_preferences(user_id, limit)
 
 
+@router.get("/{user_id}/analytics", response_model=Dict)
+def get_user_analytics(user_id: int):
+    """
+    다른 사용자의 프로필 통계 묶음 (공개)
+    """
+    return get_profile_analytics(user_id)
+
+
 @router.get("/{user_id}/stats", response_model=Dict)
 def get_user_stats_by_id(user_id: int):
     """
@@ -533,14 +560,53 @@ def set_avatar_from_character(
 
 @router.get("/leaderboard", response_model=List[Dict])
 def get_users_leaderboard(
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0)
 ):
     """
     사용자 리더보드
 
-    오타쿠 점수 높은 순으로 정렬된 사용자 목록
+    오타쿠 점수 높은 순으로 정렬된 사용자 목록 (rank: 동점 공동 순위)
+    """
+    return get_top_users(limit, offset)
+
+
+@router.get("/leaderboard/levels", response_model=List[Dict])
+def get_leaderboard_levels():
+    """
+    등급별 사용자 수 (Lv.1 루키 ~ Lv.10 오타쿠 갓)
+    """
+    return get_level_counts()
+
+
+@router.get("/me/leaderboard-rank", response_model=Dict)
+def get_my_leaderboard_rank(
+    neighbors: int = Query(2, ge=0, le=10),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    내 리더보드 순위
+
+    순위, 백분위, 등급 + 앞뒤 neighbors 명
     """
-    return get_leaderboard(limit)
+    result = get_user_rank(current_user.id, neighbors)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User stats not found")
+    return result
+
+
+@router.get("/{user_id}/leaderboard-rank", response_model=Dict)
+def get_user_leaderboard_rank(
+    user_id: int,
+    neighbors: int = Query(2, ge=0, le=10)
+):
+    """
+    다른 사용자의 리더보드 순위 (공개)
+    """
+    result = get_user_rank(user_id, neighbors)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User stats not found")
+    return result
 
 
 @router.get("/{user_id}/character-ratings", response_model=List[Dict])
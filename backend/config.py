@@ -22,11 +22,23 @@ else:
 # Database - 단일 DB 구조 (볼륨에 영구 저장)
 DATABASE_PATH = os.getenv("DATABASE_PATH", str(DATA_DIR / "anime.db"))
 
+# Database connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "16"))  # 프로세스당 최대 연결 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 연결 대기 최대 시간 (초) - 스레드풀 작업만 대기
+DB_PRAGMAS = [
+    "journal_mode=WAL",  # WAL 모드 (동시 읽기/쓰기 지원)
+    "busy_timeout=60000",  # 60초 대기
+]
+
 # JWT Settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")  # 프로덕션에서는 환경변수로 변경 필수
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Authenticated user cache (api.deps.get_current_user)
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))  # 초, 0이면 캐시 비활성화
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "4096"))  # 최대 토큰 수
+
 # Google OAuth Settings
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -59,6 +71,10 @@ ALLOWED_ORIGINS = list(set(_DEFAULT_ORIGINS + _PRODUCTION_ORIGINS + [o.strip() f
 DEFAULT_PAGE_SIZE = 50
 MAX_PAGE_SIZE = 100
 
+# Following feed (fan-out-on-write home timeline)
+# 팔로워가 이 수를 넘는 계정은 타임라인에 fan-out 하지 않고 읽을 때 직접 조회 (hybrid pull)
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "1000"))
+
 # Rating constraints
 MIN_RATING = 0.5
 MAX_RATING = 5.0
@@ -78,10 +94,36 @@ MIN_REVIEW_CONTENT_LENGTH = 10
 MIN_RATINGS_FOR_RECOMMENDATION = 10
 RECOMMENDATION_CACHE_DAYS = 7
 TOP_K_SIMILAR_USERS = 20
+TOP_K_SIMILAR_ITEMS = 50  # 애니당 저장하는 유사 애니 수 (anime_similarity)
+RECOMMENDATIONS_PER_USER = 50  # recommendation_cache 에 저장하는 사용자별 추천 수
+RECOMMENDATION_BLOCK_SIZE = 512  # 유사도 계산 시 한 번에 처리하는 애니 열 수 (메모리 상한)
+
+# Taste compatibility (services.compatibility_service) - 사용자별 평점 벡터 캐시
+COMPATIBILITY_VECTOR_TTL = float(os.getenv("COMPATIBILITY_VECTOR_TTL", "300"))  # 초, 다른 워커의 평가 변경 반영 시간
+COMPATIBILITY_CACHE_SIZE = int(os.getenv("COMPATIBILITY_CACHE_SIZE", "2048"))  # 최대 사용자 수
+MIN_COMMON_RATINGS_FOR_COMPATIBILITY = 3  # 이보다 적게 겹치면 점수 없음
+COMPATIBILITY_LIST_BATCH = 50  # 팔로우 목록 한 페이지에서 유사도를 계산하는 최대 사용자 수
+
+# Profile analytics bundle (services.profile_analytics_service) - 사용자별 통계 묶음 캐시
+PROFILE_ANALYTICS_CACHE_TTL = float(os.getenv("PROFILE_ANALYTICS_CACHE_TTL", "600"))  # 초, 0이면 캐시 비활성화
+PROFILE_ANALYTICS_CACHE_SIZE = int(os.getenv("PROFILE_ANALYTICS_CACHE_SIZE", "1024"))  # 최대 사용자 수
+
+# Rating page candidate queue (services.rating_page_service) - 사용자별 평가 후보 애니 순서
+RATING_QUEUE_SIZE = 3000  # 사용자별 최대 후보 수 (anime_id 4바이트씩 BLOB 저장)
+RATING_QUEUE_TIER_SIZE = 150  # 인기도 구간 크기 - 구간 안에서만 섞음 (기본 페이지 50 x 3)
+RATING_QUEUE_REFILL_AT = 200  # 남은 후보가 이보다 적으면 백그라운드에서 보충
+
+# Leaderboard (services.leaderboard_service) - user_stats 변경 확인 주기 (다른 워커/스크립트의 점수 변경 반영)
+LEADERBOARD_CHECK_INTERVAL = float(os.getenv("LEADERBOARD_CHECK_INTERVAL", "60"))  # 초
+
+# Franchise graph (services.series_service) - anime_relation 변경 확인 주기 (크롤러는 별도 프로세스)
+FRANCHISE_GRAPH_CHECK_INTERVAL = float(os.getenv("FRANCHISE_GRAPH_CHECK_INTERVAL", "300"))  # 초
 
 # Images
 COVER_IMAGES_DIR = DATA_DIR / "images" / "covers"
 IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "http://localhost:8000/images")
+R2_NEGATIVE_CACHE_TTL = float(os.getenv("R2_NEGATIVE_CACHE_TTL", "600"))  # 초, R2에 없는 객체 기억 시간
+R2_POSITIVE_CACHE_TTL = float(os.getenv("R2_POSITIVE_CACHE_TTL", "300"))  # 초, 메모리의 "있음" 항목을 r2_objects 테이블로 재확인하는 주기
 
 # Cloudflare R2 Settings (Production)
 # Set IMAGE_BASE_URL=https://images.anibite.com in production environment
@@ -1,35 +1,336 @@
 """
 Database connection and utilities
-SQLite3 connection management
+SQLite3 connection management (pooled connections)
 """
+import asyncio
+import os
+import queue
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional, Dict, List, Any
-from config import DATABASE_PATH
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Any, Callable
+from config import DATABASE_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_PRAGMAS
+
+
+class ConnectionPool:
+    """
+    SQLite 연결 풀
+    - 연결은 생성 시 한 번만 PRAGMA 설정
+    - 최대 max_size 개까지 생성, 초과 시 반납될 때까지 대기
+    - 이벤트 루프 스레드(async 엔드포인트)는 대기하지 않음 - 한도 초과 시 임시 연결을 열고 반납 때 닫음
+    - fork 이후(uvicorn workers) 부모 프로세스의 연결은 재사용하지 않음
+    """
+
+    def __init__(self, db_path: str, max_size: int = DB_POOL_SIZE,
+                 timeout: float = DB_POOL_TIMEOUT, pragmas: List[str] = None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = pragmas if pragmas is not None else DB_PRAGMAS
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._size = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._discarded = 0
+        self._overflows = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=60.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Row 객체로 결과 반환
+        for pragma in self.pragmas:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """풀에서 연결 가져오기 (없으면 생성, 한도 초과 시 대기 - 이벤트 루프 스레드는 임시 연결)"""
+        on_event_loop = _on_event_loop()
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+                if self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                elif on_event_loop:
+                    # 루프를 막으면 연결을 반납할 다른 코루틴도 멈춤 → 대기 대신 한도 밖 임시 연결
+                    self._size += 1
+                    self._overflows += 1
+                    create = True
+                else:
+                    create = False
+            else:
+                create = False
+            if conn is not None or create:
+                self._in_use += 1
+                self._checkouts += 1
+
+        if conn is not None:
+            return conn
+
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._in_use -= 1
+                raise
+
+        # 풀이 가득 참 - 반납 대기
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out after {self.timeout}s waiting for a database connection "
+                f"(pool size {self.max_size})"
+            )
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._waits += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """연결 반납 (열린 트랜잭션은 롤백)"""
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 이전에 체크아웃된 연결 - 현재 풀과 무관
+                return
+            self._in_use -= 1
+            if discard:
+                self._discarded += 1
+            elif self._size > self.max_size:
+                # 한도 밖 임시 연결 - 닫아서 풀 크기 복구
+                discard = True
+            if discard:
+                self._size -= 1
+
+        if discard:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        else:
+            self._idle.put(conn)
+
+    def close_all(self):
+        """유휴 연결 모두 닫기"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._size -= 1
+            conn.close()
+
+    def stats(self) -> Dict:
+        """풀 지표"""
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": self._size - self._in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+                "discarded": self._discarded,
+                "overflows": self._overflows,
+            }
+
+
+def _on_event_loop() -> bool:
+    """현재 스레드에서 asyncio 이벤트 루프가 실행 중인지 (async 엔드포인트 안)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _ScopedConnection:
+    """요청 범위 연결 홀더 (첫 사용 시 체크아웃)"""
+
+    def __init__(self):
+        self.conn: Optional[sqlite3.Connection] = None
+        self.closed = False
+        self.lock = threading.RLock()  # 같은 요청 안의 동시 사용 직렬화
+
+
+class _Transaction:
+    """진행 중인 트랜잭션 상태 (중첩 깊이)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 0
+        self.after_commit: List[Callable[[], None]] = []
 
 
 class Database:
     """데이터베이스 연결 관리 클래스"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, pool_size: int = None):
         self.db_path = db_path or str(DATABASE_PATH)
+        self.pool = ConnectionPool(self.db_path, max_size=pool_size or DB_POOL_SIZE)
+        self._scope: ContextVar[Optional[_ScopedConnection]] = ContextVar(
+            f"db_scope_{id(self)}", default=None
+        )
+        self._tx: ContextVar[Optional[_Transaction]] = ContextVar(
+            f"db_tx_{id(self)}", default=None
+        )
 
     @contextmanager
-    def get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
-        conn = sqlite3.connect(self.db_path, timeout=60.0)
-        conn.row_factory = sqlite3.Row  # Row 객체로 결과 반환
-        # WAL 모드 활성화 (동시 읽기/쓰기 지원)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=60000")  # 60초 대기
+    def request_scope(self):
+        """
+        연결 범위 바인딩 (스크립트/백그라운드 작업용)
+        이 범위 안의 모든 쿼리는 같은 풀 연결을 재사용하고, 범위가 끝나면 반납
+        HTTP 요청에는 바인딩하지 않음 - 요청 전체(모든 await 포함) 동안 연결을 잡으면 풀이 고갈되므로
+        요청 중에는 쿼리/트랜잭션 단위로 체크아웃
+        """
+        if self._scope.get() is not None:
+            # 이미 바인딩됨 (중첩 호출)
+            yield
+            return
+
+        holder = _ScopedConnection()
+        token = self._scope.set(holder)
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+            holder.closed = True
+            if holder.conn is not None:
+                self.pool.release(holder.conn)
+                holder.conn = None
+
+    @contextmanager
+    def _checkout(self):
+        """현재 범위의 연결 또는 풀 연결 가져오기"""
+        holder = self._scope.get()
+        if holder is not None and not holder.closed:
+            with holder.lock:
+                if holder.conn is None:
+                    holder.conn = self.pool.acquire()
+                yield holder.conn
+            return
+
+        conn = self.pool.acquire()
+        discard = False
         try:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
+        except sqlite3.ProgrammingError:
+            discard = True
+            raise
         finally:
-            conn.close()
+            self.pool.release(conn, discard=discard)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit-of-work 트랜잭션
+        블록 안에서 이 Database로 실행되는 모든 쿼리(다른 서비스 호출 포함)가
+        하나의 연결/트랜잭션을 공유하고, 블록이 끝날 때 한 번만 커밋
+
+        사용 예:
+            with db.transaction() as tx:
+                tx.execute_update(...)
+                other_service_call(...)  # 같은 트랜잭션에 참여
+
+        중첩 호출은 바깥 트랜잭션에 합류 (예외 발생 시 전체 롤백)
+        """
+        tx = self._tx.get()
+        if tx is not None:
+            tx.depth += 1
+            try:
+                yield self
+            finally:
+                tx.depth -= 1
+            return
+
+        with self._checkout() as conn:
+            if conn.in_transaction:
+                conn.commit()
+            # 쓰기 잠금을 미리 획득 (읽기→쓰기 승격 시 SQLITE_BUSY 방지)
+            conn.execute("BEGIN IMMEDIATE")
+            tx = _Transaction(conn)
+            token = self._tx.set(tx)
+            try:
+                yield self
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._tx.reset(token)
+
+        for callback in tx.after_commit:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[Database] WARNING: after-commit callback failed: {e}")
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        현재 트랜잭션이 커밋된 뒤 실행할 콜백 등록 (프로세스 캐시 무효화/메모리 구조 갱신 등)
+        커밋 전에 무효화하면 동시 요청이 커밋 전 데이터로 캐시를 다시 채울 수 있으므로 커밋 후 실행
+        트랜잭션 밖이면 즉시 실행, 롤백되면 실행하지 않음
+        """
+        tx = self._tx.get()
+        if tx is None:
+            callback()
+            return
+        tx.after_commit.append(callback)
+
+    def in_transaction(self) -> bool:
+        """현재 컨텍스트에서 transaction() 블록 안인지 여부"""
+        return self._tx.get() is not None
+
+    @contextmanager
+    def get_connection(self):
+        """데이터베이스 연결 컨텍스트 매니저"""
+        tx = self._tx.get()
+        if tx is not None:
+            # 트랜잭션 참여 - 커밋/롤백은 transaction() 블록이 담당
+            yield tx.conn
+            return
+
+        with self._checkout() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    def pool_stats(self) -> Dict:
+        """연결 풀 지표 (checkouts, wait time, size)"""
+        return self.pool.stats()
 
     def execute_query(
         self, query: str, params: tuple = None, fetch_one: bool = False
@@ -72,7 +373,10 @@ db = Database()
 
 
 def get_db() -> Database:
-    """FastAPI dependency로 사용할 DB 인스턴스"""
+    """
+    FastAPI dependency로 사용할 DB 인스턴스
+    연결은 쿼리/트랜잭션 단위로 풀에서 체크아웃
+    """
     return db
 
 
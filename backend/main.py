@@ -16,6 +16,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.exceptions import HTTPException
 from config import ALLOWED_ORIGINS, COVER_IMAGES_DIR
+from database import get_db
 import os
 
 # Import API routers
@@ -170,6 +171,16 @@ async def startup_event():
         traceback.print_exc()
         print("⚠️  Server will start but Google OAuth may not work!\n")
 
+    # 4.6. Fallback character avatar stored on users (character_avatar_url)
+    print("🖼️ Ensuring character avatar column...")
+    try:
+        from scripts.add_character_avatar import ensure_character_avatar
+        ensure_character_avatar()
+        print("✅ Character avatars ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure character avatars: {e}")
+        print("Server will continue, but default avatars will be computed per request.\n")
+
     # 5. Verify existing users (one-time migration for email verification feature)
     print("👤 Verifying existing users...")
     try:
@@ -199,6 +210,136 @@ async def startup_event():
         print(f"WARNING: Failed to add indexes: {e}")
         print("Server will continue, but queries may be slow.\n")
 
+    # 7.4. Primary anime per character (character_primary_anime)
+    print("🎭 Ensuring character primary anime...")
+    try:
+        from scripts.create_character_primary_anime import ensure_character_primary_anime
+        ensure_character_primary_anime()
+        print("✅ Character primary anime ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure character primary anime: {e}")
+        print("Server will continue, but character activities may miss their anime.\n")
+
+    # 7.5. Denormalized like/comment counters on activities
+    print("❤️ Ensuring activity engagement counters...")
+    try:
+        from scripts.add_engagement_counters import ensure_engagement_counters
+        ensure_engagement_counters()
+        print("✅ Engagement counters ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure engagement counters: {e}")
+        print("Server will continue, but like/comment counts may be stale.\n")
+
+    # 7.6. Home timeline for the following feed (fan-out on write)
+    print("📰 Ensuring home timeline...")
+    try:
+        from scripts.create_home_timeline import ensure_home_timeline
+        ensure_home_timeline()
+        print("✅ Home timeline ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure home timeline: {e}")
+        print("Server will continue, but the following feed may be incomplete.\n")
+
+    # 7.7. Precomputed site rating aggregates (anime_site_stats, character_site_stats)
+    print("⭐ Ensuring site rating stats...")
+    try:
+        from scripts.create_site_stats import ensure_site_stats
+        ensure_site_stats()
+        print("✅ Site rating stats ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure site rating stats: {e}")
+        print("Server will continue, but site ratings may be missing.\n")
+
+    # 7.8. FTS5 trigram search index (anime_search, character_search)
+    print("🔍 Ensuring search index...")
+    try:
+        from scripts.create_search_index import ensure_search_index
+        ensure_search_index()
+        print("✅ Search index ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure search index: {e}")
+        print("Server will continue, but search will fall back to LIKE scans.\n")
+
+    # 7.9. In-memory autocomplete index (Hangul jamo / chosung prefixes)
+    print("⌨️ Building autocomplete index...")
+    try:
+        from services.autocomplete_service import build_autocomplete_index
+        stats = build_autocomplete_index()
+        print(f"✅ Autocomplete index ready: {stats}\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build autocomplete index: {e}")
+        print("Server will continue, but autocomplete will return no results.\n")
+
+    # 7.10. R2 object existence index (image proxy redirects without HEAD requests)
+    print("🗂️ Loading R2 object index...")
+    try:
+        from scripts.create_r2_object_index import ensure_r2_object_index
+        count = ensure_r2_object_index()
+        print(f"✅ R2 object index ready: {count} objects\n")
+    except Exception as e:
+        print(f"WARNING: Failed to load R2 object index: {e}")
+        print("Server will continue, but image requests will fall back to R2 HEAD checks.\n")
+
+    # 7.11. Incrementally maintained user_stats (counters, genre tallies, rank_level)
+    print("📈 Ensuring user stats counters...")
+    try:
+        from scripts.create_user_stats_counters import ensure_user_stats_counters
+        ensure_user_stats_counters()
+        print("✅ User stats counters ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure user stats counters: {e}")
+        print("Server will continue, but user stats may be stale.\n")
+
+    # 7.12. Structured rank promotions (item_id = new_level, unique per user/level)
+    print("🏅 Ensuring rank promotion index...")
+    try:
+        from scripts.create_rank_promotions import ensure_rank_promotions
+        ensure_rank_promotions()
+        print("✅ Rank promotion index ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure rank promotion index: {e}")
+        print("Server will continue, but duplicate promotions are not prevented.\n")
+
+    # 7.13. In-memory franchise graph (sequel traversal, season_number)
+    print("🧬 Building franchise graph...")
+    try:
+        from services.series_service import build_franchise_graph
+        stats = build_franchise_graph()
+        print(f"✅ Franchise graph ready: {stats}\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build franchise graph: {e}")
+        print("Server will continue, and the graph will be built on first use.\n")
+
+    # 7.14. Personalized recommendation tables (anime_similarity, recommendation_cache)
+    print("🎯 Ensuring recommendation tables...")
+    try:
+        from scripts.create_recommendation_cache import ensure_recommendation_cache
+        ensure_recommendation_cache()
+        print("✅ Recommendation tables ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure recommendation tables: {e}")
+        print("Server will continue, but personalized recommendations are unavailable.\n")
+
+    # 7.15. In-memory leaderboard (otaku_score rank, percentile, level counts)
+    print("🏆 Building leaderboard...")
+    try:
+        from services.leaderboard_service import build_leaderboard
+        stats = build_leaderboard()
+        print(f"✅ Leaderboard ready: {stats}\n")
+    except Exception as e:
+        print(f"WARNING: Failed to build leaderboard: {e}")
+        print("Server will continue, and the leaderboard will be built on first use.\n")
+
+    # 7.16. Per-user rating candidate queue (rating page pagination without repeats)
+    print("🗂️ Ensuring rating candidate queue table...")
+    try:
+        from scripts.create_rating_candidate_queue import ensure_rating_candidate_queue
+        ensure_rating_candidate_queue()
+        print("✅ Rating candidate queue ready!\n")
+    except Exception as e:
+        print(f"WARNING: Failed to ensure rating candidate queue: {e}")
+        print("Server will continue, but the anime rating page may fail.\n")
+
     # 8. CRITICAL: Backfill anime_title_native and item_title_native for ALL activities
     print("🌐 Backfilling Japanese titles for ALL activities...")
     try:
@@ -429,6 +570,12 @@ def health_check():
     return {"status": "ok", "timestamp": "2026-01-13"}
 
 
+# Database connection pool metrics
+@app.get("/health/db")
+def health_db():
+    return {"status": "ok", "pool": get_db().pool_stats()}
+
+
 # Legacy image proxy removed - now using routers/image_proxy.py with auto-download functionality
 
 
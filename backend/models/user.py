@@ -96,7 +96,16 @@ class UserStatsResponse(BaseModel):
     updated_at: datetime
 
 
+class TasteCompatibilityResponse(BaseModel):
+    """두 사용자의 평점 취향 유사도"""
+    score: Optional[int]  # 0~100, 겹친 평가가 부족하면 None
+    common_count: int
+    pearson: Optional[float]
+    cosine: Optional[float]
+
+
 class UserProfileResponse(BaseModel):
     """사용자 프로필 (정보 + 통계)"""
     user: UserPublicResponse
     stats: Optional[UserStatsResponse]
+    compatibility: Optional[TasteCompatibilityResponse] = None  # 로그인한 사용자와의 취향 유사도
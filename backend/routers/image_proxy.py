@@ -1,17 +1,148 @@
 """
 Image Proxy Router
 이미지 프록시 - R2에 없으면 AniList에서 다운로드 후 캐싱
+
+- AniList 다운로드는 공유 httpx.AsyncClient (커넥션 풀) 로 이벤트 루프를 막지 않음
+- 같은 이미지에 대한 동시 요청은 하나의 다운로드를 공유 (single-flight)
+- R2 존재 여부는 utils.r2_object_index 메모리 인덱스로 판단, 모를 때만 HEAD
+- boto3 호출(HEAD/업로드)과 DB 조회는 스레드풀에서 실행
+- R2 업로드는 응답 이후 백그라운드에서 처리, 업로드가 끝날 때까지 받은 이미지를 재사용
 """
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import httpx
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import RedirectResponse, Response
-import requests
-from utils.r2_storage import upload_to_r2, check_r2_object_exists
+from starlette.concurrency import run_in_threadpool
+
+from config import IMAGE_BASE_URL
 from database import db
-import logging
+from utils import r2_object_index
+from utils.r2_storage import upload_to_r2, check_r2_object_exists
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DOWNLOAD_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+_client: Optional[httpx.AsyncClient] = None
+# r2_path -> (content, content_type) 다운로드 작업. 실패 시 즉시, 성공 시 R2 업로드 후 제거
+_inflight: Dict[str, "asyncio.Task[Tuple[bytes, str]]"] = {}
+_background: Set[asyncio.Task] = set()
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=DOWNLOAD_TIMEOUT,
+            limits=DOWNLOAD_LIMITS,
+            follow_redirects=True,
+        )
+    return _client
+
+
+@router.on_event("shutdown")
+async def close_http_client():
+    global _client
+    if _background:
+        await asyncio.gather(*_background, return_exceptions=True)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _download(url: str, ext: str) -> Tuple[bytes, str]:
+    logger.info(f"Downloading from AniList: {url}")
+    response = await _get_client().get(url)
+    response.raise_for_status()
+    return response.content, response.headers.get('content-type', f'image/{ext}')
+
+
+async def _persist(r2_path: str, content: bytes, content_type: str,
+                   on_uploaded: Optional[Callable[[], None]]):
+    """R2 업로드 (+ DB 갱신) 후 single-flight 항목 제거"""
+    try:
+        logger.info(f"Uploading to R2: {r2_path}")
+        await run_in_threadpool(upload_to_r2, content, r2_path, content_type)
+        if on_uploaded is not None:
+            await run_in_threadpool(on_uploaded)
+        logger.info(f"Successfully cached image: {r2_path}")
+    except Exception as e:
+        logger.error(f"Failed to upload to R2: {r2_path}: {e}")
+    finally:
+        _inflight.pop(r2_path, None)
+
+
+def _spawn(coro: Awaitable):
+    task = asyncio.ensure_future(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _fetch_once(r2_path: str, url: str, ext: str,
+                      on_uploaded: Optional[Callable[[], None]] = None) -> Tuple[bytes, str]:
+    """
+    같은 r2_path 요청은 하나의 다운로드 결과를 공유
+    첫 요청자가 취소되어도 다운로드는 계속됨 (asyncio.shield)
+    """
+    task = _inflight.get(r2_path)
+    if task is None:
+        task = asyncio.ensure_future(_download(url, ext))
+        _inflight[r2_path] = task
+
+        def _done(t: asyncio.Task):
+            if t.cancelled() or t.exception() is not None:
+                _inflight.pop(r2_path, None)
+            else:
+                content, content_type = t.result()
+                _spawn(_persist(r2_path, content, content_type, on_uploaded))
+
+        task.add_done_callback(_done)
+
+    return await asyncio.shield(task)
+
+
+def _load_or_check_exists(path: str) -> bool:
+    exists = r2_object_index.load(path)
+    if exists is None:
+        exists = check_r2_object_exists(path)
+    return exists
+
+
+async def _r2_redirect(*r2_paths: str) -> Optional[RedirectResponse]:
+    for path in r2_paths:
+        # 존재 여부 인덱스에 있으면 네트워크 요청 없이 판단, 메모리 항목이 만료되면 r2_objects 테이블, 모를 때만 HEAD
+        exists = r2_object_index.lookup(path)
+        if exists is None:
+            exists = await run_in_threadpool(_load_or_check_exists, path)
+        if exists:
+            return RedirectResponse(url=f"{IMAGE_BASE_URL}/{path}")
+    return None
+
+
+async def _proxy_image(r2_path: str, ext: str, source_url: Optional[str],
+                       on_uploaded: Optional[Callable[[], None]] = None) -> Response:
+    try:
+        content, content_type = await _fetch_once(r2_path, source_url, ext, on_uploaded)
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to download from AniList: {e}")
+        raise HTTPException(status_code=502, detail=f"Failed to download image from AniList: {str(e)}")
+    return Response(content=content, media_type=content_type)
+
+
+def _lookup_image_url(table: str, item_id: int) -> Optional[str]:
+    row = db.execute_query(
+        f"SELECT image_url FROM {table} WHERE id = ?",
+        (item_id,),
+        fetch_one=True
+    )
+    return row['image_url'] if row else None
+
+
 @router.get("/images/test")
 async def test_endpoint():
     """Test endpoint to verify router is working"""
@@ -24,58 +155,25 @@ async def get_character_image(character_id: int, ext: str):
     캐릭터 이미지 가져오기 - R2에 없으면 AniList에서 자동 다운로드
     """
     r2_path = f"images/characters/{character_id}.{ext}"
-    
-    # Check if image exists in R2
-    if check_r2_object_exists(r2_path):
-        # Redirect to R2 public URL
-        from config import IMAGE_BASE_URL
-        return RedirectResponse(url=f"{IMAGE_BASE_URL}/{r2_path}")
-    
-    # Image not in R2, try to download from AniList
-    logger.info(f"Image not found in R2: {r2_path}, attempting to download from AniList")
-    
-    # Get character's AniList image URL from database
-    character = db.execute_query(
-        "SELECT image_url FROM character WHERE id = ?",
-        (character_id,),
-        fetch_one=True
-    )
-    
-    if not character or not character['image_url']:
+
+    # 다운로드/업로드 진행 중이면 R2 확인 없이 공유
+    if r2_path not in _inflight:
+        redirect = await _r2_redirect(r2_path)
+        if redirect:
+            return redirect
+        logger.info(f"Image not found in R2: {r2_path}, attempting to download from AniList")
+
+    anilist_url = await run_in_threadpool(_lookup_image_url, 'character', character_id)
+    if not anilist_url:
         raise HTTPException(status_code=404, detail="Character not found or no image URL")
-    
-    anilist_url = character['image_url']
-    
-    try:
-        # Download from AniList
-        logger.info(f"Downloading from AniList: {anilist_url}")
-        response = requests.get(anilist_url, timeout=10)
-        response.raise_for_status()
-        
-        # Determine content type
-        content_type = response.headers.get('content-type', f'image/{ext}')
-        
-        # Upload to R2
-        logger.info(f"Uploading to R2: {r2_path}")
-        upload_to_r2(response.content, r2_path, content_type)
-        
-        # Update database with local path
+
+    def mark_local():
         db.execute_update(
             "UPDATE character SET image_local = ? WHERE id = ?",
             (r2_path, character_id)
         )
-        
-        logger.info(f"Successfully cached image: {r2_path}")
-        
-        # Return the image directly
-        return Response(content=response.content, media_type=content_type)
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to download from AniList: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to download image from AniList: {str(e)}")
-    except Exception as e:
-        logger.error(f"Failed to upload to R2: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to cache image: {str(e)}")
+
+    return await _proxy_image(r2_path, ext, anilist_url, mark_local)
 
 
 @router.get("/images/staff/{staff_id}.{ext}")
@@ -86,54 +184,15 @@ async def get_staff_image(staff_id: int, ext: str):
     """
     r2_path = f"images/staff/{staff_id}.{ext}"
 
-    # Check if image exists in R2
-    if check_r2_object_exists(r2_path):
-        # Redirect to R2 public URL
-        from config import IMAGE_BASE_URL
-        return RedirectResponse(url=f"{IMAGE_BASE_URL}/{r2_path}")
-
-    # Also check without images/ prefix (legacy upload path)
-    legacy_r2_path = f"staff/{staff_id}.{ext}"
-    if check_r2_object_exists(legacy_r2_path):
-        from config import IMAGE_BASE_URL
-        return RedirectResponse(url=f"{IMAGE_BASE_URL}/{legacy_r2_path}")
-
-    # Image not in R2, try to download from AniList
-    logger.info(f"Staff image not found in R2: {r2_path}, attempting to download from AniList")
-
-    # Get staff's AniList image URL from database
-    staff = db.execute_query(
-        "SELECT image_url FROM staff WHERE id = ?",
-        (staff_id,),
-        fetch_one=True
-    )
+    if r2_path not in _inflight:
+        # images/ 접두어 없는 경로도 확인 (legacy upload path)
+        redirect = await _r2_redirect(r2_path, f"staff/{staff_id}.{ext}")
+        if redirect:
+            return redirect
+        logger.info(f"Staff image not found in R2: {r2_path}, attempting to download from AniList")
 
-    if not staff or not staff['image_url']:
+    anilist_url = await run_in_threadpool(_lookup_image_url, 'staff', staff_id)
+    if not anilist_url:
         raise HTTPException(status_code=404, detail="Staff not found or no image URL")
 
-    anilist_url = staff['image_url']
-
-    try:
-        # Download from AniList
-        logger.info(f"Downloading staff image from AniList: {anilist_url}")
-        response = requests.get(anilist_url, timeout=10)
-        response.raise_for_status()
-
-        # Determine content type
-        content_type = response.headers.get('content-type', f'image/{ext}')
-
-        # Upload to R2
-        logger.info(f"Uploading staff image to R2: {r2_path}")
-        upload_to_r2(response.content, r2_path, content_type)
-
-        logger.info(f"Successfully cached staff image: {r2_path}")
-
-        # Return the image directly
-        return Response(content=response.content, media_type=content_type)
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to download staff image from AniList: {e}")
-        raise HTTPException(status_code=502, detail=f"Failed to download image from AniList: {str(e)}")
-    except Exception as e:
-        logger.error(f"Failed to upload staff image to R2: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to cache image: {str(e)}")
+    return await _proxy_image(r2_path, ext, anilist_url)
@@ -50,6 +50,28 @@ def add_indexes():
     except Exception as e:
         print(f"✗ Error creating composite index: {e}")
 
+    # Keyset indexes for feed pagination: ORDER BY activity_time DESC, id DESC
+    # (activity_time 만 있는 인덱스는 같은 시각 안에서 id 순서가 반대라 정렬 단계가 남음)
+    try:
+        db.execute_query("""
+            CREATE INDEX IF NOT EXISTS idx_activities_feed
+            ON activities(activity_time DESC, id DESC)
+        """)
+        print("✓ Created composite index on activity_time + id")
+    except Exception as e:
+        print(f"✗ Error creating activity_time + id index: {e}")
+
+    try:
+        db.execute_query("""
+            CREATE INDEX IF NOT EXISTS idx_activities_user_feed
+            ON activities(user_id, activity_time DESC, id DESC)
+        """)
+        # 이전 버전의 (user_id, activity_time) 인덱스는 위 인덱스로 대체
+        db.execute_query("DROP INDEX IF EXISTS idx_activities_user_time")
+        print("✓ Created composite index on user_id + activity_time + id")
+    except Exception as e:
+        print(f"✗ Error creating user_id + activity_time + id index: {e}")
+
     # Index for activity_likes.activity_id
     try:
         db.execute_query("""
@@ -70,6 +92,22 @@ def add_indexes():
     except Exception as e:
         print(f"✗ Error creating activity_comments index: {e}")
 
+    # Indexes for single-query comment threads and batched feed engagement
+    comment_indexes = [
+        ("idx_activity_comments_parent", "activity_comments(parent_comment_id)"),
+        ("idx_activity_comments_legacy_key", "activity_comments(activity_type, activity_user_id, item_id)"),
+        ("idx_review_comments_review", "review_comments(review_id, review_type)"),
+        ("idx_review_comments_parent", "review_comments(parent_comment_id)"),
+        # 피드 좋아요 수 (engagement_service, activity 키 기준)
+        ("idx_activity_likes_legacy_key", "activity_likes(activity_type, activity_user_id, item_id)"),
+    ]
+    for name, target in comment_indexes:
+        try:
+            db.execute_query(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+            print(f"✓ Created index on {target}")
+        except Exception as e:
+            print(f"✗ Error creating {name}: {e}")
+
     # Composite index for user likes lookup
     try:
         db.execute_query("""
@@ -0,0 +1,110 @@
+"""
+Fallback character avatar stored on users
+users.character_avatar_url - 최근 5점 준 캐릭터 이미지 (avatar_url이 없을 때 프로필 사진)
+
+- 요청마다 character_ratings JOIN 으로 다시 계산하지 않도록 트리거로 유지
+  - character_ratings 5점 추가/변경/삭제 시 해당 사용자 재계산
+  - character.image_url 변경 시 그 캐릭터에 5점 준 사용자 재계산
+
+Usage:
+    python scripts/add_character_avatar.py            # 컬럼/트리거 생성 (+ 최초 backfill)
+    python scripts/add_character_avatar.py --rebuild  # 전체 재계산
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+def _avatar_sql(user_id_expr: str) -> str:
+    """utils.user_helpers.get_user_avatar_url 과 같은 조회 (가장 최근 5점 캐릭터 이미지)"""
+    return f"""(
+        SELECT c.image_url
+        FROM character_ratings cr
+        JOIN character c ON cr.character_id = c.id
+        WHERE cr.user_id = {user_id_expr} AND cr.rating = 5
+        ORDER BY cr.created_at DESC
+        LIMIT 1
+    )"""
+
+
+AVATAR_TRIGGERS = {
+    'trg_character_avatar_insert': f"""
+        CREATE TRIGGER trg_character_avatar_insert
+        AFTER INSERT ON character_ratings
+        WHEN NEW.rating = 5
+        BEGIN
+            UPDATE users SET character_avatar_url = {_avatar_sql('NEW.user_id')} WHERE id = NEW.user_id;
+        END
+    """,
+    'trg_character_avatar_update': f"""
+        CREATE TRIGGER trg_character_avatar_update
+        AFTER UPDATE OF rating, character_id, user_id ON character_ratings
+        WHEN OLD.rating = 5 OR NEW.rating = 5
+        BEGIN
+            UPDATE users SET character_avatar_url = {_avatar_sql('users.id')}
+            WHERE id IN (OLD.user_id, NEW.user_id);
+        END
+    """,
+    'trg_character_avatar_delete': f"""
+        CREATE TRIGGER trg_character_avatar_delete
+        AFTER DELETE ON character_ratings
+        WHEN OLD.rating = 5
+        BEGIN
+            UPDATE users SET character_avatar_url = {_avatar_sql('OLD.user_id')} WHERE id = OLD.user_id;
+        END
+    """,
+    'trg_character_avatar_image': f"""
+        CREATE TRIGGER trg_character_avatar_image
+        AFTER UPDATE OF image_url ON character
+        WHEN NEW.image_url IS NOT OLD.image_url
+        BEGIN
+            UPDATE users SET character_avatar_url = {_avatar_sql('users.id')}
+            WHERE id IN (SELECT user_id FROM character_ratings WHERE character_id = NEW.id AND rating = 5);
+        END
+    """,
+}
+
+
+def rebuild_character_avatars() -> int:
+    """모든 사용자의 character_avatar_url 재계산. Returns: 값이 바뀐 사용자 수"""
+    return db.execute_update(f"""
+        UPDATE users SET character_avatar_url = {_avatar_sql('users.id')}
+        WHERE character_avatar_url IS NOT {_avatar_sql('users.id')}
+    """)
+
+
+def ensure_character_avatar():
+    """컬럼/트리거 생성 (idempotent). 컬럼을 새로 추가한 경우 backfill"""
+    columns = [col['name'] for col in db.execute_query("PRAGMA table_info(users)")]
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+    }
+    created = False
+
+    # 트리거 생성과 backfill을 같은 트랜잭션에서 처리 (사이에 들어온 평가 누락 방지)
+    with db.transaction():
+        if 'character_avatar_url' not in columns:
+            db.execute_update("ALTER TABLE users ADD COLUMN character_avatar_url TEXT")
+            print("✓ Added users.character_avatar_url column")
+            created = True
+
+        for name, sql in AVATAR_TRIGGERS.items():
+            if name not in existing:
+                db.execute_update(sql)
+                print(f"✓ Created {name}")
+                created = True
+
+        if created:
+            count = rebuild_character_avatars()
+            print(f"✓ Backfilled character avatars for {count} users")
+
+
+if __name__ == "__main__":
+    ensure_character_avatar()
+    if '--rebuild' in sys.argv:
+        count = rebuild_character_avatars()
+        print(f"✓ Rebuilt character avatars for {count} users")
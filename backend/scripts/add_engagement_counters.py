@@ -0,0 +1,124 @@
+"""
+Denormalized engagement counters on activities
+activities.likes_count / activities.comments_count 컬럼을 트리거로 증분 유지
+(피드 조회 시 activity_likes / activity_comments 전체 GROUP BY 제거)
+
+Usage:
+    python scripts/add_engagement_counters.py              # 컬럼/트리거 생성 + 최초 backfill
+    python scripts/add_engagement_counters.py --reconcile  # 카운터 재계산 (drift 보정)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+COUNTER_TRIGGERS = {
+    'trg_activity_likes_count_insert': """
+        CREATE TRIGGER trg_activity_likes_count_insert
+        AFTER INSERT ON activity_likes
+        WHEN NEW.activity_id IS NOT NULL
+        BEGIN
+            UPDATE activities SET likes_count = likes_count + 1 WHERE id = NEW.activity_id;
+        END
+    """,
+    'trg_activity_likes_count_delete': """
+        CREATE TRIGGER trg_activity_likes_count_delete
+        AFTER DELETE ON activity_likes
+        WHEN OLD.activity_id IS NOT NULL
+        BEGIN
+            UPDATE activities SET likes_count = MAX(likes_count - 1, 0) WHERE id = OLD.activity_id;
+        END
+    """,
+    'trg_activity_comments_count_insert': """
+        CREATE TRIGGER trg_activity_comments_count_insert
+        AFTER INSERT ON activity_comments
+        WHEN NEW.activity_id IS NOT NULL
+        BEGIN
+            UPDATE activities SET comments_count = comments_count + 1 WHERE id = NEW.activity_id;
+        END
+    """,
+    'trg_activity_comments_count_delete': """
+        CREATE TRIGGER trg_activity_comments_count_delete
+        AFTER DELETE ON activity_comments
+        WHEN OLD.activity_id IS NOT NULL
+        BEGIN
+            UPDATE activities SET comments_count = MAX(comments_count - 1, 0) WHERE id = OLD.activity_id;
+        END
+    """,
+}
+
+
+def _table_columns(table: str) -> list:
+    return [col['name'] for col in db.execute_query(f"PRAGMA table_info({table})")]
+
+
+def reconcile_engagement_counters() -> dict:
+    """
+    likes_count / comments_count 를 원본 테이블에서 다시 계산
+    Returns: {'likes_fixed': n, 'comments_fixed': n} - 값이 달랐던(drift) 행 수
+    """
+    with db.transaction():
+        likes_fixed = db.execute_update("""
+            UPDATE activities
+            SET likes_count = (
+                SELECT COUNT(*) FROM activity_likes al WHERE al.activity_id = activities.id
+            )
+            WHERE likes_count IS NOT (
+                SELECT COUNT(*) FROM activity_likes al WHERE al.activity_id = activities.id
+            )
+        """)
+
+        comments_fixed = db.execute_update("""
+            UPDATE activities
+            SET comments_count = (
+                SELECT COUNT(*) FROM activity_comments ac WHERE ac.activity_id = activities.id
+            )
+            WHERE comments_count IS NOT (
+                SELECT COUNT(*) FROM activity_comments ac WHERE ac.activity_id = activities.id
+            )
+        """)
+
+    return {'likes_fixed': likes_fixed, 'comments_fixed': comments_fixed}
+
+
+def ensure_engagement_counters():
+    """컬럼과 트리거 생성 (idempotent). 컬럼을 새로 추가한 경우 backfill 실행"""
+    columns = _table_columns('activities')
+    added = False
+
+    if 'likes_count' not in columns:
+        db.execute_update("ALTER TABLE activities ADD COLUMN likes_count INTEGER NOT NULL DEFAULT 0")
+        print("✓ Added activities.likes_count column")
+        added = True
+
+    if 'comments_count' not in columns:
+        db.execute_update("ALTER TABLE activities ADD COLUMN comments_count INTEGER NOT NULL DEFAULT 0")
+        print("✓ Added activities.comments_count column")
+        added = True
+
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+    }
+
+    # 트리거 생성과 backfill을 같은 트랜잭션에서 처리 (사이에 들어온 좋아요 누락 방지)
+    with db.transaction():
+        for name, sql in COUNTER_TRIGGERS.items():
+            if name not in existing:
+                db.execute_update(sql)
+                print(f"✓ Created {name}")
+                added = True
+
+        if added:
+            result = reconcile_engagement_counters()
+            print(f"✓ Backfilled engagement counters: {result}")
+
+
+if __name__ == "__main__":
+    ensure_engagement_counters()
+    if '--reconcile' in sys.argv:
+        result = reconcile_engagement_counters()
+        print(f"✓ Reconciled engagement counters: {result}")
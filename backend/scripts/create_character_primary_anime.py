@@ -0,0 +1,156 @@
+"""
+Precomputed primary anime for every character
+캐릭터별 대표 애니메이션 테이블 (character_primary_anime)
+
+- 대표 애니메이션: MAIN 역할 우선, 그다음 인기도 높은 작품
+- 피드/캐릭터 목록에서 anime_character 전체를 ROW_NUMBER() 로 정렬하거나
+  행마다 상관 서브쿼리를 실행하지 않고 PK로 JOIN
+- anime_character 변경, anime INSERT/DELETE/popularity 변경 시 트리거로 갱신
+  (크롤러/관리자 수정 등 모든 쓰기 경로 포함)
+
+Usage:
+    python scripts/create_character_primary_anime.py            # 테이블/트리거 생성 (+ 최초 계산)
+    python scripts/create_character_primary_anime.py --rebuild  # 전체 재계산
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+def _refresh_sql(character_filter: str) -> str:
+    """character_filter 에 해당하는 캐릭터들의 대표 애니메이션 재계산 (DELETE + INSERT)"""
+    return f"""
+        DELETE FROM character_primary_anime WHERE character_id IN ({character_filter});
+        INSERT OR REPLACE INTO character_primary_anime (character_id, anime_id)
+        SELECT character_id, anime_id FROM (
+            SELECT ac.character_id, ac.anime_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY ac.character_id
+                       ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC, ac.anime_id
+                   ) as rn
+            FROM anime_character ac
+            JOIN anime a ON a.id = ac.anime_id
+            WHERE ac.character_id IN ({character_filter})
+        )
+        WHERE rn = 1;
+    """
+
+
+def _anime_characters(anime_id_expr: str) -> str:
+    return f"SELECT character_id FROM anime_character WHERE anime_id = {anime_id_expr}"
+
+
+PRIMARY_ANIME_TRIGGERS = {
+    'trg_character_primary_anime_link_insert': f"""
+        CREATE TRIGGER trg_character_primary_anime_link_insert
+        AFTER INSERT ON anime_character
+        BEGIN
+            {_refresh_sql('NEW.character_id')}
+        END
+    """,
+    'trg_character_primary_anime_link_update': f"""
+        CREATE TRIGGER trg_character_primary_anime_link_update
+        AFTER UPDATE ON anime_character
+        BEGIN
+            {_refresh_sql('OLD.character_id, NEW.character_id')}
+        END
+    """,
+    'trg_character_primary_anime_link_delete': f"""
+        CREATE TRIGGER trg_character_primary_anime_link_delete
+        AFTER DELETE ON anime_character
+        BEGIN
+            {_refresh_sql('OLD.character_id')}
+        END
+    """,
+    'trg_character_primary_anime_anime_insert': f"""
+        CREATE TRIGGER trg_character_primary_anime_anime_insert
+        AFTER INSERT ON anime
+        BEGIN
+            {_refresh_sql(_anime_characters('NEW.id'))}
+        END
+    """,
+    'trg_character_primary_anime_popularity': f"""
+        CREATE TRIGGER trg_character_primary_anime_popularity
+        AFTER UPDATE OF popularity ON anime
+        WHEN NEW.popularity IS NOT OLD.popularity
+        BEGIN
+            {_refresh_sql(_anime_characters('NEW.id'))}
+        END
+    """,
+    'trg_character_primary_anime_anime_delete': f"""
+        CREATE TRIGGER trg_character_primary_anime_anime_delete
+        AFTER DELETE ON anime
+        BEGIN
+            {_refresh_sql(_anime_characters('OLD.id'))}
+        END
+    """,
+}
+
+
+def rebuild_character_primary_anime() -> int:
+    """전체 재계산. Returns: 대표 애니메이션이 있는 캐릭터 수"""
+    with db.transaction():
+        db.execute_update("DELETE FROM character_primary_anime")
+        return db.execute_update("""
+            INSERT INTO character_primary_anime (character_id, anime_id)
+            SELECT character_id, anime_id FROM (
+                SELECT ac.character_id, ac.anime_id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY ac.character_id
+                           ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC, ac.anime_id
+                       ) as rn
+                FROM anime_character ac
+                JOIN anime a ON a.id = ac.anime_id
+            )
+            WHERE rn = 1
+        """)
+
+
+def ensure_character_primary_anime():
+    """테이블/인덱스/트리거 생성 (idempotent). 테이블을 새로 만든 경우 전체 계산"""
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )
+    }
+    created = False
+
+    # 트리거 생성과 초기 계산을 같은 트랜잭션에서 처리 (사이의 크롤러 쓰기 누락 방지)
+    with db.transaction():
+        if 'character_primary_anime' not in existing:
+            db.execute_update("""
+                CREATE TABLE character_primary_anime (
+                    character_id INTEGER PRIMARY KEY,
+                    anime_id INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            print("✓ Created character_primary_anime table")
+            created = True
+
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_character_primary_anime_anime
+            ON character_primary_anime(anime_id)
+        """)
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_anime_character_character
+            ON anime_character(character_id)
+        """)
+
+        for name, sql in PRIMARY_ANIME_TRIGGERS.items():
+            if name not in existing:
+                db.execute_update(sql)
+                print(f"✓ Created {name}")
+                created = True
+
+        if created:
+            count = rebuild_character_primary_anime()
+            print(f"✓ Computed primary anime for {count} characters")
+
+
+if __name__ == "__main__":
+    ensure_character_primary_anime()
+    if '--rebuild' in sys.argv:
+        count = rebuild_character_primary_anime()
+        print(f"✓ Rebuilt primary anime for {count} characters")
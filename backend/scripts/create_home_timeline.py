@@ -0,0 +1,234 @@
+"""
+Fan-out-on-write home timeline for the following feed
+팔로잉 피드용 사용자별 타임라인 테이블 (home_timeline)
+
+- activities INSERT 시 작성자의 팔로워 타임라인에 항목 추가 (트리거)
+- activities 삭제/activity_time 변경 시 타임라인 동기화 (트리거)
+- 팔로우 시 대상의 기존 활동 backfill, 언팔로우 시 제거 (트리거)
+- 팔로워가 FEED_FANOUT_MAX_FOLLOWERS를 넘는 인기 계정은 fan-out 하지 않음
+  → feed_service.get_following_feed가 읽을 때 직접 조회 (hybrid pull)
+- 팔로워 수가 한도를 넘는 순간 기존 타임라인 항목 제거, 한도 이하로 내려오는 순간 팔로워 타임라인 backfill (트리거)
+- 한도(FEED_FANOUT_MAX_FOLLOWERS)나 트리거가 바뀌면 시작 시 타임라인 전체 재생성
+
+Usage:
+    python scripts/create_home_timeline.py            # 테이블/트리거 생성
+    python scripts/create_home_timeline.py --rebuild  # 타임라인 전체 재생성
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from config import FEED_FANOUT_MAX_FOLLOWERS
+
+
+def _is_fanout_account_sql(user_id_expr: str) -> str:
+    """user_id_expr 계정이 fan-out 대상(팔로워 수 한도 이하)인지 확인하는 SQL 조건"""
+    return f"""(
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM user_follows f2
+            WHERE f2.following_id = {user_id_expr}
+            LIMIT {FEED_FANOUT_MAX_FOLLOWERS + 1}
+        )
+    ) <= {FEED_FANOUT_MAX_FOLLOWERS}"""
+
+
+def _follower_count_sql(user_id_expr: str) -> str:
+    """user_id_expr 계정의 팔로워 수 (한도 + 2 에서 세기 중단 - 한도 경계 판단용)"""
+    return f"""(
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM user_follows f2
+            WHERE f2.following_id = {user_id_expr}
+            LIMIT {FEED_FANOUT_MAX_FOLLOWERS + 2}
+        )
+    )"""
+
+
+def _timeline_triggers() -> dict:
+    fanout_author = _is_fanout_account_sql("NEW.user_id")
+    fanout_followee = _is_fanout_account_sql("NEW.following_id")
+
+    return {
+        # INSERT OR REPLACE로 기존 활동이 교체될 때 (DELETE 트리거가 실행되지 않음) 이전 항목 제거
+        'trg_home_timeline_replace': """
+            CREATE TRIGGER trg_home_timeline_replace
+            BEFORE INSERT ON activities
+            WHEN NEW.item_id IS NOT NULL
+            BEGIN
+                DELETE FROM home_timeline
+                WHERE activity_id IN (
+                    SELECT id FROM activities
+                    WHERE activity_type = NEW.activity_type
+                      AND user_id = NEW.user_id
+                      AND item_id = NEW.item_id
+                );
+            END
+        """,
+        'trg_home_timeline_fanout': f"""
+            CREATE TRIGGER trg_home_timeline_fanout
+            AFTER INSERT ON activities
+            BEGIN
+                INSERT OR IGNORE INTO home_timeline (user_id, activity_id, actor_id, activity_time)
+                SELECT
+                    uf.follower_id,
+                    NEW.id,
+                    NEW.user_id,
+                    NEW.activity_time
+                FROM user_follows uf
+                WHERE uf.following_id = NEW.user_id
+                  AND uf.follower_id != NEW.user_id
+                  AND {fanout_author};
+            END
+        """,
+        'trg_home_timeline_retime': """
+            CREATE TRIGGER trg_home_timeline_retime
+            AFTER UPDATE OF activity_time ON activities
+            WHEN NEW.activity_time IS NOT OLD.activity_time
+            BEGIN
+                UPDATE home_timeline SET activity_time = NEW.activity_time WHERE activity_id = NEW.id;
+            END
+        """,
+        'trg_home_timeline_delete': """
+            CREATE TRIGGER trg_home_timeline_delete
+            AFTER DELETE ON activities
+            BEGIN
+                DELETE FROM home_timeline WHERE activity_id = OLD.id;
+            END
+        """,
+        'trg_home_timeline_follow': f"""
+            CREATE TRIGGER trg_home_timeline_follow
+            AFTER INSERT ON user_follows
+            WHEN NEW.follower_id != NEW.following_id
+            BEGIN
+                INSERT OR IGNORE INTO home_timeline (user_id, activity_id, actor_id, activity_time)
+                SELECT
+                    NEW.follower_id,
+                    a.id,
+                    a.user_id,
+                    a.activity_time
+                FROM activities a
+                WHERE a.user_id = NEW.following_id
+                  AND {fanout_followee};
+            END
+        """,
+        'trg_home_timeline_unfollow': """
+            CREATE TRIGGER trg_home_timeline_unfollow
+            AFTER DELETE ON user_follows
+            BEGIN
+                DELETE FROM home_timeline
+                WHERE user_id = OLD.follower_id AND actor_id = OLD.following_id;
+            END
+        """,
+        # 팔로워 수가 한도를 막 넘음 → pull 대상: fan-out 해 둔 항목 제거 (읽을 때 activities에서 직접 조회)
+        'trg_home_timeline_fanout_off': f"""
+            CREATE TRIGGER trg_home_timeline_fanout_off
+            AFTER INSERT ON user_follows
+            WHEN {_follower_count_sql("NEW.following_id")} = {FEED_FANOUT_MAX_FOLLOWERS + 1}
+            BEGIN
+                DELETE FROM home_timeline
+                WHERE activity_id IN (SELECT id FROM activities WHERE user_id = NEW.following_id);
+            END
+        """,
+        # 팔로워 수가 한도로 막 내려옴 → fan-out 대상: pull 하던 동안의 활동까지 팔로워 타임라인에 채움
+        'trg_home_timeline_fanout_on': f"""
+            CREATE TRIGGER trg_home_timeline_fanout_on
+            AFTER DELETE ON user_follows
+            WHEN {_follower_count_sql("OLD.following_id")} = {FEED_FANOUT_MAX_FOLLOWERS}
+            BEGIN
+                INSERT OR IGNORE INTO home_timeline (user_id, activity_id, actor_id, activity_time)
+                SELECT uf.follower_id, a.id, a.user_id, a.activity_time
+                FROM user_follows uf
+                JOIN activities a ON a.user_id = uf.following_id
+                WHERE uf.following_id = OLD.following_id
+                  AND uf.follower_id != uf.following_id;
+            END
+        """,
+    }
+
+
+def rebuild_home_timeline() -> int:
+    """모든 팔로우 관계에 대해 타임라인 재생성. Returns: 생성된 항목 수"""
+    with db.transaction():
+        db.execute_update("DELETE FROM home_timeline")
+        return db.execute_update(f"""
+            INSERT OR IGNORE INTO home_timeline (user_id, activity_id, actor_id, activity_time)
+            SELECT
+                uf.follower_id,
+                a.id,
+                a.user_id,
+                a.activity_time
+            FROM user_follows uf
+            JOIN activities a ON a.user_id = uf.following_id
+            WHERE uf.follower_id != uf.following_id
+              AND {_is_fanout_account_sql("uf.following_id")}
+        """)
+
+
+def ensure_home_timeline():
+    """테이블/인덱스/트리거 생성 (idempotent). 테이블을 새로 만든 경우 전체 backfill"""
+    existing = db.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'home_timeline'",
+        fetch_one=True
+    )
+
+    with db.transaction():
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS home_timeline (
+                user_id INTEGER NOT NULL,          -- 타임라인 소유자 (팔로워)
+                activity_id INTEGER NOT NULL,      -- activities.id
+                actor_id INTEGER NOT NULL,         -- 활동 작성자 (팔로잉)
+                activity_time DATETIME NOT NULL,
+                PRIMARY KEY (user_id, activity_id)
+            ) WITHOUT ROWID
+        """)
+        # 피드 정렬 키 (activity_time, activity_id) 그대로 - 이전 버전 인덱스(promotion_order 포함)는 교체
+        feed_index_columns = [row['name'] for row in db.execute_query("PRAGMA index_info(idx_home_timeline_feed)")]
+        if 'promotion_order' in feed_index_columns:
+            db.execute_update("DROP INDEX idx_home_timeline_feed")
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_home_timeline_feed
+            ON home_timeline(user_id, activity_time DESC, activity_id DESC)
+        """)
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_home_timeline_activity
+            ON home_timeline(activity_id)
+        """)
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_home_timeline_actor
+            ON home_timeline(user_id, actor_id)
+        """)
+        db.execute_update("""
+            CREATE INDEX IF NOT EXISTS idx_user_follows_following
+            ON user_follows(following_id)
+        """)
+
+        # 팔로워 한도(FEED_FANOUT_MAX_FOLLOWERS)가 트리거 SQL에 포함되므로 매번 재생성
+        triggers = _timeline_triggers()
+        placeholders = ','.join('?' * len(triggers))
+        installed = {
+            row['name']: row['sql']
+            for row in db.execute_query(
+                f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+                tuple(triggers)
+            )
+        }
+        for name, sql in triggers.items():
+            db.execute_update(f"DROP TRIGGER IF EXISTS {name}")
+            db.execute_update(sql)
+
+        if not existing:
+            count = rebuild_home_timeline()
+            print(f"✓ Backfilled home_timeline with {count} entries")
+        elif any(installed.get(name) != sql.strip() for name, sql in triggers.items()):
+            # 한도가 바뀌면 fan-out/pull 대상 계정이 달라짐 → 기존 타임라인을 새 기준으로 재생성
+            count = rebuild_home_timeline()
+            print(f"✓ Rebuilt home_timeline with {count} entries (fan-out rules changed)")
+
+    print("✓ home_timeline table and triggers ready")
+
+
+if __name__ == "__main__":
+    ensure_home_timeline()
+    if '--rebuild' in sys.argv:
+        count = rebuild_home_timeline()
+        print(f"✓ Rebuilt home_timeline with {count} entries")
@@ -0,0 +1,78 @@
+"""
+R2 object existence index
+R2 객체 존재 여부 테이블 (r2_objects) - utils.r2_object_index 의 영속 저장소
+
+- 이미지 프록시가 요청마다 HEAD 요청 대신 메모리에서 redirect 여부 판단
+- 버킷 목록(list_objects_v2, 1000개 단위 페이지)으로 present 항목 채움
+- 이후 upload_to_r2 / delete_from_r2 / HEAD 결과로 증분 갱신
+
+Usage:
+    python scripts/create_r2_object_index.py            # 테이블 생성 (+ 최초 버킷 목록 적재)
+    python scripts/create_r2_object_index.py --rebuild  # 버킷 목록으로 전체 재적재
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from utils import r2_object_index
+from utils.r2_storage import get_r2_client, is_r2_configured, R2_BUCKET_NAME
+
+# 이미지 프록시가 확인하는 경로 (staff/ 는 legacy 업로드 경로)
+INDEXED_PREFIXES = ('images/', 'staff/')
+
+
+def _list_objects(prefix: str):
+    paginator = get_r2_client().get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=R2_BUCKET_NAME, Prefix=prefix, PaginationConfig={'PageSize': 1000}):
+        for obj in page.get('Contents', []):
+            yield obj['Key']
+
+
+def rebuild_r2_object_index() -> int:
+    """버킷 목록으로 r2_objects 재적재 후 메모리 인덱스 갱신. Returns: present 객체 수"""
+    keys = [key for prefix in INDEXED_PREFIXES for key in _list_objects(prefix)]
+    now = time.time()
+
+    with db.transaction():
+        db.execute_update("DELETE FROM r2_objects")
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO r2_objects (object_key, present, checked_at) VALUES (?, 1, ?)",
+                ((key, now) for key in keys)
+            )
+
+    r2_object_index.load_index()
+    return len(keys)
+
+
+def ensure_r2_object_index() -> int:
+    """테이블 생성 (idempotent) 후 메모리 적재. 테이블을 새로 만든 경우 버킷 목록 적재. Returns: 적재 항목 수"""
+    existing = db.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'r2_objects'",
+        fetch_one=True
+    )
+    if not existing:
+        db.execute_update("""
+            CREATE TABLE IF NOT EXISTS r2_objects (
+                object_key TEXT PRIMARY KEY,
+                present INTEGER NOT NULL,
+                checked_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        print("✓ Created r2_objects table")
+
+        if is_r2_configured():
+            count = rebuild_r2_object_index()
+            print(f"✓ Indexed {count} R2 objects")
+            return count
+
+    return r2_object_index.load_index()
+
+
+if __name__ == "__main__":
+    ensure_r2_object_index()
+    if '--rebuild' in sys.argv:
+        count = rebuild_r2_object_index()
+        print(f"✓ Rebuilt R2 object index: {count} objects")
@@ -0,0 +1,241 @@
+"""
+Structured rank promotion records
+승급 기록(activities.activity_type = 'rank_promotion')을 레벨 기준으로 구조화
+
+- item_id = new_level (승급한 레벨), UNIQUE (user_id, item_id) WHERE activity_type = 'rank_promotion'
+  → 중복 확인이 metadata LIKE 스캔 대신 인덱스 조회 한 번
+- 기존 기록(item_id NULL)은 metadata.new_level 로 채우고, 같은 레벨 중복은 한 기록만 유지
+  (좋아요/댓글이 달린 기록 우선, 삭제되는 기록의 좋아요/댓글은 남는 기록으로 이동)
+- backfill_rank_promotions: 모든 사용자의 승급 이력을 한 번의 집합 연산(윈도 함수)으로 계산
+
+Usage:
+    python scripts/create_rank_promotions.py               # 인덱스 생성 (+ 기존 기록 정리)
+    python scripts/create_rank_promotions.py --backfill    # 누락된 과거 승급 기록 추가
+    python scripts/create_rank_promotions.py --regenerate  # 과거 승급 기록 시각/metadata 재계산
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+from services.rating_service import RANK_MIN_SCORES, RANK_NAMES
+
+
+def rank_level_sql(score_expr: str) -> str:
+    """otaku_score → 등급 레벨 (rating_service._get_rank_info 와 동일한 기준)"""
+    whens = ' '.join(
+        f"WHEN {score_expr} >= {min_score} THEN {level}"
+        for level, min_score in reversed(list(enumerate(RANK_MIN_SCORES, 1)))
+    )
+    return f"(CASE {whens} ELSE 1 END)"
+
+
+def rank_name_sql(level_expr: str) -> str:
+    whens = ' '.join(f"WHEN {level} THEN '{name}'" for level, name in enumerate(RANK_NAMES, 1))
+    return f"(CASE {level_expr} {whens} END)"
+
+
+def _metadata_level_sql(alias: str = '') -> str:
+    prefix = f"{alias}." if alias else ''
+    return f"(CASE WHEN json_valid({prefix}metadata) THEN json_extract({prefix}metadata, '$.new_level') END)"
+
+
+# 원본 테이블 기준 시간순 점수 이벤트 → 레벨이 오른 시점 (사용자별 레벨당 한 행)
+PROMOTIONS_CTE = f"""
+    WITH events AS (
+        SELECT user_id, updated_at as activity_time, 2 as points
+        FROM user_ratings WHERE status = 'RATED' AND rating IS NOT NULL
+        UNION ALL
+        SELECT user_id, created_at, 5 FROM user_reviews
+        UNION ALL
+        SELECT user_id, updated_at, 1 FROM character_ratings WHERE rating IS NOT NULL
+        UNION ALL
+        SELECT user_id, created_at, 5 FROM character_reviews
+    ),
+    scored AS (
+        SELECT user_id, activity_time,
+               SUM(points) OVER (
+                   PARTITION BY user_id ORDER BY activity_time ROWS UNBOUNDED PRECEDING
+               ) as otaku_score
+        FROM events
+        WHERE activity_time IS NOT NULL AND (:user_id IS NULL OR user_id = :user_id)
+    ),
+    leveled AS (
+        SELECT user_id, activity_time, otaku_score,
+               {rank_level_sql('otaku_score')} as new_level,
+               LAG({rank_level_sql('otaku_score')}) OVER (
+                   PARTITION BY user_id ORDER BY activity_time, otaku_score
+               ) as old_level
+        FROM scored
+    ),
+    promotions AS (
+        SELECT user_id, activity_time, otaku_score, old_level, new_level,
+               json_object(
+                   'old_rank', {rank_name_sql('old_level')},
+                   'old_level', old_level,
+                   'new_rank', {rank_name_sql('new_level')},
+                   'new_level', new_level,
+                   'otaku_score', otaku_score
+               ) as metadata
+        FROM leveled
+        WHERE old_level IS NOT NULL AND new_level > old_level
+    )
+"""
+
+
+def _execute_counted(query: str, params: dict) -> int:
+    """WITH 로 시작하는 문장은 cursor.rowcount 가 -1 → 같은 연결에서 changes() 로 변경 행 수 확인"""
+    with db.get_connection() as conn:
+        conn.execute(query, params)
+        return conn.execute("SELECT changes()").fetchone()[0]
+
+
+def backfill_rank_promotions(regenerate: bool = False, user_id: int = None) -> dict:
+    """
+    과거 승급 기록 생성 (집합 연산 한 번)
+    regenerate: 이미 있는 기록의 activity_time / metadata 도 재계산 값으로 갱신
+    user_id: 지정하면 해당 사용자만
+    Returns: {'created': n, 'updated': n}
+    """
+    params = {'user_id': user_id}
+    updated = 0
+    with db.transaction():
+        if regenerate:
+            updated = _execute_counted(f"""
+                {PROMOTIONS_CTE}
+                UPDATE activities SET
+                    metadata = p.metadata,
+                    activity_time = p.activity_time,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM promotions p
+                WHERE activities.activity_type = 'rank_promotion'
+                  AND activities.user_id = p.user_id
+                  AND activities.item_id = p.new_level
+            """, params)
+
+        # 이미 있는 레벨은 INSERT 자체를 하지 않음 (ON CONFLICT 는 BEFORE INSERT 트리거가 먼저 실행됨)
+        created = _execute_counted(f"""
+            {PROMOTIONS_CTE}
+            INSERT INTO activities (
+                activity_type, user_id, username, display_name, avatar_url,
+                item_id, metadata, activity_time, created_at, updated_at
+            )
+            SELECT 'rank_promotion', p.user_id, u.username, u.display_name, u.avatar_url,
+                   p.new_level, p.metadata, p.activity_time, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+            FROM promotions p
+            JOIN users u ON u.id = p.user_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM activities e
+                WHERE e.activity_type = 'rank_promotion'
+                  AND e.user_id = p.user_id
+                  AND e.item_id = p.new_level
+            )
+        """, params)
+
+    return {'created': created, 'updated': updated}
+
+
+def _repoint_duplicate_engagement():
+    """
+    삭제할 중복 승급 기록의 좋아요/댓글/북마크/알림을 남길 기록으로 이동
+    (temp.rank_promotion_duplicates: id → keep_id)
+    - 같은 사용자가 두 기록 모두에 좋아요/북마크한 경우는 하나만 남김 (UNIQUE(activity_id, user_id))
+    - activity_id 변경은 카운터 트리거 대상이 아니므로 남길 기록의 카운터는 다시 계산
+    """
+    repoint = """
+        UPDATE OR IGNORE {table}
+        SET activity_id = (
+            SELECT keep_id FROM temp.rank_promotion_duplicates d WHERE d.id = {table}.activity_id
+        )
+        WHERE activity_id IN (SELECT id FROM temp.rank_promotion_duplicates)
+    """
+    for table in ('activity_likes', 'activity_comments', 'activity_bookmarks', 'notifications'):
+        exists = db.execute_query(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,), fetch_one=True
+        )
+        if not exists:
+            continue
+        db.execute_update(repoint.format(table=table))
+        # 충돌로 옮기지 못한 행 (남길 기록에 이미 같은 사용자의 좋아요/북마크가 있음)
+        db.execute_update(f"""
+            DELETE FROM {table}
+            WHERE activity_id IN (SELECT id FROM temp.rank_promotion_duplicates)
+        """)
+
+    db.execute_update("""
+        UPDATE activities
+        SET likes_count = (
+                SELECT COUNT(*) FROM activity_likes al WHERE al.activity_id = activities.id
+            ),
+            comments_count = (
+                SELECT COUNT(*) FROM activity_comments ac WHERE ac.activity_id = activities.id
+            )
+        WHERE id IN (SELECT keep_id FROM temp.rank_promotion_duplicates)
+    """)
+
+
+def ensure_rank_promotions():
+    """기존 승급 기록 정리 + (user_id, new_level) 유니크 인덱스 생성 (idempotent)"""
+    existing = db.execute_query(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_activities_rank_promotion_level'",
+        fetch_one=True
+    )
+    if existing:
+        return
+
+    level = f"COALESCE(item_id, {_metadata_level_sql()})"
+    with db.transaction():
+        # 같은 (사용자, 레벨) 중 한 기록만 유지 - 좋아요/댓글이 달린 기록 우선, 그다음 가장 이른 기록
+        db.execute_update("DROP TABLE IF EXISTS temp.rank_promotion_duplicates")
+        db.execute_update(f"""
+            CREATE TEMP TABLE rank_promotion_duplicates AS
+            SELECT id, keep_id FROM (
+                SELECT id,
+                       FIRST_VALUE(id) OVER w as keep_id,
+                       ROW_NUMBER() OVER w as rn
+                FROM activities a
+                WHERE activity_type = 'rank_promotion' AND {level} IS NOT NULL
+                WINDOW w AS (
+                    PARTITION BY user_id, {level}
+                    ORDER BY (
+                        EXISTS (SELECT 1 FROM activity_likes al WHERE al.activity_id = a.id)
+                        OR EXISTS (SELECT 1 FROM activity_comments ac WHERE ac.activity_id = a.id)
+                    ) DESC, activity_time, id
+                )
+            )
+            WHERE rn > 1
+        """)
+
+        duplicates = db.execute_query(
+            "SELECT COUNT(*) as cnt FROM temp.rank_promotion_duplicates", fetch_one=True
+        )['cnt']
+        if duplicates:
+            _repoint_duplicate_engagement()
+            deleted = db.execute_update("""
+                DELETE FROM activities
+                WHERE id IN (SELECT id FROM temp.rank_promotion_duplicates)
+            """)
+            print(f"✓ Removed {deleted} duplicate rank promotions")
+        db.execute_update("DROP TABLE temp.rank_promotion_duplicates")
+
+        filled = db.execute_update(f"""
+            UPDATE activities SET item_id = {_metadata_level_sql()}
+            WHERE activity_type = 'rank_promotion' AND item_id IS NULL
+              AND {_metadata_level_sql()} IS NOT NULL
+        """)
+        if filled:
+            print(f"✓ Set new_level (item_id) on {filled} rank promotions")
+
+        db.execute_update("""
+            CREATE UNIQUE INDEX idx_activities_rank_promotion_level
+            ON activities(user_id, item_id)
+            WHERE activity_type = 'rank_promotion'
+        """)
+        print("✓ Created idx_activities_rank_promotion_level")
+
+
+if __name__ == "__main__":
+    ensure_rank_promotions()
+    if '--backfill' in sys.argv or '--regenerate' in sys.argv:
+        result = backfill_rank_promotions(regenerate='--regenerate' in sys.argv)
+        print(f"✓ Rank promotions backfilled: {result}")
@@ -0,0 +1,49 @@
+"""
+Per-user rating candidate queue
+애니메이션 평가 페이지용 사용자별 후보 큐 테이블 (services/rating_page_service.py)
+
+- anime_ids: 이번 바퀴 후보 anime_id 를 4바이트 부호 없는 정수로 이어 붙인 BLOB (인기도 구간별 섞은 순서)
+  이미 보여준 앞부분도 남겨 둠 → 보충할 때 이번 바퀴에 없던 후보만 뒤에 추가
+- position: 다음에 보여줄 위치 - 페이지마다 앞으로만 이동 (이미 보여준 후보는 다시 나오지 않음)
+- seed: 마지막 구간 섞기에 사용한 시드
+- cycle_complete: 모든 후보가 이번 바퀴에 들어감 (큐를 다 쓸 때까지 보충 생략)
+
+Usage:
+    python scripts/create_rating_candidate_queue.py          # 테이블 생성
+    python scripts/create_rating_candidate_queue.py --reset  # 모든 사용자 큐 삭제 (다음 요청 때 재생성)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+def ensure_rating_candidate_queue():
+    """후보 큐 테이블 생성 / 컬럼 추가 (idempotent)"""
+    db.execute_update("""
+        CREATE TABLE IF NOT EXISTS rating_candidate_queue (
+            user_id INTEGER PRIMARY KEY,
+            anime_ids BLOB NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            seed INTEGER NOT NULL,
+            cycle_complete INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    columns = [col['name'] for col in db.execute_query("PRAGMA table_info(rating_candidate_queue)")]
+    if 'cycle_complete' not in columns:
+        db.execute_update(
+            "ALTER TABLE rating_candidate_queue ADD COLUMN cycle_complete INTEGER NOT NULL DEFAULT 0"
+        )
+        print("✓ Added rating_candidate_queue.cycle_complete column")
+
+
+if __name__ == "__main__":
+    ensure_rating_candidate_queue()
+    print("✓ rating_candidate_queue ready")
+
+    if '--reset' in sys.argv:
+        deleted = db.execute_update("DELETE FROM rating_candidate_queue")
+        print(f"✓ Cleared {deleted} candidate queues")
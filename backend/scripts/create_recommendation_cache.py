@@ -0,0 +1,63 @@
+"""
+Personalized recommendation tables
+item-item 협업 필터링 결과 저장 테이블 (services/recommendation_service.py)
+
+- anime_similarity: 애니별 상위 K 유사 애니 (adjusted cosine)
+- recommendation_cache: 사용자별 추천 목록 (score = 예상 평점, reason = {"based_on": anime_id})
+- recommendation_users: 사용자별 마지막 계산 시각 (증분 갱신 대상 판별 - 추천 조회 시 갱신 대상이면 백그라운드 재계산)
+- idx_recommendation_cache_user_score: 추천 조회를 인덱스 한 번 읽기로
+
+Usage:
+    python scripts/create_recommendation_cache.py            # 테이블/인덱스 생성
+    python scripts/create_recommendation_cache.py --rebuild  # 유사도 + 전체 추천 재계산 (numpy 필요)
+    python scripts/create_recommendation_cache.py --refresh  # 평가가 바뀐 사용자만 재계산
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+def ensure_recommendation_cache():
+    """추천 테이블/인덱스 생성 (idempotent)"""
+    db.execute_update("""
+        CREATE TABLE IF NOT EXISTS recommendation_cache (
+            user_id INTEGER,
+            anime_id INTEGER,
+            score REAL,
+            reason TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, anime_id)
+        )
+    """)
+    db.execute_update("""
+        CREATE INDEX IF NOT EXISTS idx_recommendation_cache_user_score
+        ON recommendation_cache(user_id, score DESC)
+    """)
+    db.execute_update("""
+        CREATE TABLE IF NOT EXISTS anime_similarity (
+            anime_id INTEGER NOT NULL,
+            similar_anime_id INTEGER NOT NULL,
+            similarity REAL NOT NULL,
+            PRIMARY KEY (anime_id, similar_anime_id)
+        ) WITHOUT ROWID
+    """)
+    db.execute_update("""
+        CREATE TABLE IF NOT EXISTS recommendation_users (
+            user_id INTEGER PRIMARY KEY,
+            computed_at DATETIME NOT NULL
+        )
+    """)
+
+
+if __name__ == "__main__":
+    ensure_recommendation_cache()
+    print("✓ Recommendation tables ready")
+
+    if '--rebuild' in sys.argv:
+        from services.recommendation_service import rebuild_recommendations
+        print(f"✓ Recommendations rebuilt: {rebuild_recommendations()}")
+    elif '--refresh' in sys.argv:
+        from services.recommendation_service import refresh_stale_recommendations
+        print(f"✓ Recommendations refreshed: {refresh_stale_recommendations()}")
@@ -0,0 +1,122 @@
+"""
+FTS5 trigram search index for anime titles and character names
+애니메이션 제목/캐릭터 이름 전문 검색 인덱스 (anime_search, character_search)
+
+- trigram 토크나이저: 한국어/일본어 포함 임의의 부분 문자열(3글자 이상) 검색 가능
+- rowid = anime.id / character.id
+- *_compact 컬럼은 띄어쓰기 제거본 (띄어쓰기 무시 검색용)
+- anime / character INSERT·UPDATE·DELETE 시 트리거로 동기화 (관리자 수정 포함)
+
+Usage:
+    python scripts/create_search_index.py            # 인덱스/트리거 생성 (+ 최초 색인)
+    python scripts/create_search_index.py --rebuild  # 전체 재색인
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+# (인덱스 테이블, 원본 테이블, 텍스트 컬럼, 띄어쓰기 제거 컬럼, 색인 대상 컬럼)
+SEARCH_INDEXES = [
+    ('anime_search', 'anime', 'titles', 'titles_compact',
+     ['title_romaji', 'title_english', 'title_native', 'title_korean']),
+    ('character_search', 'character', 'names', 'names_compact',
+     ['name_full', 'name_native', 'name_korean']),
+]
+
+
+def _joined(row: str, columns: list) -> str:
+    """색인할 값들을 줄바꿈으로 연결 (값 경계를 넘는 trigram 매칭 방지)"""
+    return " || char(10) || ".join(f"COALESCE({row}.{col}, '')" for col in columns)
+
+
+def _index_triggers(index_table: str, source_table: str, text_col: str, compact_col: str, columns: list) -> dict:
+    joined = _joined('NEW', columns)
+    insert_new = f"""
+                INSERT INTO {index_table} (rowid, {text_col}, {compact_col})
+                VALUES (NEW.id, {joined}, REPLACE({joined}, ' ', ''));
+    """
+
+    return {
+        # INSERT OR REPLACE로 교체되는 경우 DELETE 트리거가 실행되지 않으므로 먼저 제거
+        f'trg_{index_table}_insert': f"""
+            CREATE TRIGGER trg_{index_table}_insert
+            AFTER INSERT ON {source_table}
+            BEGIN
+                DELETE FROM {index_table} WHERE rowid = NEW.id;
+                {insert_new}
+            END
+        """,
+        f'trg_{index_table}_update': f"""
+            CREATE TRIGGER trg_{index_table}_update
+            AFTER UPDATE OF id, {', '.join(columns)} ON {source_table}
+            BEGIN
+                DELETE FROM {index_table} WHERE rowid = OLD.id;
+                {insert_new}
+            END
+        """,
+        f'trg_{index_table}_delete': f"""
+            CREATE TRIGGER trg_{index_table}_delete
+            AFTER DELETE ON {source_table}
+            BEGIN
+                DELETE FROM {index_table} WHERE rowid = OLD.id;
+            END
+        """,
+    }
+
+
+def rebuild_search_index() -> dict:
+    """
+    원본 테이블에서 검색 인덱스 전체 재색인
+    Returns: {'anime_search': n, 'character_search': n} - 색인된 행 수
+    """
+    result = {}
+    with db.transaction():
+        for index_table, source_table, text_col, compact_col, columns in SEARCH_INDEXES:
+            joined = _joined('s', columns)
+            db.execute_update(f"DELETE FROM {index_table}")
+            result[index_table] = db.execute_update(f"""
+                INSERT INTO {index_table} (rowid, {text_col}, {compact_col})
+                SELECT s.id, {joined}, REPLACE({joined}, ' ', '')
+                FROM {source_table} s
+            """)
+    return result
+
+
+def ensure_search_index():
+    """FTS5 테이블/트리거 생성 (idempotent). 테이블을 새로 만든 경우 전체 색인"""
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )
+    }
+    created = False
+
+    with db.transaction():
+        for index_table, source_table, text_col, compact_col, columns in SEARCH_INDEXES:
+            if index_table not in existing:
+                db.execute_update(f"""
+                    CREATE VIRTUAL TABLE {index_table}
+                    USING fts5({text_col}, {compact_col}, tokenize = 'trigram')
+                """)
+                print(f"✓ Created {index_table} (FTS5 trigram)")
+                created = True
+
+            for name, sql in _index_triggers(index_table, source_table, text_col, compact_col, columns).items():
+                if name not in existing:
+                    db.execute_update(sql)
+                    print(f"✓ Created {name}")
+                    created = True
+
+        if created:
+            result = rebuild_search_index()
+            print(f"✓ Indexed search tables: {result}")
+
+
+if __name__ == "__main__":
+    ensure_search_index()
+    if '--rebuild' in sys.argv:
+        result = rebuild_search_index()
+        print(f"✓ Rebuilt search index: {result}")
@@ -0,0 +1,141 @@
+"""
+Precomputed site rating aggregates
+애니메이션/캐릭터별 우리 사이트 평가 통계 테이블 (anime_site_stats, character_site_stats)
+
+- user_ratings / character_ratings 변경 시 트리거로 증분 유지 (rating_count, rating_sum, average_rating)
+- 목록/검색에서 행마다 AVG()/COUNT() 서브쿼리를 실행하지 않고 JOIN으로 조회
+- average_rating 인덱스로 평점순 정렬/필터
+
+Usage:
+    python scripts/create_site_stats.py            # 테이블/트리거 생성 (+ 최초 backfill)
+    python scripts/create_site_stats.py --rebuild  # 통계 전체 재계산
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+# (통계 테이블, 원본 평가 테이블, 대상 ID 컬럼)
+SITE_STATS_TARGETS = [
+    ('anime_site_stats', 'user_ratings', 'anime_id'),
+    ('character_site_stats', 'character_ratings', 'character_id'),
+]
+
+
+def _counted(row: str) -> str:
+    """평균에 포함되는 평가인지 (RATED 이고 rating 있음)"""
+    return f"{row}.status = 'RATED' AND {row}.rating IS NOT NULL"
+
+
+def _stats_triggers(stats_table: str, ratings_table: str, key: str) -> dict:
+    add_new = f"""
+                INSERT INTO {stats_table} ({key}, rating_count, rating_sum, average_rating)
+                SELECT NEW.{key}, 1, NEW.rating, NEW.rating
+                WHERE {_counted('NEW')}
+                ON CONFLICT({key}) DO UPDATE SET
+                    rating_count = rating_count + 1,
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    average_rating = (rating_sum + excluded.rating_sum) / (rating_count + 1);
+    """
+    remove_old = f"""
+                UPDATE {stats_table} SET
+                    rating_count = rating_count - 1,
+                    rating_sum = rating_sum - OLD.rating,
+                    average_rating = CASE WHEN rating_count > 1
+                        THEN (rating_sum - OLD.rating) / (rating_count - 1)
+                        ELSE NULL END
+                WHERE {key} = OLD.{key} AND {_counted('OLD')};
+    """
+
+    return {
+        f'trg_{stats_table}_insert': f"""
+            CREATE TRIGGER trg_{stats_table}_insert
+            AFTER INSERT ON {ratings_table}
+            BEGIN
+                {add_new}
+            END
+        """,
+        f'trg_{stats_table}_update': f"""
+            CREATE TRIGGER trg_{stats_table}_update
+            AFTER UPDATE OF {key}, rating, status ON {ratings_table}
+            BEGIN
+                {remove_old}
+                {add_new}
+            END
+        """,
+        f'trg_{stats_table}_delete': f"""
+            CREATE TRIGGER trg_{stats_table}_delete
+            AFTER DELETE ON {ratings_table}
+            BEGIN
+                {remove_old}
+            END
+        """,
+    }
+
+
+def rebuild_site_stats() -> dict:
+    """
+    원본 평가 테이블에서 통계 전체 재계산
+    Returns: {'anime_site_stats': n, 'character_site_stats': n} - 평가가 있는 항목 수
+    """
+    result = {}
+    with db.transaction():
+        for stats_table, ratings_table, key in SITE_STATS_TARGETS:
+            db.execute_update(f"DELETE FROM {stats_table}")
+            result[stats_table] = db.execute_update(f"""
+                INSERT INTO {stats_table} ({key}, rating_count, rating_sum, average_rating)
+                SELECT {key}, COUNT(*), SUM(rating), AVG(rating)
+                FROM {ratings_table} r
+                WHERE {_counted('r')}
+                GROUP BY {key}
+            """)
+    return result
+
+
+def ensure_site_stats():
+    """테이블/인덱스/트리거 생성 (idempotent). 테이블을 새로 만든 경우 backfill"""
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )
+    }
+    created = False
+
+    # 트리거 생성과 backfill을 같은 트랜잭션에서 처리 (사이에 들어온 평가 누락 방지)
+    with db.transaction():
+        for stats_table, ratings_table, key in SITE_STATS_TARGETS:
+            if stats_table not in existing:
+                db.execute_update(f"""
+                    CREATE TABLE {stats_table} (
+                        {key} INTEGER PRIMARY KEY,
+                        rating_count INTEGER NOT NULL DEFAULT 0,
+                        rating_sum REAL NOT NULL DEFAULT 0,
+                        average_rating REAL             -- rating_count가 0이면 NULL
+                    )
+                """)
+                print(f"✓ Created {stats_table} table")
+                created = True
+
+            db.execute_update(f"""
+                CREATE INDEX IF NOT EXISTS idx_{stats_table}_average
+                ON {stats_table}(average_rating, rating_count)
+            """)
+
+            for name, sql in _stats_triggers(stats_table, ratings_table, key).items():
+                if name not in existing:
+                    db.execute_update(sql)
+                    print(f"✓ Created {name}")
+                    created = True
+
+        if created:
+            result = rebuild_site_stats()
+            print(f"✓ Backfilled site stats: {result}")
+
+
+if __name__ == "__main__":
+    ensure_site_stats()
+    if '--rebuild' in sys.argv:
+        result = rebuild_site_stats()
+        print(f"✓ Rebuilt site stats: {result}")
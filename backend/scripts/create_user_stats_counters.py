@@ -0,0 +1,452 @@
+"""
+Incrementally maintained user_stats
+사용자 통계(user_stats)를 평가/리뷰 변경 시 트리거로 증분 유지
+
+- user_ratings: total_rated / total_want_to_watch / total_pass / rating_sum / rating_score_count /
+  total_watch_time_minutes + 장르별 평가 수(user_genre_stats) → favorite_genre
+- user_reviews, character_reviews: total_reviews
+- character_ratings: total_character_ratings
+- anime.episodes/duration, anime_genre 변경 시 해당 애니를 평가한 사용자 보정
+- average_rating, otaku_score 는 카운터 변경 시 user_stats 트리거에서 재계산
+- 평가 쓰기와 같은 트랜잭션에서 갱신되므로 별도 재집계 불필요
+  (rating_service._update_user_stats 는 등급 변경 감지만 담당, rank_level 컬럼 사용)
+- 주의: INSERT OR REPLACE 로 기존 행을 교체하면 DELETE 트리거가 실행되지 않음 (recursive_triggers 꺼짐)
+  → 평가 테이블 쓰기는 UPDATE / UPSERT 사용, 스크립트 등으로 생긴 drift 는 --verify / --rebuild 로 확인
+
+Usage:
+    python scripts/create_user_stats_counters.py            # 컬럼/테이블/트리거 생성 (+ 최초 재계산)
+    python scripts/create_user_stats_counters.py --verify   # 원본 테이블과 비교해 drift 보고
+    python scripts/create_user_stats_counters.py --rebuild  # 전체 재계산 (drift 보정)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db
+
+
+# user_stats 에 추가하는 컬럼 (평균 계산용 합계/개수, 마지막으로 확인한 등급)
+COUNTER_COLUMNS = {
+    'rating_sum': "REAL NOT NULL DEFAULT 0",
+    'rating_score_count': "INTEGER NOT NULL DEFAULT 0",
+    'rank_level': "INTEGER",
+}
+
+# 재계산/검증 대상 컬럼
+STAT_COLUMNS = [
+    'total_rated', 'total_want_to_watch', 'total_pass', 'rating_sum', 'rating_score_count',
+    'average_rating', 'total_reviews', 'total_character_ratings', 'total_watch_time_minutes',
+    'otaku_score', 'favorite_genre',
+]
+
+
+def _scored(row: str) -> str:
+    """평균에 포함되는 평가인지 (RATED 이고 rating 있음)"""
+    return f"({row}.status = 'RATED' AND {row}.rating IS NOT NULL)"
+
+
+def _watch_minutes(anime_id_expr: str) -> str:
+    return f"COALESCE((SELECT episodes * COALESCE(duration, 24) FROM anime WHERE id = {anime_id_expr}), 0)"
+
+
+def _favorite_genre_sql(user_id_expr: str) -> str:
+    return f"""
+        UPDATE user_stats SET favorite_genre = (
+            SELECT g.name
+            FROM user_genre_stats ugs
+            JOIN genre g ON g.id = ugs.genre_id
+            WHERE ugs.user_id = user_stats.user_id
+            ORDER BY ugs.rated_count DESC, g.name
+            LIMIT 1
+        )
+        WHERE user_id IN ({user_id_expr});
+    """
+
+
+def _ensure_row(user_id_expr: str) -> str:
+    # INSERT OR IGNORE 는 바깥 문장의 충돌 처리로 덮어써지므로 UPSERT 사용
+    return f"INSERT INTO user_stats (user_id) VALUES ({user_id_expr}) ON CONFLICT(user_id) DO NOTHING;"
+
+
+def _rating_delta(row: str, sign: str) -> str:
+    """user_ratings 한 행의 기여분을 더하거나(+) 뺌(-)"""
+    return f"""
+        {_ensure_row(f'{row}.user_id')}
+        UPDATE user_stats SET
+            total_rated = total_rated {sign} ({row}.status = 'RATED'),
+            total_want_to_watch = total_want_to_watch {sign} ({row}.status = 'WANT_TO_WATCH'),
+            total_pass = total_pass {sign} ({row}.status = 'PASS'),
+            rating_sum = rating_sum {sign} (CASE WHEN {_scored(row)} THEN {row}.rating ELSE 0 END),
+            rating_score_count = rating_score_count {sign} {_scored(row)},
+            total_watch_time_minutes = total_watch_time_minutes {sign}
+                (CASE WHEN {row}.status = 'RATED' THEN {_watch_minutes(f'{row}.anime_id')} ELSE 0 END),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = {row}.user_id;
+    """
+
+
+def _genre_add(row: str) -> str:
+    return f"""
+        INSERT INTO user_genre_stats (user_id, genre_id, rated_count)
+        SELECT {row}.user_id, genre_id, 1 FROM anime_genre
+        WHERE anime_id = {row}.anime_id AND {row}.status = 'RATED'
+        ON CONFLICT(user_id, genre_id) DO UPDATE SET rated_count = rated_count + 1;
+    """
+
+
+def _genre_remove(row: str) -> str:
+    return f"""
+        UPDATE user_genre_stats SET rated_count = rated_count - 1
+        WHERE user_id = {row}.user_id AND {row}.status = 'RATED'
+          AND genre_id IN (SELECT genre_id FROM anime_genre WHERE anime_id = {row}.anime_id);
+        DELETE FROM user_genre_stats WHERE user_id = {row}.user_id AND rated_count <= 0;
+    """
+
+
+def _counter_delta(column: str, row: str, sign: str) -> str:
+    return f"""
+        {_ensure_row(f'{row}.user_id')}
+        UPDATE user_stats SET {column} = {column} {sign} 1, updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = {row}.user_id;
+    """
+
+
+def _raters(anime_id_expr: str) -> str:
+    return f"SELECT user_id FROM user_ratings WHERE anime_id = {anime_id_expr} AND status = 'RATED'"
+
+
+USER_STATS_TRIGGERS = {
+    # ---- user_ratings ----
+    'trg_user_stats_rating_insert': f"""
+        CREATE TRIGGER trg_user_stats_rating_insert
+        AFTER INSERT ON user_ratings
+        BEGIN
+            {_rating_delta('NEW', '+')}
+            {_genre_add('NEW')}
+            {_favorite_genre_sql('NEW.user_id')}
+        END
+    """,
+    'trg_user_stats_rating_update': f"""
+        CREATE TRIGGER trg_user_stats_rating_update
+        AFTER UPDATE OF user_id, anime_id, rating, status ON user_ratings
+        BEGIN
+            {_rating_delta('OLD', '-')}
+            {_rating_delta('NEW', '+')}
+            {_genre_remove('OLD')}
+            {_genre_add('NEW')}
+            {_favorite_genre_sql('OLD.user_id, NEW.user_id')}
+        END
+    """,
+    'trg_user_stats_rating_delete': f"""
+        CREATE TRIGGER trg_user_stats_rating_delete
+        AFTER DELETE ON user_ratings
+        BEGIN
+            {_rating_delta('OLD', '-')}
+            {_genre_remove('OLD')}
+            {_favorite_genre_sql('OLD.user_id')}
+        END
+    """,
+    # ---- 리뷰 / 캐릭터 평가 ----
+    'trg_user_stats_review_insert': f"""
+        CREATE TRIGGER trg_user_stats_review_insert
+        AFTER INSERT ON user_reviews
+        BEGIN
+            {_counter_delta('total_reviews', 'NEW', '+')}
+        END
+    """,
+    'trg_user_stats_review_delete': f"""
+        CREATE TRIGGER trg_user_stats_review_delete
+        AFTER DELETE ON user_reviews
+        BEGIN
+            {_counter_delta('total_reviews', 'OLD', '-')}
+        END
+    """,
+    'trg_user_stats_character_review_insert': f"""
+        CREATE TRIGGER trg_user_stats_character_review_insert
+        AFTER INSERT ON character_reviews
+        BEGIN
+            {_counter_delta('total_reviews', 'NEW', '+')}
+        END
+    """,
+    'trg_user_stats_character_review_delete': f"""
+        CREATE TRIGGER trg_user_stats_character_review_delete
+        AFTER DELETE ON character_reviews
+        BEGIN
+            {_counter_delta('total_reviews', 'OLD', '-')}
+        END
+    """,
+    'trg_user_stats_character_rating_insert': f"""
+        CREATE TRIGGER trg_user_stats_character_rating_insert
+        AFTER INSERT ON character_ratings
+        BEGIN
+            {_counter_delta('total_character_ratings', 'NEW', '+')}
+        END
+    """,
+    'trg_user_stats_character_rating_delete': f"""
+        CREATE TRIGGER trg_user_stats_character_rating_delete
+        AFTER DELETE ON character_ratings
+        BEGIN
+            {_counter_delta('total_character_ratings', 'OLD', '-')}
+        END
+    """,
+    # ---- 애니메이션 정보 변경 (크롤러/관리자 수정) ----
+    'trg_user_stats_anime_duration': f"""
+        CREATE TRIGGER trg_user_stats_anime_duration
+        AFTER UPDATE OF episodes, duration ON anime
+        BEGIN
+            UPDATE user_stats SET total_watch_time_minutes = total_watch_time_minutes
+                - COALESCE(OLD.episodes * COALESCE(OLD.duration, 24), 0)
+                + COALESCE(NEW.episodes * COALESCE(NEW.duration, 24), 0)
+            WHERE user_id IN ({_raters('NEW.id')});
+        END
+    """,
+    'trg_user_stats_anime_genre_insert': f"""
+        CREATE TRIGGER trg_user_stats_anime_genre_insert
+        AFTER INSERT ON anime_genre
+        BEGIN
+            INSERT INTO user_genre_stats (user_id, genre_id, rated_count)
+            SELECT user_id, NEW.genre_id, 1 FROM user_ratings
+            WHERE anime_id = NEW.anime_id AND status = 'RATED'
+            ON CONFLICT(user_id, genre_id) DO UPDATE SET rated_count = rated_count + 1;
+            {_favorite_genre_sql(_raters('NEW.anime_id'))}
+        END
+    """,
+    'trg_user_stats_anime_genre_delete': f"""
+        CREATE TRIGGER trg_user_stats_anime_genre_delete
+        AFTER DELETE ON anime_genre
+        BEGIN
+            UPDATE user_genre_stats SET rated_count = rated_count - 1
+            WHERE genre_id = OLD.genre_id AND user_id IN ({_raters('OLD.anime_id')});
+            DELETE FROM user_genre_stats WHERE genre_id = OLD.genre_id AND rated_count <= 0;
+            {_favorite_genre_sql(_raters('OLD.anime_id'))}
+        END
+    """,
+    # ---- 파생 값 (평균, 오타쿠 점수) ----
+    # 공식: (애니메이션 평가수 × 2) + (캐릭터 평가수 × 1) + (리뷰수 × 5)
+    'trg_user_stats_derived': """
+        CREATE TRIGGER trg_user_stats_derived
+        AFTER UPDATE OF total_rated, total_character_ratings, total_reviews, rating_sum, rating_score_count
+        ON user_stats
+        BEGIN
+            UPDATE user_stats SET
+                otaku_score = total_rated * 2 + total_character_ratings + total_reviews * 5,
+                average_rating = CASE WHEN rating_score_count > 0
+                    THEN rating_sum / rating_score_count ELSE NULL END
+            WHERE user_id = NEW.user_id;
+        END
+    """,
+}
+
+
+# 원본 테이블에서 계산한 사용자별 통계 (재계산/검증 공용)
+GENRE_TALLY_SQL = """
+    SELECT ur.user_id, ag.genre_id, COUNT(*) as rated_count
+    FROM user_ratings ur
+    JOIN anime_genre ag ON ag.anime_id = ur.anime_id
+    WHERE ur.status = 'RATED'
+    GROUP BY ur.user_id, ag.genre_id
+"""
+
+COMPUTED_STATS_SQL = f"""
+    WITH r AS (
+        SELECT ur.user_id,
+               SUM(ur.status = 'RATED') as total_rated,
+               SUM(ur.status = 'WANT_TO_WATCH') as total_want_to_watch,
+               SUM(ur.status = 'PASS') as total_pass,
+               SUM(CASE WHEN {_scored('ur')} THEN ur.rating ELSE 0 END) as rating_sum,
+               SUM({_scored('ur')}) as rating_score_count,
+               SUM(CASE WHEN ur.status = 'RATED'
+                   THEN COALESCE(a.episodes * COALESCE(a.duration, 24), 0) ELSE 0 END) as watch_minutes
+        FROM user_ratings ur
+        LEFT JOIN anime a ON a.id = ur.anime_id
+        GROUP BY ur.user_id
+    ),
+    rv AS (
+        SELECT user_id, COUNT(*) as total_reviews FROM (
+            SELECT user_id FROM user_reviews
+            UNION ALL
+            SELECT user_id FROM character_reviews
+        ) GROUP BY user_id
+    ),
+    cr AS (
+        SELECT user_id, COUNT(*) as total_character_ratings FROM character_ratings GROUP BY user_id
+    ),
+    fav AS (
+        SELECT user_id, name FROM (
+            SELECT t.user_id, g.name,
+                   ROW_NUMBER() OVER (PARTITION BY t.user_id ORDER BY t.rated_count DESC, g.name) as rn
+            FROM ({GENRE_TALLY_SQL}) t
+            JOIN genre g ON g.id = t.genre_id
+        ) WHERE rn = 1
+    )
+    SELECT u.id as user_id,
+           COALESCE(r.total_rated, 0) as total_rated,
+           COALESCE(r.total_want_to_watch, 0) as total_want_to_watch,
+           COALESCE(r.total_pass, 0) as total_pass,
+           COALESCE(r.rating_sum, 0) as rating_sum,
+           COALESCE(r.rating_score_count, 0) as rating_score_count,
+           CASE WHEN r.rating_score_count > 0 THEN r.rating_sum / r.rating_score_count END as average_rating,
+           COALESCE(rv.total_reviews, 0) as total_reviews,
+           COALESCE(cr.total_character_ratings, 0) as total_character_ratings,
+           COALESCE(r.watch_minutes, 0) as total_watch_time_minutes,
+           COALESCE(r.total_rated, 0) * 2 + COALESCE(cr.total_character_ratings, 0)
+               + COALESCE(rv.total_reviews, 0) * 5 as otaku_score,
+           fav.name as favorite_genre
+    FROM users u
+    LEFT JOIN r ON r.user_id = u.id
+    LEFT JOIN rv ON rv.user_id = u.id
+    LEFT JOIN cr ON cr.user_id = u.id
+    LEFT JOIN fav ON fav.user_id = u.id
+"""
+
+
+def _differs(stored, computed) -> bool:
+    if isinstance(stored, (int, float)) and isinstance(computed, (int, float)):
+        return abs(stored - computed) > 1e-6
+    return stored != computed
+
+
+def verify_user_stats(sample_limit: int = 20) -> dict:
+    """
+    저장된 통계와 원본 테이블 재계산 값 비교 (수정하지 않음)
+    Returns: {'users_checked', 'users_drifted', 'columns': {컬럼: drift 사용자 수},
+              'genre_tallies_drifted', 'samples': [...]}
+    """
+    stored = {
+        row['user_id']: dict(row) for row in db.execute_query(
+            f"SELECT user_id, {', '.join(STAT_COLUMNS)} FROM user_stats"
+        )
+    }
+
+    columns = {}
+    samples = []
+    drifted = 0
+    checked = 0
+    for row in db.execute_query(COMPUTED_STATS_SQL):
+        checked += 1
+        current = stored.get(row['user_id'])
+        diffs = {
+            col: {'stored': current[col] if current else None, 'computed': row[col]}
+            for col in STAT_COLUMNS
+            if current is None or _differs(current[col], row[col])
+        }
+        if diffs:
+            drifted += 1
+            for col in diffs:
+                columns[col] = columns.get(col, 0) + 1
+            if len(samples) < sample_limit:
+                samples.append({'user_id': row['user_id'], 'diffs': diffs})
+
+    genre_drift = db.execute_query(f"""
+        SELECT COUNT(*) as cnt FROM (
+            SELECT user_id, genre_id, rated_count FROM ({GENRE_TALLY_SQL})
+            EXCEPT
+            SELECT user_id, genre_id, rated_count FROM user_genre_stats
+            UNION ALL
+            SELECT * FROM (
+                SELECT user_id, genre_id, rated_count FROM user_genre_stats
+                EXCEPT
+                SELECT user_id, genre_id, rated_count FROM ({GENRE_TALLY_SQL})
+            )
+        )
+    """, fetch_one=True)['cnt']
+
+    return {
+        'users_checked': checked,
+        'users_drifted': drifted,
+        'columns': columns,
+        'genre_tallies_drifted': genre_drift,
+        'samples': samples,
+    }
+
+
+def rebuild_user_stats() -> int:
+    """원본 테이블에서 모든 사용자의 통계/장르 집계 재계산. Returns: 사용자 수"""
+    set_clause = ', '.join(f"{col} = excluded.{col}" for col in STAT_COLUMNS)
+    with db.transaction():
+        db.execute_update("DELETE FROM user_genre_stats")
+        db.execute_update(f"""
+            INSERT INTO user_genre_stats (user_id, genre_id, rated_count)
+            {GENRE_TALLY_SQL}
+        """)
+        return db.execute_update(f"""
+            INSERT INTO user_stats (user_id, {', '.join(STAT_COLUMNS)}, updated_at)
+            SELECT user_id, {', '.join(STAT_COLUMNS)}, CURRENT_TIMESTAMP
+            FROM ({COMPUTED_STATS_SQL}) WHERE 1
+            ON CONFLICT(user_id) DO UPDATE SET {set_clause}, updated_at = CURRENT_TIMESTAMP
+        """)
+
+
+def _backfill_rank_levels():
+    """rank_level 이 없는 사용자에 현재 otaku_score 기준 등급 기록 (승급 감지 기준점)"""
+    from services.rating_service import _get_rank_info
+
+    rows = db.execute_query("SELECT user_id, otaku_score FROM user_stats WHERE rank_level IS NULL")
+    with db.get_connection() as conn:
+        conn.executemany(
+            "UPDATE user_stats SET rank_level = ? WHERE user_id = ?",
+            [(_get_rank_info(row['otaku_score'] or 0)[1], row['user_id']) for row in rows]
+        )
+    return len(rows)
+
+
+def ensure_user_stats_counters():
+    """컬럼/테이블/트리거 생성 (idempotent). 새로 만든 경우 전체 재계산"""
+    columns = {col['name'] for col in db.execute_query("PRAGMA table_info(user_stats)")}
+    existing = {
+        row['name'] for row in db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        )
+    }
+    created = False
+
+    # 트리거 생성과 재계산을 같은 트랜잭션에서 처리 (사이에 들어온 평가 누락 방지)
+    with db.transaction():
+        for name, definition in COUNTER_COLUMNS.items():
+            if name not in columns:
+                db.execute_update(f"ALTER TABLE user_stats ADD COLUMN {name} {definition}")
+                print(f"✓ Added user_stats.{name} column")
+                created = True
+
+        if 'user_genre_stats' not in existing:
+            db.execute_update("""
+                CREATE TABLE user_genre_stats (
+                    user_id INTEGER NOT NULL,
+                    genre_id INTEGER NOT NULL,
+                    rated_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, genre_id)
+                ) WITHOUT ROWID
+            """)
+            print("✓ Created user_genre_stats table")
+            created = True
+
+        db.execute_update("CREATE INDEX IF NOT EXISTS idx_user_genre_stats_genre ON user_genre_stats(genre_id)")
+
+        for name, sql in USER_STATS_TRIGGERS.items():
+            if name not in existing:
+                db.execute_update(sql)
+                print(f"✓ Created {name}")
+                created = True
+
+        if created:
+            count = rebuild_user_stats()
+            print(f"✓ Recomputed stats for {count} users")
+
+        count = _backfill_rank_levels()
+        if count:
+            print(f"✓ Backfilled rank_level for {count} users")
+
+
+if __name__ == "__main__":
+    ensure_user_stats_counters()
+    if '--verify' in sys.argv:
+        report = verify_user_stats()
+        print(f"✓ Checked {report['users_checked']} users: {report['users_drifted']} drifted, "
+              f"{report['genre_tallies_drifted']} genre tallies drifted")
+        for col, count in report['columns'].items():
+            print(f"  - {col}: {count}")
+        for sample in report['samples']:
+            print(f"  user {sample['user_id']}: {sample['diffs']}")
+    if '--rebuild' in sys.argv:
+        count = rebuild_user_stats()
+        print(f"✓ Rebuilt stats for {count} users")
@@ -5,21 +5,58 @@ Download character images from AniList and upload to R2
 import os
 import sys
 import requests
-import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config import DATA_DIR
 from database import db
-from utils.r2_storage import upload_to_r2
+from utils.r2_bulk_sync import R2BulkSync, RateLimiter
 
-def download_and_upload_character_images(limit=None):
+UPLOAD_WORKERS = 8
+ANILIST_FETCHES_PER_SECOND = 2  # Rate limiting - be nice to AniList (워커 전체 합산)
+CHECKPOINT_PATH = str(DATA_DIR / 'r2_sync_characters.checkpoint.json')
+
+
+def _image_ext(image_url: str) -> str:
+    """Determine file extension from URL"""
+    lowered = image_url.lower()
+    for ext in ('png', 'webp', 'gif'):
+        if f'.{ext}' in lowered:
+            return ext
+    return 'jpg'
+
+
+_anilist_limiter = RateLimiter(ANILIST_FETCHES_PER_SECOND)
+
+
+def _fetch(image_url: str) -> bytes:
+    _anilist_limiter.wait()
+    response = requests.get(image_url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def _mark_local(char_id: int):
+    def on_synced(r2_path: str):
+        db.execute_update(
+            "UPDATE character SET image_local = ? WHERE id = ?",
+            (r2_path, char_id)
+        )
+    return on_synced
+
+
+def download_and_upload_character_images(limit=None, workers=UPLOAD_WORKERS):
     """
     Download character images from AniList and upload to R2
-    
+    워커 풀로 병렬 처리 (AniList 다운로드는 초당 ANILIST_FETCHES_PER_SECOND 회로 제한),
+    체크포인트로 중단 후 재개 가능
+    R2 에 이미 있는 항목은 다운로드 없이 스킵하되 on_synced 로 image_local 은 채움 (다음 실행 목록에서 제외)
+
     Args:
         limit: Maximum number of images to process (None for all)
+        workers: Number of concurrent download/upload workers
     """
     # Get all characters with image URLs
     query = """
@@ -42,63 +79,26 @@ def download_and_upload_character_images(limit=None):
         return
     
     print(f"Found {len(characters)} characters to process")
-    
-    success_count = 0
-    error_count = 0
-    
-    for idx, char in enumerate(characters, 1):
-        char_id = char['id']
-        image_url = char['image_url']
-        name = char['name_full']
-        
-        print(f"\n[{idx}/{len(characters)}] Processing: {name} (ID: {char_id})")
-        print(f"  URL: {image_url}")
-        
-        try:
-            # Download image from AniList
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Determine file extension from URL or content-type
-            ext = 'jpg'
-            if '.png' in image_url.lower():
-                ext = 'png'
-            elif '.webp' in image_url.lower():
-                ext = 'webp'
-            elif '.gif' in image_url.lower():
-                ext = 'gif'
-            
-            # Upload to R2
-            r2_path = f"images/characters/{char_id}.{ext}"
-            content_type = f"image/{ext}"
-            
-            print(f"  Uploading to R2: {r2_path}")
-            upload_to_r2(response.content, r2_path, content_type)
-            
-            # Update database with local path
-            db.execute_query(
-                "UPDATE character SET image_local = ? WHERE id = ?",
-                (r2_path, char_id)
-            )
-            
-            success_count += 1
-            print(f"  ✅ Success! ({success_count} total)")
-            
-            # Rate limiting - be nice to AniList
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            error_count += 1
-            print(f"  ❌ Download error: {e}")
-        except Exception as e:
-            error_count += 1
-            print(f"  ❌ Upload error: {e}")
+
+    items = []
+    for char in characters:
+        ext = _image_ext(char['image_url'])
+        items.append({
+            'key': f"images/characters/{char['id']}.{ext}",
+            'fetch': lambda url=char['image_url']: _fetch(url),
+            'content_type': f"image/{ext}",
+            'on_synced': _mark_local(char['id']),
+        })
+
+    syncer = R2BulkSync(workers=workers, checkpoint_path=CHECKPOINT_PATH)
+    stats = syncer.run(items, prefixes=['images/characters/'])
     
     print(f"\n{'='*60}")
     print(f"Processing complete!")
-    print(f"  ✅ Success: {success_count}")
-    print(f"  ❌ Errors: {error_count}")
-    print(f"  📊 Total: {len(characters)}")
+    print(f"  ✅ Uploaded: {stats['uploaded']}")
+    print(f"  ⏭️ Already in R2: {stats['skipped']}")
+    print(f"  ❌ Errors: {stats['failed']}")
+    print(f"  📊 Total: {stats['total']} in {stats['elapsed_seconds']}s ({stats['objects_per_second']} obj/s)")
     print(f"{'='*60}")
 
 if __name__ == "__main__":
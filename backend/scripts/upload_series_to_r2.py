@@ -11,10 +11,15 @@ import json
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.r2_storage import upload_file_bytes_to_r2, is_r2_configured, check_r2_object_exists
+from config import DATA_DIR
+from utils.r2_storage import is_r2_configured
+from utils.r2_bulk_sync import R2BulkSync, RateLimiter
 
 API_URL = 'https://graphql.anilist.co'
 REQUEST_DELAY = 0.7
+UPLOAD_WORKERS = 8
+IMAGE_FETCHES_PER_SECOND = 2  # AniList CDN 다운로드 간격 (워커 전체 합산)
+CHECKPOINT_PATH = str(DATA_DIR / 'r2_sync_series.checkpoint.json')
 
 
 def make_request(query: str, variables: dict = None) -> dict:
@@ -147,11 +152,16 @@ def get_anime_characters(anime_id: int):
     return all_characters
 
 
+_image_limiter = RateLimiter(IMAGE_FETCHES_PER_SECOND)
+
+
 def download_image(url: str) -> bytes:
-    """이미지 다운로드"""
+    """이미지 다운로드 (워커 간 공유 간격 제한)"""
     if not url:
         return None
 
+    _image_limiter.wait()
+
     try:
         req = urllib.request.Request(url, headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -163,23 +173,13 @@ def download_image(url: str) -> bytes:
         return None
 
 
-def upload_image_to_r2(image_bytes: bytes, object_key: str) -> bool:
-    """R2에 업로드 (이미 있으면 스킵)"""
-    if not image_bytes:
-        return False
-
-    try:
-        # 이미 있는지 확인
-        if check_r2_object_exists(object_key):
-            print(f"  Already exists: {object_key}")
-            return True
-
-        url = upload_file_bytes_to_r2(image_bytes, object_key, 'image/jpeg')
-        print(f"  Uploaded: {url}")
-        return True
-    except Exception as e:
-        print(f"  Upload failed: {e}")
-        return False
+def image_item(object_key: str, url: str) -> dict:
+    """R2BulkSync 항목 (원격에 이미 있으면 다운로드 없이 스킵)"""
+    return {
+        'key': object_key,
+        'fetch': lambda: download_image(url),
+        'content_type': 'image/jpeg',
+    }
 
 
 def process_anime_list(anime_ids: list):
@@ -203,20 +203,12 @@ def process_anime_list(anime_ids: list):
             all_anime.append(anime)
             print(f"  [{anime_id}] {anime['title']['romaji']}")
 
-    # 커버 이미지 업로드
-    print("\n" + "=" * 60)
-    print("Uploading cover images...")
-    print("=" * 60)
-
+    # 커버 이미지 (업로드는 아래에서 한 번에)
+    items = []
     for anime in all_anime:
-        anime_id = anime['id']
         cover_url = anime['coverImage'].get('extraLarge') or anime['coverImage'].get('large')
-
         if cover_url:
-            print(f"\n[{anime_id}] {anime['title']['romaji']}")
-            image_bytes = download_image(cover_url)
-            if image_bytes:
-                upload_image_to_r2(image_bytes, f"covers_large/{anime_id}.jpg")
+            items.append(image_item(f"covers_large/{anime['id']}.jpg", cover_url))
 
     # 캐릭터 및 성우 정보 수집
     print("\n" + "=" * 60)
@@ -250,27 +242,16 @@ def process_anime_list(anime_ids: list):
     print(f"\nTotal characters: {len(all_characters)}")
     print(f"Total voice actors: {len(all_staff)}")
 
-    # 캐릭터 이미지 업로드
-    print("\n" + "=" * 60)
-    print("Uploading character images...")
-    print("=" * 60)
-
-    for char_id, info in all_characters.items():
-        print(f"\n[{char_id}] {info['name']}")
-        image_bytes = download_image(info['image_url'])
-        if image_bytes:
-            upload_image_to_r2(image_bytes, f"characters/{char_id}.jpg")
+    items += [image_item(f"characters/{char_id}.jpg", info['image_url']) for char_id, info in all_characters.items()]
+    items += [image_item(f"staff/{staff_id}.jpg", info['image_url']) for staff_id, info in all_staff.items()]
 
-    # 성우 이미지 업로드
+    # 커버/캐릭터/성우 이미지 병렬 업로드 (재실행 시 체크포인트부터 재개)
     print("\n" + "=" * 60)
-    print("Uploading voice actor images...")
+    print(f"Uploading {len(items)} images with {UPLOAD_WORKERS} workers...")
     print("=" * 60)
 
-    for staff_id, info in all_staff.items():
-        print(f"\n[{staff_id}] {info['name']}")
-        image_bytes = download_image(info['image_url'])
-        if image_bytes:
-            upload_image_to_r2(image_bytes, f"staff/{staff_id}.jpg")
+    syncer = R2BulkSync(workers=UPLOAD_WORKERS, checkpoint_path=CHECKPOINT_PATH)
+    syncer.run(items, prefixes=['covers_large/', 'characters/', 'staff/'])
 
     print("\n" + "=" * 60)
     print("DONE!")
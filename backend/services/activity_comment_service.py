@@ -6,6 +6,63 @@ from typing import List, Dict, Optional
 from database import db, dict_from_row
 
 
+def load_comment_thread(table: str, top_level_where: str, params: tuple, extra_columns: str = '') -> List[Dict]:
+    """
+    최상위 댓글 + 답글을 한 번의 쿼리로 조회해 계층 구조로 조립
+    top_level_where: 최상위 댓글 조건 (별칭 없이 컬럼명 사용)
+    답글은 최상위 댓글의 직계 답글만 (parent_comment_id 기준, 기존 화면과 동일)
+    """
+    rows = db.execute_query(
+        f"""
+        WITH top AS (
+            SELECT id FROM {table}
+            WHERE {top_level_where} AND parent_comment_id IS NULL
+        )
+        SELECT
+            c.id,
+            c.user_id,
+            c.content,
+            c.created_at,
+            c.parent_comment_id,
+            {extra_columns}
+            u.username,
+            u.display_name,
+            u.avatar_url,
+            COALESCE(us.otaku_score, 0) as otaku_score
+        FROM {table} c
+        JOIN users u ON c.user_id = u.id
+        LEFT JOIN user_stats us ON u.id = us.user_id
+        WHERE c.id IN (SELECT id FROM top)
+           OR c.parent_comment_id IN (SELECT id FROM top)
+        ORDER BY c.created_at ASC
+        """,
+        params
+    )
+    return assemble_comment_threads(rows)
+
+
+def assemble_comment_threads(rows) -> List[Dict]:
+    """created_at 순 댓글 행 → 최상위 댓글 목록 (각 댓글의 replies 포함)"""
+    comments = []
+    by_id = {}
+    replies = []
+    for row in rows:
+        comment = dict_from_row(row)
+        if comment['parent_comment_id'] is None:
+            comment['replies'] = []
+            comments.append(comment)
+            by_id[comment['id']] = comment
+        else:
+            replies.append(comment)
+
+    for reply in replies:
+        parent = by_id.get(reply['parent_comment_id'])
+        if parent is not None:
+            parent['replies'].append(reply)
+
+    return comments
+
+
 def _get_activity_id(activity_type: str, activity_user_id: int, item_id: int) -> int:
     """activities 테이블에서 activity_id 찾기"""
     try:
@@ -64,60 +121,13 @@ def get_activity_comments(activity_type: str, activity_user_id: int, item_id: in
         )
 
         if review:
-            review_id = review['id']
-
-            # 최상위 댓글 조회
-            rows = db.execute_query(
-                """
-                SELECT
-                    rc.id,
-                    rc.user_id,
-                    rc.content,
-                    rc.created_at,
-                    rc.parent_comment_id,
-                    u.username,
-                    u.display_name,
-                    u.avatar_url,
-                    COALESCE(us.otaku_score, 0) as otaku_score
-                FROM review_comments rc
-                JOIN users u ON rc.user_id = u.id
-                LEFT JOIN user_stats us ON u.id = us.user_id
-                WHERE rc.review_id = ?
-                    AND rc.review_type = 'anime'
-                    AND rc.parent_comment_id IS NULL
-                ORDER BY rc.created_at ASC
-                """,
-                (review_id,)
+            # 최상위 댓글과 답글을 한 번에 조회
+            return load_comment_thread(
+                'review_comments',
+                "review_id = ? AND review_type = 'anime'",
+                (review['id'],)
             )
 
-            comments = [dict_from_row(row) for row in rows]
-
-            # 각 최상위 댓글에 대한 답글 조회
-            for comment in comments:
-                reply_rows = db.execute_query(
-                    """
-                    SELECT
-                        rc.id,
-                        rc.user_id,
-                        rc.content,
-                        rc.created_at,
-                        rc.parent_comment_id,
-                        u.username,
-                        u.display_name,
-                        u.avatar_url,
-                        COALESCE(us.otaku_score, 0) as otaku_score
-                    FROM review_comments rc
-                    JOIN users u ON rc.user_id = u.id
-                    LEFT JOIN user_stats us ON u.id = us.user_id
-                    WHERE rc.parent_comment_id = ?
-                    ORDER BY rc.created_at ASC
-                    """,
-                    (comment['id'],)
-                )
-                comment['replies'] = [dict_from_row(row) for row in reply_rows]
-
-            return comments
-
     # 캐릭터 리뷰와 평가는 review_comments 사용 (리뷰가 있는 경우)
     # 리뷰가 없으면 activity_comments로 폴백
     elif activity_type in ['character_review', 'character_rating']:
@@ -131,116 +141,23 @@ def get_activity_comments(activity_type: str, activity_user_id: int, item_id: in
         print(f"[get_activity_comments] Review found: {review}")
 
         if review:
-            review_id = review['id']
-
-            # 최상위 댓글 조회
-            rows = db.execute_query(
-                """
-                SELECT
-                    rc.id,
-                    rc.user_id,
-                    rc.content,
-                    rc.created_at,
-                    rc.parent_comment_id,
-                    u.username,
-                    u.display_name,
-                    u.avatar_url,
-                    COALESCE(us.otaku_score, 0) as otaku_score
-                FROM review_comments rc
-                JOIN users u ON rc.user_id = u.id
-                LEFT JOIN user_stats us ON u.id = us.user_id
-                WHERE rc.review_id = ?
-                    AND rc.review_type = 'character'
-                    AND rc.parent_comment_id IS NULL
-                ORDER BY rc.created_at ASC
-                """,
-                (review_id,)
+            # 최상위 댓글과 답글을 한 번에 조회
+            return load_comment_thread(
+                'review_comments',
+                "review_id = ? AND review_type = 'character'",
+                (review['id'],)
             )
-
-            comments = [dict_from_row(row) for row in rows]
-
-            # 각 최상위 댓글에 대한 답글 조회
-            for comment in comments:
-                reply_rows = db.execute_query(
-                    """
-                    SELECT
-                        rc.id,
-                        rc.user_id,
-                        rc.content,
-                        rc.created_at,
-                        rc.parent_comment_id,
-                        u.username,
-                        u.display_name,
-                        u.avatar_url,
-                        COALESCE(us.otaku_score, 0) as otaku_score
-                    FROM review_comments rc
-                    JOIN users u ON rc.user_id = u.id
-                    LEFT JOIN user_stats us ON u.id = us.user_id
-                    WHERE rc.parent_comment_id = ?
-                    ORDER BY rc.created_at ASC
-                    """,
-                    (comment['id'],)
-                )
-                comment['replies'] = [dict_from_row(row) for row in reply_rows]
-
-            return comments
         else:
             print(f"[get_activity_comments] No review found for character_rating, will use activity_comments")
 
     # 기타 활동은 activity_comments 사용
     print(f"[get_activity_comments] Using activity_comments table for activity_type={activity_type}")
-    rows = db.execute_query(
-        """
-        SELECT
-            ac.id,
-            ac.user_id,
-            ac.content,
-            ac.created_at,
-            ac.parent_comment_id,
-            u.username,
-            u.display_name,
-            u.avatar_url,
-            COALESCE(us.otaku_score, 0) as otaku_score
-        FROM activity_comments ac
-        JOIN users u ON ac.user_id = u.id
-        LEFT JOIN user_stats us ON u.id = us.user_id
-        WHERE ac.activity_type = ?
-            AND ac.activity_user_id = ?
-            AND ac.item_id = ?
-            AND ac.parent_comment_id IS NULL
-        ORDER BY ac.created_at ASC
-        """,
+    return load_comment_thread(
+        'activity_comments',
+        "activity_type = ? AND activity_user_id = ? AND item_id = ?",
         (activity_type, activity_user_id, item_id)
     )
 
-    comments = [dict_from_row(row) for row in rows]
-
-    # 각 최상위 댓글에 대한 답글 조회
-    for comment in comments:
-        reply_rows = db.execute_query(
-            """
-            SELECT
-                ac.id,
-                ac.user_id,
-                ac.content,
-                ac.created_at,
-                ac.parent_comment_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score
-            FROM activity_comments ac
-            JOIN users u ON ac.user_id = u.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            WHERE ac.parent_comment_id = ?
-            ORDER BY ac.created_at ASC
-            """,
-            (comment['id'],)
-        )
-        comment['replies'] = [dict_from_row(row) for row in reply_rows]
-
-    return comments
-
 
 def create_activity_comment(
     user_id: int,
@@ -535,62 +452,50 @@ def delete_activity_comment(comment_id: int, user_id: int) -> bool:
 
 def get_comment_counts_for_activities(activities: List[Dict]) -> Dict:
     """
-    여러 활동에 대한 댓글 수 일괄 조회
+    여러 활동에 대한 댓글 수 일괄 조회 (쿼리 1회)
     리뷰는 review_comments, 기타는 activity_comments
+    Returns: {"{activity_type}_{user_id}_{item_id}": count}
     """
     if not activities:
         return {}
 
-    counts = {}
-
-    for activity in activities:
-        activity_key = f"{activity['activity_type']}_{activity['user_id']}_{activity['item_id']}"
-        activity_type = activity['activity_type']
+    keys = list(dict.fromkeys(
+        (activity['activity_type'], activity['user_id'], activity['item_id']) for activity in activities
+    ))
+    values_sql = ','.join(['(?, ?, ?)'] * len(keys))
+    params = [value for key in keys for value in key]
 
-        # 리뷰인 경우 review_comments에서 조회
-        if activity_type in ['anime_review', 'review']:
-            review = db.execute_query(
-                "SELECT id FROM user_reviews WHERE user_id = ? AND anime_id = ?",
-                (activity['user_id'], activity['item_id']),
-                fetch_one=True
-            )
-            if review:
-                row = db.execute_query(
-                    "SELECT COUNT(*) as count FROM review_comments WHERE review_id = ? AND review_type = 'anime'",
-                    (review['id'],),
-                    fetch_one=True
+    rows = db.execute_query(
+        f"""
+        WITH keys(activity_type, user_id, item_id) AS (VALUES {values_sql})
+        SELECT
+            k.activity_type, k.user_id, k.item_id,
+            CASE
+                WHEN k.activity_type IN ('anime_review', 'review') THEN (
+                    SELECT COUNT(*) FROM review_comments rc
+                    WHERE rc.review_id = ur.id AND rc.review_type = 'anime'
                 )
-                counts[activity_key] = row[0] if row else 0
-            else:
-                counts[activity_key] = 0
-
-        elif activity_type == 'character_review':
-            review = db.execute_query(
-                "SELECT id FROM character_reviews WHERE user_id = ? AND character_id = ?",
-                (activity['user_id'], activity['item_id']),
-                fetch_one=True
-            )
-            if review:
-                row = db.execute_query(
-                    "SELECT COUNT(*) as count FROM review_comments WHERE review_id = ? AND review_type = 'character'",
-                    (review['id'],),
-                    fetch_one=True
+                WHEN k.activity_type = 'character_review' THEN (
+                    SELECT COUNT(*) FROM review_comments rc
+                    WHERE rc.review_id = cr.id AND rc.review_type = 'character'
                 )
-                counts[activity_key] = row[0] if row else 0
-            else:
-                counts[activity_key] = 0
-
-        else:
-            # 기타 활동은 activity_comments에서 조회
-            row = db.execute_query(
-                """
-                SELECT COUNT(*) as count
-                FROM activity_comments
-                WHERE activity_type = ? AND activity_user_id = ? AND item_id = ?
-                """,
-                (activity['activity_type'], activity['user_id'], activity['item_id']),
-                fetch_one=True
-            )
-            counts[activity_key] = row[0] if row else 0
+                ELSE (
+                    SELECT COUNT(*) FROM activity_comments ac
+                    WHERE ac.activity_type = k.activity_type
+                      AND ac.activity_user_id = k.user_id
+                      AND ac.item_id = k.item_id
+                )
+            END as count
+        FROM keys k
+        LEFT JOIN user_reviews ur ON k.activity_type IN ('anime_review', 'review')
+            AND ur.user_id = k.user_id AND ur.anime_id = k.item_id
+        LEFT JOIN character_reviews cr ON k.activity_type = 'character_review'
+            AND cr.user_id = k.user_id AND cr.character_id = k.item_id
+        """,
+        tuple(params)
+    )
 
-    return counts
+    return {
+        f"{row['activity_type']}_{row['user_id']}_{row['item_id']}": row['count']
+        for row in rows
+    }
@@ -8,7 +8,12 @@ NORMALIZED: Item titles and images are fetched via JOIN, not stored in activitie
 """
 from typing import List, Optional, Dict
 from database import Database, dict_from_row, db as default_db
+from utils.pagination import encode_cursor, decode_cursor
 from api.notifications import create_notification, delete_notification_by_action
+from services.activity_comment_service import load_comment_thread
+
+# 피드 카드에 미리 보여줄 최신 댓글 수
+COMMENT_PREVIEW_LIMIT = 2
 
 
 def get_activities(
@@ -19,7 +24,9 @@ def get_activities(
     following_only: bool = False,
     current_user_id: Optional[int] = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None
 ) -> Dict:
     """
     Get activities with optional filtering
@@ -31,11 +38,20 @@ def get_activities(
         following_only: Show only activities from followed users
         current_user_id: Current user for liked status
         limit: Number of results
-        offset: Pagination offset
+        offset: Pagination offset (ignored when cursor is given)
+        cursor: Opaque keyset cursor (activity_time, id) from a previous page's next_cursor
+        include_total: Whether to run the COUNT(*) query (default: only for offset pagination)
 
     Returns:
-        Dict with 'items' (list of activities) and 'total' (count)
+        Dict with 'items' (list of activities), 'total' (count or None) and
+        'next_cursor' (cursor for the next page, None on the last page)
+
+    Raises:
+        ValueError: invalid cursor
     """
+    cursor_values = decode_cursor(cursor, 2)
+    if include_total is None:
+        include_total = cursor_values is None
 
     # Build WHERE clauses and JOIN clauses
     where_clauses = []
@@ -59,23 +75,33 @@ def get_activities(
         where_clauses.append("a.item_id = ?")
         params.append(item_id)
 
+    filter_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+    filter_params = params.copy()
+
+    # Keyset pagination: seek past the last (activity_time, id) of the previous page
+    if cursor_values is not None:
+        where_clauses.append("a.activity_time <= ? AND (a.activity_time < ? OR a.id < ?)")
+        params.extend([cursor_values[0], cursor_values[0], cursor_values[1]])
+        offset = 0
+
     where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
 
-    # Get total count
-    count_params = params.copy()
-    total_row = db.execute_query(
-        f"SELECT COUNT(*) as total FROM activities a {follow_join} WHERE {where_sql}",
-        tuple(count_params),
-        fetch_one=True
-    )
-    total = total_row['total'] if total_row else 0
+    # Get total count (optional - skipped by default for cursor pagination)
+    total = None
+    if include_total:
+        total_row = db.execute_query(
+            f"SELECT COUNT(*) as total FROM activities a {follow_join} WHERE {filter_sql}",
+            tuple(filter_params),
+            fetch_one=True
+        )
+        total = total_row['total'] if total_row else 0
 
     # Get activities with engagement counts
     # NORMALIZED: JOIN anime/character tables to get titles dynamically
     query_params = []
 
-    # Add current_user_id twice for liked check (FIRST in SQL)
-    query_params.extend([current_user_id, current_user_id])
+    # Add current_user_id for liked/bookmarked checks (FIRST in SQL)
+    query_params.extend([current_user_id, current_user_id, current_user_id])
 
     # Add WHERE clause params (SECOND in SQL)
     query_params.extend(params)
@@ -126,9 +152,12 @@ def get_activities(
             a.anime_title_korean as anime_title_korean,
             a.anime_title_native as anime_title_native,
             a.metadata,
-            COALESCE(likes.count, 0) as likes_count,
-            COALESCE(comments.count, 0) as comments_count,
+            COALESCE(a.likes_count, 0) as likes_count,
+            COALESCE(a.comments_count, 0) as comments_count,
             CASE WHEN ? IS NOT NULL AND user_like.activity_id IS NOT NULL THEN 1 ELSE 0 END as user_liked,
+            EXISTS (
+                SELECT 1 FROM activity_bookmarks b WHERE b.activity_id = a.id AND b.user_id = ?
+            ) as user_bookmarked,
             a.activity_time,
             a.created_at,
             a.updated_at
@@ -140,24 +169,14 @@ def get_activities(
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
         -- User stats
         LEFT JOIN user_stats us ON a.user_id = us.user_id
-        -- Engagement counts
-        LEFT JOIN (
-            SELECT activity_id, COUNT(*) as count
-            FROM activity_likes
-            GROUP BY activity_id
-        ) likes ON likes.activity_id = a.id
-        LEFT JOIN (
-            SELECT activity_id, COUNT(*) as count
-            FROM activity_comments
-            GROUP BY activity_id
-        ) comments ON comments.activity_id = a.id
+        -- Engagement counts: denormalized on activities (scripts/add_engagement_counters.py)
         LEFT JOIN (
             SELECT activity_id
             FROM activity_likes
             WHERE user_id = ?
         ) user_like ON user_like.activity_id = a.id
         WHERE {where_sql}
-        ORDER BY a.activity_time DESC
+        ORDER BY a.activity_time DESC, a.id DESC
         LIMIT ? OFFSET ?
         """,
         tuple(query_params)
@@ -168,6 +187,7 @@ def get_activities(
         activity_dict = dict_from_row(row)
         # Convert user_liked to boolean
         activity_dict['user_liked'] = bool(activity_dict.get('user_liked', 0))
+        activity_dict['user_bookmarked'] = bool(activity_dict.get('user_bookmarked', 0))
         # Add is_my_activity flag
         if current_user_id:
             activity_dict['is_my_activity'] = activity_dict['user_id'] == current_user_id
@@ -184,9 +204,15 @@ def get_activities(
 
         items.append(activity_dict)
 
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last['activity_time'], last['id'])
+
     return {
         'items': items,
-        'total': total
+        'total': total,
+        'next_cursor': next_cursor
     }
 
 
@@ -196,8 +222,8 @@ def get_activity_by_id(activity_id: int, current_user_id: Optional[int] = None,
     if db is None:
         db = default_db
 
-    # ALWAYS add current_user_id twice (even if None) to match SQL placeholders, then activity_id
-    query_params = [current_user_id, current_user_id, activity_id]
+    # ALWAYS add current_user_id for liked/bookmarked checks (even if None) to match SQL placeholders, then activity_id
+    query_params = [current_user_id, current_user_id, current_user_id, activity_id]
 
     row = db.execute_query(
         """
@@ -254,9 +280,12 @@ def get_activity_by_id(activity_id: int, current_user_id: Optional[int] = None,
                 ELSE NULL
             END as anime_title_native,
             a.metadata,
-            COALESCE(likes.count, 0) as likes_count,
-            COALESCE(comments.count, 0) as comments_count,
+            COALESCE(a.likes_count, 0) as likes_count,
+            COALESCE(a.comments_count, 0) as comments_count,
             CASE WHEN ? IS NOT NULL AND user_like.activity_id IS NOT NULL THEN 1 ELSE 0 END as user_liked,
+            EXISTS (
+                SELECT 1 FROM activity_bookmarks b WHERE b.activity_id = a.id AND b.user_id = ?
+            ) as user_bookmarked,
             a.activity_time,
             a.created_at,
             a.updated_at
@@ -265,22 +294,12 @@ def get_activity_by_id(activity_id: int, current_user_id: Optional[int] = None,
         LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
         -- JOIN character table for character activities
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
-        -- JOIN anime_character to get the anime for character activities
-        LEFT JOIN anime_character ac ON ch.id = ac.character_id AND ac.role = 'MAIN'
-        LEFT JOIN anime char_anime ON ac.anime_id = char_anime.id
+        -- 캐릭터 활동의 대표 애니메이션 (character_primary_anime, 캐릭터당 1행)
+        LEFT JOIN character_primary_anime cpa ON ch.id = cpa.character_id
+        LEFT JOIN anime char_anime ON cpa.anime_id = char_anime.id
         -- User stats
         LEFT JOIN user_stats us ON a.user_id = us.user_id
-        -- Engagement counts
-        LEFT JOIN (
-            SELECT activity_id, COUNT(*) as count
-            FROM activity_likes
-            GROUP BY activity_id
-        ) likes ON likes.activity_id = a.id
-        LEFT JOIN (
-            SELECT activity_id, COUNT(*) as count
-            FROM activity_comments
-            GROUP BY activity_id
-        ) comments ON comments.activity_id = a.id
+        -- Engagement counts: denormalized on activities (scripts/add_engagement_counters.py)
         LEFT JOIN (
             SELECT activity_id
             FROM activity_likes
@@ -297,6 +316,7 @@ def get_activity_by_id(activity_id: int, current_user_id: Optional[int] = None,
 
     activity_dict = dict_from_row(row)
     activity_dict['user_liked'] = bool(activity_dict.get('user_liked', 0))
+    activity_dict['user_bookmarked'] = bool(activity_dict.get('user_bookmarked', 0))
     if current_user_id:
         activity_dict['is_my_activity'] = activity_dict['user_id'] == current_user_id
     else:
@@ -471,90 +491,125 @@ def like_activity(activity_id: int, user_id: int) -> bool:
     """Like an activity"""
     db = default_db
 
-    # Get activity details for the required fields
-    activity = db.execute_query(
-        "SELECT activity_type, user_id as activity_user_id, item_id FROM activities WHERE id = ?",
-        (activity_id,),
-        fetch_one=True
-    )
-
-    if not activity:
-        return False
+    # 좋아요와 알림을 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # Get activity details for the required fields
+        activity = db.execute_query(
+            "SELECT activity_type, user_id as activity_user_id, item_id FROM activities WHERE id = ?",
+            (activity_id,),
+            fetch_one=True
+        )
 
-    activity_type = activity[0]
-    activity_user_id = activity[1]
-    item_id = activity[2]
+        if not activity:
+            return False
 
-    # Check if already liked
-    existing = db.execute_query(
-        "SELECT 1 FROM activity_likes WHERE activity_id = ? AND user_id = ?",
-        (activity_id, user_id),
-        fetch_one=True
-    )
+        activity_type = activity[0]
+        activity_user_id = activity[1]
+        item_id = activity[2]
 
-    if existing:
-        # Already liked, unlike
-        db.execute_update(
-            "DELETE FROM activity_likes WHERE activity_id = ? AND user_id = ?",
-            (activity_id, user_id)
-        )
-        # Delete notification
-        delete_notification_by_action(db, activity_user_id, user_id, 'like', activity_id)
-        return False
-    else:
-        # Not liked, add like
-        db.execute_insert(
-            """INSERT INTO activity_likes
-               (activity_id, user_id, activity_type, activity_user_id, item_id, created_at)
-               VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
-            (activity_id, user_id, activity_type, activity_user_id, item_id)
+        # Check if already liked
+        existing = db.execute_query(
+            "SELECT 1 FROM activity_likes WHERE activity_id = ? AND user_id = ?",
+            (activity_id, user_id),
+            fetch_one=True
         )
-        # Create notification
-        create_notification(db, activity_user_id, user_id, 'like', activity_id)
-        return True
 
+        if existing:
+            # Already liked, unlike
+            db.execute_update(
+                "DELETE FROM activity_likes WHERE activity_id = ? AND user_id = ?",
+                (activity_id, user_id)
+            )
+            # Delete notification
+            delete_notification_by_action(db, activity_user_id, user_id, 'like', activity_id)
+            return False
+        else:
+            # Not liked, add like
+            db.execute_insert(
+                """INSERT INTO activity_likes
+                   (activity_id, user_id, activity_type, activity_user_id, item_id, created_at)
+                   VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+                (activity_id, user_id, activity_type, activity_user_id, item_id)
+            )
+            # Create notification
+            create_notification(db, activity_user_id, user_id, 'like', activity_id)
+            return True
 
-def get_activity_comments(activity_id: int) -> List[Dict]:
-    """Get comments for an activity"""
-    db = default_db
 
-    # Get top-level comments
-    rows = db.execute_query(
-        """
-        SELECT
-            ac.id, ac.activity_id, ac.user_id, ac.content, ac.created_at, ac.parent_comment_id,
-            u.username, u.display_name, u.avatar_url,
-            COALESCE(us.otaku_score, 0) as otaku_score
-        FROM activity_comments ac
-        JOIN users u ON ac.user_id = u.id
-        LEFT JOIN user_stats us ON u.id = us.user_id
-        WHERE ac.activity_id = ? AND ac.parent_comment_id IS NULL
-        ORDER BY ac.created_at ASC
-        """,
-        (activity_id,)
+def get_activity_comments(activity_id: int) -> List[Dict]:
+    """Get comments for an activity (top-level comments and replies in one query)"""
+    return load_comment_thread(
+        'activity_comments',
+        "activity_id = ?",
+        (activity_id,),
+        extra_columns="c.activity_id,"
     )
 
-    comments = [dict_from_row(row) for row in rows]
 
-    # Get replies for each comment
-    for comment in comments:
-        reply_rows = db.execute_query(
-            """
+def get_comment_previews(activity_ids: List[int], limit: int = COMMENT_PREVIEW_LIMIT) -> Dict[int, List[Dict]]:
+    """
+    Latest top-level comments for a page of activities in one query
+
+    Comment source follows activity_comment_service.get_activity_comments:
+    anime/character ratings and reviews with a review use review_comments, everything else activity_comments
+
+    Returns: {activity_id: [comment, ...]} (oldest first, at most `limit` per activity)
+    """
+    db = default_db
+    if not activity_ids:
+        return {}
+
+    placeholders = ','.join('?' * len(activity_ids))
+    rows = db.execute_query(
+        f"""
+        WITH page AS (
             SELECT
-                ac.id, ac.activity_id, ac.user_id, ac.content, ac.created_at, ac.parent_comment_id,
+                a.id as activity_id,
+                COALESCE(ur.id, cr.id) as review_id,
+                CASE WHEN ur.id IS NOT NULL THEN 'anime' WHEN cr.id IS NOT NULL THEN 'character' END as review_type
+            FROM activities a
+            LEFT JOIN user_reviews ur ON a.activity_type IN ('anime_review', 'review', 'anime_rating')
+                AND ur.user_id = a.user_id AND ur.anime_id = a.item_id
+            LEFT JOIN character_reviews cr ON a.activity_type IN ('character_review', 'character_rating')
+                AND cr.user_id = a.user_id AND cr.character_id = a.item_id
+            WHERE a.id IN ({placeholders})
+        ),
+        comments AS (
+            SELECT p.activity_id, ac.id, ac.user_id, ac.content, ac.created_at, ac.parent_comment_id
+            FROM page p
+            JOIN activity_comments ac ON ac.activity_id = p.activity_id
+            WHERE p.review_id IS NULL AND ac.parent_comment_id IS NULL
+            UNION ALL
+            SELECT p.activity_id, rc.id, rc.user_id, rc.content, rc.created_at, rc.parent_comment_id
+            FROM page p
+            JOIN review_comments rc ON rc.review_id = p.review_id AND rc.review_type = p.review_type
+            WHERE rc.parent_comment_id IS NULL
+        )
+        SELECT * FROM (
+            SELECT
+                c.id, c.activity_id, c.user_id, c.content, c.created_at, c.parent_comment_id,
                 u.username, u.display_name, u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score
-            FROM activity_comments ac
-            JOIN users u ON ac.user_id = u.id
+                COALESCE(us.otaku_score, 0) as otaku_score,
+                ROW_NUMBER() OVER (
+                    PARTITION BY c.activity_id ORDER BY c.created_at DESC, c.id DESC
+                ) as preview_rank
+            FROM comments c
+            JOIN users u ON c.user_id = u.id
             LEFT JOIN user_stats us ON u.id = us.user_id
-            WHERE ac.parent_comment_id = ?
-            ORDER BY ac.created_at ASC
-            """,
-            (comment['id'],)
         )
-        comment['replies'] = [dict_from_row(row) for row in reply_rows]
+        WHERE preview_rank <= ?
+        ORDER BY activity_id, created_at ASC, id ASC
+        """,
+        (*activity_ids, limit)
+    )
 
-    return comments
+    previews = {activity_id: [] for activity_id in activity_ids}
+    for row in rows:
+        comment = dict_from_row(row)
+        del comment['preview_rank']
+        comment['replies'] = []
+        previews[comment['activity_id']].append(comment)
+    return previews
 
 
 def create_activity_comment(
@@ -566,76 +621,80 @@ def create_activity_comment(
     """Create a comment on an activity"""
     db = default_db
 
-    # Verify activity exists and get activity info for legacy columns
-    activity = get_activity_by_id(activity_id)
-    if not activity:
-        raise ValueError(f"Activity {activity_id} not found")
+    # 댓글과 알림을 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # Verify activity exists and get activity info for legacy columns
+        activity = get_activity_by_id(activity_id)
+        if not activity:
+            raise ValueError(f"Activity {activity_id} not found")
 
-    # Insert comment with legacy columns (activity_type, activity_user_id, item_id)
-    comment_id = db.execute_insert(
-        """
-        INSERT INTO activity_comments (
-            activity_id, user_id, parent_comment_id, content,
-            activity_type, activity_user_id, item_id, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """,
-        (activity_id, user_id, parent_comment_id, content,
-         activity['activity_type'], activity['user_id'], activity.get('item_id'))
-    )
+        # Insert comment with legacy columns (activity_type, activity_user_id, item_id)
+        comment_id = db.execute_insert(
+            """
+            INSERT INTO activity_comments (
+                activity_id, user_id, parent_comment_id, content,
+                activity_type, activity_user_id, item_id, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            (activity_id, user_id, parent_comment_id, content,
+             activity['activity_type'], activity['user_id'], activity.get('item_id'))
+        )
 
-    # Create notification for the activity owner
-    create_notification(db, activity['user_id'], user_id, 'comment', activity_id, comment_id, content)
+        # Create notification for the activity owner
+        create_notification(db, activity['user_id'], user_id, 'comment', activity_id, comment_id, content)
 
-    # Get created comment
-    comment = db.execute_query(
-        """
-        SELECT
-            ac.id, ac.activity_id, ac.user_id, ac.content, ac.created_at, ac.parent_comment_id,
-            u.username, u.display_name, u.avatar_url,
-            COALESCE(us.otaku_score, 0) as otaku_score
-        FROM activity_comments ac
-        JOIN users u ON ac.user_id = u.id
-        LEFT JOIN user_stats us ON u.id = us.user_id
-        WHERE ac.id = ?
-        """,
-        (comment_id,),
-        fetch_one=True
-    )
+        # Get created comment
+        comment = db.execute_query(
+            """
+            SELECT
+                ac.id, ac.activity_id, ac.user_id, ac.content, ac.created_at, ac.parent_comment_id,
+                u.username, u.display_name, u.avatar_url,
+                COALESCE(us.otaku_score, 0) as otaku_score
+            FROM activity_comments ac
+            JOIN users u ON ac.user_id = u.id
+            LEFT JOIN user_stats us ON u.id = us.user_id
+            WHERE ac.id = ?
+            """,
+            (comment_id,),
+            fetch_one=True
+        )
 
-    return dict_from_row(comment)
+        return dict_from_row(comment)
 
 
 def delete_activity_comment(comment_id: int, user_id: int) -> bool:
     """Delete a comment (only by the author)"""
     db = default_db
 
-    # Verify comment exists and get activity info for notification deletion
-    comment = db.execute_query(
-        "SELECT id, activity_id, activity_user_id FROM activity_comments WHERE id = ? AND user_id = ?",
-        (comment_id, user_id),
-        fetch_one=True
-    )
+    # 댓글과 알림 삭제를 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # Verify comment exists and get activity info for notification deletion
+        comment = db.execute_query(
+            "SELECT id, activity_id, activity_user_id FROM activity_comments WHERE id = ? AND user_id = ?",
+            (comment_id, user_id),
+            fetch_one=True
+        )
 
-    if not comment:
-        return False
+        if not comment:
+            return False
 
-    activity_id = comment[1]
-    activity_user_id = comment[2]
+        activity_id = comment[1]
+        activity_user_id = comment[2]
 
-    # Delete replies first (cascade)
-    db.execute_update(
-        "DELETE FROM activity_comments WHERE parent_comment_id = ?",
-        (comment_id,)
-    )
+        # Delete replies first (cascade)
+        db.execute_update(
+            "DELETE FROM activity_comments WHERE parent_comment_id = ?",
+            (comment_id,)
+        )
 
-    # Delete the comment
-    rowcount = db.execute_update(
-        "DELETE FROM activity_comments WHERE id = ? AND user_id = ?",
-        (comment_id, user_id)
-    )
+        # Delete the comment
+        rowcount = db.execute_update(
+            "DELETE FROM activity_comments WHERE id = ? AND user_id = ?",
+            (comment_id, user_id)
+        )
 
-    # Delete notification
-    if rowcount > 0:
-        delete_notification_by_action(db, activity_user_id, user_id, 'comment', activity_id)
+        # Delete notification
+        if rowcount > 0:
+            delete_notification_by_action(db, activity_user_id, user_id, 'comment', activity_id)
 
-    return rowcount > 0
+        return rowcount > 0
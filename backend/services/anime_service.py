@@ -7,6 +7,8 @@ import random
 from database import db, dict_from_row, dicts_from_rows
 from models.anime import AnimeResponse, AnimeDetailResponse, AnimeListResponse
 from config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.search_index import title_search_clause, title_match_rank
+from services.series_service import get_season_numbers
 
 
 def get_anime_list(
@@ -73,6 +75,7 @@ def get_anime_list(
     sort_column = {
         "popularity": "(popularity + (RANDOM() % 3000)) DESC",  # 랜덤성 추가
         "score": "average_score DESC",
+        "site_rating": "ss.average_rating DESC, ss.rating_count DESC",  # 우리 사이트 평점 (필터 후 정렬 - 인덱스 미사용)
         "trending": "trending DESC",
         "favourites": "favourites DESC",
         "title": "title_romaji ASC",
@@ -83,7 +86,7 @@ def get_anime_list(
     count_query = f"SELECT COUNT(*) as total FROM anime WHERE {where_clause}"
     total = db.execute_query(count_query, tuple(params), fetch_one=True)['total']
 
-    # 목록 조회 (시즌 번호 포함, 로컬 이미지 우선, 우리 사이트 평가 통계, 사용자 평가 상태)
+    # 목록 조회 (로컬 이미지 우선, 우리 사이트 평가 통계, 사용자 평가 상태)
     user_status_query = ""
     if exclude_user_id:
         user_status_query = f"""
@@ -98,14 +101,11 @@ def get_anime_list(
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
                a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM anime_relation ar
-                WHERE ar.anime_id = a.id AND ar.relation_type = 'PREQUEL') + 1 as season_number,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               COALESCE(ss.rating_count, 0) as site_rating_count,
+               ss.average_rating as site_average_rating
                {user_status_query}
         FROM anime a
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
         WHERE {where_clause}
         ORDER BY {sort_column}
         LIMIT ? OFFSET ?
@@ -127,14 +127,11 @@ def get_anime_list(
                    COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                    a.cover_image_color, a.banner_image_url,
                    a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-                   (SELECT COUNT(*) FROM anime_relation ar
-                    WHERE ar.anime_id = a.id AND ar.relation_type = 'PREQUEL') + 1 as season_number,
-                   (SELECT COUNT(*) FROM user_ratings ur
-                    WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-                   (SELECT AVG(ur.rating) FROM user_ratings ur
-                    WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating,
+                   COALESCE(ss.rating_count, 0) as site_rating_count,
+                   ss.average_rating as site_average_rating,
                    'WANT_TO_WATCH' as user_rating_status
             FROM anime a
+            LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
             WHERE a.id IN (
                 SELECT anime_id FROM user_ratings
                 WHERE user_id = ? AND status = 'WANT_TO_WATCH'
@@ -151,23 +148,17 @@ def get_anime_list(
         # exclude_user_id가 없거나 page_size가 작으면 기존 로직
         all_rows = db.execute_query(list_query, tuple(params + [page_size, offset]))
 
-    # 각 애니메이션에 장르 정보 추가
+    # 페이지 전체 장르를 한 번에 조회 (행마다 쿼리하지 않음), 시즌 번호는 프랜차이즈 그래프에서
+    page_ids = [row['id'] for row in all_rows]
+    genres_by_anime = get_genres_by_anime_ids(page_ids)
+    season_numbers = get_season_numbers(page_ids)
+
     items = []
     for row in all_rows:
         anime_dict = dict_from_row(row)
         anime_dict['airing_status'] = anime_dict.get('status')  # airing_status 별칭 추가
-
-        # 장르 가져오기
-        genre_rows = db.execute_query(
-            """
-            SELECT g.name
-            FROM anime_genre ag
-            JOIN genre g ON ag.genre_id = g.id
-            WHERE ag.anime_id = ?
-            """,
-            (anime_dict['id'],)
-        )
-        anime_dict['genres'] = [g['name'] for g in genre_rows]
+        anime_dict['genres'] = genres_by_anime.get(anime_dict['id'], [])
+        anime_dict['season_number'] = season_numbers[anime_dict['id']]
 
         items.append(AnimeResponse(**anime_dict))
 
@@ -180,6 +171,29 @@ def get_anime_list(
     )
 
 
+def get_genres_by_anime_ids(anime_ids: List[int]) -> Dict[int, List[str]]:
+    """여러 애니메이션의 장르를 한 번의 쿼리로 조회. Returns: {anime_id: [장르명, ...]}"""
+    if not anime_ids:
+        return {}
+
+    unique_ids = list(dict.fromkeys(anime_ids))
+    placeholders = ','.join('?' * len(unique_ids))
+    rows = db.execute_query(
+        f"""
+        SELECT ag.anime_id, g.name
+        FROM anime_genre ag
+        JOIN genre g ON ag.genre_id = g.id
+        WHERE ag.anime_id IN ({placeholders})
+        """,
+        tuple(unique_ids)
+    )
+
+    genres_by_anime: Dict[int, List[str]] = {}
+    for row in rows:
+        genres_by_anime.setdefault(row['anime_id'], []).append(row['name'])
+    return genres_by_anime
+
+
 def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailResponse]:
     """애니메이션 상세 정보 조회 (user_id가 있으면 캐릭터별 내 별점 포함)"""
 
@@ -344,12 +358,11 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
             COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
             a.average_score,
             ar.rating as recommendation_score,
-            (SELECT COUNT(*) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-            (SELECT AVG(ur.rating) FROM user_ratings ur
-             WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+            COALESCE(ss.rating_count, 0) as site_rating_count,
+            ss.average_rating as site_average_rating
         FROM anime_recommendation ar
         JOIN anime a ON ar.recommended_anime_id = a.id
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
         WHERE ar.anime_id = ?
         ORDER BY ar.rating DESC
         LIMIT 6
@@ -377,13 +390,7 @@ def get_anime_by_id(anime_id: int, user_id: int = None) -> Optional[AnimeDetailR
 
     # 우리 사이트 평가 통계
     site_stats_row = db.execute_query(
-        """
-        SELECT
-            COUNT(*) as rating_count,
-            AVG(rating) as average_rating
-        FROM user_ratings
-        WHERE anime_id = ? AND status = 'RATED' AND rating IS NOT NULL
-        """,
+        "SELECT rating_count, average_rating FROM anime_site_stats WHERE anime_id = ?",
         (anime_id,),
         fetch_one=True
     )
@@ -418,44 +425,38 @@ def search_anime(
     page_size = min(page_size, MAX_PAGE_SIZE)
     offset = (page - 1) * page_size
 
-    # 띄어쓰기 제거한 검색 패턴
-    search_pattern = f"%{query.replace(' ', '')}%"
+    # 띄어쓰기 무시 검색 (3글자 이상이면 FTS5 trigram 인덱스 사용)
+    title_columns = ['a.title_romaji', 'a.title_english', 'a.title_native', 'a.title_korean']
+    where_clause, where_params = title_search_clause(
+        'a.id', 'anime_search', 'titles_compact', title_columns, query, ignore_spaces=True
+    )
+    rank_expr, rank_params = title_match_rank(title_columns, query, ignore_spaces=True)
 
-    # 전체 개수 (띄어쓰기 무시)
+    # 전체 개수
     total = db.execute_query(
-        """
-        SELECT COUNT(*) as total FROM anime
-        WHERE REPLACE(title_romaji, ' ', '') LIKE ?
-           OR REPLACE(title_english, ' ', '') LIKE ?
-           OR REPLACE(title_native, ' ', '') LIKE ?
-           OR REPLACE(title_korean, ' ', '') LIKE ?
-        """,
-        (search_pattern, search_pattern, search_pattern, search_pattern),
+        f"SELECT COUNT(*) as total FROM anime a WHERE {where_clause}",
+        where_params,
         fetch_one=True
     )['total']
 
-    # 검색 결과 (로컬 이미지 우선, 우리 사이트 평가 통계, 띄어쓰기 무시)
+    # 검색 결과 (제목 일치 등급 → 인기도 순, 로컬 이미지 우선, 우리 사이트 평가 통계)
     rows = db.execute_query(
-        """
+        f"""
         SELECT a.id, a.title_romaji, a.title_english, a.title_native, a.title_korean, a.title_korean_official,
                a.type, a.format, a.status, a.description,
                a.season, a.season_year, a.episodes, a.duration,
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
                a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               COALESCE(ss.rating_count, 0) as site_rating_count,
+               ss.average_rating as site_average_rating
         FROM anime a
-        WHERE REPLACE(a.title_romaji, ' ', '') LIKE ?
-           OR REPLACE(a.title_english, ' ', '') LIKE ?
-           OR REPLACE(a.title_native, ' ', '') LIKE ?
-           OR REPLACE(a.title_korean, ' ', '') LIKE ?
-        ORDER BY a.popularity DESC
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
+        WHERE {where_clause}
+        ORDER BY {rank_expr}, a.popularity DESC
         LIMIT ? OFFSET ?
         """,
-        (search_pattern, search_pattern, search_pattern, search_pattern, page_size, offset)
+        where_params + rank_params + (page_size, offset)
     )
 
     items = [AnimeResponse(**dict_from_row(row)) for row in rows]
@@ -480,11 +481,10 @@ def get_popular_anime(limit: int = 50) -> List[AnimeResponse]:
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
                a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               COALESCE(ss.rating_count, 0) as site_rating_count,
+               ss.average_rating as site_average_rating
         FROM anime a
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
         ORDER BY a.popularity DESC
         LIMIT ?
         """,
@@ -505,11 +505,10 @@ def get_top_rated_anime(limit: int = 50) -> List[AnimeResponse]:
                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
                a.cover_image_color, a.banner_image_url,
                a.average_score, a.popularity, a.favourites, a.source, a.is_adult,
-               (SELECT COUNT(*) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_rating_count,
-               (SELECT AVG(ur.rating) FROM user_ratings ur
-                WHERE ur.anime_id = a.id AND ur.status = 'RATED' AND ur.rating IS NOT NULL) as site_average_rating
+               COALESCE(ss.rating_count, 0) as site_rating_count,
+               ss.average_rating as site_average_rating
         FROM anime a
+        LEFT JOIN anime_site_stats ss ON ss.anime_id = a.id
         WHERE a.average_score IS NOT NULL
         ORDER BY a.average_score DESC, a.popularity DESC
         LIMIT ?
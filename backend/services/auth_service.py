@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from database import db, dict_from_row
 from utils.security import hash_password, verify_password, create_access_token
 from utils.user_helpers import set_default_avatar
+from utils.user_cache import invalidate_user
 from models.user import UserRegister, UserLogin, UserResponse, TokenResponse
 from services.email_service import send_verification_email
 
@@ -230,6 +231,7 @@ def update_user_profile(user_id: int, display_name: Optional[str] = None, email:
         f"UPDATE users SET {', '.join(update_fields)} WHERE id = ?",
         tuple(params)
     )
+    invalidate_user(user_id)
 
     # 업데이트된 사용자 정보 반환 (with otaku_score)
     user_row = db.execute_query(
@@ -293,6 +295,7 @@ def update_user_password(user_id: int, current_password: str, new_password: str)
         "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (new_hashed_password, user_id)
     )
+    invalidate_user(user_id)
 
     return True
 
@@ -305,6 +308,7 @@ def update_user_avatar(user_id: int, avatar_url: str) -> UserResponse:
         "UPDATE users SET avatar_url = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (avatar_url, user_id)
     )
+    invalidate_user(user_id)
 
     # 업데이트된 사용자 정보 반환 (with otaku_score)
     user_row = db.execute_query(
@@ -0,0 +1,237 @@
+"""
+Autocomplete Service
+한글 자모/초성 접두어 자동완성 (메모리 인덱스, 조회 시 SQLite 미사용)
+
+- 서버 시작 시 anime / character 제목·이름으로 정렬된 키 배열 생성
+- 키: 단어 시작 위치부터의 접미어 (띄어쓰기 제거)
+  - "j:" 자모 분해 키 → 조합 중인 음절 입력 ("귀며" → 귀멸의 칼날)
+  - "c:" 초성 키 → 초성 입력 ("ㄱㅁㅇㅋㄴ" → 귀멸의 칼날)
+- 짧은 접두어는 상위 결과를 종류별(전체/anime/character)로 미리 계산, 나머지는 이진 탐색 후 범위 스캔
+- 관리자 수정 시 refresh_anime / refresh_character 로 증분 갱신
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from database import db
+from utils.hangul import normalize, decompose, chosung, has_hangul, is_chosung_query
+
+# 이 길이(마커 제외) 이하 접두어는 상위 결과를 미리 계산 ("가" = 2자모, "강" = 3자모)
+SHORT_PREFIX_LENGTH = 3
+SHORT_PREFIX_TOP_K = 50
+# 긴 접두어 범위 스캔 상한 (응답 시간 보장)
+MAX_SCAN = 20000
+KEY_END = '\U0010ffff'
+
+ANIME_NAME_COLUMNS = ['title_korean', 'title_korean_official', 'title_romaji', 'title_english', 'title_native']
+CHARACTER_NAME_COLUMNS = ['name_korean', 'name_full', 'name_native']
+
+ANIME_QUERY = """
+    SELECT id, title_korean, title_korean_official, title_romaji, title_english, title_native,
+           COALESCE('/' || cover_image_local, cover_image_url) as image_url,
+           COALESCE(popularity, 0) as popularity
+    FROM anime
+"""
+CHARACTER_QUERY = """
+    SELECT id, name_korean, name_full, name_native,
+           COALESCE('/' || image_local, image_url) as image_url,
+           COALESCE(favourites, 0) as popularity
+    FROM character
+"""
+
+Ref = Tuple[str, int]  # ('anime' | 'character', id)
+KINDS = (None, 'anime', 'character')  # 미리 계산하는 종류 필터 (None = 전체)
+
+
+def _index_keys(names: List[str]) -> set:
+    """이름들의 단어 시작 위치별 접미어로 자모/초성 키 생성"""
+    keys = set()
+    for name in names:
+        words = normalize(name).split()
+        for i in range(len(words)):
+            suffix = ''.join(words[i:])
+            keys.add('j:' + decompose(suffix))
+            if has_hangul(suffix):
+                keys.add('c:' + chosung(suffix))
+    return keys
+
+
+def _query_key(query: str) -> Optional[str]:
+    term = ''.join(normalize(query).split())
+    if not term:
+        return None
+    if is_chosung_query(term):
+        return 'c:' + term
+    return 'j:' + decompose(term)
+
+
+def _make_entry(kind: str, row: Dict) -> Dict:
+    columns = ANIME_NAME_COLUMNS if kind == 'anime' else CHARACTER_NAME_COLUMNS
+    names = [row[col] for col in columns if row.get(col)]
+    return {
+        'type': kind,
+        'id': row['id'],
+        'title': names[0] if names else None,  # 한국어 이름 우선
+        'image_url': row.get('image_url'),
+        'popularity': row.get('popularity') or 0,
+        'keys': _index_keys(names),
+    }
+
+
+class AutocompleteIndex:
+    """정렬된 (key, kind, id) 배열 기반 접두어 인덱스"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, str, int]] = []
+        self._entries: Dict[Ref, Dict] = {}
+        self._short_top: Dict[str, Dict[Optional[str], List[Ref]]] = {}
+        self.ready = False
+
+    def build(self, entries: List[Dict]):
+        entry_map = {(e['type'], e['id']): e for e in entries}
+        keys = sorted(
+            (key, ref[0], ref[1])
+            for ref, entry in entry_map.items()
+            for key in entry['keys']
+        )
+
+        short_candidates: Dict[str, Dict[Ref, int]] = {}
+        for key, kind, item_id in keys:
+            ref = (kind, item_id)
+            for length in range(1, SHORT_PREFIX_LENGTH + 1):
+                if len(key) - 2 < length:
+                    break
+                short_candidates.setdefault(key[:2 + length], {})[ref] = entry_map[ref]['popularity']
+
+        short_top = {
+            prefix: self._top_by_kind(refs, SHORT_PREFIX_TOP_K)
+            for prefix, refs in short_candidates.items()
+        }
+
+        with self._lock:
+            self._keys = keys
+            self._entries = entry_map
+            self._short_top = short_top
+            self.ready = True
+
+    @staticmethod
+    def _top_by_kind(refs: Dict[Ref, int], limit: int) -> Dict[Optional[str], List[Ref]]:
+        """{ref: popularity} → 종류 필터별 인기도 상위 limit 개"""
+        return {
+            kind: heapq.nlargest(
+                limit, (ref for ref in refs if kind is None or ref[0] == kind), key=refs.get
+            )
+            for kind in KINDS
+        }
+
+    def _range_refs(self, prefix: str, max_scan: int) -> Dict[Ref, int]:
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + KEY_END,), start)
+        return {
+            (kind, item_id): self._entries[(kind, item_id)]['popularity']
+            for _, kind, item_id in self._keys[start:min(end, start + max_scan)]
+        }
+
+    def _scan(self, prefix: str, limit: int, kind: Optional[str] = None, max_scan: int = MAX_SCAN) -> List[Ref]:
+        refs = self._range_refs(prefix, max_scan)
+        return heapq.nlargest(
+            limit, (ref for ref in refs if kind is None or ref[0] == kind), key=refs.get
+        )
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict]:
+        prefix = _query_key(query)
+        if prefix is None:
+            return []
+
+        # 종류 필터는 상위 limit 개를 고르기 전에 적용 (짧은 접두어는 종류별로 미리 계산된 목록)
+        with self._lock:
+            if len(prefix) - 2 <= SHORT_PREFIX_LENGTH:
+                refs = self._short_top.get(prefix, {}).get(kind, [])
+            else:
+                refs = self._scan(prefix, limit, kind)
+            entries = [self._entries[ref] for ref in refs]
+
+        return [
+            {
+                'type': e['type'],
+                'id': e['id'],
+                'title': e['title'],
+                'image_url': e['image_url'],
+                'popularity': e['popularity'],
+            }
+            for e in entries[:limit]
+        ]
+
+    def upsert(self, entry: Optional[Dict], ref: Ref):
+        """항목 추가/교체 (entry가 None이면 삭제) 후 영향받는 짧은 접두어 재계산"""
+        with self._lock:
+            old = self._entries.pop(ref, None)
+            affected = set(old['keys']) if old else set()
+            for key in affected:
+                i = bisect_left(self._keys, (key, ref[0], ref[1]))
+                if i < len(self._keys) and self._keys[i] == (key, ref[0], ref[1]):
+                    del self._keys[i]
+
+            if entry is not None:
+                self._entries[ref] = entry
+                for key in entry['keys']:
+                    insort(self._keys, (key, ref[0], ref[1]))
+                affected |= entry['keys']
+
+            prefixes = {
+                key[:2 + length]
+                for key in affected
+                for length in range(1, SHORT_PREFIX_LENGTH + 1)
+                if len(key) - 2 >= length
+            }
+            for prefix in prefixes:
+                refs = self._range_refs(prefix, max_scan=len(self._keys))
+                if refs:
+                    self._short_top[prefix] = self._top_by_kind(refs, SHORT_PREFIX_TOP_K)
+                else:
+                    self._short_top.pop(prefix, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'entries': len(self._entries),
+                'keys': len(self._keys),
+                'short_prefixes': len(self._short_top),
+            }
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def build_autocomplete_index() -> Dict:
+    """DB 전체에서 자동완성 인덱스 (재)생성. Returns: 인덱스 통계"""
+    entries = [_make_entry('anime', dict(row)) for row in db.execute_query(ANIME_QUERY)]
+    entries += [_make_entry('character', dict(row)) for row in db.execute_query(CHARACTER_QUERY)]
+    autocomplete_index.build(entries)
+    return autocomplete_index.stats()
+
+
+def _refresh(kind: str, query: str, item_id: int):
+    if not autocomplete_index.ready:
+        return
+    row = db.execute_query(f"{query} WHERE id = ?", (item_id,), fetch_one=True)
+    entry = _make_entry(kind, dict(row)) if row else None
+    autocomplete_index.upsert(entry, (kind, item_id))
+
+
+def refresh_anime(anime_id: int):
+    """애니메이션 제목 변경/삭제 반영"""
+    _refresh('anime', ANIME_QUERY, anime_id)
+
+
+def refresh_character(character_id: int):
+    """캐릭터 이름 변경/삭제 반영"""
+    _refresh('character', CHARACTER_QUERY, character_id)
+
+
+def autocomplete(query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict]:
+    """자동완성 결과 (인기도 순). kind: 'anime' | 'character' | None(전체)"""
+    return autocomplete_index.search(query, limit, kind)
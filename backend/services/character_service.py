@@ -5,6 +5,7 @@ Character Service
 from typing import List, Dict, Optional
 import random
 from database import db, dict_from_row
+from utils.user_cache import invalidate_user
 
 
 def get_user_rated_characters(user_id: int, limit: int = 100, offset: int = 0) -> List[Dict]:
@@ -182,88 +183,93 @@ def create_or_update_character_rating(user_id: int, character_id: int, rating: f
     """
     캐릭터 평가 생성 또는 수정 + activities 테이블 동기화
     """
-    # Delete from activities first (트리거가 동작하지 않을 경우를 대비)
-    db.execute_update(
-        """
-        DELETE FROM activities
-        WHERE activity_type = 'character_rating'
-          AND user_id = ?
-          AND item_id = ?
-        """,
-        (user_id, character_id)
-    )
-
-    # Check if rating exists
-    existing = get_character_rating(user_id, character_id)
-
-    if existing:
-        # Update - only update fields that are provided
-        update_parts = []
-        params = []
-
-        if rating is not None:
-            update_parts.append("rating = ?")
-            params.append(rating)
-
-        if status is not None:
-            update_parts.append("status = ?")
-            params.append(status)
-
-        if update_parts:
-            update_parts.append("updated_at = CURRENT_TIMESTAMP")
-            params.extend([user_id, character_id])
-
-            db.execute_update(
-                f"""
-                UPDATE character_ratings
-                SET {', '.join(update_parts)}
-                WHERE user_id = ? AND character_id = ?
-                """,
-                tuple(params)
-            )
-    else:
-        # Insert
-        if rating is None and status is None:
-            return None
-
-        db.execute_insert(
+    # 한 번의 트랜잭션으로 처리 (평점/activities/통계/승급 기록을 한 번에 커밋)
+    with db.transaction():
+        # Delete from activities first (트리거가 동작하지 않을 경우를 대비)
+        db.execute_update(
             """
-            INSERT INTO character_ratings (user_id, character_id, rating, status)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, character_id, rating, status or 'RATED')
-        )
-
-    # Sync to activities table only if rating exists
-    # (WANT_TO_KNOW, NOT_INTERESTED should not appear in feed)
-    if rating is not None and rating > 0:
-        _sync_character_rating_to_activities(user_id, character_id)
-
-        # Update activity_time to current time (move to recent feed)
-        db.execute_update("""
-            UPDATE activities
-            SET activity_time = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
+            DELETE FROM activities
             WHERE activity_type = 'character_rating'
               AND user_id = ?
               AND item_id = ?
-        """, (user_id, character_id))
+            """,
+            (user_id, character_id)
+        )
 
-    # Update user stats (otaku score)
-    from services.rating_service import _update_user_stats
-    _update_user_stats(user_id)
+        # Check if rating exists
+        existing = get_character_rating(user_id, character_id)
+
+        if existing:
+            # Update - only update fields that are provided
+            update_parts = []
+            params = []
+
+            if rating is not None:
+                update_parts.append("rating = ?")
+                params.append(rating)
+
+            if status is not None:
+                update_parts.append("status = ?")
+                params.append(status)
+
+            if update_parts:
+                update_parts.append("updated_at = CURRENT_TIMESTAMP")
+                params.extend([user_id, character_id])
+
+                db.execute_update(
+                    f"""
+                    UPDATE character_ratings
+                    SET {', '.join(update_parts)}
+                    WHERE user_id = ? AND character_id = ?
+                    """,
+                    tuple(params)
+                )
+        else:
+            # Insert
+            if rating is None and status is None:
+                return None
+
+            db.execute_insert(
+                """
+                INSERT INTO character_ratings (user_id, character_id, rating, status)
+                VALUES (?, ?, ?, ?)
+                """,
+                (user_id, character_id, rating, status or 'RATED')
+            )
 
-    # Get updated rating
-    result = get_character_rating(user_id, character_id)
+        # Sync to activities table only if rating exists
+        # (WANT_TO_KNOW, NOT_INTERESTED should not appear in feed)
+        if rating is not None and rating > 0:
+            _sync_character_rating_to_activities(user_id, character_id)
+
+            # Update activity_time to current time (move to recent feed)
+            db.execute_update("""
+                UPDATE activities
+                SET activity_time = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE activity_type = 'character_rating'
+                  AND user_id = ?
+                  AND item_id = ?
+            """, (user_id, character_id))
+
+        # Update user stats (otaku score)
+        from services.rating_service import _update_user_stats
+        _update_user_stats(user_id)
+
+        # Get updated rating
+        result = get_character_rating(user_id, character_id)
+
+        # Add updated otaku_score to response
+        updated_stats = db.execute_query(
+            "SELECT otaku_score FROM user_stats WHERE user_id = ?",
+            (user_id,),
+            fetch_one=True
+        )
+        if updated_stats and result:
+            result['otaku_score'] = updated_stats['otaku_score']
 
-    # Add updated otaku_score to response
-    updated_stats = db.execute_query(
-        "SELECT otaku_score FROM user_stats WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )
-    if updated_stats and result:
-        result['otaku_score'] = updated_stats['otaku_score']
+    # 5점 캐릭터가 바뀌면 기본 아바타(users.character_avatar_url)도 바뀌므로 캐시 무효화
+    invalidate_user(user_id)
 
     return result
 
@@ -359,29 +365,34 @@ def delete_character_rating(user_id: int, character_id: int) -> bool:
     """
     캐릭터 평가 삭제 (activities 삭제 시 CASCADE로 댓글/좋아요도 자동 삭제)
     """
-    # activities 테이블에서 삭제 (CASCADE로 comments/likes 자동 삭제)
-    db.execute_update(
-        """
-        DELETE FROM activities
-        WHERE activity_type = 'character_rating'
-        AND user_id = ?
-        AND item_id = ?
-        """,
-        (user_id, character_id)
-    )
+    # 한 번의 트랜잭션으로 처리 (평점/activities/통계/승급 기록을 한 번에 커밋)
+    with db.transaction():
+        # activities 테이블에서 삭제 (CASCADE로 comments/likes 자동 삭제)
+        db.execute_update(
+            """
+            DELETE FROM activities
+            WHERE activity_type = 'character_rating'
+            AND user_id = ?
+            AND item_id = ?
+            """,
+            (user_id, character_id)
+        )
 
-    # 평점 삭제
-    db.execute_update(
-        """
-        DELETE FROM character_ratings
-        WHERE user_id = ? AND character_id = ?
-        """,
-        (user_id, character_id)
-    )
+        # 평점 삭제
+        db.execute_update(
+            """
+            DELETE FROM character_ratings
+            WHERE user_id = ? AND character_id = ?
+            """,
+            (user_id, character_id)
+        )
 
-    # Update user stats (otaku score)
-    from services.rating_service import _update_user_stats
-    _update_user_stats(user_id)
+        # Update user stats (otaku score)
+        from services.rating_service import _update_user_stats
+        _update_user_stats(user_id)
+
+    # 기본 아바타(users.character_avatar_url)가 바뀔 수 있으므로 캐시 무효화
+    invalidate_user(user_id)
 
     return True
 
@@ -416,28 +427,14 @@ def get_user_character_ratings(
                 c.name_native,
                 c.name_korean,
                 COALESCE('/' || c.image_local, c.image_url) as image_url,
-                (SELECT a.id FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_id,
-                (SELECT a.title_romaji FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title,
-                (SELECT a.title_korean FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_korean,
-                (SELECT a.title_native FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_native
+                pa.id as anime_id,
+                pa.title_romaji as anime_title,
+                pa.title_korean as anime_title_korean,
+                pa.title_native as anime_title_native
             FROM character_ratings cr
             JOIN character c ON cr.character_id = c.id
+            LEFT JOIN character_primary_anime cpa ON cpa.character_id = c.id
+            LEFT JOIN anime pa ON pa.id = cpa.anime_id
             WHERE {where_clause}
             ORDER BY cr.updated_at DESC
             {limit_clause}
@@ -623,28 +620,14 @@ def get_all_user_character_ratings(user_id: int, rating_filter: float = None, st
                 c.name_native,
                 c.name_korean,
                 COALESCE('/' || c.image_local, c.image_url) as image_url,
-                (SELECT a.id FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_id,
-                (SELECT a.title_romaji FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title,
-                (SELECT a.title_korean FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_korean,
-                (SELECT a.title_native FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_native
+                pa.id as anime_id,
+                pa.title_romaji as anime_title,
+                pa.title_korean as anime_title_korean,
+                pa.title_native as anime_title_native
             FROM character_ratings cr
             JOIN character c ON cr.character_id = c.id
+            LEFT JOIN character_primary_anime cpa ON cpa.character_id = c.id
+            LEFT JOIN anime pa ON pa.id = cpa.anime_id
             WHERE cr.user_id = ? AND cr.status = 'WANT_TO_KNOW'
             ORDER BY cr.updated_at DESC
             """,
@@ -665,28 +648,14 @@ def get_all_user_character_ratings(user_id: int, rating_filter: float = None, st
                 c.name_native,
                 c.name_korean,
                 COALESCE('/' || c.image_local, c.image_url) as image_url,
-                (SELECT a.id FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_id,
-                (SELECT a.title_romaji FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title,
-                (SELECT a.title_korean FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_korean,
-                (SELECT a.title_native FROM anime a
-                 JOIN anime_character ac ON a.id = ac.anime_id
-                 WHERE ac.character_id = c.id
-                 ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.start_date ASC
-                 LIMIT 1) as anime_title_native
+                pa.id as anime_id,
+                pa.title_romaji as anime_title,
+                pa.title_korean as anime_title_korean,
+                pa.title_native as anime_title_native
             FROM character_ratings cr
             JOIN character c ON cr.character_id = c.id
+            LEFT JOIN character_primary_anime cpa ON cpa.character_id = c.id
+            LEFT JOIN anime pa ON pa.id = cpa.anime_id
             WHERE cr.user_id = ? AND cr.status = 'NOT_INTERESTED'
             ORDER BY cr.updated_at DESC
             """,
@@ -813,13 +782,7 @@ def get_character_detail(character_id: int, user_id: int) -> Optional[Dict]:
 
     # Get site rating statistics
     site_stats_row = db.execute_query(
-        """
-        SELECT
-            COUNT(*) as rating_count,
-            AVG(rating) as average_rating
-        FROM character_ratings
-        WHERE character_id = ? AND rating IS NOT NULL
-        """,
+        "SELECT rating_count, average_rating FROM character_site_stats WHERE character_id = ?",
         (character_id,),
         fetch_one=True
     )
@@ -0,0 +1,210 @@
+"""
+Taste Compatibility Service
+두 사용자의 애니 평점 취향 유사도 (프로필, 팔로우 목록)
+
+- 사용자별 평점 벡터: anime_id 정렬 배열 + float32 평점 배열 (RATED 만)
+- 프로세스별 TTL LRU 캐시 - 평가 변경 시 invalidate_rating_vector 로 해당 사용자 제거 (커밋 후에도 한 번 더),
+  다른 워커의 변경은 COMPATIBILITY_VECTOR_TTL 이내에 반영
+- 겹치는 애니는 정렬 배열 병합 (NumPy intersect1d, 없으면 투 포인터) → Pearson / cosine
+- 캐시에 없는 사용자들은 쿼리 한 번으로 함께 적재
+"""
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from config import (
+    COMPATIBILITY_VECTOR_TTL,
+    COMPATIBILITY_CACHE_SIZE,
+    MIN_COMMON_RATINGS_FOR_COMPATIBILITY,
+)
+from database import db
+
+# NumPy 는 선택 의존성 - 없으면 array 모듈 + 순수 Python 병합
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# 겹치는 평가가 적을 때 상관계수 축소 (pearson * n / (n + SHRINKAGE))
+COMPATIBILITY_SHRINKAGE = 10.0
+# 평점 범위 (0.5 ~ 5.0) - 분산이 0일 때 평균 절대 차이로 일치도 계산
+RATING_RANGE = 4.5
+
+_lock = threading.Lock()
+_vectors: "OrderedDict[int, tuple]" = OrderedDict()  # user_id -> (ids, ratings, expires_at)
+_generation = 0  # 무효화마다 증가 - 적재 중에 무효화가 있었으면 적재 결과를 캐시에 넣지 않음
+
+
+# ---- 평점 벡터 캐시 ----
+
+def _make_vector(ids: List[int], ratings: List[float]) -> Tuple:
+    if np is not None:
+        return np.array(ids, dtype=np.int64), np.array(ratings, dtype=np.float32)
+    return array('q', ids), array('f', ratings)
+
+
+def _load_vectors(user_ids: List[int]) -> Dict[int, Tuple]:
+    placeholders = ','.join('?' * len(user_ids))
+    rows = db.execute_query(
+        f"""
+        SELECT user_id, anime_id, rating FROM user_ratings
+        WHERE user_id IN ({placeholders}) AND status = 'RATED' AND rating IS NOT NULL
+        ORDER BY user_id, anime_id
+        """,
+        tuple(user_ids)
+    )
+    columns: Dict[int, Tuple[List[int], List[float]]] = {user_id: ([], []) for user_id in user_ids}
+    for row in rows:
+        ids, ratings = columns[row['user_id']]
+        ids.append(row['anime_id'])
+        ratings.append(row['rating'])
+    return {user_id: _make_vector(ids, ratings) for user_id, (ids, ratings) in columns.items()}
+
+
+def get_rating_vectors(user_ids: Iterable[int]) -> Dict[int, Tuple]:
+    """
+    사용자별 (anime_id 정렬 배열, 평점 배열)
+    캐시에 없거나 만료된 사용자만 쿼리 한 번으로 적재
+    """
+    wanted = list(dict.fromkeys(user_ids))
+    now = time.monotonic()
+    vectors: Dict[int, Tuple] = {}
+    with _lock:
+        for user_id in wanted:
+            entry = _vectors.get(user_id)
+            if entry is not None and entry[2] > now:
+                _vectors.move_to_end(user_id)
+                vectors[user_id] = entry[:2]
+        generation = _generation
+
+    missing = [user_id for user_id in wanted if user_id not in vectors]
+    if missing:
+        loaded = _load_vectors(missing)
+        vectors.update(loaded)
+        if COMPATIBILITY_VECTOR_TTL > 0:
+            expires_at = time.monotonic() + COMPATIBILITY_VECTOR_TTL
+            with _lock:
+                if generation != _generation:
+                    # 적재 중에 평가 변경 - 커밋 전 데이터일 수 있으므로 캐시하지 않음
+                    return vectors
+                for user_id, (ids, ratings) in loaded.items():
+                    _vectors[user_id] = (ids, ratings, expires_at)
+                    _vectors.move_to_end(user_id)
+                while len(_vectors) > COMPATIBILITY_CACHE_SIZE:
+                    _vectors.popitem(last=False)
+
+    return vectors
+
+
+def _drop_rating_vector(user_id: int):
+    global _generation
+    with _lock:
+        _generation += 1
+        _vectors.pop(user_id, None)
+
+
+def invalidate_rating_vector(user_id: int):
+    """
+    평가 추가/수정/삭제 시 해당 사용자 벡터 제거
+    트랜잭션 안이면 커밋 후 한 번 더 제거 (그 사이 다른 요청이 커밋 전 데이터로 다시 채운 벡터 제거)
+    """
+    _drop_rating_vector(user_id)
+    if db.in_transaction():
+        db.after_commit(lambda: _drop_rating_vector(user_id))
+
+
+def clear_rating_vectors():
+    global _generation
+    with _lock:
+        _generation += 1
+        _vectors.clear()
+
+
+# ---- 유사도 ----
+
+def _common_ratings(a: Tuple, b: Tuple) -> Tuple[List[float], List[float]]:
+    """두 정렬 벡터의 공통 anime_id 평점 (투 포인터 병합, NumPy 없을 때)"""
+    a_ids, a_ratings = a
+    b_ids, b_ratings = b
+    x, y = [], []
+    i = j = 0
+    while i < len(a_ids) and j < len(b_ids):
+        if a_ids[i] == b_ids[j]:
+            x.append(a_ratings[i])
+            y.append(b_ratings[j])
+            i += 1
+            j += 1
+        elif a_ids[i] < b_ids[j]:
+            i += 1
+        else:
+            j += 1
+    return x, y
+
+
+def _overlap_stats(a: Tuple, b: Tuple) -> Tuple[int, float, float, float, float, float, float]:
+    """Returns: (겹친 수, Σx, Σy, Σxx, Σyy, Σxy, Σ|x-y|) - float64 로 누적"""
+    if np is not None:
+        _, ia, ib = np.intersect1d(a[0], b[0], assume_unique=True, return_indices=True)
+        x = a[1][ia].astype(np.float64)
+        y = b[1][ib].astype(np.float64)
+        return (
+            len(x), float(x.sum()), float(y.sum()), float(x @ x), float(y @ y), float(x @ y),
+            float(np.abs(x - y).sum()),
+        )
+    x, y = _common_ratings(a, b)
+    return (
+        len(x), sum(x), sum(y),
+        sum(v * v for v in x), sum(v * v for v in y), sum(p * q for p, q in zip(x, y)),
+        sum(abs(p - q) for p, q in zip(x, y)),
+    )
+
+
+def compute_compatibility(a: Tuple, b: Tuple) -> Dict:
+    """
+    두 평점 벡터의 취향 유사도
+    Returns: {'score': 0~100 또는 None, 'common_count', 'pearson', 'cosine'}
+    - score: Pearson 을 겹친 수로 축소해 0~100 으로 변환 (분산이 0이면 평균 절대 차이 기반 일치도)
+    - 겹친 평가가 MIN_COMMON_RATINGS_FOR_COMPATIBILITY 미만이면 score/pearson/cosine 은 None
+    """
+    n, sx, sy, sxx, syy, sxy, sad = _overlap_stats(a, b)
+    result = {'score': None, 'common_count': n, 'pearson': None, 'cosine': None}
+    if n < MIN_COMMON_RATINGS_FOR_COMPATIBILITY:
+        return result
+
+    if sxx > 0 and syy > 0:
+        result['cosine'] = round(sxy / math.sqrt(sxx * syy), 4)
+
+    cov = sxy - sx * sy / n
+    var_x = sxx - sx * sx / n
+    var_y = syy - sy * sy / n
+    if var_x > 1e-9 and var_y > 1e-9:
+        correlation = max(-1.0, min(1.0, cov / math.sqrt(var_x * var_y)))
+        result['pearson'] = round(correlation, 4)
+    else:
+        correlation = 1.0 - 2.0 * (sad / n) / RATING_RANGE
+
+    correlation *= n / (n + COMPATIBILITY_SHRINKAGE)
+    result['score'] = round(50 * (1 + correlation))
+    return result
+
+
+def get_compatibility(user_id: int, other_user_id: int) -> Dict:
+    """두 사용자의 취향 유사도 (compute_compatibility 참고)"""
+    vectors = get_rating_vectors([user_id, other_user_id])
+    return compute_compatibility(vectors[user_id], vectors[other_user_id])
+
+
+def get_compatibilities(user_id: int, other_user_ids: List[int]) -> Dict[int, Dict]:
+    """
+    기준 사용자와 여러 사용자의 취향 유사도 (팔로우 목록 등)
+    Returns: {other_user_id: compute_compatibility 결과} - 자기 자신은 제외
+    """
+    others = [other_id for other_id in other_user_ids if other_id != user_id]
+    if not others:
+        return {}
+    vectors = get_rating_vectors([user_id, *others])
+    base = vectors[user_id]
+    return {other_id: compute_compatibility(base, vectors[other_id]) for other_id in others}
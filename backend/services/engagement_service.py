@@ -0,0 +1,108 @@
+"""
+Engagement Service
+피드 페이지 활동들의 좋아요/댓글 수와 현재 사용자의 좋아요/북마크 여부를 한 번의 쿼리로 조회
+
+- 애니/캐릭터 평가·리뷰: 리뷰가 있으면 리뷰 기준 (likes_count 컬럼, review_likes / character_review_likes,
+  review_comments - (review_id, review_type) 인덱스 범위 수), 없으면 활동 기준
+- 활동 기준: 트리거로 유지되는 activities.likes_count / comments_count 컬럼 (scripts/add_engagement_counters.py)
+  + 현재 사용자 좋아요 여부만 activity_likes 조회
+- 북마크: activity_bookmarks (activity_id)
+- 활동 수와 관계없이 쿼리 1회 (행별 조회는 모두 인덱스 탐색)
+"""
+from typing import Dict, List, Optional
+from database import db, dict_from_row
+
+
+ENGAGEMENT_QUERY = """
+    SELECT
+        a.id,
+        CASE
+            WHEN ur.id IS NOT NULL THEN COALESCE(ur.likes_count, 0)
+            WHEN cr.id IS NOT NULL THEN COALESCE(cr.likes_count, 0)
+            ELSE COALESCE(a.likes_count, 0)
+        END as likes_count,
+        CASE
+            WHEN ur.id IS NOT NULL THEN (
+                SELECT COUNT(*) FROM review_comments rc
+                WHERE rc.review_id = ur.id AND rc.review_type = 'anime'
+            )
+            WHEN cr.id IS NOT NULL THEN (
+                SELECT COUNT(*) FROM review_comments rc
+                WHERE rc.review_id = cr.id AND rc.review_type = 'character'
+            )
+            ELSE COALESCE(a.comments_count, 0)
+        END as comments_count,
+        CASE
+            WHEN ur.id IS NOT NULL THEN EXISTS (
+                SELECT 1 FROM review_likes rl WHERE rl.review_id = ur.id AND rl.user_id = :viewer_id
+            )
+            WHEN cr.id IS NOT NULL THEN EXISTS (
+                SELECT 1 FROM character_review_likes crl WHERE crl.review_id = cr.id AND crl.user_id = :viewer_id
+            )
+            ELSE EXISTS (
+                SELECT 1 FROM activity_likes al
+                WHERE al.activity_type = a.activity_type
+                  AND al.activity_user_id = a.user_id
+                  AND al.item_id = a.item_id
+                  AND al.user_id = :viewer_id
+            )
+        END as user_liked,
+        EXISTS (
+            SELECT 1 FROM activity_bookmarks b WHERE b.activity_id = a.id AND b.user_id = :viewer_id
+        ) as user_bookmarked
+    FROM activities a
+    LEFT JOIN user_reviews ur ON a.activity_type IN ('anime_rating', 'anime_review')
+        AND ur.user_id = a.user_id AND ur.anime_id = a.item_id
+    LEFT JOIN character_reviews cr ON a.activity_type IN ('character_rating', 'character_review')
+        AND cr.user_id = a.user_id AND cr.character_id = a.item_id
+    WHERE a.id IN ({placeholders})
+"""
+
+
+def get_engagement(activity_ids: List[int], viewer_id: Optional[int] = None) -> Dict[int, Dict]:
+    """
+    활동별 참여 정보
+    Returns: {activity_id: {'likes_count', 'comments_count', 'user_liked', 'user_bookmarked'}}
+    viewer_id 가 없으면 user_liked / user_bookmarked 는 항상 False
+    """
+    ids = sorted({activity_id for activity_id in activity_ids if activity_id is not None})
+    if not ids:
+        return {}
+
+    params = {f'id{i}': activity_id for i, activity_id in enumerate(ids)}
+    params['viewer_id'] = viewer_id
+    placeholders = ','.join(f':id{i}' for i in range(len(ids)))
+    rows = db.execute_query(ENGAGEMENT_QUERY.format(placeholders=placeholders), params)
+
+    engagement = {}
+    for row in rows:
+        data = dict_from_row(row)
+        engagement[data.pop('id')] = {
+            'likes_count': data['likes_count'] or 0,
+            'comments_count': data['comments_count'] or 0,
+            'user_liked': bool(data['user_liked']),
+            'user_bookmarked': bool(data['user_bookmarked']),
+        }
+    return engagement
+
+
+def enrich_with_engagement(activities: List[Dict], viewer_id: Optional[int] = None) -> List[Dict]:
+    """
+    피드 활동 목록에 likes_count, comments_count, user_liked(user_has_liked), user_bookmarked 추가
+    id 가 없는 항목은 기본값 (0 / False)
+    """
+    engagement = get_engagement([activity.get('id') for activity in activities], viewer_id)
+
+    for activity in activities:
+        data = engagement.get(activity.get('id'))
+        if data:
+            activity.update(data)
+        else:
+            activity.setdefault('likes_count', 0)
+            activity.setdefault('comments_count', 0)
+            activity['user_liked'] = False
+            activity['user_bookmarked'] = False
+        # user_has_liked: 기존 응답 호환 필드
+        activity['user_has_liked'] = activity['user_liked']
+
+    return activities
@@ -1,270 +1,205 @@
 """
 Feed Service
 사용자 활동 피드 - 최적화 버전
+(좋아요/댓글 수, 좋아요/북마크 여부는 api.feed 에서 engagement_service 로 페이지 단위 일괄 조회)
 """
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from database import db, dict_from_row
+from config import FEED_FANOUT_MAX_FOLLOWERS
+from utils.pagination import encode_cursor, decode_cursor
 
 
-def get_following_feed(user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
+# 피드 정렬 키: activity_time DESC, id DESC
+# (activities(activity_time) / activities(user_id, activity_time) / home_timeline 인덱스 순서 그대로 - 정렬 단계 없음)
+def _feed_cursor_clause(
+    cursor: Optional[str],
+    time_col: str = "a.activity_time",
+    id_col: str = "a.id"
+) -> Tuple[str, list]:
     """
-    팔로잉하는 사용자들의 활동 피드 (UNION ALL로 최적화)
+    Keyset 커서 (activity_time, id) → WHERE 조건
+    Raises: ValueError - 잘못된 커서
     """
-    # 팔로잉 사용자 ID 목록 조회 (자기 자신 제외)
-    following_ids = db.execute_query(
+    values = decode_cursor(cursor, 2)
+    if values is None:
+        return "1=1", []
+
+    activity_time, activity_id = values
+    return (
+        f"{time_col} <= ? AND ({time_col} < ? OR {id_col} < ?)",
+        [activity_time, activity_time, activity_id]
+    )
+
+
+def _feed_sort_key(activity: Dict):
+    return (activity['activity_time'] or '', activity['id'] or 0)
+
+
+def get_next_feed_cursor(activities: List[Dict], limit: int) -> Optional[str]:
+    """피드 페이지의 다음 커서 (마지막 페이지면 None)"""
+    if len(activities) < limit or not activities:
+        return None
+
+    last = activities[-1]
+    if last.get('id') is None:
+        return None
+
+    return encode_cursor(last['activity_time'], last['id'])
+
+
+def _get_pull_followees(user_id: int) -> List[int]:
+    """
+    팔로워가 FEED_FANOUT_MAX_FOLLOWERS를 넘는 팔로잉 계정 (타임라인 fan-out 대상이 아님)
+    이 계정들의 활동은 읽을 때 activities에서 직접 조회 (hybrid pull)
+    """
+    rows = db.execute_query(
         """
-        SELECT following_id FROM user_follows
-        WHERE follower_id = ? AND following_id != ?
+        SELECT uf.following_id
+        FROM user_follows uf
+        WHERE uf.follower_id = ?
+          AND uf.following_id != ?
+          AND (
+              SELECT COUNT(*) FROM (
+                  SELECT 1 FROM user_follows f2
+                  WHERE f2.following_id = uf.following_id
+                  LIMIT ?
+              )
+          ) > ?
         """,
-        (user_id, user_id)
+        (user_id, user_id, FEED_FANOUT_MAX_FOLLOWERS + 1, FEED_FANOUT_MAX_FOLLOWERS)
     )
+    return [row[0] for row in rows]
 
-    if not following_ids:
-        return []
 
-    following_id_list = [str(row[0]) for row in following_ids]
-    placeholders = ','.join(['?' for _ in following_id_list])
+def get_following_feed(user_id: int, limit: int = 50, offset: int = 0, cursor: Optional[str] = None) -> List[Dict]:
+    """
+    팔로잉하는 사용자들의 활동 피드 (home_timeline fan-out + 인기 계정 pull)
+    - home_timeline(user_id, activity_time) 인덱스 범위 스캔 한 번으로 조회
+      (scripts/create_home_timeline.py의 트리거가 활동 작성/팔로우 시 채움)
+    - 팔로워가 많은 계정은 activities(user_id, activity_time) 인덱스로 직접 조회 후 병합
+    - cursor가 주어지면 offset 대신 keyset 페이지네이션
+    """
+    timeline_cursor_sql, timeline_cursor_params = _feed_cursor_clause(
+        cursor, time_col="ht.activity_time", id_col="ht.activity_id"
+    )
+    cursor_sql, cursor_params = _feed_cursor_clause(cursor)
+    if cursor_params:
+        offset = 0
+
+    # 각 후보 집합에서 offset + limit 개만 가져와도 병합 결과의 상위 offset + limit 개를 덮음
+    window = offset + limit
+
+    candidate_sql = f"""
+        SELECT activity_id AS id FROM (
+            SELECT ht.activity_id
+            FROM home_timeline ht
+            WHERE ht.user_id = ?
+              AND {timeline_cursor_sql}
+            ORDER BY ht.activity_time DESC, ht.activity_id DESC
+            LIMIT ?
+        )
+    """
+    candidate_params = [user_id, *timeline_cursor_params, window]
+
+    pull_followees = _get_pull_followees(user_id)
+    if pull_followees:
+        placeholders = ','.join(['?' for _ in pull_followees])
+        candidate_sql += f"""
+        UNION
+        SELECT id FROM (
+            SELECT a.id
+            FROM activities a
+            WHERE a.user_id IN ({placeholders})
+              AND {cursor_sql}
+            ORDER BY a.activity_time DESC, a.id DESC
+            LIMIT ?
+        )
+        """
+        candidate_params.extend([*pull_followees, *cursor_params, window])
 
-    # UNION ALL로 모든 활동을 단일 쿼리로 통합
     rows = db.execute_query(
         f"""
-        SELECT * FROM (
-            -- 애니메이션 평가 활동
-            SELECT
-                NULL as id,
-                'anime_rating' as activity_type,
-                ur.user_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score,
-                ur.anime_id as item_id,
-                a.title_romaji as item_title,
-                a.title_korean as item_title_korean,
-                a.title_native as item_title_native,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url) as item_image,
-                ur.rating,
-                ur.status,
-                COALESCE(r.created_at, ur.updated_at) as activity_time,
-                NULL as anime_title,
-                NULL as anime_title_korean,
-                NULL as anime_title_native,
-                NULL as anime_id,
-                r.id as review_id,
-                r.content as review_content,
-                NULL as post_content,
-                0 as comments_count,
-                NULL as metadata
-            FROM user_ratings ur
-            JOIN users u ON ur.user_id = u.id
-            JOIN anime a ON ur.anime_id = a.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            LEFT JOIN user_reviews r ON ur.user_id = r.user_id AND ur.anime_id = r.anime_id
-            WHERE ur.status = 'RATED' AND ur.rating IS NOT NULL
-                AND ur.user_id IN ({placeholders})
-
-            UNION ALL
-
-            -- 캐릭터 평가 활동 (LEFT JOIN으로 최적화)
-            SELECT
-                NULL as id,
-                'character_rating' as activity_type,
-                cr.user_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score,
-                cr.character_id as item_id,
-                c.name_full as item_title,
-                COALESCE(c.name_korean, c.name_native) as item_title_korean,
-                c.name_native as item_title_native,
-                COALESCE('/' || c.image_local, c.image_url) as item_image,
-                cr.rating,
-                NULL as status,
-                COALESCE(rev.created_at, cr.updated_at) as activity_time,
-                a.title_romaji as anime_title,
-                a.title_korean as anime_title_korean,
-                a.title_native as anime_title_native,
-                a.id as anime_id,
-                rev.id as review_id,
-                rev.content as review_content,
-                NULL as post_content,
-                0 as comments_count,
-                NULL as metadata
-            FROM character_ratings cr
-            JOIN users u ON cr.user_id = u.id
-            JOIN character c ON cr.character_id = c.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            LEFT JOIN character_reviews rev ON cr.user_id = rev.user_id AND cr.character_id = rev.character_id
-            LEFT JOIN (
-                SELECT DISTINCT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            ) a ON c.id = a.character_id AND a.rn = 1
-            WHERE cr.rating IS NOT NULL
-                AND cr.user_id IN ({placeholders})
-
-            UNION ALL
-
-            -- 캐릭터 리뷰 (평점 없이)
-            SELECT
-                NULL as id,
-                'character_review' as activity_type,
-                cr.user_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score,
-                cr.character_id as item_id,
-                c.name_full as item_title,
-                COALESCE(c.name_korean, c.name_native) as item_title_korean,
-                c.name_native as item_title_native,
-                COALESCE('/' || c.image_local, c.image_url) as item_image,
-                NULL as rating,
-                NULL as status,
-                cr.created_at as activity_time,
-                a.title_romaji as anime_title,
-                a.title_korean as anime_title_korean,
-                a.title_native as anime_title_native,
-                NULL as anime_id,
-                cr.id as review_id,
-                cr.content as review_content,
-                NULL as post_content,
-                0 as comments_count,
-                NULL as metadata
-            FROM character_reviews cr
-            JOIN users u ON cr.user_id = u.id
-            JOIN character c ON cr.character_id = c.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            LEFT JOIN (
-                SELECT DISTINCT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            ) a ON c.id = a.character_id AND a.rn = 1
-            WHERE cr.user_id IN ({placeholders})
-            AND NOT EXISTS (
-                SELECT 1 FROM character_ratings cr2
-                WHERE cr2.user_id = cr.user_id
-                AND cr2.character_id = cr.character_id
-                AND cr2.rating IS NOT NULL
-            )
-
-            UNION ALL
-
-            -- 애니 리뷰 (평점 없이)
-            SELECT
-                NULL as id,
-                'anime_review' as activity_type,
-                r.user_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score,
-                r.anime_id as item_id,
-                a.title_romaji as item_title,
-                a.title_korean as item_title_korean,
-                a.title_native as item_title_native,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url) as item_image,
-                NULL as rating,
-                NULL as status,
-                r.created_at as activity_time,
-                NULL as anime_title,
-                NULL as anime_title_korean,
-                NULL as anime_title_native,
-                NULL as anime_id,
-                r.id as review_id,
-                r.content as review_content,
-                NULL as post_content,
-                0 as comments_count,
-                NULL as metadata
-            FROM user_reviews r
-            JOIN users u ON r.user_id = u.id
-            JOIN anime a ON r.anime_id = a.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            WHERE r.user_id IN ({placeholders})
-            AND NOT EXISTS (
-                SELECT 1 FROM user_ratings ur
-                WHERE ur.user_id = r.user_id
-                AND ur.anime_id = r.anime_id
-                AND ur.status = 'RATED'
-                AND ur.rating IS NOT NULL
-            )
-
-            UNION ALL
-
-            -- 사용자 게시글
-            SELECT
-                NULL as id,
-                'user_post' as activity_type,
-                up.user_id,
-                u.username,
-                u.display_name,
-                u.avatar_url,
-                COALESCE(us.otaku_score, 0) as otaku_score,
-                NULL as item_id,
-                NULL as item_title,
-                NULL as item_title_korean,
-                NULL as item_title_native,
-                NULL as item_image,
-                NULL as rating,
-                NULL as status,
-                up.created_at as activity_time,
-                NULL as anime_title,
-                NULL as anime_title_korean,
-                NULL as anime_title_native,
-                NULL as anime_id,
-                up.id as review_id,
-                up.content as review_content,
-                up.content as post_content,
-                0 as comments_count,
-                NULL as metadata
-            FROM user_posts up
-            JOIN users u ON up.user_id = u.id
-            LEFT JOIN user_stats us ON u.id = us.user_id
-            WHERE up.user_id IN ({placeholders})
-
-            UNION ALL
-
-            -- 랭크 프로모션
-            SELECT
-                a.id,
-                a.activity_type,
-                a.user_id,
-                a.username,
-                a.display_name,
-                a.avatar_url,
-                COALESCE(us.otaku_score, a.otaku_score, 0) as otaku_score,
-                a.item_id,
-                a.item_title,
-                a.item_title_korean,
-                a.item_image,
-                a.rating,
-                NULL as status,
-                a.activity_time,
-                a.anime_title,
-                a.anime_title_korean,
-                a.anime_title_native,
-                a.anime_id,
-                NULL as review_id,
-                a.review_content,
-                NULL as post_content,
-                0 as comments_count,
-                a.metadata
-            FROM activities a
-            LEFT JOIN user_stats us ON a.user_id = us.user_id
-            WHERE a.activity_type = 'rank_promotion' AND a.user_id IN ({placeholders})
-        )
-        ORDER BY activity_time DESC,
-                 CASE activity_type
-                     WHEN 'rank_promotion' THEN 1
-                     ELSE 0
-                 END ASC
+        SELECT
+            a.id,
+            a.activity_type,
+            a.user_id,
+            a.username,
+            a.display_name,
+            a.avatar_url,
+            COALESCE(us.otaku_score, a.otaku_score, 0) as otaku_score,
+            a.item_id,
+            -- Item title: JOIN으로 동적 조회
+            CASE
+                WHEN a.activity_type IN ('anime_rating', 'anime_review') THEN an.title_romaji
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN ch.name_full
+                ELSE a.item_title
+            END as item_title,
+            CASE
+                WHEN a.activity_type IN ('anime_rating', 'anime_review') THEN an.title_korean
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN COALESCE(ch.name_korean, ch.name_native)
+                ELSE a.item_title_korean
+            END as item_title_korean,
+            CASE
+                WHEN a.activity_type IN ('anime_rating', 'anime_review') THEN an.title_native
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN ch.name_native
+                ELSE a.item_title_native
+            END as item_title_native,
+            CASE
+                WHEN a.activity_type IN ('anime_rating', 'anime_review') THEN COALESCE('/' || an.cover_image_local, an.cover_image_url)
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN COALESCE('/' || ch.image_local, ch.image_url)
+                ELSE a.item_image
+            END as item_image,
+            a.rating,
+            CASE WHEN a.activity_type = 'anime_rating' THEN 'RATED' ELSE NULL END as status,
+            a.activity_time,
+            -- Anime title for character activities: JOIN으로 동적 조회
+            CASE
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN char_anime.title_romaji
+                ELSE a.anime_title
+            END as anime_title,
+            CASE
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN char_anime.title_korean
+                ELSE a.anime_title_korean
+            END as anime_title_korean,
+            CASE
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN char_anime.title_native
+                ELSE a.anime_title_native
+            END as anime_title_native,
+            CASE
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN char_anime.id
+                ELSE a.anime_id
+            END as anime_id,
+            -- 댓글 대상 ID: 애니/캐릭터 리뷰 또는 게시글
+            CASE
+                WHEN a.activity_type IN ('anime_rating', 'anime_review') THEN ur.id
+                WHEN a.activity_type IN ('character_rating', 'character_review') THEN cr.id
+                WHEN a.activity_type = 'user_post' THEN a.item_id
+                ELSE NULL
+            END as review_id,
+            a.review_content,
+            CASE WHEN a.activity_type = 'user_post' THEN a.review_content ELSE NULL END as post_content,
+            0 as comments_count,
+            a.metadata
+        FROM ({candidate_sql}) feed
+        JOIN activities a ON a.id = feed.id
+        LEFT JOIN user_stats us ON a.user_id = us.user_id
+        -- JOIN anime for anime activities
+        LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
+        -- JOIN character for character activities
+        LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
+        -- Reviews (comment targets)
+        LEFT JOIN user_reviews ur ON a.activity_type IN ('anime_rating', 'anime_review')
+            AND ur.user_id = a.user_id AND ur.anime_id = a.item_id
+        LEFT JOIN character_reviews cr ON a.activity_type IN ('character_rating', 'character_review')
+            AND cr.user_id = a.user_id AND cr.character_id = a.item_id
+        -- JOIN anime for character (대표 애니메이션: character_primary_anime)
+        LEFT JOIN character_primary_anime cpa ON cpa.character_id = ch.id
+        LEFT JOIN anime char_anime ON char_anime.id = cpa.anime_id
+        ORDER BY a.activity_time DESC, a.id DESC
         LIMIT ? OFFSET ?
         """,
-        (*following_id_list, *following_id_list, *following_id_list, *following_id_list, *following_id_list, *following_id_list, limit, offset)
+        (*candidate_params, limit, offset)
     )
 
     results = [dict_from_row(row) for row in rows]
@@ -277,21 +212,22 @@ def get_following_feed(user_id: int, limit: int = 50, offset: int = 0) -> List[D
             except (json.JSONDecodeError, TypeError):
                 activity['metadata'] = None
 
-    # Batch load comments_count for performance
-    _enrich_comments_count(results)
-
     return results
 
 
-def get_global_feed(limit: int = 50, offset: int = 0) -> List[Dict]:
+def get_global_feed(limit: int = 50, offset: int = 0, cursor: Optional[str] = None) -> List[Dict]:
     """
     전체 사용자의 최근 활동 피드 (activities 테이블 + JOIN)
     - 정규화: anime/character 테이블에서 타이틀 동적 조회
+    - cursor가 주어지면 offset 대신 keyset 페이지네이션 (깊은 페이지도 첫 페이지와 같은 비용)
     """
+    cursor_sql, cursor_params = _feed_cursor_clause(cursor)
+    if cursor_params:
+        offset = 0
 
     # activities 테이블 + JOIN으로 조회 (정규화)
     rows = db.execute_query(
-        """
+        f"""
         SELECT
             a.id,
             a.activity_type,
@@ -355,25 +291,14 @@ def get_global_feed(limit: int = 50, offset: int = 0) -> List[Dict]:
         LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
         -- JOIN character for character activities
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
-        -- JOIN anime for character (only ONE anime per character using subquery with ROW_NUMBER)
-        LEFT JOIN (
-            SELECT character_id, id, title_romaji, title_korean, title_native
-            FROM (
-                SELECT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            )
-            WHERE rn = 1
-        ) char_anime ON ch.id = char_anime.character_id
-        ORDER BY a.activity_time DESC,
-                 CASE a.activity_type
-                     WHEN 'rank_promotion' THEN 1
-                     ELSE 0
-                 END ASC
+        -- JOIN anime for character (대표 애니메이션: character_primary_anime)
+        LEFT JOIN character_primary_anime cpa ON cpa.character_id = ch.id
+        LEFT JOIN anime char_anime ON char_anime.id = cpa.anime_id
+        WHERE {cursor_sql}
+        ORDER BY a.activity_time DESC, a.id DESC
         LIMIT ? OFFSET ?
         """,
-        (limit, offset)
+        (*cursor_params, limit, offset)
     )
 
     results = [dict_from_row(row) for row in rows]
@@ -386,88 +311,24 @@ def get_global_feed(limit: int = 50, offset: int = 0) -> List[Dict]:
             except (json.JSONDecodeError, TypeError):
                 activity['metadata'] = None
 
-    # Batch load comments_count for performance
-    _enrich_comments_count(results)
-
     return results
 
 
-def _enrich_comments_count(activities: List[Dict]):
-    """
-    Batch로 comments_count 조회 (성능 최적화)
-    """
-    if not activities:
-        return
-
-    # Group by review type
-    anime_review_ids = []
-    character_review_ids = []
-    post_keys = []
-
-    for activity in activities:
-        if activity['review_id']:
-            if activity['activity_type'] in ['anime_rating', 'anime_review']:
-                anime_review_ids.append(activity['review_id'])
-            elif activity['activity_type'] in ['character_rating', 'character_review']:
-                character_review_ids.append(activity['review_id'])
-        elif activity['activity_type'] == 'user_post':
-            post_keys.append((activity['user_id'], activity['item_id']))
-
-    # Batch query for anime review comments
-    anime_comments_count = {}
-    if anime_review_ids:
-        placeholders = ','.join(['?' for _ in anime_review_ids])
-        rows = db.execute_query(
-            f"SELECT review_id, COUNT(*) as count FROM review_comments WHERE review_type = 'anime' AND review_id IN ({placeholders}) GROUP BY review_id",
-            tuple(anime_review_ids)
-        )
-        anime_comments_count = {row[0]: row[1] for row in rows}
-
-    # Batch query for character review comments
-    character_comments_count = {}
-    if character_review_ids:
-        placeholders = ','.join(['?' for _ in character_review_ids])
-        rows = db.execute_query(
-            f"SELECT review_id, COUNT(*) as count FROM review_comments WHERE review_type = 'character' AND review_id IN ({placeholders}) GROUP BY review_id",
-            tuple(character_review_ids)
-        )
-        character_comments_count = {row[0]: row[1] for row in rows}
-
-    # Batch query for post comments
-    post_comments_count = {}
-    if post_keys:
-        conditions = ' OR '.join([f"(activity_user_id = ? AND item_id = ?)" for _ in post_keys])
-        params = []
-        for user_id, item_id in post_keys:
-            params.extend([user_id, item_id])
-
-        rows = db.execute_query(
-            f"SELECT activity_user_id, item_id, COUNT(*) as count FROM activity_comments WHERE activity_type = 'post' AND ({conditions}) GROUP BY activity_user_id, item_id",
-            tuple(params)
-        )
-        post_comments_count = {(row[0], row[1]): row[2] for row in rows}
-
-    # Update activities with comments_count
-    for activity in activities:
-        if activity['review_id']:
-            if activity['activity_type'] in ['anime_rating', 'anime_review']:
-                activity['comments_count'] = anime_comments_count.get(activity['review_id'], 0)
-            elif activity['activity_type'] in ['character_rating', 'character_review']:
-                activity['comments_count'] = character_comments_count.get(activity['review_id'], 0)
-        elif activity['activity_type'] == 'user_post':
-            activity['comments_count'] = post_comments_count.get((activity['user_id'], activity['item_id']), 0)
-
-
-def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0) -> List[Dict]:
+def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0,
+                  cursor: Optional[str] = None) -> List[Dict]:
     """
     특정 사용자의 활동 피드 (activities 테이블 + JOIN)
     - 정규화: anime/character 테이블에서 타이틀 동적 조회
     - 최근 30일 이내의 rank_promotion은 항상 포함
+    - cursor가 주어지면 offset 대신 keyset 페이지네이션
     """
+    cursor_sql, cursor_params = _feed_cursor_clause(cursor)
+    if cursor_params:
+        offset = 0
 
     # 먼저 최근 30일 이내의 rank_promotion 가져오기 (rank_promotion은 item이 없으므로 JOIN 불필요)
     recent_promotions = db.execute_query(
-        """
+        f"""
         SELECT
             a.id,
             a.activity_type,
@@ -498,14 +359,15 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
         WHERE a.user_id = ?
           AND a.activity_type = 'rank_promotion'
           AND a.activity_time >= datetime('now', '-30 days')
-        ORDER BY a.activity_time DESC
+          AND {cursor_sql}
+        ORDER BY a.activity_time DESC, a.id DESC
         """,
-        (user_id,)
+        (user_id, *cursor_params)
     )
 
     # activities 테이블 + JOIN으로 조회 (정규화)
     rows = db.execute_query(
-        """
+        f"""
         SELECT
             a.id,
             a.activity_type,
@@ -570,26 +432,15 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
         LEFT JOIN anime an ON a.activity_type IN ('anime_rating', 'anime_review') AND a.item_id = an.id
         -- JOIN character for character activities
         LEFT JOIN character ch ON a.activity_type IN ('character_rating', 'character_review') AND a.item_id = ch.id
-        -- JOIN anime for character (only ONE anime per character using subquery with ROW_NUMBER)
-        LEFT JOIN (
-            SELECT character_id, id, title_romaji, title_korean, title_native
-            FROM (
-                SELECT ac.character_id, a.id, a.title_romaji, a.title_korean, a.title_native,
-                       ROW_NUMBER() OVER (PARTITION BY ac.character_id ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END, a.popularity DESC) as rn
-                FROM anime_character ac
-                JOIN anime a ON ac.anime_id = a.id
-            )
-            WHERE rn = 1
-        ) char_anime ON ch.id = char_anime.character_id
+        -- JOIN anime for character (대표 애니메이션: character_primary_anime)
+        LEFT JOIN character_primary_anime cpa ON cpa.character_id = ch.id
+        LEFT JOIN anime char_anime ON char_anime.id = cpa.anime_id
         WHERE a.user_id = ?
-        ORDER BY a.activity_time DESC,
-                 CASE a.activity_type
-                     WHEN 'rank_promotion' THEN 1
-                     ELSE 0
-                 END ASC
+          AND {cursor_sql}
+        ORDER BY a.activity_time DESC, a.id DESC
         LIMIT ? OFFSET ?
         """,
-        (user_id, limit, offset)
+        (user_id, *cursor_params, limit, offset)
     )
 
     results = [dict_from_row(row) for row in rows]
@@ -601,7 +452,7 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
 
     # 승급 + 다른 활동을 합치고 시간순 정렬
     combined = promotions + filtered_results
-    combined.sort(key=lambda x: x['activity_time'], reverse=True)
+    combined.sort(key=_feed_sort_key, reverse=True)
 
     # limit 적용
     final_results = combined[:limit]
@@ -614,7 +465,4 @@ def get_user_feed(user_id: int, current_user_id: int = None, limit: int = 50, of
             except (json.JSONDecodeError, TypeError):
                 activity['metadata'] = None
 
-    # Batch load comments_count for performance
-    _enrich_comments_count(final_results)
-
     return final_results
@@ -9,6 +9,7 @@ from google.auth.transport import requests
 from database import db, dict_from_row
 from utils.security import create_access_token
 from utils.user_helpers import set_default_avatar
+from utils.user_cache import invalidate_user
 from models.user import UserResponse, TokenResponse
 from config import GOOGLE_CLIENT_ID
 
@@ -147,6 +148,7 @@ async def google_login_or_register(google_user_info: Dict[str, str], preferred_l
             """,
             (oauth_id, user_id)
         )
+        invalidate_user(user_id)
 
         # 업데이트된 사용자 정보 다시 조회
         updated_user = db.execute_query(
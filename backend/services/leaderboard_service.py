@@ -0,0 +1,345 @@
+"""
+Leaderboard Service
+오타쿠 점수 리더보드 - 메모리 순서 통계 구조로 상위 N / 내 순위 / 주변 사용자 조회
+
+- 정렬 키 (-otaku_score, user_id) 를 버킷 정렬 리스트로 유지
+  + 버킷 길이 Fenwick 트리 → 삽입/삭제/순위/k번째 모두 O(log n) (버킷 내부 이동은 버킷 크기 상한)
+- 등급(레벨)별 사용자 수는 점수 갱신 시 함께 증감
+- 쓰기 경로: rating_service._update_user_stats 가 갱신된 otaku_score 를 트랜잭션 커밋 후 update_score 로 반영
+- 다른 워커/스크립트의 변경: LEADERBOARD_CHECK_INTERVAL 마다 user_stats fingerprint (사용자 수, 점수 합) 비교 후 재생성
+- 순위는 동점 공동 순위 (1 + 나보다 점수가 높은 사용자 수)
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from config import LEADERBOARD_CHECK_INTERVAL
+from database import db, dict_from_row
+from services.rating_service import RANK_MIN_SCORES, RANK_NAMES, _get_rank_info
+
+# 버킷 최대 크기 (넘으면 둘로 분할)
+BUCKET_SIZE = 512
+
+FINGERPRINT_QUERY = """
+    SELECT COUNT(*) as users, TOTAL(s.otaku_score) as score_sum
+    FROM user_stats s JOIN users u ON u.id = s.user_id
+"""
+SCORES_QUERY = """
+    SELECT s.user_id, COALESCE(s.otaku_score, 0) as otaku_score
+    FROM user_stats s JOIN users u ON u.id = s.user_id
+"""
+
+
+class OrderedScores:
+    """(-score, user_id) 정렬 키의 버킷 정렬 리스트 + 버킷 길이 Fenwick 트리 (위치 검색)"""
+
+    def __init__(self, keys: List[Tuple[float, int]] = ()):
+        keys = sorted(keys)
+        half = BUCKET_SIZE // 2
+        self._buckets: List[List[Tuple[float, int]]] = [keys[i:i + half] for i in range(0, len(keys), half)]
+        self._len = len(keys)
+        self._reindex()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _reindex(self):
+        """버킷 경계(최대 키)와 Fenwick 트리 재구성 - 버킷 분할/제거 시에만"""
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        tree = [0] * (len(self._buckets) + 1)
+        for i, bucket in enumerate(self._buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, index: int, delta: int):
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, index: int) -> int:
+        """앞의 버킷 index 개에 들어있는 키 수"""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def add(self, key: Tuple[float, int]):
+        if not self._buckets:
+            self._buckets = [[key]]
+            self._len = 1
+            self._reindex()
+            return
+        index = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[index]
+        insort(bucket, key)
+        self._len += 1
+        if len(bucket) > BUCKET_SIZE:
+            half = len(bucket) // 2
+            self._buckets[index:index + 1] = [bucket[:half], bucket[half:]]
+            self._reindex()
+        else:
+            self._maxes[index] = bucket[-1]
+            self._tree_add(index, 1)
+
+    def remove(self, key: Tuple[float, int]) -> bool:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._buckets):
+            return False
+        bucket = self._buckets[index]
+        position = bisect_left(bucket, key)
+        if position == len(bucket) or bucket[position] != key:
+            return False
+        del bucket[position]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[index]
+            self._reindex()
+        else:
+            self._maxes[index] = bucket[-1]
+            self._tree_add(index, -1)
+        return True
+
+    def count_below(self, key) -> int:
+        """key 보다 작은 키 수 (= 정렬 위치)"""
+        index = bisect_left(self._maxes, key)
+        if index == len(self._buckets):
+            return self._len
+        return self._prefix(index) + bisect_left(self._buckets[index], key)
+
+    def at(self, position: int) -> Tuple[float, int]:
+        """position 번째 키 (0부터) - Fenwick 트리 하강 검색"""
+        if not 0 <= position < self._len:
+            raise IndexError(position)
+        index, remaining = 0, position
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= remaining:
+                index = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return self._buckets[index][remaining]
+
+    def slice(self, start: int, stop: int) -> List[Tuple[float, int]]:
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return []
+        first = self.at(start)
+        index = bisect_left(self._maxes, first)
+        position = bisect_left(self._buckets[index], first)
+        keys: List[Tuple[float, int]] = []
+        while len(keys) < stop - start:
+            bucket = self._buckets[index]
+            keys.extend(bucket[position:position + (stop - start - len(keys))])
+            index, position = index + 1, 0
+        return keys
+
+
+class Leaderboard:
+    """사용자별 otaku_score + 순서 통계 구조 + 등급별 사용자 수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scores: Dict[int, float] = {}
+        self._order = OrderedScores()
+        self._level_counts = [0] * len(RANK_MIN_SCORES)
+        self._fingerprint: Optional[Tuple[int, float]] = None
+        self._checked_at = 0.0
+        self.ready = False
+
+    @staticmethod
+    def _read_fingerprint() -> Tuple[int, float]:
+        row = db.execute_query(FINGERPRINT_QUERY, fetch_one=True)
+        return row['users'], row['score_sum']
+
+    def build(self):
+        fingerprint = self._read_fingerprint()
+        scores = {row['user_id']: row['otaku_score'] for row in db.execute_query(SCORES_QUERY)}
+        level_counts = [0] * len(RANK_MIN_SCORES)
+        for score in scores.values():
+            level_counts[_get_rank_info(score)[1] - 1] += 1
+        order = OrderedScores([(-score, user_id) for user_id, score in scores.items()])
+
+        with self._lock:
+            self._scores = scores
+            self._order = order
+            self._level_counts = level_counts
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            self.ready = True
+
+    def refresh_if_stale(self):
+        """확인 주기가 지났으면 user_stats fingerprint 비교 후 바뀌었으면 재생성"""
+        if self.ready and time.monotonic() - self._checked_at < LEADERBOARD_CHECK_INTERVAL:
+            return
+        if self.ready and self._read_fingerprint() == self._fingerprint:
+            self._checked_at = time.monotonic()
+            return
+        self.build()
+
+    def update_score(self, user_id: int, otaku_score: Optional[float]):
+        """점수 변경 반영 (O(log n))"""
+        if not self.ready:
+            return
+        score = otaku_score or 0
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == score:
+                return
+            if old is not None:
+                self._order.remove((-old, user_id))
+                self._level_counts[_get_rank_info(old)[1] - 1] -= 1
+            self._scores[user_id] = score
+            self._order.add((-score, user_id))
+            self._level_counts[_get_rank_info(score)[1] - 1] += 1
+            # 이 프로세스의 변경은 fingerprint 에도 반영 (다음 확인 때 불필요한 재생성 방지)
+            if self._fingerprint is not None:
+                users, score_sum = self._fingerprint
+                self._fingerprint = (users + (old is None), score_sum - (old or 0) + score)
+
+    def _ensure(self):
+        if not self.ready:
+            self.build()
+        else:
+            self.refresh_if_stale()
+
+    def top(self, limit: int, offset: int = 0) -> List[Tuple[int, float, int]]:
+        """Returns: [(user_id, otaku_score, rank)] 점수 내림차순"""
+        self._ensure()
+        with self._lock:
+            return [
+                (user_id, -neg_score, self._order.count_below((neg_score,)) + 1)
+                for neg_score, user_id in self._order.slice(offset, offset + limit)
+            ]
+
+    def position(self, user_id: int, radius: int = 0) -> Optional[Dict]:
+        """
+        사용자 순위
+        Returns: {'otaku_score', 'rank', 'position', 'total_users', 'percentile', 'neighbors': [(user_id, score, rank)]}
+        percentile: 나보다 점수가 낮은 사용자 비율 (%)
+        """
+        self._ensure()
+        with self._lock:
+            score = self._scores.get(user_id)
+            if score is None:
+                return None
+            total = len(self._order)
+            position = self._order.count_below((-score, user_id))
+            below = total - self._order.count_below((-score, float('inf')))
+            neighbors = [
+                (other_id, -neg_score, self._order.count_below((neg_score,)) + 1)
+                for neg_score, other_id in self._order.slice(position - radius, position + radius + 1)
+            ] if radius else []
+            return {
+                'otaku_score': score,
+                'rank': self._order.count_below((-score,)) + 1,
+                'position': position + 1,
+                'total_users': total,
+                'percentile': round(100 * below / total, 1),
+                'neighbors': neighbors,
+            }
+
+    def level_counts(self) -> List[Dict]:
+        """등급별 사용자 수"""
+        self._ensure()
+        with self._lock:
+            counts = list(self._level_counts)
+        return [
+            {'level': level, 'rank_name': name, 'min_score': min_score, 'count': count}
+            for level, (name, min_score, count) in enumerate(zip(RANK_NAMES, RANK_MIN_SCORES, counts), 1)
+        ]
+
+    def stats(self) -> Dict:
+        return {'users': len(self._scores), 'buckets': len(self._order._buckets)}
+
+
+leaderboard = Leaderboard()
+
+
+def build_leaderboard() -> Dict:
+    """user_stats 에서 리더보드 (재)생성. Returns: 통계"""
+    leaderboard.build()
+    return leaderboard.stats()
+
+
+def update_leaderboard_score(user_id: int, otaku_score: Optional[float]):
+    leaderboard.update_score(user_id, otaku_score)
+
+
+def _with_user_info(entries: List[Tuple[int, float, int]]) -> List[Dict]:
+    """(user_id, otaku_score, rank) → 사용자 정보 + 통계 (쿼리 한 번, 순서 유지)"""
+    if not entries:
+        return []
+    user_ids = [user_id for user_id, _, _ in entries]
+    placeholders = ','.join('?' * len(user_ids))
+    rows = db.execute_query(
+        f"""
+        SELECT
+            u.id,
+            u.username,
+            u.display_name,
+            u.avatar_url,
+            s.otaku_score,
+            s.total_rated,
+            s.total_character_ratings,
+            s.total_reviews
+        FROM users u
+        INNER JOIN user_stats s ON u.id = s.user_id
+        WHERE u.id IN ({placeholders})
+        """,
+        tuple(user_ids)
+    )
+    by_id = {row['id']: dict_from_row(row) for row in rows}
+    items = []
+    for user_id, _, rank in entries:
+        item = by_id.get(user_id)
+        if item:
+            item['rank'] = rank
+            items.append(item)
+    return items
+
+
+def get_top_users(limit: int = 50, offset: int = 0) -> List[Dict]:
+    """상위 사용자 (점수 내림차순, rank 포함)"""
+    return _with_user_info(leaderboard.top(limit, offset))
+
+
+def get_user_rank(user_id: int, radius: int = 2) -> Optional[Dict]:
+    """
+    사용자 순위 / 백분위 / 등급 + 앞뒤 radius 명
+    Returns: None - user_stats 가 없는 사용자
+    """
+    result = leaderboard.position(user_id, radius)
+    if result is None:
+        # 마지막 재생성 이후 가입한 사용자
+        row = db.execute_query(
+            """
+            SELECT s.otaku_score FROM user_stats s JOIN users u ON u.id = s.user_id
+            WHERE s.user_id = ?
+            """,
+            (user_id,),
+            fetch_one=True
+        )
+        if row is None:
+            return None
+        leaderboard.update_score(user_id, row['otaku_score'])
+        result = leaderboard.position(user_id, radius)
+    rank_name, level = _get_rank_info(result['otaku_score'])
+    result.update({
+        'user_id': user_id,
+        'level': level,
+        'rank_name': rank_name,
+        'neighbors': _with_user_info(result['neighbors']),
+    })
+    return result
+
+
+def get_level_counts() -> List[Dict]:
+    """등급별 사용자 수 (Lv.1 ~ Lv.10)"""
+    return leaderboard.level_counts()
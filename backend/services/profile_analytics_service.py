@@ -0,0 +1,363 @@
+"""
+Profile Analytics Service
+프로필 통계 묶음 - 사용자의 평가 목록(user_ratings JOIN anime)을 한 번 읽어 모든 분포를 한 번에 계산
+
+- 쿼리 1회: 평가한 애니 + 장르/제작사/감독 (애니별 json 배열 서브쿼리, 모두 PK 탐색)
+- 결과 형식/정렬(동점은 이름순)은 profile_service 의 개별 통계 함수와 동일 (기본 limit 기준)
+- 프로세스별 TTL LRU 캐시 - 평가/리뷰 변경 시 invalidate_profile_analytics 로 해당 사용자 제거 (커밋 후에도 한 번 더),
+  다른 워커의 변경과 애니 메타데이터 변경은 PROFILE_ANALYTICS_CACHE_TTL 이내에 반영
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import Dict, List, Optional
+
+from config import PROFILE_ANALYTICS_CACHE_TTL, PROFILE_ANALYTICS_CACHE_SIZE
+from database import db
+from services.profile_service import SOURCE_NAMES, year_distribution_range
+
+# 개별 통계 엔드포인트의 기본값과 동일
+TOP_LIMIT = 10
+HIDDEN_GEMS_LIMIT = 10
+RADAR_GENRES = 8
+
+_lock = threading.Lock()
+_entries: "OrderedDict[int, tuple]" = OrderedDict()  # user_id -> (analytics, expires_at)
+_generation = 0  # 무효화마다 증가 - 계산 중에 무효화가 있었으면 결과를 캐시에 넣지 않음
+
+
+def _load_rated(user_id: int) -> List[Dict]:
+    rows = db.execute_query(
+        """
+        SELECT
+            ur.anime_id,
+            ur.rating,
+            COALESCE(a.title_korean, a.title_romaji) as title,
+            a.cover_image_url,
+            a.cover_image_local,
+            a.average_score,
+            a.popularity,
+            a.episodes,
+            a.duration,
+            a.season_year,
+            a.season,
+            a.format,
+            a.source,
+            (
+                SELECT json_group_array(json_array(g.id, g.name))
+                FROM anime_genre ag JOIN genre g ON ag.genre_id = g.id
+                WHERE ag.anime_id = a.id
+            ) as genres,
+            (
+                SELECT json_group_array(json_array(s.id, s.name, ast.is_main))
+                FROM anime_studio ast JOIN studio s ON ast.studio_id = s.id
+                WHERE ast.anime_id = a.id
+            ) as studios,
+            (
+                SELECT json_group_array(json_array(s.id, s.name_full))
+                FROM anime_staff ast JOIN staff s ON ast.staff_id = s.id
+                WHERE ast.anime_id = a.id AND ast.role LIKE '%Director%'
+            ) as directors
+        FROM user_ratings ur
+        JOIN anime a ON ur.anime_id = a.id
+        WHERE ur.user_id = ? AND ur.status = 'RATED'
+        """,
+        (user_id,)
+    )
+    return [dict(row) for row in rows]
+
+
+# ---- 집계 ----
+
+class _Group:
+    """COUNT(*) / AVG / MAX / MIN(rating) 누적 (rating NULL 은 평균에서 제외)"""
+    __slots__ = ('count', 'rated', 'total', 'max', 'min')
+
+    def __init__(self):
+        self.count = 0
+        self.rated = 0
+        self.total = 0.0
+        self.max = None
+        self.min = None
+
+    def add(self, rating: Optional[float]):
+        self.count += 1
+        if rating is not None:
+            self.rated += 1
+            self.total += rating
+            self.max = rating if self.max is None else max(self.max, rating)
+            self.min = rating if self.min is None else min(self.min, rating)
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.total / self.rated if self.rated else None
+
+
+def _add(groups: Dict, key, rating: Optional[float]):
+    group = groups.get(key)
+    if group is None:
+        group = groups[key] = _Group()
+    group.add(rating)
+
+
+def compute_profile_analytics(rows: List[Dict]) -> Dict:
+    """평가 목록 → 프로필 통계 묶음 (한 번 순회)"""
+    ratings: List[float] = []
+    rating_counts: Dict[float, int] = {}
+    total_minutes = 0
+    years, formats, lengths, seasons, sources = {}, {}, {}, {}, {}
+    genre_names, genre_ids, genre_pairs = {}, {}, {}
+    studios, main_studios, directors = {}, {}, {}
+    names: Dict = {}
+    gems, overrated = [], []
+    first_year, last_year = year_distribution_range()
+
+    for row in rows:
+        rating = row['rating']
+        rated = rating is not None
+
+        # status = 'RATED' 전체 (평균은 rating 있는 것만)
+        if row['episodes'] is not None:
+            total_minutes += row['episodes'] * (row['duration'] if row['duration'] is not None else 24)
+        if row['season_year'] is not None and first_year <= row['season_year'] <= last_year:
+            _add(years, row['season_year'], rating)
+        if row['format'] is not None:
+            _add(formats, row['format'], rating)
+        if row['episodes'] is not None and row['episodes'] > 0:
+            category = 'SHORT' if row['episodes'] <= 12 else 'MEDIUM' if row['episodes'] <= 26 else 'LONG'
+            _add(lengths, category, rating)
+        if row['season'] is not None:
+            _add(seasons, row['season'], rating)
+
+        if not rated:
+            continue
+
+        # rating IS NOT NULL
+        ratings.append(rating)
+        rating_counts[rating] = rating_counts.get(rating, 0) + 1
+        if row['source'] is not None:
+            _add(sources, row['source'], rating)
+
+        genres = sorted(json.loads(row['genres'] or '[]'))
+        for genre_id, genre_name in genres:
+            names[('genre', genre_id)] = genre_name
+            _add(genre_names, genre_name, rating)
+            _add(genre_ids, genre_id, rating)
+        for (_, first_name), (_, second_name) in combinations(genres, 2):
+            _add(genre_pairs, (first_name, second_name), rating)
+
+        for studio_id, studio_name, is_main in json.loads(row['studios'] or '[]'):
+            names[('studio', studio_id)] = studio_name
+            _add(studios, studio_id, rating)
+            if is_main == 1:
+                _add(main_studios, studio_id, rating)
+
+        for staff_id, staff_name in dict.fromkeys(map(tuple, json.loads(row['directors'] or '[]'))):
+            names[('staff', staff_id)] = staff_name
+            _add(directors, staff_id, rating)
+
+        if row['average_score'] is not None:
+            if rating >= 4.0 and row['average_score'] < 70:
+                gems.append(row)
+            elif rating <= 2.5 and row['average_score'] >= 75:
+                overrated.append(row)
+
+    def distribution(groups: Dict, key_name: str) -> List[Dict]:
+        return [
+            {key_name: key, 'count': group.count, 'average_rating': group.average}
+            for key, group in groups.items()
+        ]
+
+    def frequent(groups: Dict) -> List:
+        return [(key, group) for key, group in groups.items() if group.count >= 2]
+
+    def gem_item(row: Dict, kind: str) -> Dict:
+        return {
+            'anime_id': row['anime_id'],
+            'title': row['title'],
+            'cover_image_url': row['cover_image_url'],
+            'cover_image_local': row['cover_image_local'],
+            'my_rating': row['rating'],
+            'anilist_score': row['average_score'],
+            'rating_difference': row['rating'] * 20 - row['average_score'],
+            'popularity': row['popularity'],
+            'type': kind,
+        }
+
+    overall_average = sum(ratings) / len(ratings) if ratings else None
+    if ratings:
+        variance = sum((r - overall_average) ** 2 for r in ratings) / len(ratings)
+        rating_stats = {
+            'total_ratings': len(ratings),
+            'mean_rating': round(overall_average, 2),
+            'std_dev': round(variance ** 0.5, 2),
+            'min_rating': min(ratings),
+            'max_rating': max(ratings),
+        }
+    else:
+        rating_stats = {'total_ratings': 0, 'mean_rating': 0, 'std_dev': 0, 'min_rating': 0, 'max_rating': 0}
+
+    genre_preferences = sorted(
+        (
+            {
+                'genre': genre, 'count': group.count, 'avg_rating': group.average,
+                'max_rating': group.max, 'min_rating': group.min, 'score': group.count * group.average,
+            }
+            for genre, group in frequent(genre_names)
+        ),
+        key=lambda item: (-item['score'], item['genre'] or '')
+    )[:TOP_LIMIT]
+
+    studio_stats = sorted(
+        (
+            {'studio_name': names[('studio', studio_id)], 'count': group.count, 'average_rating': group.average}
+            for studio_id, group in frequent(studios)
+        ),
+        key=lambda item: (-item['count'], -item['average_rating'], item['studio_name'] or '')
+    )[:TOP_LIMIT]
+
+    favorite_studios = sorted(
+        (
+            {
+                'studio_id': studio_id, 'studio_name': names[('studio', studio_id)],
+                'anime_count': group.count, 'average_rating': group.average,
+                'max_rating': group.max, 'min_rating': group.min,
+            }
+            for studio_id, group in frequent(main_studios)
+        ),
+        key=lambda item: (-item['average_rating'], -item['anime_count'], item['studio_name'] or '')
+    )[:TOP_LIMIT]
+
+    genre_combinations = sorted(
+        (
+            {
+                'genre1': genre1, 'genre2': genre2,
+                'count': group.count, 'average_rating': group.average,
+            }
+            for (genre1, genre2), group in frequent(genre_pairs)
+        ),
+        key=lambda item: (-item['count'], -item['average_rating'], item['genre1'] or '', item['genre2'] or '')
+    )[:TOP_LIMIT]
+
+    director_preferences = sorted(
+        (
+            {
+                'staff_id': staff_id, 'director_name': names[('staff', staff_id)],
+                'anime_count': group.count, 'average_rating': group.average,
+            }
+            for staff_id, group in frequent(directors)
+        ),
+        key=lambda item: (-item['average_rating'], -item['anime_count'], item['director_name'] or '')
+    )[:TOP_LIMIT]
+
+    source_list = sorted(
+        (
+            {
+                'source': source, 'count': group.count, 'average_rating': group.average,
+                'max_rating': group.max, 'source_korean': SOURCE_NAMES.get(source, source),
+            }
+            for source, group in sources.items()
+        ),
+        key=lambda item: item['count'], reverse=True
+    )
+
+    radar_genres = sorted(
+        (
+            {'genre': names[('genre', genre_id)], 'count': group.count, 'average_rating': group.average}
+            for genre_id, group in genre_ids.items()
+        ),
+        key=lambda item: (-item['count'], item['genre'] or '')
+    )[:RADAR_GENRES]
+
+    gems.sort(key=lambda row: row['rating'] * 20 - row['average_score'], reverse=True)
+    overrated.sort(key=lambda row: row['rating'] * 20 - row['average_score'])
+
+    return {
+        'genre_preferences': genre_preferences,
+        'rating_distribution': [
+            {'rating': rating, 'count': count}
+            for rating, count in sorted(rating_counts.items(), reverse=True)
+        ],
+        'watch_time': {
+            'total_minutes': int(total_minutes),
+            'total_hours': round(total_minutes / 60, 1),
+            'total_days': round(total_minutes / 1440, 1),
+        },
+        'year_distribution': sorted(distribution(years, 'year'), key=lambda item: item['year']),
+        'format_distribution': sorted(distribution(formats, 'format'), key=lambda item: item['count'], reverse=True),
+        'episode_length_distribution': sorted(
+            distribution(lengths, 'length_category'), key=lambda item: item['count'], reverse=True
+        ),
+        'rating_stats': rating_stats,
+        'studio_stats': studio_stats,
+        'season_stats': sorted(distribution(seasons, 'season'), key=lambda item: item['count'], reverse=True),
+        'genre_combinations': genre_combinations,
+        'studio_preferences': {'favorite_studios': favorite_studios, 'overall_average': overall_average},
+        'hidden_gems': (
+            [gem_item(row, 'hidden_gem') for row in gems[:HIDDEN_GEMS_LIMIT // 2]]
+            + [gem_item(row, 'overrated') for row in overrated[:HIDDEN_GEMS_LIMIT // 2]]
+        ),
+        'source_preferences': {'sources': source_list, 'total_count': sum(s['count'] for s in source_list)},
+        'director_preferences': director_preferences,
+        'genre_radar': {
+            'genres': radar_genres,
+            'chart_data': {
+                'labels': [g['genre'] for g in radar_genres],
+                'ratings': [float(g['average_rating']) for g in radar_genres],
+                'counts': [g['count'] for g in radar_genres],
+            },
+        },
+    }
+
+
+# ---- 캐시 ----
+
+def get_profile_analytics(user_id: int) -> Dict:
+    """프로필 통계 묶음 (캐시 적중 시 쿼리 없음)"""
+    if PROFILE_ANALYTICS_CACHE_TTL > 0:
+        with _lock:
+            entry = _entries.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                _entries.move_to_end(user_id)
+                return entry[0]
+            generation = _generation
+
+    analytics = compute_profile_analytics(_load_rated(user_id))
+
+    if PROFILE_ANALYTICS_CACHE_TTL > 0:
+        with _lock:
+            if generation != _generation:
+                # 계산 중에 평가 변경 - 커밋 전 데이터일 수 있으므로 캐시하지 않음
+                return analytics
+            _entries[user_id] = (analytics, time.monotonic() + PROFILE_ANALYTICS_CACHE_TTL)
+            _entries.move_to_end(user_id)
+            while len(_entries) > PROFILE_ANALYTICS_CACHE_SIZE:
+                _entries.popitem(last=False)
+
+    return analytics
+
+
+def _drop_profile_analytics(user_id: int):
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.pop(user_id, None)
+
+
+def invalidate_profile_analytics(user_id: int):
+    """
+    평가/리뷰 변경 시 해당 사용자 통계 묶음 제거
+    트랜잭션 안이면 커밋 후 한 번 더 제거 (그 사이 다른 요청이 커밋 전 데이터로 다시 채운 항목 제거)
+    """
+    _drop_profile_analytics(user_id)
+    if db.in_transaction():
+        db.after_commit(lambda: _drop_profile_analytics(user_id))
+
+
+def clear_profile_analytics():
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
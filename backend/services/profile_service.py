@@ -2,10 +2,31 @@
 Profile Service
 사용자 프로필, 통계 조회
 """
-from typing import Optional, Dict, List
+from datetime import date
+from typing import Optional, Dict, List, Tuple
 from database import db, dict_from_row
 from models.user import UserStatsResponse, UserProfileResponse, UserPublicResponse
 
+# 원작별 한글 이름 매핑
+SOURCE_NAMES = {
+    'MANGA': '만화',
+    'LIGHT_NOVEL': '라이트 노벨',
+    'ORIGINAL': '오리지널',
+    'GAME': '게임',
+    'VISUAL_NOVEL': '비주얼 노벨',
+    'NOVEL': '소설',
+    'WEB_MANGA': '웹 만화',
+    'OTHER': '기타'
+}
+
+# 연도별 분포에 포함하는 첫 방영 연도
+FIRST_SEASON_YEAR = 1960
+
+
+def year_distribution_range() -> Tuple[int, int]:
+    """연도별 분포 범위 (1960 ~ 내년 - 방영 예정작 포함, 해가 바뀌면 자동으로 늘어남)"""
+    return FIRST_SEASON_YEAR, date.today().year + 1
+
 
 def get_user_stats(user_id: int) -> Optional[UserStatsResponse]:
     """사용자 통계 조회"""
@@ -66,7 +87,7 @@ def get_genre_preferences(user_id: int, limit: int = 10) -> List[Dict]:
         WHERE ur.user_id = ? AND ur.status = 'RATED' AND ur.rating IS NOT NULL
         GROUP BY g.name
         HAVING count >= 2
-        ORDER BY score DESC
+        ORDER BY score DESC, g.name ASC
         LIMIT ?
         """,
         (user_id, limit)
@@ -157,12 +178,12 @@ def get_year_distribution(user_id: int) -> List[Dict]:
         WHERE ur.user_id = ?
             AND ur.status = 'RATED'
             AND a.season_year IS NOT NULL
-            AND a.season_year >= 1960
-            AND a.season_year <= 2026
+            AND a.season_year >= ?
+            AND a.season_year <= ?
         GROUP BY a.season_year
         ORDER BY a.season_year ASC
         """,
-        (user_id,)
+        (user_id, *year_distribution_range())
     )
 
     return [dict_from_row(row) for row in rows]
@@ -286,7 +307,7 @@ def get_studio_stats(user_id: int, limit: int = 10) -> List[Dict]:
             AND ur.rating IS NOT NULL
         GROUP BY s.id, s.name
         HAVING count >= 2
-        ORDER BY count DESC, average_rating DESC
+        ORDER BY count DESC, average_rating DESC, s.name ASC
         LIMIT ?
         """,
         (user_id, limit)
@@ -340,7 +361,7 @@ def get_genre_combination_stats(user_id: int, limit: int = 10) -> List[Dict]:
             AND g1.id < g2.id
         GROUP BY g1.name, g2.name
         HAVING count >= 2
-        ORDER BY count DESC, average_rating DESC
+        ORDER BY count DESC, average_rating DESC, g1.name ASC, g2.name ASC
         LIMIT ?
         """,
         (user_id, limit)
@@ -412,20 +433,13 @@ def get_character_ratings(user_id: int, limit: int = 500) -> List[Dict]:
                 ELSE cr.status
             END as status,
             cr.updated_at,
-            (SELECT a.id FROM anime a
-             JOIN anime_character ac ON a.id = ac.anime_id
-             WHERE ac.character_id = cr.character_id
-             ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1) as anime_id,
-            (SELECT a.title_romaji FROM anime a
-             JOIN anime_character ac ON a.id = ac.anime_id
-             WHERE ac.character_id = cr.character_id
-             ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1) as anime_title,
-            (SELECT a.title_korean FROM anime a
-             JOIN anime_character ac ON a.id = ac.anime_id
-             WHERE ac.character_id = cr.character_id
-             ORDER BY CASE WHEN ac.role = 'MAIN' THEN 0 ELSE 1 END LIMIT 1) as anime_title_korean
+            pa.id as anime_id,
+            pa.title_romaji as anime_title,
+            pa.title_korean as anime_title_korean
         FROM character_ratings cr
         JOIN character c ON cr.character_id = c.id
+        LEFT JOIN character_primary_anime cpa ON cpa.character_id = cr.character_id
+        LEFT JOIN anime pa ON pa.id = cpa.anime_id
         WHERE cr.user_id = ? AND cr.rating IS NULL
         ORDER BY cr.updated_at DESC
         """,
@@ -440,28 +454,9 @@ def get_character_ratings(user_id: int, limit: int = 500) -> List[Dict]:
 
 
 def get_leaderboard(limit: int = 50) -> List[Dict]:
-    """오타쿠 점수 리더보드 (상위 사용자)"""
-
-    rows = db.execute_query(
-        """
-        SELECT
-            u.id,
-            u.username,
-            u.display_name,
-            u.avatar_url,
-            s.otaku_score,
-            s.total_rated,
-            s.total_character_ratings,
-            s.total_reviews
-        FROM users u
-        INNER JOIN user_stats s ON u.id = s.user_id
-        ORDER BY s.otaku_score DESC
-        LIMIT ?
-        """,
-        (limit,)
-    )
-
-    return [dict_from_row(row) for row in rows]
+    """오타쿠 점수 리더보드 (상위 사용자, 메모리 순위 구조에서 조회 - services/leaderboard_service.py)"""
+    from services.leaderboard_service import get_top_users
+    return get_top_users(limit)
 
 
 def get_studio_preferences(user_id: int, limit: int = 10) -> Dict:
@@ -490,7 +485,7 @@ def get_studio_preferences(user_id: int, limit: int = 10) -> Dict:
             AND ast.is_main = 1
         GROUP BY s.id, s.name
         HAVING anime_count >= 2
-        ORDER BY average_rating DESC, anime_count DESC
+        ORDER BY average_rating DESC, anime_count DESC, s.name ASC
         LIMIT ?
         """,
         (user_id, limit)
@@ -608,20 +603,8 @@ def get_source_preferences(user_id: int) -> Dict:
 
     sources = [dict_from_row(row) for row in rows]
 
-    # 원작별 한글 이름 매핑
-    source_names = {
-        'MANGA': '만화',
-        'LIGHT_NOVEL': '라이트 노벨',
-        'ORIGINAL': '오리지널',
-        'GAME': '게임',
-        'VISUAL_NOVEL': '비주얼 노벨',
-        'NOVEL': '소설',
-        'WEB_MANGA': '웹 만화',
-        'OTHER': '기타'
-    }
-
     for source in sources:
-        source['source_korean'] = source_names.get(source['source'], source['source'])
+        source['source_korean'] = SOURCE_NAMES.get(source['source'], source['source'])
 
     return {
         'sources': sources,
@@ -651,7 +634,7 @@ def get_director_preferences(user_id: int, limit: int = 10) -> List[Dict]:
             AND ast.role LIKE '%Director%'
         GROUP BY s.id, s.name_full
         HAVING anime_count >= 2
-        ORDER BY average_rating DESC, anime_count DESC
+        ORDER BY average_rating DESC, anime_count DESC, s.name_full ASC
         LIMIT ?
         """,
         (user_id, limit)
@@ -680,7 +663,7 @@ def get_genre_radar_data(user_id: int) -> Dict:
             AND ur.status = 'RATED'
             AND ur.rating IS NOT NULL
         GROUP BY g.id, g.name
-        ORDER BY count DESC
+        ORDER BY count DESC, g.name ASC
         """,
         (user_id,)
     )
@@ -2,114 +2,204 @@
 Rating Page Service - Ultra-optimized queries for rating pages
 평가 페이지 전용 초고속 쿼리 (목표: 0.1초 이내)
 """
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from array import array
 import random
+from config import RATING_QUEUE_SIZE, RATING_QUEUE_TIER_SIZE
 from database import db, dict_from_row
 
 
-def get_anime_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
-    """
-    애니메이션 평가 페이지 전용 - 초고속 쿼리
+# 평가 페이지 애니 카드 컬럼 (user_rating_status: NULL = 미평가, WANT_TO_WATCH)
+ANIME_CARD_COLUMNS = """
+    a.id,
+    a.title_romaji,
+    a.title_english,
+    a.title_native,
+    a.title_korean,
+    COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+    a.format,
+    a.episodes,
+    a.season,
+    a.season_year,
+    a.average_score,
+    a.popularity,
+    ur.status as user_rating_status
+"""
 
-    최적화:
-    - 서브쿼리 0개
-    - LEFT JOIN으로 user_rating_status만 확인
-    - site stats 제거 (불필요)
-    - 가중치 랜덤 정렬: 인기도 기반, Python에서 랜덤 섞기
-    - 인덱스 활용
-    - WANT_TO_WATCH는 소수만 포함 (10%)
+# 큐에서 한 번 요청에 꺼내는 최대 횟수 (이미 평가한 후보를 건너뛰며 페이지를 채울 때)
+MAX_QUEUE_ROUNDS = 4
 
-    목표: 0.1초 이내
-    """
 
-    # Fetch more items than needed (3x) for randomization
-    fetch_limit = limit * 3
+def _pack_ids(anime_ids: List[int]) -> bytes:
+    return array('I', anime_ids).tobytes()
 
-    # Calculate how many WANT_TO_WATCH items to include (10% of limit)
-    want_to_watch_limit = max(int(limit * 0.10), 5)  # At least 5 items
-    unrated_limit = fetch_limit - want_to_watch_limit
 
-    # Fetch unrated anime (majority)
-    unrated_rows = db.execute_query(
-        """
-        SELECT
-            a.id,
-            a.title_romaji,
-            a.title_english,
-            a.title_native,
-            a.title_korean,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-            a.format,
-            a.episodes,
-            a.season,
-            a.season_year,
-            a.average_score,
-            a.popularity,
-            NULL as user_rating_status
-        FROM anime a
-        LEFT JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
-        WHERE ur.id IS NULL
-        ORDER BY COALESCE(a.popularity, 0) DESC
-        LIMIT ?
-        """,
-        (user_id, unrated_limit)
-    )
+def _unpack_ids(blob: bytes) -> List[int]:
+    return array('I', blob).tolist()
+
+
+def _tiered_shuffle(anime_ids: List[int], seed: int) -> List[int]:
+    """인기도순 목록을 RATING_QUEUE_TIER_SIZE 구간으로 나눠 구간 안에서만 섞음 (인기작이 먼저, 순서는 매번 다름)"""
+    rng = random.Random(seed)
+    shuffled = []
+    for start in range(0, len(anime_ids), RATING_QUEUE_TIER_SIZE):
+        tier = anime_ids[start:start + RATING_QUEUE_TIER_SIZE]
+        rng.shuffle(tier)
+        shuffled.extend(tier)
+    return shuffled
 
-    # Fetch WANT_TO_WATCH anime (small portion)
-    want_to_watch_rows = db.execute_query(
+
+def _candidate_anime_ids(user_id: int) -> List[int]:
+    """미평가 + 보고싶어요 애니 (인기도순) - 큐 생성/보충 때만 실행"""
+    rows = db.execute_query(
         """
-        SELECT
-            a.id,
-            a.title_romaji,
-            a.title_english,
-            a.title_native,
-            a.title_korean,
-            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
-            a.format,
-            a.episodes,
-            a.season,
-            a.season_year,
-            a.average_score,
-            a.popularity,
-            ur.status as user_rating_status
+        SELECT a.id
         FROM anime a
-        INNER JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
-        WHERE ur.status = 'WANT_TO_WATCH'
+        LEFT JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
+        WHERE ur.id IS NULL OR ur.status = 'WANT_TO_WATCH'
         ORDER BY COALESCE(a.popularity, 0) DESC
-        LIMIT ?
         """,
-        (user_id, want_to_watch_limit)
+        (user_id,)
     )
+    return [row['id'] for row in rows]
 
-    # Combine results
-    items = [dict_from_row(row) for row in unrated_rows] + [dict_from_row(row) for row in want_to_watch_rows]
 
-    # Weighted random: shuffle within popularity tiers
-    # Top 30%: high popularity items
-    # Middle 40%: medium popularity items
-    # Bottom 30%: lower popularity items
-    if len(items) > limit:
-        tier_size = len(items) // 3
-        top_tier = items[:tier_size]
-        mid_tier = items[tier_size:tier_size*2]
-        low_tier = items[tier_size*2:]
-
-        # Shuffle each tier
-        random.shuffle(top_tier)
-        random.shuffle(mid_tier)
-        random.shuffle(low_tier)
+def refill_anime_candidate_queue(user_id: int) -> int:
+    """
+    후보 큐 생성/보충
+    큐 BLOB 은 이번 바퀴 전체 순서 (이미 보여준 앞부분 + 남은 후보) - 위치는 그대로 두고
+    이번 바퀴에 아직 없던 후보만 인기도 구간별로 섞어 뒤에 추가 (남은 후보가 RATING_QUEUE_SIZE 까지)
+    모든 후보가 이번 바퀴에 들어갔으면 cycle_complete 로 표시 - 큐를 다 쓸 때까지 보충 생략,
+    다 쓴 뒤에야 새 순서로 처음부터
+    Returns: 큐에 남은 후보 수
+    """
+    row = db.execute_query(
+        "SELECT length(anime_ids) / 4 - position as remaining, cycle_complete "
+        "FROM rating_candidate_queue WHERE user_id = ?",
+        (user_id,),
+        fetch_one=True
+    )
+    if row and row['cycle_complete'] and row['remaining'] > 0:
+        # 새 후보 없음 - 전체 안티 조인 생략
+        return row['remaining']
+
+    candidates = _candidate_anime_ids(user_id)
+    seed = random.getrandbits(31)
+
+    with db.transaction():
+        row = db.execute_query(
+            "SELECT anime_ids, position FROM rating_candidate_queue WHERE user_id = ?",
+            (user_id,),
+            fetch_one=True
+        )
+        cycle = _unpack_ids(row['anime_ids']) if row else []
+        position = row['position'] if row else 0
+        pending = len(cycle) - position
+
+        in_cycle = set(cycle)
+        fresh = [anime_id for anime_id in candidates if anime_id not in in_cycle]
+        if not fresh and pending <= 0:
+            # 모든 후보를 한 번씩 보여줌 → 새 순서로 처음부터
+            cycle, position, fresh = [], 0, candidates
+            pending = 0
+        appended = _tiered_shuffle(fresh, seed)[:max(RATING_QUEUE_SIZE - pending, 0)]
+        cycle_complete = len(appended) == len(fresh)
+
+        db.execute_update(
+            """
+            INSERT INTO rating_candidate_queue (user_id, anime_ids, position, seed, cycle_complete, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id) DO UPDATE SET
+                anime_ids = excluded.anime_ids,
+                position = excluded.position,
+                seed = excluded.seed,
+                cycle_complete = excluded.cycle_complete,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (user_id, _pack_ids(cycle + appended), position, seed, int(cycle_complete))
+        )
+
+    return pending + len(appended)
+
+
+def _take_from_queue(user_id: int, count: int) -> Tuple[Optional[List[int]], int, bool]:
+    """
+    큐 현재 위치에서 count 개를 꺼내고 위치 이동 (BLOB 일부만 읽음)
+    Returns: (anime_ids, 남은 후보 수, cycle_complete) - 큐가 없으면 (None, 0, False)
+    """
+    with db.transaction():
+        row = db.execute_query(
+            """
+            SELECT substr(anime_ids, position * 4 + 1, ? * 4) as chunk,
+                   length(anime_ids) / 4 - position as remaining,
+                   cycle_complete
+            FROM rating_candidate_queue WHERE user_id = ?
+            """,
+            (count, user_id),
+            fetch_one=True
+        )
+        if row is None:
+            return None, 0, False
+
+        anime_ids = _unpack_ids(row['chunk'] or b'')
+        if anime_ids:
+            db.execute_update(
+                "UPDATE rating_candidate_queue SET position = position + ? WHERE user_id = ?",
+                (len(anime_ids), user_id)
+            )
+        return anime_ids, row['remaining'] - len(anime_ids), bool(row['cycle_complete'])
+
+
+def get_anime_for_rating(user_id: int, limit: int = 50) -> Dict:
+    """
+    애니메이션 평가 페이지 - 사용자별 후보 큐에서 다음 페이지
 
-        # Take from each tier proportionally
-        top_count = int(limit * 0.5)  # 50% from top
-        mid_count = int(limit * 0.3)  # 30% from mid
-        low_count = limit - top_count - mid_count  # 20% from low
+    - 큐: 미평가 + 보고싶어요 애니를 인기도 구간별로 섞은 순서 (rating_candidate_queue)
+    - 페이지마다 큐 위치가 앞으로만 이동 → 모든 후보를 한 번씩 보여줄 때까지 중복 없음
+    - 큐에 들어간 뒤 평가/관심없음 처리한 애니는 꺼낼 때 건너뜀
+    - 페이지 비용 O(limit): BLOB 일부 + 애니 PK 조회 (전체 anime 안티 조인 없음)
+    - 큐가 없거나 다 쓰면 즉시 생성, 얼마 안 남으면 remaining 으로 알려 호출자가 백그라운드 보충
+      (cycle_complete 이면 보충할 새 후보가 없으므로 생략)
 
-        result = top_tier[:top_count] + mid_tier[:mid_count] + low_tier[:low_count]
-        random.shuffle(result)  # Final shuffle
-        return result
-    else:
-        random.shuffle(items)
-        return items
+    Returns: {'items': [...], 'remaining': 큐에 남은 후보 수, 'cycle_complete': bool}
+    """
+    items: List[Dict] = []
+    shown = set()
+    remaining = 0
+    cycle_complete = False
+    refilled = False
+
+    for _ in range(MAX_QUEUE_ROUNDS):
+        anime_ids, remaining, cycle_complete = _take_from_queue(user_id, limit - len(items))
+        if not anime_ids:
+            if refilled:
+                break
+            refill_anime_candidate_queue(user_id)
+            refilled = True
+            continue
+
+        placeholders = ','.join('?' * len(anime_ids))
+        rows = db.execute_query(
+            f"""
+            SELECT {ANIME_CARD_COLUMNS}
+            FROM anime a
+            LEFT JOIN user_ratings ur ON a.id = ur.anime_id AND ur.user_id = ?
+            WHERE a.id IN ({placeholders})
+              AND (ur.id IS NULL OR ur.status = 'WANT_TO_WATCH')
+            """,
+            (user_id, *anime_ids)
+        )
+        by_id = {row['id']: dict_from_row(row) for row in rows}
+        for anime_id in anime_ids:
+            # 한 바퀴를 다 돌아 새 큐가 만들어진 경우 같은 페이지 안 중복 방지
+            if anime_id in by_id and anime_id not in shown:
+                shown.add(anime_id)
+                items.append(by_id[anime_id])
+
+        if len(items) >= limit:
+            break
+
+    return {'items': items, 'remaining': remaining, 'cycle_complete': cycle_complete}
 
 
 def get_characters_for_rating(user_id: int, limit: int = 50) -> List[Dict]:
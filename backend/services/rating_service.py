@@ -2,136 +2,282 @@
 Rating Service
 평점 생성, 수정, 삭제, 조회
 """
+import json
+from bisect import bisect_right
 from typing import List, Optional, Dict
 from datetime import datetime
 from fastapi import HTTPException, status
 from database import db, dict_from_row, dicts_from_rows
 from models.rating import RatingCreate, RatingUpdate, RatingResponse, UserRatingListResponse, RatingStatus
+from services.compatibility_service import invalidate_rating_vector
+from services.profile_analytics_service import invalidate_profile_analytics
+from utils.user_cache import invalidate_user
 
 
 def create_or_update_rating(user_id: int, rating_data: RatingCreate) -> RatingResponse:
     """평점 생성 또는 수정"""
 
-    # 애니메이션 존재 확인
-    anime_exists = db.execute_query(
-        "SELECT id FROM anime WHERE id = ?",
-        (rating_data.anime_id,),
-        fetch_one=True
-    )
-
-    if not anime_exists:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Anime not found"
+    # 한 번의 트랜잭션으로 처리 (평점/activities/통계/승급 기록을 한 번에 커밋)
+    with db.transaction():
+        # 애니메이션 존재 확인
+        anime_exists = db.execute_query(
+            "SELECT id FROM anime WHERE id = ?",
+            (rating_data.anime_id,),
+            fetch_one=True
         )
 
-    # 기존 평점 확인
-    existing = db.execute_query(
-        "SELECT id FROM user_ratings WHERE user_id = ? AND anime_id = ?",
-        (user_id, rating_data.anime_id),
-        fetch_one=True
-    )
-
-    # Delete from activities first (트리거가 동작하지 않을 경우를 대비)
-    db.execute_update(
-        """
-        DELETE FROM activities
-        WHERE activity_type = 'anime_rating'
-          AND user_id = ?
-          AND item_id = ?
-        """,
-        (user_id, rating_data.anime_id)
-    )
-
-    if existing:
-        # 수정
-        # WANT_TO_WATCH 또는 PASS로 변경 시 rating을 NULL로 설정
-        final_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
-
-        db.execute_update(
-            """
-            UPDATE user_ratings
-            SET rating = ?, status = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ? AND anime_id = ?
-            """,
-            (final_rating, rating_data.status.value, user_id, rating_data.anime_id)
-        )
-        rating_id = existing['id']
-    else:
-        # 생성
-        # WANT_TO_WATCH 또는 PASS일 때는 rating을 NULL로 설정
-        final_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
+        if not anime_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Anime not found"
+            )
 
-        rating_id = db.execute_insert(
-            """
-            INSERT INTO user_ratings (user_id, anime_id, rating, status, created_at, updated_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            """,
-            (user_id, rating_data.anime_id, final_rating, rating_data.status.value)
+        # 기존 평점 확인
+        existing = db.execute_query(
+            "SELECT id FROM user_ratings WHERE user_id = ? AND anime_id = ?",
+            (user_id, rating_data.anime_id),
+            fetch_one=True
         )
 
-    # RATED 상태일 때 activities 동기화 확인
-    # 트리거가 동작했는지 확인하고, 동작하지 않았으면 수동 동기화
-    rating_activity_time = None
-    if rating_data.status == RatingStatus.RATED and rating_data.rating:
-        # Check if trigger worked
-        activity_exists = db.execute_query(
+        # Delete from activities first (트리거가 동작하지 않을 경우를 대비)
+        db.execute_update(
             """
-            SELECT 1 FROM activities
+            DELETE FROM activities
             WHERE activity_type = 'anime_rating'
               AND user_id = ?
               AND item_id = ?
             """,
-            (user_id, rating_data.anime_id),
+            (user_id, rating_data.anime_id)
+        )
+
+        if existing:
+            # 수정
+            # WANT_TO_WATCH 또는 PASS로 변경 시 rating을 NULL로 설정
+            final_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
+
+            db.execute_update(
+                """
+                UPDATE user_ratings
+                SET rating = ?, status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND anime_id = ?
+                """,
+                (final_rating, rating_data.status.value, user_id, rating_data.anime_id)
+            )
+            rating_id = existing['id']
+        else:
+            # 생성
+            # WANT_TO_WATCH 또는 PASS일 때는 rating을 NULL로 설정
+            final_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
+
+            rating_id = db.execute_insert(
+                """
+                INSERT INTO user_ratings (user_id, anime_id, rating, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                """,
+                (user_id, rating_data.anime_id, final_rating, rating_data.status.value)
+            )
+
+        # RATED 상태일 때 activities 동기화 확인
+        # 트리거가 동작했는지 확인하고, 동작하지 않았으면 수동 동기화
+        rating_activity_time = None
+        if rating_data.status == RatingStatus.RATED and rating_data.rating:
+            # Check if trigger worked
+            activity_exists = db.execute_query(
+                """
+                SELECT 1 FROM activities
+                WHERE activity_type = 'anime_rating'
+                  AND user_id = ?
+                  AND item_id = ?
+                """,
+                (user_id, rating_data.anime_id),
+                fetch_one=True
+            )
+
+            # If trigger didn't work, manually sync
+            if not activity_exists:
+                _sync_to_activities(user_id, rating_data.anime_id)
+
+            # Update activity_time to current time (move to recent feed)
+            db.execute_update("""
+                UPDATE activities
+                SET activity_time = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE activity_type = 'anime_rating'
+                  AND user_id = ?
+                  AND item_id = ?
+            """, (user_id, rating_data.anime_id))
+
+            # 업데이트된 activity_time을 조회 (승급 메시지에 사용)
+            activity_time_result = db.execute_query(
+                """
+                SELECT activity_time
+                FROM activities
+                WHERE activity_type = 'anime_rating'
+                  AND user_id = ?
+                  AND item_id = ?
+                """,
+                (user_id, rating_data.anime_id),
+                fetch_one=True
+            )
+            if activity_time_result:
+                rating_activity_time = activity_time_result['activity_time']
+
+        # 사용자 통계 업데이트 (승급 시 사용할 activity_time 전달)
+        _update_user_stats(user_id, rating_activity_time)
+        invalidate_rating_vector(user_id)
+        invalidate_profile_analytics(user_id)
+
+        # 생성/수정된 평점 조회
+        rating_response = get_rating_by_id(rating_id)
+
+        # 업데이트된 otaku_score 조회하여 함께 반환
+        updated_stats = db.execute_query(
+            "SELECT otaku_score FROM user_stats WHERE user_id = ?",
+            (user_id,),
             fetch_one=True
         )
+        if updated_stats and rating_response:
+            # otaku_score를 rating_response에 추가
+            rating_response.otaku_score = updated_stats['otaku_score']
 
-        # If trigger didn't work, manually sync
-        if not activity_exists:
-            _sync_to_activities(user_id, rating_data.anime_id)
+        return rating_response
 
-        # Update activity_time to current time (move to recent feed)
-        db.execute_update("""
-            UPDATE activities
-            SET activity_time = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE activity_type = 'anime_rating'
-              AND user_id = ?
-              AND item_id = ?
-        """, (user_id, rating_data.anime_id))
 
-        # 업데이트된 activity_time을 조회 (승급 메시지에 사용)
-        activity_time_result = db.execute_query(
-            """
-            SELECT activity_time
-            FROM activities
+def bulk_upsert_ratings(user_id: int, ratings: List[RatingCreate]) -> Dict:
+    """
+    여러 평점을 한 번에 생성/수정 (시리즈 일괄 평가, 가져오기 등)
+
+    create_or_update_rating 과 같은 결과를 한 트랜잭션에서 집합 단위로 처리:
+    - 존재하지 않는 애니는 errors 로 분리 (나머지는 계속 처리)
+    - user_ratings 는 UPSERT 한 문장(executemany)으로 기록, activities 는 트리거 + IN 절 일괄 동기화
+    - 통계/승급 확인은 마지막에 한 번만
+    - 같은 anime_id 가 여러 번 있으면 마지막 값 사용
+
+    Returns: {'items': [RatingResponse], 'errors': [{'anime_id', 'error'}], 'otaku_score': float | None}
+    """
+    by_anime = {r.anime_id: r for r in ratings}
+    if not by_anime:
+        return {'items': [], 'errors': [], 'otaku_score': None}
+
+    with db.transaction():
+        anime_ids = list(by_anime)
+        placeholders = ','.join('?' * len(anime_ids))
+        found = {
+            row['id'] for row in db.execute_query(
+                f"SELECT id FROM anime WHERE id IN ({placeholders})",
+                tuple(anime_ids)
+            )
+        }
+        errors = [
+            {'anime_id': anime_id, 'error': 'Anime not found'}
+            for anime_id in anime_ids if anime_id not in found
+        ]
+        anime_ids = [anime_id for anime_id in anime_ids if anime_id in found]
+        if not anime_ids:
+            return {'items': [], 'errors': errors, 'otaku_score': None}
+        placeholders = ','.join('?' * len(anime_ids))
+
+        # Delete from activities first (RATED 가 아닌 상태로 바뀐 항목은 피드에서 제거)
+        db.execute_update(
+            f"""
+            DELETE FROM activities
             WHERE activity_type = 'anime_rating'
               AND user_id = ?
-              AND item_id = ?
+              AND item_id IN ({placeholders})
             """,
-            (user_id, rating_data.anime_id),
-            fetch_one=True
+            (user_id, *anime_ids)
         )
-        if activity_time_result:
-            rating_activity_time = activity_time_result['activity_time']
 
-    # 사용자 통계 업데이트 (승급 시 사용할 activity_time 전달)
-    _update_user_stats(user_id, rating_activity_time)
+        # WANT_TO_WATCH 또는 PASS일 때는 rating을 NULL로 설정
+        rows = []
+        for anime_id in anime_ids:
+            rating_data = by_anime[anime_id]
+            final_rating = rating_data.rating if rating_data.status == RatingStatus.RATED else None
+            rows.append((user_id, anime_id, final_rating, rating_data.status.value))
+
+        with db.get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO user_ratings (user_id, anime_id, rating, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id, anime_id) DO UPDATE SET
+                    rating = excluded.rating,
+                    status = excluded.status,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                rows
+            )
 
-    # 생성/수정된 평점 조회
-    rating_response = get_rating_by_id(rating_id)
+        # RATED 항목 activities 동기화 (트리거가 동작하지 않은 항목만 수동 동기화)
+        rated_ids = [
+            anime_id for anime_id in anime_ids
+            if by_anime[anime_id].status == RatingStatus.RATED and by_anime[anime_id].rating
+        ]
+        rating_activity_time = None
+        if rated_ids:
+            rated_placeholders = ','.join('?' * len(rated_ids))
+            synced = {
+                row['item_id'] for row in db.execute_query(
+                    f"""
+                    SELECT item_id FROM activities
+                    WHERE activity_type = 'anime_rating'
+                      AND user_id = ?
+                      AND item_id IN ({rated_placeholders})
+                    """,
+                    (user_id, *rated_ids)
+                )
+            }
+            for anime_id in rated_ids:
+                if anime_id not in synced:
+                    _sync_to_activities(user_id, anime_id)
+
+            # Update activity_time to current time (move to recent feed)
+            db.execute_update(
+                f"""
+                UPDATE activities
+                SET activity_time = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE activity_type = 'anime_rating'
+                  AND user_id = ?
+                  AND item_id IN ({rated_placeholders})
+                """,
+                (user_id, *rated_ids)
+            )
+            rating_activity_time = db.execute_query(
+                "SELECT CURRENT_TIMESTAMP as now",
+                fetch_one=True
+            )['now']
 
-    # 업데이트된 otaku_score 조회하여 함께 반환
-    updated_stats = db.execute_query(
-        "SELECT otaku_score FROM user_stats WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )
-    if updated_stats and rating_response:
-        # otaku_score를 rating_response에 추가
-        rating_response.otaku_score = updated_stats['otaku_score']
+        # 사용자 통계/승급 확인 한 번
+        _update_user_stats(user_id, rating_activity_time)
+        invalidate_rating_vector(user_id)
+        invalidate_profile_analytics(user_id)
 
-    return rating_response
+        item_rows = db.execute_query(
+            f"""
+            SELECT ur.*, a.title_romaji as anime_title, a.cover_image_url as anime_cover_image
+            FROM user_ratings ur
+            JOIN anime a ON ur.anime_id = a.id
+            WHERE ur.user_id = ? AND ur.anime_id IN ({placeholders})
+            """,
+            (user_id, *anime_ids)
+        )
+        updated_stats = db.execute_query(
+            "SELECT otaku_score FROM user_stats WHERE user_id = ?",
+            (user_id,),
+            fetch_one=True
+        )
+
+    otaku_score = updated_stats['otaku_score'] if updated_stats else None
+    items_by_anime = {row['anime_id']: RatingResponse(**dict_from_row(row)) for row in item_rows}
+    items = []
+    for anime_id in anime_ids:
+        item = items_by_anime.get(anime_id)
+        if item:
+            item.otaku_score = otaku_score
+            items.append(item)
+
+    return {'items': items, 'errors': errors, 'otaku_score': otaku_score}
 
 
 def get_rating_by_id(rating_id: int) -> Optional[RatingResponse]:
@@ -442,29 +588,33 @@ def get_all_user_ratings(user_id: int, rating_filter: float = None, status_filte
 def delete_rating(user_id: int, anime_id: int) -> bool:
     """평점 삭제 (activities 삭제 시 CASCADE로 댓글/좋아요도 자동 삭제)"""
 
-    # activities 테이블에서 삭제 (CASCADE로 comments/likes 자동 삭제)
-    db.execute_update(
-        """
-        DELETE FROM activities
-        WHERE activity_type = 'anime_rating'
-        AND user_id = ?
-        AND item_id = ?
-        """,
-        (user_id, anime_id)
-    )
+    # 한 번의 트랜잭션으로 처리 (평점/activities/통계/승급 기록을 한 번에 커밋)
+    with db.transaction():
+        # activities 테이블에서 삭제 (CASCADE로 comments/likes 자동 삭제)
+        db.execute_update(
+            """
+            DELETE FROM activities
+            WHERE activity_type = 'anime_rating'
+            AND user_id = ?
+            AND item_id = ?
+            """,
+            (user_id, anime_id)
+        )
 
-    # 평점 삭제
-    rowcount = db.execute_update(
-        "DELETE FROM user_ratings WHERE user_id = ? AND anime_id = ?",
-        (user_id, anime_id)
-    )
+        # 평점 삭제
+        rowcount = db.execute_update(
+            "DELETE FROM user_ratings WHERE user_id = ? AND anime_id = ?",
+            (user_id, anime_id)
+        )
 
-    if rowcount > 0:
-        # 사용자 통계 업데이트
-        _update_user_stats(user_id)
-        return True
+        if rowcount > 0:
+            # 사용자 통계 업데이트
+            _update_user_stats(user_id)
+            invalidate_rating_vector(user_id)
+            invalidate_profile_analytics(user_id)
+            return True
 
-    return False
+        return False
 
 
 def _sync_to_activities(user_id: int, anime_id: int):
@@ -534,6 +684,11 @@ def _sync_to_activities(user_id: int, anime_id: int):
         )
 
 
+# 등급별 최소 점수 / 이름 (Lv.1 ~ Lv.10)
+RANK_MIN_SCORES = [0, 50, 120, 220, 350, 550, 800, 1100, 1450, 1800]
+RANK_NAMES = ["루키", "헌터", "워리어", "나이트", "마스터", "하이마스터", "그랜드마스터", "오타쿠", "오타쿠 킹", "오타쿠 갓"]
+
+
 def _get_rank_info(otaku_score: float) -> tuple[str, int]:
     """
     Get rank name and level from otaku score
@@ -549,204 +704,84 @@ def _get_rank_info(otaku_score: float) -> tuple[str, int]:
     - Lv.9 오타쿠 킹 (1450~1799점)
     - Lv.10 오타쿠 갓 (1800+점)
     """
-    if otaku_score < 50:
-        return "루키", 1
-    elif otaku_score < 120:
-        return "헌터", 2
-    elif otaku_score < 220:
-        return "워리어", 3
-    elif otaku_score < 350:
-        return "나이트", 4
-    elif otaku_score < 550:
-        return "마스터", 5
-    elif otaku_score < 800:
-        return "하이마스터", 6
-    elif otaku_score < 1100:
-        return "그랜드마스터", 7
-    elif otaku_score < 1450:
-        return "오타쿠", 8
-    elif otaku_score < 1800:
-        return "오타쿠 킹", 9
-    else:
-        return "오타쿠 갓", 10
+    level = max(1, bisect_right(RANK_MIN_SCORES, otaku_score))
+    return RANK_NAMES[level - 1], level
+
+
+def _rank_name(level: int) -> str:
+    """등급 레벨 → 등급 이름"""
+    return RANK_NAMES[level - 1]
 
 
 def _update_user_stats(user_id: int, promotion_activity_time: Optional[str] = None):
     """
-    사용자 통계 업데이트 및 승급 감지
+    사용자 통계 반영 후 승급 감지
+
+    통계(카운터, 평균, 시청 시간, 선호 장르, otaku_score)는 평가/리뷰 쓰기와 같은 트랜잭션에서
+    트리거로 증분 갱신됨 (scripts/create_user_stats_counters.py).
+    여기서는 마지막으로 확인한 등급(rank_level)과 현재 등급을 비교해 승급만 기록
 
     Args:
         user_id: 사용자 ID
         promotion_activity_time: 승급 메시지에 사용할 activity_time (평점이 매겨진 시각)
     """
 
-    # 현재 otaku_score 조회 (승급 감지용)
     current_stats = db.execute_query(
-        "SELECT otaku_score FROM user_stats WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )
-    old_otaku_score = current_stats['otaku_score'] if current_stats else 0
-
-    # 평점 통계 계산
-    stats = db.execute_query(
-        """
-        SELECT
-            COUNT(CASE WHEN status = 'RATED' THEN 1 END) as total_rated,
-            COUNT(CASE WHEN status = 'WANT_TO_WATCH' THEN 1 END) as total_want_to_watch,
-            COUNT(CASE WHEN status = 'PASS' THEN 1 END) as total_pass,
-            AVG(CASE WHEN status = 'RATED' AND rating IS NOT NULL THEN rating END) as avg_rating
-        FROM user_ratings
-        WHERE user_id = ?
-        """,
+        "SELECT otaku_score, rank_level FROM user_stats WHERE user_id = ?",
         (user_id,),
         fetch_one=True
     )
+    if not current_stats:
+        return
 
-    # 리뷰 수 (애니메이션 리뷰 + 캐릭터 리뷰)
-    anime_review_count = db.execute_query(
-        "SELECT COUNT(*) as total FROM user_reviews WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )['total']
-
-    character_review_count = db.execute_query(
-        "SELECT COUNT(*) as total FROM character_reviews WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )['total']
-
-    review_count = anime_review_count + character_review_count
-
-    # 시청 시간 계산 (평가한 애니메이션의 에피소드 * 평균 길이)
-    watch_time = db.execute_query(
-        """
-        SELECT SUM(a.episodes * COALESCE(a.duration, 24)) as total_minutes
-        FROM user_ratings ur
-        JOIN anime a ON ur.anime_id = a.id
-        WHERE ur.user_id = ? AND ur.status = 'RATED'
-        """,
-        (user_id,),
-        fetch_one=True
-    )['total_minutes'] or 0
+    # 리더보드 순위 반영 (메모리 순서 통계 구조, O(log n)) - 커밋된 뒤에만 (롤백되면 반영하지 않음)
+    from services.leaderboard_service import update_leaderboard_score
+    otaku_score = current_stats['otaku_score']
+    db.after_commit(lambda: update_leaderboard_score(user_id, otaku_score))
+    # 인증 사용자 캐시의 UserResponse.otaku_score 갱신 (/api/auth/me) - 커밋된 뒤에만
+    db.after_commit(lambda: invalidate_user(user_id))
 
-    # 캐릭터 평가 수
-    character_rating_count = db.execute_query(
-        "SELECT COUNT(*) as total FROM character_ratings WHERE user_id = ?",
-        (user_id,),
-        fetch_one=True
-    )['total']
+    new_otaku_score = int(current_stats['otaku_score'] or 0)
+    new_rank, new_level = _get_rank_info(new_otaku_score)
+    old_level = current_stats['rank_level']
 
-    # Otaku 점수 계산
-    # 공식: (애니메이션 평가수 × 2) + (캐릭터 평가수 × 1) + (리뷰수 × 5)
-    new_otaku_score = (stats['total_rated'] * 2) + (character_rating_count * 1) + (review_count * 5)
+    if old_level == new_level:
+        return
 
-    # 선호 장르 찾기 (가장 많이 평가한 장르)
-    favorite_genre_row = db.execute_query(
-        """
-        SELECT g.name, COUNT(*) as cnt
-        FROM user_ratings ur
-        JOIN anime_genre ag ON ur.anime_id = ag.anime_id
-        JOIN genre g ON ag.genre_id = g.id
-        WHERE ur.user_id = ? AND ur.status = 'RATED'
-        GROUP BY g.name
-        ORDER BY cnt DESC
-        LIMIT 1
-        """,
-        (user_id,),
-        fetch_one=True
+    db.execute_update(
+        "UPDATE user_stats SET rank_level = ? WHERE user_id = ?",
+        (new_level, user_id)
     )
-    favorite_genre = favorite_genre_row['name'] if favorite_genre_row else None
 
-    # user_stats 업데이트
-    db.execute_update(
+    # 기준 등급이 없던 사용자는 기록만 (승급 메시지 없음)
+    if old_level is None:
+        return
+
+    # 등급이 변경되었으면 activities에 기록 (item_id = new_level)
+    # (user_id, new_level) 유니크 인덱스로 이미 있는 레벨이면 INSERT 하지 않음 (중복만 건너뜀)
+    metadata = json.dumps({
+        'old_rank': _rank_name(old_level),
+        'old_level': old_level,
+        'new_rank': new_rank,
+        'new_level': new_level,
+        'otaku_score': new_otaku_score,
+    }, ensure_ascii=False)
+
+    # promotion_activity_time이 없으면 CURRENT_TIMESTAMP (평점이 아닌 다른 활동으로 승급한 경우)
+    db.execute_insert(
         """
-        INSERT OR REPLACE INTO user_stats (
-            user_id, total_rated, total_want_to_watch, total_pass,
-            average_rating, total_reviews, total_character_ratings, total_watch_time_minutes,
-            otaku_score, favorite_genre, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """,
-        (
-            user_id,
-            stats['total_rated'],
-            stats['total_want_to_watch'],
-            stats['total_pass'],
-            stats['avg_rating'],
-            review_count,
-            character_rating_count,
-            watch_time,
-            new_otaku_score,
-            favorite_genre
+        INSERT INTO activities (
+            activity_type, user_id, username, display_name, avatar_url,
+            item_id, metadata, activity_time, created_at, updated_at
         )
+        SELECT 'rank_promotion', u.id, u.username, u.display_name, u.avatar_url,
+               ?, ?, COALESCE(?, CURRENT_TIMESTAMP), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM users u
+        WHERE u.id = ?
+          AND NOT EXISTS (
+              SELECT 1 FROM activities
+              WHERE activity_type = 'rank_promotion' AND user_id = u.id AND item_id = ?
+          )
+        """,
+        (new_level, metadata, promotion_activity_time, user_id, new_level)
     )
-
-    # 승급 감지
-    old_rank, old_level = _get_rank_info(old_otaku_score)
-    new_rank, new_level = _get_rank_info(new_otaku_score)
-
-    # 등급이 변경되었으면 activities에 기록
-    if (old_rank != new_rank) or (old_rank == new_rank and old_level < new_level):
-        # 중복 체크: 같은 승급이 이미 있는지 확인
-        existing_promotion = db.execute_query(
-            """
-            SELECT id FROM activities
-            WHERE user_id = ? AND activity_type = 'rank_promotion'
-            AND metadata LIKE ?
-            """,
-            (user_id, f'%"new_rank": "{new_rank}"%"new_level": {new_level}%'),
-            fetch_one=True
-        )
-
-        if existing_promotion:
-            # 이미 같은 승급 기록이 있으면 추가하지 않음
-            return
-
-        # 사용자 정보 조회
-        user_info = db.execute_query(
-            "SELECT username, display_name, avatar_url FROM users WHERE id = ?",
-            (user_id,),
-            fetch_one=True
-        )
-
-        if user_info:
-            # activities에 승급 기록 추가
-            # promotion_activity_time이 제공되면 해당 시간 사용, 아니면 CURRENT_TIMESTAMP
-            if promotion_activity_time:
-                db.execute_insert(
-                    """
-                    INSERT INTO activities (
-                        activity_type, user_id, username, display_name, avatar_url,
-                        item_id, metadata, activity_time, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    """,
-                    (
-                        'rank_promotion',
-                        user_id,
-                        user_info['username'],
-                        user_info['display_name'],
-                        user_info['avatar_url'],
-                        None,  # item_id not needed for rank promotion
-                        f'{{"old_rank": "{old_rank}", "old_level": {old_level}, "new_rank": "{new_rank}", "new_level": {new_level}, "otaku_score": {new_otaku_score}}}',
-                        promotion_activity_time
-                    )
-                )
-            else:
-                # Fallback: CURRENT_TIMESTAMP 사용 (평점이 아닌 다른 활동으로 승급한 경우)
-                db.execute_insert(
-                    """
-                    INSERT INTO activities (
-                        activity_type, user_id, username, display_name, avatar_url,
-                        item_id, metadata, activity_time, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    """,
-                    (
-                        'rank_promotion',
-                        user_id,
-                        user_info['username'],
-                        user_info['display_name'],
-                        user_info['avatar_url'],
-                        None,  # item_id not needed for rank promotion
-                        f'{{"old_rank": "{old_rank}", "old_level": {old_level}, "new_rank": "{new_rank}", "new_level": {new_level}, "otaku_score": {new_otaku_score}}}'
-                    )
-                )
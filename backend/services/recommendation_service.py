@@ -0,0 +1,403 @@
+"""
+Recommendation Service
+평가 기반 개인화 추천 (item-item 협업 필터링)
+
+- 전체 재계산 (오프라인, NumPy 필요 - 없으면 REBUILD_AVAILABLE = False):
+  user_ratings(RATED) → 희소 사용자 × 애니 행렬 (사용자 평균을 뺀 adjusted cosine)
+  → 애니 블록 단위로 함께 평가한 사용자의 내적만 누적해 애니별 상위 K 유사 애니를 anime_similarity 에 저장
+  → 사용자별 추천 목록을 recommendation_cache 에 저장
+- 증분 갱신: 마지막 계산 이후 평가가 바뀐 사용자(또는 RECOMMENDATION_CACHE_DAYS 경과)만
+  저장된 anime_similarity 로 다시 점수 계산 (NumPy 없어도 동작)
+  - 조회 시 is_recommendation_stale 이면 API 가 응답 후 백그라운드로 해당 사용자 갱신
+  - 전체 사용자 일괄 갱신은 /api/admin/refresh-recommendations 또는 스크립트 --refresh
+- 조회: recommendation_cache(user_id, score) 인덱스 한 번 읽기
+
+테이블/인덱스: scripts/create_recommendation_cache.py
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    MIN_RATINGS_FOR_RECOMMENDATION,
+    RECOMMENDATION_CACHE_DAYS,
+    TOP_K_SIMILAR_ITEMS,
+    RECOMMENDATIONS_PER_USER,
+    RECOMMENDATION_BLOCK_SIZE,
+)
+from database import db, dict_from_row
+
+# NumPy 는 선택 의존성 (배포 환경에 따라 설치되지 않을 수 있음) - 전체 재계산에만 필요
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+REBUILD_AVAILABLE = np is not None
+
+# 유사도 계산에 포함할 최소 평가 수 (한 명만 평가한 애니는 유사도를 신뢰할 수 없음)
+MIN_ITEM_RATERS = 2
+# 함께 평가한 사용자가 적은 쌍의 유사도 축소 (sim * n / (n + SHRINKAGE))
+SIMILARITY_SHRINKAGE = 5.0
+# 유사도 블록 계산 시 한 번에 펼치는 (평가, 같은 사용자의 평가) 쌍 수 상한 (메모리 상한)
+SIMILARITY_PAIR_CHUNK = 4_000_000
+
+
+# ---- 데이터 적재 ----
+
+def _load_rated() -> List[Tuple[int, int, float]]:
+    return [
+        (row['user_id'], row['anime_id'], row['rating'])
+        for row in db.execute_query(
+            """
+            SELECT user_id, anime_id, rating FROM user_ratings
+            WHERE status = 'RATED' AND rating IS NOT NULL
+            """
+        )
+    ]
+
+
+def _load_user_ratings(user_id: int) -> Tuple[Dict[int, float], set]:
+    """Returns: ({anime_id: rating} RATED 평가, 평가/보고싶어요/관심없음 전체 anime_id 집합)"""
+    rows = db.execute_query(
+        "SELECT anime_id, rating, status FROM user_ratings WHERE user_id = ?",
+        (user_id,)
+    )
+    rated = {
+        row['anime_id']: row['rating'] for row in rows
+        if row['status'] == 'RATED' and row['rating'] is not None
+    }
+    return rated, {row['anime_id'] for row in rows}
+
+
+# ---- 점수 계산 (사용자 한 명) ----
+
+def _score_user(rated: Dict[int, float], neighbors: Dict[int, List[Tuple[int, float]]],
+                exclude: set, limit: int = RECOMMENDATIONS_PER_USER) -> List[Tuple[int, float, int]]:
+    """
+    평가한 애니의 유사 애니에 (평점 - 평균) * 유사도 가중합 → 예상 평점
+    Returns: [(anime_id, predicted_rating, 가장 크게 기여한 평가 애니 id)] 점수 내림차순
+    """
+    if not rated:
+        return []
+    mean = sum(rated.values()) / len(rated)
+
+    numerator: Dict[int, float] = {}
+    denominator: Dict[int, float] = {}
+    best_source: Dict[int, Tuple[float, int]] = {}
+    for source_id, rating in rated.items():
+        residual = rating - mean
+        for target_id, similarity in neighbors.get(source_id, ()):
+            if target_id in exclude:
+                continue
+            numerator[target_id] = numerator.get(target_id, 0.0) + similarity * residual
+            denominator[target_id] = denominator.get(target_id, 0.0) + similarity
+            contribution = similarity * rating
+            if contribution > best_source.get(target_id, (float('-inf'), 0))[0]:
+                best_source[target_id] = (contribution, source_id)
+
+    # 분모 + 1: 근거가 적은 후보의 예측값을 평균 쪽으로 축소
+    scored = [
+        (target_id, mean + numerator[target_id] / (denominator[target_id] + 1.0), best_source[target_id][1])
+        for target_id in numerator
+    ]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [(target_id, min(max(score, 0.5), 5.0), source_id) for target_id, score, source_id in scored[:limit]]
+
+
+def _cache_rows(user_id: int, scored: List[Tuple[int, float, int]]):
+    return [
+        (user_id, anime_id, round(score, 4), json.dumps({'based_on': source_id}))
+        for anime_id, score, source_id in scored
+    ]
+
+
+def _write_user_lists(lists: Dict[int, List[Tuple[int, float, int]]]):
+    """사용자별 추천 목록 교체 + 계산 시각 기록 (호출자가 트랜잭션 관리)"""
+    with db.get_connection() as conn:
+        conn.executemany(
+            "DELETE FROM recommendation_cache WHERE user_id = ?",
+            ((user_id,) for user_id in lists)
+        )
+        conn.executemany(
+            """
+            INSERT INTO recommendation_cache (user_id, anime_id, score, reason, created_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            (row for user_id, scored in lists.items() for row in _cache_rows(user_id, scored))
+        )
+        conn.executemany(
+            """
+            INSERT INTO recommendation_users (user_id, computed_at) VALUES (?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id) DO UPDATE SET computed_at = CURRENT_TIMESTAMP
+            """,
+            ((user_id,) for user_id in lists)
+        )
+
+
+# ---- 전체 재계산 ----
+
+def _co_rating_block(start: int, end: int, n_items: int, users, items, centered,
+                     user_ptr, item_order, item_ptr) -> Tuple:
+    """
+    애니 블록 [start, end) 과 전체 애니의 (중심화 평점 내적, 함께 평가한 사용자 수)
+    블록 애니를 평가한 사용자마다 그 사용자의 평가 행(CSR)을 펼쳐 누적 - 0 이 아닌 항만 계산
+    Returns: (dot, co_raters) 각각 (end - start) × n_items
+    """
+    size = (end - start) * n_items
+    dot = np.zeros(size, dtype=np.float64)
+    co_raters = np.zeros(size, dtype=np.float64)
+
+    entries = item_order[item_ptr[start]:item_ptr[end]]  # 블록 애니 평가 (user-major 배열 위치)
+    lengths = user_ptr[users[entries] + 1] - user_ptr[users[entries]]
+    ends = np.cumsum(lengths)
+    first = 0
+    while first < len(entries):
+        # 펼친 쌍이 SIMILARITY_PAIR_CHUNK 를 넘지 않게 나눠 처리 (한 항목은 최소 포함)
+        base = ends[first - 1] if first else 0
+        last = max(int(np.searchsorted(ends, base + SIMILARITY_PAIR_CHUNK, side='right')), first + 1)
+        chunk = entries[first:last]
+        counts = lengths[first:last]
+        total = int(counts.sum())
+
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        partners = np.repeat(user_ptr[users[chunk]], counts) + offsets
+        flat = np.repeat(items[chunk] - start, counts) * n_items + items[partners]
+        dot += np.bincount(flat, weights=np.repeat(centered[chunk], counts) * centered[partners], minlength=size)
+        co_raters += np.bincount(flat, minlength=size)
+        first = last
+
+    return dot.reshape(end - start, n_items), co_raters.reshape(end - start, n_items)
+
+
+def _compute_similarities(ratings: List[Tuple[int, int, float]]) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    adjusted cosine item-item 유사도, 애니별 상위 TOP_K_SIMILAR_ITEMS (양수만)
+    희소 행렬: 평가 배열을 사용자순(CSR) / 애니순 두 인덱스로 정렬해 0 이 아닌 항만 계산
+    메모리: 평가 수에 비례하는 배열 + 블록(RECOMMENDATION_BLOCK_SIZE × 애니) 결과 두 개
+    """
+    raters: Dict[int, int] = {}
+    for _, anime_id, _ in ratings:
+        raters[anime_id] = raters.get(anime_id, 0) + 1
+    anime_ids = sorted(anime_id for anime_id, count in raters.items() if count >= MIN_ITEM_RATERS)
+    if len(anime_ids) < 2:
+        return {}
+    user_ids = sorted({user_id for user_id, _, _ in ratings})
+    item_index = {anime_id: i for i, anime_id in enumerate(anime_ids)}
+    user_index = {user_id: i for i, user_id in enumerate(user_ids)}
+    n_users, n_items = len(user_ids), len(anime_ids)
+
+    # 사용자 평균 (전체 RATED 평가 기준)
+    all_users = np.array([user_index[u] for u, _, _ in ratings], dtype=np.int64)
+    all_values = np.array([r for _, _, r in ratings], dtype=np.float64)
+    means = np.bincount(all_users, weights=all_values, minlength=n_users) / \
+        np.maximum(np.bincount(all_users, minlength=n_users), 1)
+
+    users = np.array([user_index[u] for u, a, _ in ratings if a in item_index], dtype=np.int64)
+    items = np.array([item_index[a] for _, a, _ in ratings if a in item_index], dtype=np.int64)
+    values = np.array([r for _, a, r in ratings if a in item_index], dtype=np.float64)
+
+    # 사용자순 정렬 (CSR: user_ptr[u]..user_ptr[u + 1] 이 사용자 u 의 평가)
+    order = np.lexsort((items, users))
+    users, items = users[order], items[order]
+    centered = values[order] - means[users]
+    user_ptr = np.concatenate(([0], np.cumsum(np.bincount(users, minlength=n_users))))
+    # 애니순 인덱스 (item_order[item_ptr[i]..item_ptr[i + 1]] 이 애니 i 의 평가)
+    item_order = np.argsort(items, kind='stable')
+    item_ptr = np.concatenate(([0], np.cumsum(np.bincount(items, minlength=n_items))))
+
+    norms = np.sqrt(np.bincount(items, weights=centered * centered, minlength=n_items))
+    norms[norms == 0] = np.inf
+
+    k = min(TOP_K_SIMILAR_ITEMS, n_items - 1)
+    neighbors: Dict[int, List[Tuple[int, float]]] = {}
+    for start in range(0, n_items, RECOMMENDATION_BLOCK_SIZE):
+        end = min(start + RECOMMENDATION_BLOCK_SIZE, n_items)
+        dot, co_raters = _co_rating_block(
+            start, end, n_items, users, items, centered, user_ptr, item_order, item_ptr
+        )
+        similarity = dot / np.outer(norms[start:end], norms)
+        similarity *= co_raters / (co_raters + SIMILARITY_SHRINKAGE)
+        similarity[np.arange(end - start), np.arange(start, end)] = 0.0  # 자기 자신 제외
+
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_values = np.take_along_axis(similarity, top, axis=1)
+        for row in range(end - start):
+            pairs = [
+                (anime_ids[col], float(value))
+                for col, value in zip(top[row], top_values[row]) if value > 0
+            ]
+            if pairs:
+                pairs.sort(key=lambda pair: pair[1], reverse=True)
+                neighbors[anime_ids[start + row]] = pairs
+
+    return neighbors
+
+
+def rebuild_recommendations() -> Dict:
+    """
+    유사도 + 전체 사용자 추천 목록 재계산 (오프라인 작업)
+    Returns: {'anime': n, 'similar_pairs': n, 'users': n}
+    Raises: RuntimeError - NumPy 미설치
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to rebuild item similarities (pip install numpy)")
+
+    ratings = _load_rated()
+    neighbors = _compute_similarities(ratings)
+
+    by_user: Dict[int, Dict[int, float]] = {}
+    for user_id, anime_id, rating in ratings:
+        by_user.setdefault(user_id, {})[anime_id] = rating
+    seen: Dict[int, set] = {}
+    for row in db.execute_query("SELECT user_id, anime_id FROM user_ratings"):
+        seen.setdefault(row['user_id'], set()).add(row['anime_id'])
+
+    lists = {
+        user_id: _score_user(rated, neighbors, seen.get(user_id, set()))
+        for user_id, rated in by_user.items()
+        if len(rated) >= MIN_RATINGS_FOR_RECOMMENDATION
+    }
+
+    with db.transaction():
+        db.execute_update("DELETE FROM anime_similarity")
+        db.execute_update("DELETE FROM recommendation_cache")
+        db.execute_update("DELETE FROM recommendation_users")
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO anime_similarity (anime_id, similar_anime_id, similarity) VALUES (?, ?, ?)",
+                (
+                    (anime_id, similar_id, round(similarity, 6))
+                    for anime_id, pairs in neighbors.items()
+                    for similar_id, similarity in pairs
+                )
+            )
+        _write_user_lists(lists)
+
+    return {
+        'anime': len(neighbors),
+        'similar_pairs': sum(len(pairs) for pairs in neighbors.values()),
+        'users': len(lists),
+    }
+
+
+# ---- 증분 갱신 ----
+
+def _load_neighbors(anime_ids: List[int]) -> Dict[int, List[Tuple[int, float]]]:
+    if not anime_ids:
+        return {}
+    placeholders = ','.join('?' * len(anime_ids))
+    rows = db.execute_query(
+        f"""
+        SELECT anime_id, similar_anime_id, similarity FROM anime_similarity
+        WHERE anime_id IN ({placeholders})
+        """,
+        tuple(anime_ids)
+    )
+    neighbors: Dict[int, List[Tuple[int, float]]] = {}
+    for row in rows:
+        neighbors.setdefault(row['anime_id'], []).append((row['similar_anime_id'], row['similarity']))
+    return neighbors
+
+
+def refresh_user_recommendations(user_id: int) -> int:
+    """사용자 한 명의 추천 목록 재계산 (저장된 anime_similarity 사용). Returns: 추천 수"""
+    rated, seen = _load_user_ratings(user_id)
+    if len(rated) < MIN_RATINGS_FOR_RECOMMENDATION:
+        scored = []
+    else:
+        scored = _score_user(rated, _load_neighbors(list(rated)), seen)
+
+    with db.transaction():
+        _write_user_lists({user_id: scored})
+    return len(scored)
+
+
+def get_stale_user_ids(limit: Optional[int] = None) -> List[int]:
+    """마지막 계산 이후 평가가 바뀌었거나, 계산한 지 RECOMMENDATION_CACHE_DAYS 가 지난 사용자"""
+    limit_clause = f"LIMIT {int(limit)}" if limit else ""
+    rows = db.execute_query(
+        f"""
+        SELECT ur.user_id
+        FROM user_ratings ur
+        LEFT JOIN recommendation_users ru ON ru.user_id = ur.user_id
+        GROUP BY ur.user_id
+        HAVING SUM(ur.status = 'RATED' AND ur.rating IS NOT NULL) >= ?
+           AND (
+               MAX(ru.computed_at) IS NULL
+               OR MAX(ur.updated_at) > MAX(ru.computed_at)
+               OR MAX(ru.computed_at) < datetime('now', ?)
+           )
+        {limit_clause}
+        """,
+        (MIN_RATINGS_FOR_RECOMMENDATION, f'-{RECOMMENDATION_CACHE_DAYS} days')
+    )
+    return [row['user_id'] for row in rows]
+
+
+def is_recommendation_stale(user_id: int) -> bool:
+    """
+    사용자 추천 목록이 갱신 대상인지 (평가 수 충분 + 계산 전이거나 이후 평가가 바뀌었거나 오래됨)
+    user_ratings(user_id) 인덱스 범위 한 번 + recommendation_users PK 조회
+    """
+    row = db.execute_query(
+        """
+        SELECT
+            SUM(ur.status = 'RATED' AND ur.rating IS NOT NULL) as rated,
+            MAX(ur.updated_at) as last_rated_at,
+            (SELECT computed_at FROM recommendation_users WHERE user_id = ?) as computed_at,
+            (SELECT computed_at < datetime('now', ?) FROM recommendation_users WHERE user_id = ?) as expired
+        FROM user_ratings ur
+        WHERE ur.user_id = ?
+        """,
+        (user_id, f'-{RECOMMENDATION_CACHE_DAYS} days', user_id, user_id),
+        fetch_one=True
+    )
+    if not row['rated'] or row['rated'] < MIN_RATINGS_FOR_RECOMMENDATION:
+        return False
+    return row['computed_at'] is None or bool(row['expired']) or (row['last_rated_at'] or '') > row['computed_at']
+
+
+def refresh_stale_recommendations(limit: Optional[int] = None) -> Dict:
+    """평가가 바뀐 사용자들만 추천 목록 재계산. Returns: {'users': n, 'recommendations': n}"""
+    user_ids = get_stale_user_ids(limit)
+    total = 0
+    for user_id in user_ids:
+        total += refresh_user_recommendations(user_id)
+    return {'users': len(user_ids), 'recommendations': total}
+
+
+# ---- 조회 ----
+
+def get_recommendations(user_id: int, limit: int = 20) -> List[Dict]:
+    """
+    저장된 개인화 추천 (recommendation_cache(user_id, score) 인덱스 한 번 읽기)
+    계산 이후 평가/보고싶어요/관심없음 처리한 애니는 제외
+    """
+    rows = db.execute_query(
+        """
+        SELECT
+            a.id,
+            a.title_romaji,
+            a.title_english,
+            a.title_korean,
+            a.title_korean_official,
+            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url,
+            a.average_score,
+            rc.score as predicted_rating,
+            src.id as based_on_anime_id,
+            src.title_romaji as based_on_title_romaji,
+            src.title_korean as based_on_title_korean
+        FROM recommendation_cache rc
+        JOIN anime a ON a.id = rc.anime_id
+        LEFT JOIN anime src ON src.id = json_extract(rc.reason, '$.based_on')
+        WHERE rc.user_id = ?
+          AND NOT EXISTS (
+              SELECT 1 FROM user_ratings ur
+              WHERE ur.user_id = rc.user_id AND ur.anime_id = rc.anime_id
+          )
+        ORDER BY rc.score DESC
+        LIMIT ?
+        """,
+        (user_id, limit)
+    )
+    return [dict_from_row(row) for row in rows]
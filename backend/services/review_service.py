@@ -5,98 +5,102 @@ Review Service
 from typing import List, Optional
 from fastapi import HTTPException, status
 from database import db, dict_from_row
+from services.compatibility_service import invalidate_rating_vector
+from services.profile_analytics_service import invalidate_profile_analytics
 from models.review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse
 
 
 def create_review(user_id: int, review_data: ReviewCreate) -> ReviewResponse:
     """리뷰 생성"""
 
-    # 애니메이션 존재 확인
-    anime_exists = db.execute_query(
-        "SELECT id FROM anime WHERE id = ?",
-        (review_data.anime_id,),
-        fetch_one=True
-    )
-
-    if not anime_exists:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Anime not found"
+    # 리뷰/통계/activities 갱신을 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # 애니메이션 존재 확인
+        anime_exists = db.execute_query(
+            "SELECT id FROM anime WHERE id = ?",
+            (review_data.anime_id,),
+            fetch_one=True
         )
 
-    # 중복 확인
-    existing = db.execute_query(
-        "SELECT id FROM user_reviews WHERE user_id = ? AND anime_id = ?",
-        (user_id, review_data.anime_id),
-        fetch_one=True
-    )
-
-    if existing:
-        # 이미 리뷰가 있으면 업데이트
-        return update_review(
-            existing['id'],
-            user_id,
-            ReviewUpdate(
-                content=review_data.content,
-                title=review_data.title,
-                is_spoiler=review_data.is_spoiler
+        if not anime_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Anime not found"
             )
-        )
-
-    # 별점이 함께 제공된 경우 먼저 저장
-    rating_id = None
-    if review_data.rating is not None:
-        try:
-            from services.rating_service import rate_anime
-            from models.rating import RatingCreate, RatingStatus
 
-            # 별점 저장
-            rating_result = rate_anime(
-                user_id,
-                review_data.anime_id,
-                RatingCreate(rating=review_data.rating, status=RatingStatus.RATED)
-            )
-            rating_id = rating_result.id
-        except Exception as e:
-            # 별점 저장 실패해도 리뷰는 계속 진행 (rating_id 없이)
-            print(f"Warning: Failed to save rating: {e}")
-
-    # 기존 평점 ID 가져오기 (rating이 제공되지 않았거나 저장 실패한 경우)
-    if rating_id is None:
-        rating_row = db.execute_query(
-            "SELECT id FROM user_ratings WHERE user_id = ? AND anime_id = ?",
+        # 중복 확인
+        existing = db.execute_query(
+            "SELECT id FROM user_reviews WHERE user_id = ? AND anime_id = ?",
             (user_id, review_data.anime_id),
             fetch_one=True
         )
-        rating_id = rating_row['id'] if rating_row else None
 
-    # 리뷰 생성
-    review_id = db.execute_insert(
-        """
-        INSERT INTO user_reviews (
-            user_id, anime_id, rating_id, title, content, is_spoiler,
-            likes_count, created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        """,
-        (user_id, review_data.anime_id, rating_id, review_data.title,
-         review_data.content, 1 if review_data.is_spoiler else 0)
-    )
+        if existing:
+            # 이미 리뷰가 있으면 업데이트
+            return update_review(
+                existing['id'],
+                user_id,
+                ReviewUpdate(
+                    content=review_data.content,
+                    title=review_data.title,
+                    is_spoiler=review_data.is_spoiler
+                )
+            )
 
-    # 사용자 통계 업데이트 (리뷰 수)
-    from services.rating_service import _update_user_stats
-    _update_user_stats(user_id)
+        # 별점이 함께 제공된 경우 먼저 저장
+        rating_id = None
+        if review_data.rating is not None:
+            try:
+                from services.rating_service import rate_anime
+                from models.rating import RatingCreate, RatingStatus
+
+                # 별점 저장
+                rating_result = rate_anime(
+                    user_id,
+                    review_data.anime_id,
+                    RatingCreate(rating=review_data.rating, status=RatingStatus.RATED)
+                )
+                rating_id = rating_result.id
+            except Exception as e:
+                # 별점 저장 실패해도 리뷰는 계속 진행 (rating_id 없이)
+                print(f"Warning: Failed to save rating: {e}")
+
+        # 기존 평점 ID 가져오기 (rating이 제공되지 않았거나 저장 실패한 경우)
+        if rating_id is None:
+            rating_row = db.execute_query(
+                "SELECT id FROM user_ratings WHERE user_id = ? AND anime_id = ?",
+                (user_id, review_data.anime_id),
+                fetch_one=True
+            )
+            rating_id = rating_row['id'] if rating_row else None
 
-    # Update activity_time to current time (move to recent feed)
-    db.execute_update("""
-        UPDATE activities
-        SET activity_time = CURRENT_TIMESTAMP,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE activity_type = 'anime_rating'
-          AND user_id = ?
-          AND item_id = ?
-    """, (user_id, review_data.anime_id))
+        # 리뷰 생성
+        review_id = db.execute_insert(
+            """
+            INSERT INTO user_reviews (
+                user_id, anime_id, rating_id, title, content, is_spoiler,
+                likes_count, created_at, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            """,
+            (user_id, review_data.anime_id, rating_id, review_data.title,
+             review_data.content, 1 if review_data.is_spoiler else 0)
+        )
 
-    return get_review_by_id(review_id)
+        # 사용자 통계 업데이트 (리뷰 수)
+        from services.rating_service import _update_user_stats
+        _update_user_stats(user_id)
+
+        # Update activity_time to current time (move to recent feed)
+        db.execute_update("""
+            UPDATE activities
+            SET activity_time = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE activity_type = 'anime_rating'
+              AND user_id = ?
+              AND item_id = ?
+        """, (user_id, review_data.anime_id))
+
+        return get_review_by_id(review_id)
 
 
 def update_review(review_id: int, user_id: int, review_data: ReviewUpdate) -> ReviewResponse:
@@ -133,6 +137,8 @@ def update_review(review_id: int, user_id: int, review_data: ReviewUpdate) -> Re
             """,
             (review_data.rating, user_id, anime_id)
         )
+        invalidate_rating_vector(user_id)
+        invalidate_profile_analytics(user_id)
 
     # 수정할 필드만 업데이트
     update_fields = []
@@ -175,85 +181,89 @@ def update_review(review_id: int, user_id: int, review_data: ReviewUpdate) -> Re
 def delete_review(review_id: int, user_id: int) -> bool:
     """리뷰 삭제 (관련 댓글과 좋아요도 함께 삭제)"""
 
-    # 권한 확인
-    existing = db.execute_query(
-        "SELECT user_id FROM user_reviews WHERE id = ?",
-        (review_id,),
-        fetch_one=True
-    )
-
-    if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found"
+    # 리뷰/통계/activities 갱신을 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # 권한 확인
+        existing = db.execute_query(
+            "SELECT user_id FROM user_reviews WHERE id = ?",
+            (review_id,),
+            fetch_one=True
         )
 
-    if existing['user_id'] != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this review"
-        )
+        if not existing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review not found"
+            )
 
-    # 관련 댓글 삭제 (review_comments)
-    db.execute_update(
-        "DELETE FROM review_comments WHERE review_id = ? AND review_type = 'anime'",
-        (review_id,)
-    )
+        if existing['user_id'] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to delete this review"
+            )
 
-    # 관련 좋아요 삭제 (review_likes)
-    db.execute_update(
-        "DELETE FROM review_likes WHERE review_id = ?",
-        (review_id,)
-    )
+        # 관련 댓글 삭제 (review_comments)
+        db.execute_update(
+            "DELETE FROM review_comments WHERE review_id = ? AND review_type = 'anime'",
+            (review_id,)
+        )
 
-    # 리뷰 삭제
-    db.execute_update("DELETE FROM user_reviews WHERE id = ?", (review_id,))
+        # 관련 좋아요 삭제 (review_likes)
+        db.execute_update(
+            "DELETE FROM review_likes WHERE review_id = ?",
+            (review_id,)
+        )
 
-    # 사용자 통계 업데이트
-    from services.rating_service import _update_user_stats
-    _update_user_stats(user_id)
+        # 리뷰 삭제
+        db.execute_update("DELETE FROM user_reviews WHERE id = ?", (review_id,))
 
-    return True
+        # 사용자 통계 업데이트
+        from services.rating_service import _update_user_stats
+        _update_user_stats(user_id)
+
+        return True
 
 
 def delete_review_by_anime(user_id: int, anime_id: int) -> bool:
     """anime_id로 리뷰 삭제 (관련 댓글과 좋아요도 함께 삭제)"""
 
-    # 리뷰 찾기
-    existing = db.execute_query(
-        "SELECT id FROM user_reviews WHERE user_id = ? AND anime_id = ?",
-        (user_id, anime_id),
-        fetch_one=True
-    )
-
-    if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found"
+    # 리뷰/통계/activities 갱신을 한 번의 트랜잭션으로 처리
+    with db.transaction():
+        # 리뷰 찾기
+        existing = db.execute_query(
+            "SELECT id FROM user_reviews WHERE user_id = ? AND anime_id = ?",
+            (user_id, anime_id),
+            fetch_one=True
         )
 
-    review_id = existing['id']
+        if not existing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review not found"
+            )
 
-    # 관련 댓글 삭제 (review_comments)
-    db.execute_update(
-        "DELETE FROM review_comments WHERE review_id = ? AND review_type = 'anime'",
-        (review_id,)
-    )
+        review_id = existing['id']
 
-    # 관련 좋아요 삭제 (review_likes)
-    db.execute_update(
-        "DELETE FROM review_likes WHERE review_id = ?",
-        (review_id,)
-    )
+        # 관련 댓글 삭제 (review_comments)
+        db.execute_update(
+            "DELETE FROM review_comments WHERE review_id = ? AND review_type = 'anime'",
+            (review_id,)
+        )
+
+        # 관련 좋아요 삭제 (review_likes)
+        db.execute_update(
+            "DELETE FROM review_likes WHERE review_id = ?",
+            (review_id,)
+        )
 
-    # 리뷰 삭제
-    db.execute_update("DELETE FROM user_reviews WHERE id = ?", (review_id,))
+        # 리뷰 삭제
+        db.execute_update("DELETE FROM user_reviews WHERE id = ?", (review_id,))
 
-    # 사용자 통계 업데이트
-    from services.rating_service import _update_user_stats
-    _update_user_stats(user_id)
+        # 사용자 통계 업데이트
+        from services.rating_service import _update_user_stats
+        _update_user_stats(user_id)
 
-    return True
+        return True
 
 
 def get_review_by_id(review_id: int) -> Optional[ReviewResponse]:
@@ -1,45 +1,153 @@
 """
 Series Service
 시리즈 관계 조회 및 처리
+
+- anime_relation 의 SEQUEL / PREQUEL 관계를 메모리 프랜차이즈 그래프로 유지
+  - 서버 시작 시 생성, 크롤러(별도 프로세스)가 관계를 추가하면 주기적 fingerprint 확인으로 재생성
+  - 후속작 탐색은 요청당 DB 조회 한 번 (상세 정보), 순환 관계가 있어도 종료
+  - 목록의 season_number (PREQUEL 수 + 1) 도 그래프에서 조회
 """
-from typing import List, Dict
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+from config import FRANCHISE_GRAPH_CHECK_INTERVAL
 from database import db, dict_from_row
 
+# 후속작은 방영 시기 순 (season_year, season)
+SEQUEL_EDGES_QUERY = """
+    SELECT ar.anime_id, ar.related_anime_id
+    FROM anime_relation ar
+    JOIN anime a ON ar.related_anime_id = a.id
+    WHERE ar.relation_type = 'SEQUEL'
+    ORDER BY ar.anime_id, a.season_year ASC, a.season ASC
+"""
+PREQUEL_COUNTS_QUERY = """
+    SELECT anime_id, COUNT(*) as prequel_count
+    FROM anime_relation
+    WHERE relation_type = 'PREQUEL'
+    GROUP BY anime_id
+"""
+FINGERPRINT_QUERY = "SELECT COUNT(*) as relations, COALESCE(MAX(rowid), 0) as max_rowid FROM anime_relation"
+
+
+class FranchiseGraph:
+    """SEQUEL 인접 리스트 + PREQUEL 수 (season_number)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sequels: Dict[int, List[int]] = {}
+        self._prequel_counts: Dict[int, int] = {}
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self.ready = False
+
+    @staticmethod
+    def _read_fingerprint() -> Tuple[int, int]:
+        row = db.execute_query(FINGERPRINT_QUERY, fetch_one=True)
+        return row['relations'], row['max_rowid']
+
+    def build(self):
+        fingerprint = self._read_fingerprint()
+        sequels: Dict[int, List[int]] = {}
+        for row in db.execute_query(SEQUEL_EDGES_QUERY):
+            sequels.setdefault(row['anime_id'], []).append(row['related_anime_id'])
+        prequel_counts = {
+            row['anime_id']: row['prequel_count']
+            for row in db.execute_query(PREQUEL_COUNTS_QUERY)
+        }
+
+        with self._lock:
+            self._sequels = sequels
+            self._prequel_counts = prequel_counts
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            self.ready = True
+
+    def refresh_if_stale(self):
+        """확인 주기가 지났으면 anime_relation fingerprint 비교 후 바뀌었으면 재생성"""
+        if self.ready and time.monotonic() - self._checked_at < FRANCHISE_GRAPH_CHECK_INTERVAL:
+            return
+        if self.ready and self._read_fingerprint() == self._fingerprint:
+            self._checked_at = time.monotonic()
+            return
+        self.build()
+
+    def sequel_ids(self, anime_id: int) -> List[int]:
+        """
+        모든 후속작 ID (2기 -> 3기 -> 4기, 깊이 우선 / 방영 순)
+        이미 방문한 작품은 건너뜀 (순환 관계, 여러 경로로 이어진 작품)
+        """
+        self.refresh_if_stale()
+        with self._lock:
+            sequels = self._sequels
+        result = []
+        visited = {anime_id}
+        stack = list(reversed(sequels.get(anime_id, [])))
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+            result.append(current)
+            stack.extend(reversed(sequels.get(current, [])))
+        return result
+
+    def season_numbers(self, anime_ids: List[int]) -> Dict[int, int]:
+        """시즌 번호 (PREQUEL 수 + 1)"""
+        self.refresh_if_stale()
+        with self._lock:
+            return {anime_id: self._prequel_counts.get(anime_id, 0) + 1 for anime_id in anime_ids}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'anime_with_sequels': len(self._sequels),
+                'sequel_edges': sum(len(ids) for ids in self._sequels.values()),
+                'anime_with_prequels': len(self._prequel_counts),
+            }
+
+
+franchise_graph = FranchiseGraph()
+
+
+def build_franchise_graph() -> Dict:
+    """anime_relation 에서 프랜차이즈 그래프 (재)생성. Returns: 그래프 통계"""
+    franchise_graph.build()
+    return franchise_graph.stats()
+
+
+def get_season_numbers(anime_ids: List[int]) -> Dict[int, int]:
+    """여러 애니메이션의 시즌 번호. Returns: {anime_id: season_number}"""
+    return franchise_graph.season_numbers(anime_ids)
+
 
 def get_sequel_series(anime_id: int) -> List[Dict]:
     """
     현재 애니메이션의 후속작들 조회 (재귀적으로)
-    2기 -> 3기 -> 4기 식으로 모든 후속작을 찾음
+    2기 -> 3기 -> 4기 식으로 모든 후속작을 찾음 (그래프 탐색 후 상세 정보 한 번에 조회)
     """
-    sequels = []
-
-    def find_sequels(current_id: int):
-        # 현재 애니메이션의 직접적인 후속작 찾기
-        rows = db.execute_query(
-            """
-            SELECT
-                a.id,
-                a.title_romaji,
-                a.title_english,
-                a.title_korean,
-                a.title_korean_official,
-                COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url
-            FROM anime_relation ar
-            JOIN anime a ON ar.related_anime_id = a.id
-            WHERE ar.anime_id = ? AND ar.relation_type = 'SEQUEL'
-            ORDER BY a.season_year ASC, a.season ASC
-            """,
-            (current_id,)
-        )
-
-        for row in rows:
-            sequel_dict = dict_from_row(row)
-            sequels.append(sequel_dict)
-            # 재귀적으로 그 다음 후속작 찾기
-            find_sequels(sequel_dict['id'])
-
-    find_sequels(anime_id)
-    return sequels
+    sequel_ids = franchise_graph.sequel_ids(anime_id)
+    if not sequel_ids:
+        return []
+
+    placeholders = ','.join('?' * len(sequel_ids))
+    rows = db.execute_query(
+        f"""
+        SELECT
+            a.id,
+            a.title_romaji,
+            a.title_english,
+            a.title_korean,
+            a.title_korean_official,
+            COALESCE('/' || a.cover_image_local, a.cover_image_url) as cover_image_url
+        FROM anime a
+        WHERE a.id IN ({placeholders})
+        """,
+        tuple(sequel_ids)
+    )
+    by_id = {row['id']: dict_from_row(row) for row in rows}
+    return [by_id[sequel_id] for sequel_id in sequel_ids if sequel_id in by_id]
 
 
 def get_series_info(anime_id: int) -> Dict:
@@ -0,0 +1,142 @@
+"""
+테스트 공용 설정
+- 앱 모듈 import 전에 DATABASE_PATH 를 임시 파일로 지정 (실제 data/anime.db 사용 안 함)
+- fresh_db: 테스트마다 새 DB 파일 + data/schema.sql, data/migrations/*.sql, 이후 추가된 테이블
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BACKEND_DIR.parent / "data"
+
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="anipass-test-"), "anime.db")
+sys.path.insert(0, str(BACKEND_DIR))
+
+from database import db  # noqa: E402
+
+
+# data/schema.sql + migrations 이후 서비스 코드가 쓰는 테이블 (운영 DB 스키마 기준 최소 컬럼)
+EXTRA_SCHEMA = """
+    ALTER TABLE character ADD COLUMN name_korean TEXT;
+    ALTER TABLE user_stats ADD COLUMN total_character_ratings INTEGER DEFAULT 0;
+
+    CREATE TABLE character_ratings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        character_id INTEGER NOT NULL,
+        rating REAL,
+        status TEXT DEFAULT 'RATED',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, character_id)
+    );
+    CREATE TABLE character_reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        character_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        likes_count INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, character_id)
+    );
+    CREATE TABLE user_follows (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        follower_id INTEGER NOT NULL,
+        following_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(follower_id, following_id)
+    );
+    CREATE TABLE character_primary_anime (
+        character_id INTEGER PRIMARY KEY,
+        anime_id INTEGER NOT NULL
+    );
+    CREATE TABLE activities (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        activity_type TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        username TEXT NOT NULL,
+        display_name TEXT,
+        avatar_url TEXT,
+        otaku_score INTEGER DEFAULT 0,
+        item_id INTEGER,
+        item_title TEXT,
+        item_title_korean TEXT,
+        item_title_native TEXT,
+        item_image TEXT,
+        item_year INTEGER,
+        rating REAL,
+        review_title TEXT,
+        review_content TEXT,
+        is_spoiler BOOLEAN DEFAULT 0,
+        anime_id INTEGER,
+        anime_title TEXT,
+        anime_title_korean TEXT,
+        anime_title_native TEXT,
+        metadata TEXT,
+        activity_time DATETIME NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(activity_type, user_id, item_id)
+    );
+    CREATE TABLE activity_likes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        activity_id INTEGER,
+        user_id INTEGER NOT NULL,
+        activity_type TEXT,
+        activity_user_id INTEGER,
+        item_id INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(activity_id, user_id)
+    );
+    CREATE TABLE activity_comments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        activity_id INTEGER,
+        user_id INTEGER NOT NULL,
+        activity_type TEXT,
+        activity_user_id INTEGER,
+        item_id INTEGER,
+        parent_comment_id INTEGER,
+        content TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE activity_bookmarks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        activity_id INTEGER NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, activity_id)
+    );
+"""
+
+
+def _schema_scripts():
+    yield (DATA_DIR / "schema.sql").read_text(encoding="utf-8")
+    for path in sorted((DATA_DIR / "migrations").glob("*.sql")):
+        yield path.read_text(encoding="utf-8")
+    yield EXTRA_SCHEMA
+
+
+@pytest.fixture
+def fresh_db(tmp_path):
+    """테스트 전용 빈 DB (스키마만 생성)"""
+    db.pool.close_all()
+    db.db_path = db.pool.db_path = str(tmp_path / "anime.db")
+    with db.get_connection() as conn:
+        for script in _schema_scripts():
+            conn.executescript(script)
+    yield db
+    db.pool.close_all()
+
+
+def add_users(count: int, start: int = 1):
+    """users 행 추가 (username u{id})"""
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, 'x')",
+            [(i, f"u{i}", f"u{i}@example.com") for i in range(start, start + count)]
+        )
@@ -0,0 +1,94 @@
+"""activities.likes_count / comments_count 트리거 카운터 vs 원본 테이블 재계산"""
+import random
+
+from database import db
+from scripts.add_engagement_counters import ensure_engagement_counters, reconcile_engagement_counters
+from tests.conftest import add_users
+
+
+def _counters():
+    return {
+        row['id']: (row['likes_count'], row['comments_count'])
+        for row in db.execute_query("SELECT id, likes_count, comments_count FROM activities")
+    }
+
+
+def _recomputed():
+    return {
+        row['id']: (row['likes'], row['comments'])
+        for row in db.execute_query("""
+            SELECT a.id,
+                   (SELECT COUNT(*) FROM activity_likes al WHERE al.activity_id = a.id) as likes,
+                   (SELECT COUNT(*) FROM activity_comments ac WHERE ac.activity_id = a.id) as comments
+            FROM activities a
+        """)
+    }
+
+
+def _add_activities(count):
+    for i in range(1, count + 1):
+        db.execute_insert(
+            "INSERT INTO activities (activity_type, user_id, username, item_id, activity_time) "
+            "VALUES ('user_post', 1, 'u1', ?, ?)",
+            (i, f"2024-01-01 00:00:{i:02d}")
+        )
+
+
+def test_backfill_matches_existing_rows(fresh_db):
+    add_users(3)
+    _add_activities(3)
+    db.execute_insert("INSERT INTO activity_likes (activity_id, user_id) VALUES (1, 2)")
+    db.execute_insert("INSERT INTO activity_comments (activity_id, user_id, content) VALUES (1, 2, 'a')")
+    db.execute_insert("INSERT INTO activity_comments (activity_id, user_id, content) VALUES (3, 3, 'b')")
+
+    ensure_engagement_counters()
+
+    assert _counters() == _recomputed() == {1: (1, 1), 2: (0, 0), 3: (0, 1)}
+
+
+def test_triggers_match_recompute_after_random_writes(fresh_db):
+    ensure_engagement_counters()
+    add_users(20)
+    _add_activities(30)
+
+    rng = random.Random(7)
+    likes = set()
+    comment_ids = []
+    for _ in range(600):
+        op = rng.random()
+        activity_id = rng.randint(1, 30)
+        user_id = rng.randint(1, 20)
+        if op < 0.35:
+            if (activity_id, user_id) not in likes:
+                db.execute_insert(
+                    "INSERT INTO activity_likes (activity_id, user_id) VALUES (?, ?)", (activity_id, user_id)
+                )
+                likes.add((activity_id, user_id))
+        elif op < 0.5 and likes:
+            activity_id, user_id = rng.choice(sorted(likes))
+            db.execute_update(
+                "DELETE FROM activity_likes WHERE activity_id = ? AND user_id = ?", (activity_id, user_id)
+            )
+            likes.discard((activity_id, user_id))
+        elif op < 0.85:
+            comment_ids.append(db.execute_insert(
+                "INSERT INTO activity_comments (activity_id, user_id, content) VALUES (?, ?, 'c')",
+                (activity_id, user_id)
+            ))
+        elif comment_ids:
+            comment_id = comment_ids.pop(rng.randrange(len(comment_ids)))
+            db.execute_update("DELETE FROM activity_comments WHERE id = ?", (comment_id,))
+
+    assert _counters() == _recomputed()
+    assert reconcile_engagement_counters() == {'likes_fixed': 0, 'comments_fixed': 0}
+
+
+def test_reconcile_fixes_drift(fresh_db):
+    ensure_engagement_counters()
+    add_users(2)
+    _add_activities(2)
+    db.execute_insert("INSERT INTO activity_likes (activity_id, user_id) VALUES (1, 2)")
+    db.execute_update("UPDATE activities SET likes_count = 5, comments_count = 2 WHERE id = 2")
+
+    assert reconcile_engagement_counters() == {'likes_fixed': 1, 'comments_fixed': 1}
+    assert _counters() == _recomputed()
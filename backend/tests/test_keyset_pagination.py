@@ -0,0 +1,111 @@
+"""Keyset(cursor) 페이지네이션 - 같은 시각 활동이 많아도 중복/누락 없음"""
+import random
+
+import pytest
+
+from database import db
+from scripts.add_engagement_counters import ensure_engagement_counters
+from scripts.create_home_timeline import ensure_home_timeline
+from services.activity_service import get_activities
+from services.feed_service import get_global_feed, get_following_feed, get_user_feed, get_next_feed_cursor
+from tests.conftest import add_users
+from utils.pagination import encode_cursor, decode_cursor
+
+ACTIVITY_TYPES = ['user_post', 'rank_promotion', 'anime_rating']
+
+
+@pytest.fixture
+def feed_db(fresh_db):
+    ensure_engagement_counters()
+    ensure_home_timeline()
+    add_users(6)
+    for follower_id, following_id in [(1, 2), (1, 3), (1, 4), (5, 2)]:
+        db.execute_insert(
+            "INSERT INTO user_follows (follower_id, following_id) VALUES (?, ?)", (follower_id, following_id)
+        )
+
+    rng = random.Random(5)
+    for item_id in range(1, 241):
+        # 시각을 5개로 제한 → 페이지 경계마다 같은 activity_time 이 걸침
+        _add_activity(rng.choice(ACTIVITY_TYPES), rng.randint(2, 6), item_id,
+                      f"2024-01-0{rng.randint(1, 5)} 12:00:00")
+    return fresh_db
+
+
+def _add_activity(activity_type, user_id, item_id, activity_time):
+    return db.execute_insert(
+        "INSERT INTO activities (activity_type, user_id, username, item_id, activity_time) VALUES (?, ?, ?, ?, ?)",
+        (activity_type, user_id, f"u{user_id}", item_id, activity_time)
+    )
+
+
+def _expected_order(where="1=1", params=()):
+    return [
+        row['id'] for row in db.execute_query(
+            f"SELECT id FROM activities a WHERE {where} ORDER BY activity_time DESC, id DESC", params
+        )
+    ]
+
+
+def _page_through(fetch_page, page_size=17):
+    seen = []
+    cursor = None
+    while True:
+        activities = fetch_page(page_size, cursor)
+        seen.extend(a['id'] for a in activities)
+        cursor = get_next_feed_cursor(activities, page_size)
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2024-01-01 12:00:00", 42)
+    assert decode_cursor(cursor, 2) == ["2024-01-01 12:00:00", 42]
+    assert decode_cursor(None, 2) is None
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 3)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!", 2)
+
+
+def test_activities_cursor_pages_match_full_order(feed_db):
+    seen = []
+    cursor = None
+    while True:
+        page = get_activities(db, limit=13, cursor=cursor)
+        if cursor is not None:
+            assert page['total'] is None  # 커서 페이지는 COUNT(*) 생략
+        seen.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == _expected_order()
+    assert len(seen) == len(set(seen))
+
+
+def test_activities_cursor_skips_rows_inserted_after_first_page(feed_db):
+    first = get_activities(db, limit=20)
+    # 첫 페이지 이후 가장 최근 시각에 새 활동 → offset 방식이면 다음 페이지에 중복이 생김
+    _add_activity('user_post', 2, 999, "2024-01-09 00:00:00")
+    second = get_activities(db, limit=20, cursor=first['next_cursor'])
+
+    first_ids = [item['id'] for item in first['items']]
+    second_ids = [item['id'] for item in second['items']]
+    assert not set(first_ids) & set(second_ids)
+    assert first_ids + second_ids == _expected_order()[1:41]
+
+
+def test_global_feed_cursor_pages_match_full_order(feed_db):
+    seen = _page_through(lambda limit, cursor: get_global_feed(limit=limit, cursor=cursor))
+    assert seen == _expected_order()
+
+
+def test_following_feed_cursor_pages_match_full_order(feed_db):
+    seen = _page_through(lambda limit, cursor: get_following_feed(1, limit=limit, cursor=cursor))
+    assert seen == _expected_order("a.user_id IN (2, 3, 4)")
+
+
+def test_user_feed_cursor_pages_have_no_duplicates(feed_db):
+    seen = _page_through(lambda limit, cursor: get_user_feed(3, 1, limit=limit, cursor=cursor))
+    assert seen == _expected_order("a.user_id = ?", (3,))
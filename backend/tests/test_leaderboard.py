@@ -0,0 +1,122 @@
+"""리더보드 순서 통계 구조 vs 정렬된 리스트"""
+import random
+from bisect import bisect_left
+
+import pytest
+
+from database import db
+from services import leaderboard_service
+from services.leaderboard_service import Leaderboard, OrderedScores
+from services.rating_service import RANK_MIN_SCORES, _get_rank_info
+from tests.conftest import add_users
+
+
+@pytest.fixture
+def small_buckets(monkeypatch):
+    # 버킷 분할/제거 경로까지 타도록 작은 버킷, 주기 확인으로 DB 에서 재생성되지 않도록
+    monkeypatch.setattr(leaderboard_service, 'BUCKET_SIZE', 8)
+    monkeypatch.setattr(leaderboard_service, 'LEADERBOARD_CHECK_INTERVAL', float('inf'))
+
+
+def _assert_same(order: OrderedScores, expected: list):
+    assert len(order) == len(expected)
+    assert [order.at(i) for i in range(len(expected))] == expected
+    assert order.slice(0, len(expected)) == expected
+    for start in range(0, len(expected), 7):
+        assert order.slice(start, start + 11) == expected[start:start + 11]
+
+
+def test_ordered_scores_matches_sorted_list(small_buckets):
+    rng = random.Random(3)
+    keys = {(-rng.randint(0, 50), user_id) for user_id in range(1, 60)}
+    order = OrderedScores(list(keys))
+    expected = sorted(keys)
+    _assert_same(order, expected)
+
+    for step in range(2000):
+        if expected and rng.random() < 0.45:
+            key = rng.choice(expected)
+            assert order.remove(key)
+            expected.remove(key)
+        else:
+            key = (-rng.randint(0, 50), rng.randint(1, 500))
+            if key in keys:
+                continue
+            order.add(key)
+            expected.insert(bisect_left(expected, key), key)
+        keys = set(expected)
+
+        probe = (-rng.randint(0, 50),)
+        assert order.count_below(probe) == bisect_left(expected, probe)
+        if step % 50 == 0:
+            _assert_same(order, expected)
+
+    _assert_same(order, expected)
+    assert not order.remove((1, 10 ** 6))
+    with pytest.raises(IndexError):
+        order.at(len(expected))
+
+
+def _expected_ranking(scores: dict):
+    ordered = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [
+        (user_id, score, 1 + sum(1 for other in scores.values() if other > score))
+        for user_id, score in ordered
+    ]
+
+
+def test_leaderboard_matches_sorted_scores(fresh_db, small_buckets):
+    rng = random.Random(9)
+    add_users(40)
+    scores = {user_id: rng.choice([0, 5, 12, 12, 30, 80, 200, 450]) for user_id in range(1, 41)}
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO user_stats (user_id, otaku_score) VALUES (?, ?)", list(scores.items())
+        )
+
+    board = Leaderboard()
+    board.build()
+    assert board.top(100) == _expected_ranking(scores)
+
+    # 쓰기 경로와 같은 update_score 로 점수 변경 (DB 재조회 없이 반영되는지)
+    for _ in range(300):
+        user_id = rng.randint(1, 45)
+        scores[user_id] = rng.choice([0, 5, 12, 30, 80, 200, 450, 1000])
+        board.update_score(user_id, scores[user_id])
+
+    expected = _expected_ranking(scores)
+    assert board.top(100) == expected
+    assert board.top(10, offset=15) == expected[15:25]
+
+    for position, (user_id, score, rank) in enumerate(expected):
+        info = board.position(user_id, radius=2)
+        assert (info['otaku_score'], info['rank'], info['position']) == (score, rank, position + 1)
+        assert info['total_users'] == len(scores)
+        below = sum(1 for other in scores.values() if other < score)
+        assert info['percentile'] == round(100 * below / len(scores), 1)
+        assert info['neighbors'] == expected[max(0, position - 2):position + 3]
+
+    level_counts = [0] * len(RANK_MIN_SCORES)
+    for score in scores.values():
+        level_counts[_get_rank_info(score)[1] - 1] += 1
+    assert [row['count'] for row in board.level_counts()] == level_counts
+    assert board.position(10 ** 6) is None
+
+
+def test_score_change_applies_only_after_commit(fresh_db, small_buckets):
+    add_users(2)
+    with db.get_connection() as conn:
+        conn.executemany("INSERT INTO user_stats (user_id, otaku_score) VALUES (?, ?)", [(1, 10), (2, 20)])
+    board = Leaderboard()
+    board.build()
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.after_commit(lambda: board.update_score(1, 500))
+            raise RuntimeError("rollback")
+    assert board.position(1)['rank'] == 2
+
+    with db.transaction():
+        db.after_commit(lambda: board.update_score(1, 500))
+        assert board.position(1)['rank'] == 2  # 커밋 전에는 그대로
+    assert board.position(1)['rank'] == 1
@@ -0,0 +1,83 @@
+"""평가 페이지 후보 큐 - 보충을 거쳐도 한 바퀴 안에서 같은 애니가 다시 나오지 않음"""
+import pytest
+
+from database import db
+from scripts.create_rating_candidate_queue import ensure_rating_candidate_queue
+from services import rating_page_service
+from services.rating_page_service import get_anime_for_rating, refill_anime_candidate_queue
+from tests.conftest import add_users
+
+ANIME = 100
+REFILL_AT = 10
+
+
+@pytest.fixture
+def queue_db(fresh_db, monkeypatch):
+    # 큐 크기를 후보 수보다 작게 → 한 바퀴 도는 동안 여러 번 보충
+    monkeypatch.setattr(rating_page_service, 'RATING_QUEUE_SIZE', 30)
+    monkeypatch.setattr(rating_page_service, 'RATING_QUEUE_TIER_SIZE', 10)
+    ensure_rating_candidate_queue()
+    add_users(1)
+    _add_anime(range(1, ANIME + 1))
+    return fresh_db
+
+
+def _add_anime(anime_ids):
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO anime (id, title_romaji, popularity) VALUES (?, ?, ?)",
+            [(anime_id, f"Anime {anime_id}", 10000 - anime_id) for anime_id in anime_ids]
+        )
+
+
+def _next_page(user_id, limit=7):
+    """api.rating_pages.get_anime_to_rate 와 같은 순서: 페이지 → (필요하면) 보충"""
+    page = get_anime_for_rating(user_id, limit)
+    if page['remaining'] < REFILL_AT and not page['cycle_complete']:
+        refill_anime_candidate_queue(user_id)
+    return [item['id'] for item in page['items']]
+
+
+def _serve(user_id, count):
+    served = []
+    while len(served) < count:
+        ids = _next_page(user_id)
+        assert ids
+        served.extend(ids)
+    return served
+
+
+def test_no_repeats_across_refills(queue_db):
+    served = _serve(1, ANIME)
+
+    first_cycle = served[:ANIME]
+    assert len(set(first_cycle)) == ANIME
+    assert set(first_cycle) == set(range(1, ANIME + 1))
+
+
+def test_next_cycle_starts_after_all_candidates_shown(queue_db):
+    served = _serve(1, ANIME + 20)
+
+    assert len(set(served[:ANIME])) == ANIME
+    # 두 번째 바퀴도 자체적으로는 중복 없음
+    second_cycle = served[ANIME:]
+    assert len(set(second_cycle)) == len(second_cycle)
+
+
+def test_rated_and_new_anime_during_cycle(queue_db):
+    served = _serve(1, 20)
+    queued_not_shown = [anime_id for anime_id in range(1, ANIME + 1) if anime_id not in served][:5]
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO user_ratings (user_id, anime_id, rating, status) VALUES (1, ?, 4.0, 'RATED')",
+            [(anime_id,) for anime_id in queued_not_shown]
+        )
+    _add_anime(range(ANIME + 1, ANIME + 6))
+
+    expected = set(range(1, ANIME + 6)) - set(queued_not_shown)
+    served += _serve(1, len(expected) - len(served))
+
+    # 평가한 애니는 건너뛰고, 새로 추가된 애니는 이번 바퀴 보충 때 들어옴
+    first_cycle = served[:len(expected)]
+    assert len(first_cycle) == len(set(first_cycle))
+    assert set(first_cycle) == expected
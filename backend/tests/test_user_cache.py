@@ -0,0 +1,35 @@
+"""통계 변경 시 인증 사용자 캐시 무효화 (utils/user_cache.py) - 커밋 후에만"""
+from types import SimpleNamespace
+
+import pytest
+
+from database import db
+from scripts.create_user_stats_counters import ensure_user_stats_counters
+from services.rating_service import _update_user_stats
+from tests.conftest import add_users
+from utils.user_cache import cache_user, clear_user_cache, get_cached_user
+
+
+@pytest.fixture
+def cached_user(fresh_db):
+    add_users(1)
+    ensure_user_stats_counters()
+    clear_user_cache()
+    cache_user('token-1', SimpleNamespace(id=1))
+    yield
+    clear_user_cache()
+
+
+def test_stats_change_invalidates_after_commit(cached_user):
+    with db.transaction():
+        _update_user_stats(1)
+        assert get_cached_user('token-1') is not None
+    assert get_cached_user('token-1') is None
+
+
+def test_rollback_keeps_cached_user(cached_user):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            _update_user_stats(1)
+            raise RuntimeError('rollback')
+    assert get_cached_user('token-1') is not None
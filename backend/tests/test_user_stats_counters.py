@@ -0,0 +1,123 @@
+"""user_stats 트리거 증분 갱신 vs 원본 테이블 재계산 (scripts/create_user_stats_counters.py)"""
+import random
+
+from database import db
+from scripts.create_user_stats_counters import ensure_user_stats_counters, verify_user_stats
+from tests.conftest import add_users
+
+USERS = 8
+ANIME = 15
+CHARACTERS = 10
+GENRES = ['Action', 'Comedy', 'Drama', 'Romance']
+
+
+def _seed_catalog():
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO anime (id, title_romaji, episodes, duration) VALUES (?, ?, ?, ?)",
+            [(i, f"Anime {i}", 12 + i, None if i % 4 == 0 else 24) for i in range(1, ANIME + 1)]
+        )
+        conn.executemany("INSERT INTO genre (id, name) VALUES (?, ?)", list(enumerate(GENRES, 1)))
+        conn.executemany(
+            "INSERT INTO anime_genre (anime_id, genre_id) VALUES (?, ?)",
+            [(i, g) for i in range(1, ANIME + 1) for g in range(1, len(GENRES) + 1) if (i + g) % 3 == 0]
+        )
+        conn.executemany(
+            "INSERT INTO character (id, name_full) VALUES (?, ?)",
+            [(i, f"Character {i}") for i in range(1, CHARACTERS + 1)]
+        )
+
+
+def _assert_no_drift():
+    report = verify_user_stats()
+    assert report['users_drifted'] == 0, report['samples']
+    assert report['genre_tallies_drifted'] == 0
+
+
+def test_initial_rebuild_matches_existing_rows(fresh_db):
+    add_users(2)
+    _seed_catalog()
+    db.execute_insert("INSERT INTO user_ratings (user_id, anime_id, rating, status) VALUES (1, 1, 4.5, 'RATED')")
+    db.execute_insert("INSERT INTO user_ratings (user_id, anime_id, status) VALUES (1, 2, 'WANT_TO_WATCH')")
+    db.execute_insert("INSERT INTO character_ratings (user_id, character_id, rating) VALUES (2, 1, 3.0)")
+
+    ensure_user_stats_counters()
+
+    _assert_no_drift()
+    stats = db.execute_query("SELECT * FROM user_stats WHERE user_id = 1", fetch_one=True)
+    assert (stats['total_rated'], stats['total_want_to_watch'], stats['otaku_score']) == (1, 1, 2)
+    assert stats['rank_level'] is not None
+
+
+def test_triggers_match_recompute_after_random_writes(fresh_db):
+    add_users(USERS)
+    _seed_catalog()
+    ensure_user_stats_counters()
+
+    rng = random.Random(11)
+    for _ in range(800):
+        user_id = rng.randint(1, USERS)
+        anime_id = rng.randint(1, ANIME)
+        character_id = rng.randint(1, CHARACTERS)
+        op = rng.random()
+        if op < 0.3:
+            status = rng.choice(['RATED', 'RATED', 'WANT_TO_WATCH', 'PASS'])
+            rating = rng.choice([1.0, 2.5, 3.5, 4.0, 5.0]) if status == 'RATED' else None
+            db.execute_update(
+                """
+                INSERT INTO user_ratings (user_id, anime_id, rating, status) VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, anime_id) DO UPDATE SET rating = excluded.rating, status = excluded.status
+                """,
+                (user_id, anime_id, rating, status)
+            )
+        elif op < 0.4:
+            db.execute_update(
+                "DELETE FROM user_ratings WHERE user_id = ? AND anime_id = ?", (user_id, anime_id)
+            )
+        elif op < 0.55:
+            db.execute_update(
+                """
+                INSERT INTO character_ratings (user_id, character_id, rating) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, character_id) DO UPDATE SET rating = excluded.rating
+                """,
+                (user_id, character_id, rng.choice([2.0, 4.5]))
+            )
+        elif op < 0.6:
+            db.execute_update(
+                "DELETE FROM character_ratings WHERE user_id = ? AND character_id = ?", (user_id, character_id)
+            )
+        elif op < 0.7:
+            db.execute_update(
+                "INSERT OR IGNORE INTO user_reviews (user_id, anime_id, content) VALUES (?, ?, 'review')",
+                (user_id, anime_id)
+            )
+        elif op < 0.75:
+            db.execute_update(
+                "DELETE FROM user_reviews WHERE user_id = ? AND anime_id = ?", (user_id, anime_id)
+            )
+        elif op < 0.82:
+            db.execute_update(
+                "INSERT OR IGNORE INTO character_reviews (user_id, character_id, content) VALUES (?, ?, 'review')",
+                (user_id, character_id)
+            )
+        elif op < 0.85:
+            db.execute_update(
+                "DELETE FROM character_reviews WHERE user_id = ? AND character_id = ?", (user_id, character_id)
+            )
+        elif op < 0.9:
+            db.execute_update(
+                "UPDATE anime SET episodes = ?, duration = ? WHERE id = ?",
+                (rng.randint(1, 50), rng.choice([None, 12, 24]), anime_id)
+            )
+        elif op < 0.95:
+            db.execute_update(
+                "INSERT OR IGNORE INTO anime_genre (anime_id, genre_id) VALUES (?, ?)",
+                (anime_id, rng.randint(1, len(GENRES)))
+            )
+        else:
+            db.execute_update(
+                "DELETE FROM anime_genre WHERE anime_id = ? AND genre_id = ?",
+                (anime_id, rng.randint(1, len(GENRES)))
+            )
+
+    _assert_no_drift()
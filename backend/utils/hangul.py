@@ -0,0 +1,78 @@
+"""
+Hangul utilities
+한글 음절 자모 분해 / 초성 추출 (자동완성용)
+"""
+import unicodedata
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+JUNGSUNG = [
+    'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ',
+    'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ',
+]
+JONGSUNG = [
+    '', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+    'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+
+# 겹받침/이중모음은 입력 순서대로 낱자로 분해 ("갈" + "ㅂ" → "갋" 도 "갈비"의 접두어가 되도록)
+COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ',
+    'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+def is_hangul_syllable(ch: str) -> bool:
+    return HANGUL_BASE <= ord(ch) <= HANGUL_LAST
+
+
+def normalize(text: str) -> str:
+    """NFC 정규화 + 소문자 (macOS 등에서 들어오는 NFD 한글 처리)"""
+    return unicodedata.normalize('NFC', text or '').lower()
+
+
+def decompose(text: str) -> str:
+    """
+    한글 음절을 낱자(호환 자모)로 분해, 한글이 아닌 문자는 그대로
+    예: "귀멸" → "ㄱㅜㅣㅁㅕㄹ"
+    """
+    result = []
+    for ch in text:
+        if is_hangul_syllable(ch):
+            offset = ord(ch) - HANGUL_BASE
+            cho, rest = divmod(offset, 21 * 28)
+            jung, jong = divmod(rest, 28)
+            for jamo in (CHOSUNG[cho], JUNGSUNG[jung], JONGSUNG[jong]):
+                if jamo:
+                    result.append(COMPOUND_JAMO.get(jamo, jamo))
+        else:
+            result.append(COMPOUND_JAMO.get(ch, ch))
+    return ''.join(result)
+
+
+def chosung(text: str) -> str:
+    """
+    한글 음절을 초성으로 변환, 한글이 아닌 문자는 그대로
+    예: "귀멸의 칼날" → "ㄱㅁㅇ ㅋㄴ"
+    """
+    return ''.join(
+        CHOSUNG[(ord(ch) - HANGUL_BASE) // (21 * 28)] if is_hangul_syllable(ch) else ch
+        for ch in text
+    )
+
+
+def has_hangul(text: str) -> bool:
+    return any(is_hangul_syllable(ch) for ch in text)
+
+
+def is_chosung_query(text: str) -> bool:
+    """초성(자음)만으로 이루어진 검색어인지 (예: "ㄱㅁㅇㅋㄴ")"""
+    return bool(text) and all(ch in CHOSUNG_SET for ch in text)
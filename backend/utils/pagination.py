@@ -0,0 +1,34 @@
+"""
+Pagination utilities
+Keyset(cursor) 페이지네이션용 불투명 커서 인코딩/디코딩
+"""
+import base64
+import json
+from typing import Any, List, Optional
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps(list(values), separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """
+    커서 디코딩
+    Returns: 정렬 키 값 리스트 (cursor가 없으면 None)
+    Raises: ValueError - 잘못된 커서
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+
+    return values
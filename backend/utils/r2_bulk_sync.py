@@ -0,0 +1,236 @@
+"""
+R2 Bulk Sync
+대량 이미지 업로드 엔진 (커버/캐릭터/성우 이미지 동기화 스크립트용)
+
+- 고정 크기 워커 풀 + 하나의 공유 S3 클라이언트 (boto3 클라이언트는 thread-safe)
+- 변경 없는 객체 스킵: 버킷 목록의 ETag(단일 PUT = MD5) 와 내용 MD5 비교
+  - 내려받아야 내용을 알 수 있는 항목(fetch)은 원격에 이미 있으면 다운로드 없이 스킵
+- 재개 체크포인트: 완료된 key → md5 를 JSON 파일로 주기적으로 저장, 재실행 시 스킵
+- 처리량 보고: 업로드/스킵/실패 수, 바이트, objects/s, MB/s
+- client / bucket 을 주입할 수 있어 로컬 S3 호환 서버(MinIO 등)로 테스트 가능
+- 외부 CDN(AniList) 다운로드는 워커 수와 무관하게 RateLimiter 로 요청 간격 제한 (fetch 안에서 wait)
+
+항목 형식 (dict):
+    {
+        'key': 'images/characters/1.jpg',          # 필수
+        'data': b'...' 또는 '/local/path.jpg',      # data / fetch 중 하나
+        'fetch': lambda: bytes | None,              # 필요할 때만 호출 (다운로드)
+        'content_type': 'image/jpeg',               # 생략 시 파일명으로 추정
+        'on_synced': lambda key: None,              # 업로드 완료 또는 이미 최신일 때 호출 (DB 갱신 등)
+    }
+
+사용 예:
+    syncer = R2BulkSync(workers=8, checkpoint_path='data/r2_sync_characters.checkpoint.json')
+    stats = syncer.run(items, prefixes=['images/characters/'])
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils import r2_object_index
+from utils.r2_storage import get_r2_client, R2_BUCKET_NAME
+
+CACHE_CONTROL = 'public, max-age=31536000'  # upload_to_r2 와 동일 (1 year cache)
+DEFAULT_WORKERS = 8
+CHECKPOINT_EVERY = 50
+PROGRESS_EVERY = 100
+
+
+def _md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+class RateLimiter:
+    """워커 스레드 간 공유 요청 간격 제한 (초당 per_second 회) - 호출마다 다음 슬롯을 예약하고 그때까지 대기"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            slot = max(time.monotonic(), self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class R2BulkSync:
+    """bounded worker pool 기반 R2 대량 업로드"""
+
+    def __init__(self, client=None, bucket: str = R2_BUCKET_NAME, workers: int = DEFAULT_WORKERS,
+                 checkpoint_path: Optional[str] = None, overwrite_fetched: bool = False,
+                 log: Callable[[str], None] = print):
+        self.client = client or get_r2_client()
+        self.bucket = bucket
+        self.workers = max(1, workers)
+        self.checkpoint_path = checkpoint_path
+        self.overwrite_fetched = overwrite_fetched
+        self.log = log
+
+        self._lock = threading.Lock()
+        self._done: Dict[str, str] = self._load_checkpoint()
+        self._remote: Dict[str, str] = {}
+        self._since_checkpoint = 0
+        self._stats = {'uploaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+        self.errors: List[Dict] = []
+
+    # ---- checkpoint ----
+
+    def _load_checkpoint(self) -> Dict[str, str]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        # 다른 버킷의 체크포인트는 무시
+        if checkpoint.get('bucket') != self.bucket:
+            return {}
+        return checkpoint.get('done', {})
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        with self._lock:
+            snapshot = dict(self._done)
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'bucket': self.bucket, 'done': snapshot}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # ---- remote state ----
+
+    def load_remote_etags(self, prefixes: Iterable[str]) -> int:
+        """버킷 목록으로 key → ETag(MD5) 적재 (HEAD 요청 대신 1000개 단위 페이지). Returns: 객체 수"""
+        paginator = self.client.get_paginator('list_objects_v2')
+        for prefix in prefixes:
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    self._remote[obj['Key']] = obj.get('ETag', '').strip('"')
+        return len(self._remote)
+
+    # ---- per item ----
+
+    def _is_current(self, key: str, digest: Optional[str]) -> bool:
+        """업로드가 필요 없는지 (digest 가 None 이면 내용을 모르는 fetch 항목)"""
+        if digest is None:
+            return not self.overwrite_fetched and (key in self._done or key in self._remote)
+        return self._done.get(key) == digest or self._remote.get(key) == digest
+
+    def _read(self, item: Dict) -> Optional[bytes]:
+        data = item.get('data')
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                return f.read()
+        if data is not None:
+            return data
+        return item['fetch']()
+
+    def _synced(self, item: Dict, result: str) -> str:
+        if item.get('on_synced'):
+            item['on_synced'](item['key'])
+        return result
+
+    def _process(self, item: Dict) -> str:
+        key = item['key']
+
+        # 내용을 알기 전에 스킵 가능한 경우 (다운로드 생략)
+        if 'data' not in item and self._is_current(key, None):
+            return self._synced(item, 'skipped')
+
+        data = self._read(item)
+        if not data:
+            raise ValueError("empty content")
+
+        digest = _md5(data)
+        if self._is_current(key, digest):
+            with self._lock:
+                self._done[key] = digest
+            return self._synced(item, 'skipped')
+
+        content_type = item.get('content_type')
+        if not content_type:
+            content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=CACHE_CONTROL,
+        )
+        if self.bucket == R2_BUCKET_NAME:
+            r2_object_index.record(key, True)
+
+        with self._lock:
+            self._done[key] = digest
+            self._remote[key] = digest
+            self._stats['bytes'] += len(data)
+        return self._synced(item, 'uploaded')
+
+    # ---- run ----
+
+    def _report(self, started: float, total: int, final: bool = False) -> Dict:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        with self._lock:
+            stats = dict(self._stats)
+        processed = stats['uploaded'] + stats['skipped'] + stats['failed']
+        stats.update({
+            'total': total,
+            'elapsed_seconds': round(elapsed, 2),
+            'objects_per_second': round(processed / elapsed, 2),
+            'mb_per_second': round(stats['bytes'] / elapsed / 1024 / 1024, 3),
+        })
+        label = "Done" if final else "Progress"
+        self.log(
+            f"[R2 Sync] {label}: {processed}/{total} "
+            f"(uploaded {stats['uploaded']}, skipped {stats['skipped']}, failed {stats['failed']}) "
+            f"- {stats['objects_per_second']} obj/s, {stats['mb_per_second']} MB/s"
+        )
+        return stats
+
+    def run(self, items: Iterable[Dict], prefixes: Optional[Iterable[str]] = None) -> Dict:
+        """
+        항목 동기화
+        prefixes: 지정하면 시작 전에 해당 경로의 원격 ETag 를 목록으로 적재 (스킵 판단용)
+        Returns: 처리 통계
+        """
+        items = list(items)
+        if prefixes:
+            count = self.load_remote_etags(prefixes)
+            self.log(f"[R2 Sync] Listed {count} remote objects")
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._process, item): item['key'] for item in items}
+            for i, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = 'failed'
+                    self.errors.append({'key': key, 'error': str(e)})
+                    self.log(f"[R2 Sync] Failed: {key}: {e}")
+
+                with self._lock:
+                    self._stats[result] += 1
+                    self._since_checkpoint += 1
+                    checkpoint_due = self._since_checkpoint >= CHECKPOINT_EVERY
+                    if checkpoint_due:
+                        self._since_checkpoint = 0
+                if checkpoint_due:
+                    self._save_checkpoint()
+                if i % PROGRESS_EVERY == 0:
+                    self._report(started, len(items))
+
+        self._save_checkpoint()
+        return self._report(started, len(items), final=True)
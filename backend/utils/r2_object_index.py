@@ -0,0 +1,136 @@
+"""
+R2 object existence index
+R2 객체 존재 여부 인덱스 (이미지 요청마다 HEAD 요청을 보내지 않도록)
+
+- 메모리 dict + r2_objects 테이블에 영속화 (재시작 후에도 유지, 워커 간 공유)
+- 존재(positive): 메모리에서는 R2_POSITIVE_CACHE_TTL 동안만 유효, 만료되면 r2_objects 테이블로 재확인
+  (다른 워커의 delete_from_r2 반영 - 테이블에 present = 0 으로 기록됨)
+- 없음(negative): R2_NEGATIVE_CACHE_TTL 동안만 유효 (다른 프로세스/스크립트의 업로드 반영)
+- upload_to_r2 / delete_from_r2 / HEAD 결과로 갱신
+- scripts/create_r2_object_index.py 가 버킷 목록(list_objects_v2)으로 채움
+"""
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import R2_NEGATIVE_CACHE_TTL, R2_POSITIVE_CACHE_TTL
+from database import db
+
+logger = logging.getLogger(__name__)
+
+# negative 항목이 이 수를 넘으면 만료된 항목 정리
+MAX_NEGATIVE_ENTRIES = 100000
+
+_lock = threading.Lock()
+_entries: Dict[str, Tuple[bool, float]] = {}  # object_key -> (present, checked_at epoch - positive 는 메모리 확인 시각)
+_negative_count = 0
+
+
+def lookup(object_key: str) -> Optional[bool]:
+    """메모리에서 알려진 존재 여부 (모르거나 만료되면 None → load 로 테이블 확인). DB 접근 없음"""
+    entry = _entries.get(object_key)
+    if entry is None:
+        return None
+    present, checked_at = entry
+    if time.time() - checked_at < (R2_POSITIVE_CACHE_TTL if present else R2_NEGATIVE_CACHE_TTL):
+        return present
+    return None
+
+
+def load(object_key: str) -> Optional[bool]:
+    """
+    r2_objects 테이블에서 존재 여부를 다시 읽어 메모리 갱신 (다른 워커의 업로드/삭제 반영)
+    Returns: 테이블에 없거나 negative 가 만료되면 None (→ HEAD 요청)
+    """
+    try:
+        row = db.execute_query(
+            "SELECT present, checked_at FROM r2_objects WHERE object_key = ?",
+            (object_key,),
+            fetch_one=True
+        )
+    except sqlite3.OperationalError as e:
+        logger.debug(f"r2_objects not available: {e}")
+        row = None
+
+    now = time.time()
+    with _lock:
+        if row is None or (not row['present'] and now - row['checked_at'] >= R2_NEGATIVE_CACHE_TTL):
+            _discard(object_key)
+            return None
+        present = bool(row['present'])
+        _set(object_key, present, now if present else row['checked_at'])
+        return present
+
+
+def _set(object_key: str, present: bool, checked_at: float):
+    global _negative_count
+    old = _entries.get(object_key)
+    if old is not None and not old[0]:
+        _negative_count -= 1
+    _entries[object_key] = (present, checked_at)
+    if not present:
+        _negative_count += 1
+
+
+def _discard(object_key: str):
+    global _negative_count
+    old = _entries.pop(object_key, None)
+    if old is not None and not old[0]:
+        _negative_count -= 1
+
+
+def _prune_negatives():
+    global _negative_count
+    cutoff = time.time() - R2_NEGATIVE_CACHE_TTL
+    for key in [k for k, (present, checked_at) in _entries.items() if not present and checked_at < cutoff]:
+        del _entries[key]
+    _negative_count = sum(1 for present, _ in _entries.values() if not present)
+
+
+def record(object_key: str, present: bool):
+    """존재 여부 기록 (메모리 + r2_objects)"""
+    now = time.time()
+    with _lock:
+        _set(object_key, present, now)
+        if _negative_count > MAX_NEGATIVE_ENTRIES:
+            _prune_negatives()
+
+    try:
+        db.execute_update(
+            """
+            INSERT INTO r2_objects (object_key, present, checked_at) VALUES (?, ?, ?)
+            ON CONFLICT(object_key) DO UPDATE SET present = excluded.present, checked_at = excluded.checked_at
+            """,
+            (object_key, 1 if present else 0, now)
+        )
+    except sqlite3.OperationalError as e:
+        # 테이블이 아직 없는 환경(단독 실행 스크립트 등)에서는 메모리에만 기록
+        logger.debug(f"r2_objects not persisted: {e}")
+
+
+def load_index() -> int:
+    """r2_objects 테이블 전체를 메모리로 적재 (만료된 negative 제외). Returns: 적재 항목 수"""
+    global _negative_count
+    rows = db.execute_query("SELECT object_key, present, checked_at FROM r2_objects")
+    cutoff = time.time() - R2_NEGATIVE_CACHE_TTL
+    with _lock:
+        _entries.clear()
+        _negative_count = 0
+        now = time.time()
+        for row in rows:
+            if row['present']:
+                _set(row['object_key'], True, now)
+            elif row['checked_at'] >= cutoff:
+                _set(row['object_key'], False, row['checked_at'])
+        return len(_entries)
+
+
+def stats() -> Dict:
+    with _lock:
+        return {
+            'entries': len(_entries),
+            'present': len(_entries) - _negative_count,
+            'absent': _negative_count,
+        }
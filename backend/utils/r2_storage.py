@@ -3,11 +3,14 @@ Cloudflare R2 Storage Utility
 S3-compatible object storage for images
 """
 import os
+import threading
 import boto3
 from botocore.exceptions import ClientError
 from typing import Optional
 import mimetypes
 
+from utils import r2_object_index
+
 # R2 Configuration from environment variables
 R2_ACCESS_KEY_ID = os.getenv("R2_ACCESS_KEY_ID")
 R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY")
@@ -24,18 +27,27 @@ print(f"  - R2_ACCESS_KEY_ID: {'SET' if R2_ACCESS_KEY_ID else 'NOT SET'}")
 print(f"  - R2_SECRET_ACCESS_KEY: {'SET' if R2_SECRET_ACCESS_KEY else 'NOT SET'}")
 
 
+_client = None
+_client_lock = threading.Lock()
+
+
 def get_r2_client():
-    """Get configured R2 S3 client"""
+    """Get configured R2 S3 client (프로세스 전체에서 하나의 클라이언트 재사용, thread-safe)"""
+    global _client
     if not all([R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY, R2_ENDPOINT_URL]):
         raise ValueError("R2 credentials not configured. Set R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY, and R2_ENDPOINT_URL")
 
-    return boto3.client(
-        's3',
-        endpoint_url=R2_ENDPOINT_URL,
-        aws_access_key_id=R2_ACCESS_KEY_ID,
-        aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-        region_name='auto'  # R2 uses 'auto' region
-    )
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    's3',
+                    endpoint_url=R2_ENDPOINT_URL,
+                    aws_access_key_id=R2_ACCESS_KEY_ID,
+                    aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+                    region_name='auto'  # R2 uses 'auto' region
+                )
+    return _client
 
 
 def upload_to_r2(
@@ -80,6 +92,7 @@ def upload_to_r2(
             ContentType=content_type,
             CacheControl='public, max-age=31536000',  # 1 year cache
         )
+        r2_object_index.record(object_key, True)
         
         # Return public URL
         public_url = f"{R2_PUBLIC_URL}/{object_key}"
@@ -115,6 +128,7 @@ def upload_file_bytes_to_r2(
             ContentType=content_type,
             CacheControl='public, max-age=3600, must-revalidate',  # 1시간 캐시, 재검증 필요
         )
+        r2_object_index.record(object_key, True)
 
         public_url = f"{R2_PUBLIC_URL}/{object_key}"
         return public_url
@@ -144,6 +158,7 @@ def delete_from_r2(object_key: str) -> bool:
             Bucket=R2_BUCKET_NAME,
             Key=object_key
         )
+        r2_object_index.record(object_key, False)
         return True
     except ClientError as e:
         print(f"Failed to delete from R2: {str(e)}")
@@ -153,6 +168,7 @@ def delete_from_r2(object_key: str) -> bool:
 def check_r2_object_exists(object_key: str) -> bool:
     """
     Check if an object exists in R2
+    존재 여부 인덱스(utils.r2_object_index)에 있으면 HEAD 요청 생략
     
     Args:
         object_key: S3 object key (e.g., "images/characters/123.jpg")
@@ -160,16 +176,22 @@ def check_r2_object_exists(object_key: str) -> bool:
     Returns:
         True if object exists, False otherwise
     """
+    known = r2_object_index.lookup(object_key)
+    if known is not None:
+        return known
+
     try:
         s3_client = get_r2_client()
         s3_client.head_object(
             Bucket=R2_BUCKET_NAME,
             Key=object_key
         )
+        r2_object_index.record(object_key, True)
         return True
     except ClientError as e:
         # 404 means object doesn't exist
         if e.response['Error']['Code'] == '404':
+            r2_object_index.record(object_key, False)
             return False
         # Other errors, re-raise
         raise
@@ -0,0 +1,88 @@
+"""
+Search index utilities
+FTS5 trigram 검색 조건 생성 (scripts/create_search_index.py 의 anime_search / character_search)
+"""
+from typing import List, Tuple
+from database import db
+
+# trigram 토크나이저는 3글자 미만 검색어를 매칭할 수 없음
+TRIGRAM_MIN_LENGTH = 3
+
+_ready_indexes = set()
+
+
+def _index_ready(index_table: str) -> bool:
+    """검색 인덱스 테이블 존재 여부 (있으면 프로세스 내 캐시)"""
+    if index_table in _ready_indexes:
+        return True
+
+    row = db.execute_query(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (index_table,),
+        fetch_one=True
+    )
+    if row:
+        _ready_indexes.add(index_table)
+    return row is not None
+
+
+def fts_phrase(column: str, query: str) -> str:
+    """검색어를 FTS5 컬럼 한정 phrase 쿼리로 변환 (따옴표 이스케이프)"""
+    return f'{column} : "{query.replace(chr(34), chr(34) * 2)}"'
+
+
+def title_search_clause(
+    id_expr: str,
+    index_table: str,
+    index_column: str,
+    like_columns: List[str],
+    query: str,
+    ignore_spaces: bool = False
+) -> Tuple[str, tuple]:
+    """
+    제목/이름 부분 문자열 검색 WHERE 조건
+    검색어가 3글자 이상이고 인덱스가 있으면 FTS5 MATCH, 아니면 LIKE 스캔으로 대체
+
+    Args:
+        id_expr: 원본 테이블 id 표현식 (예: 'a.id')
+        index_column: MATCH 대상 컬럼 (ignore_spaces면 *_compact 컬럼)
+        like_columns: LIKE 대체 시 검색할 원본 컬럼들
+        ignore_spaces: 띄어쓰기 무시 검색
+
+    Returns: (SQL 조건, 파라미터)
+    """
+    term = query.replace(' ', '') if ignore_spaces else query
+
+    if len(term) >= TRIGRAM_MIN_LENGTH and _index_ready(index_table):
+        return (
+            f"{id_expr} IN (SELECT rowid FROM {index_table} WHERE {index_table} MATCH ?)",
+            (fts_phrase(index_column, term),)
+        )
+
+    pattern = f"%{term}%"
+    if ignore_spaces:
+        conditions = [f"REPLACE({col}, ' ', '') LIKE ?" for col in like_columns]
+    else:
+        conditions = [f"{col} LIKE ?" for col in like_columns]
+    return "(" + " OR ".join(conditions) + ")", (pattern,) * len(like_columns)
+
+
+def title_match_rank(like_columns: List[str], query: str, ignore_spaces: bool = False) -> Tuple[str, tuple]:
+    """
+    검색 결과 정렬용 일치 등급 SQL 표현식 (인기도 등 다른 정렬 앞에 사용)
+    0: 제목이 검색어와 일치, 1: 검색어로 시작, 2: 부분 일치
+
+    Returns: (SQL 표현식, 파라미터)
+    """
+    term = (query.replace(' ', '') if ignore_spaces else query).lower()
+    columns = [
+        f"LOWER(REPLACE({col}, ' ', ''))" if ignore_spaces else f"LOWER({col})"
+        for col in like_columns
+    ]
+
+    exact = " OR ".join(f"{col} = ?" for col in columns)
+    prefix = " OR ".join(f"INSTR({col}, ?) = 1" for col in columns)
+    return (
+        f"CASE WHEN {exact} THEN 0 WHEN {prefix} THEN 1 ELSE 2 END",
+        (term,) * (len(columns) * 2)
+    )
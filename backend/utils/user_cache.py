@@ -0,0 +1,83 @@
+"""
+Authenticated user cache
+토큰 → UserResponse 단기(TTL) LRU 캐시 (api.deps.get_current_user 용)
+
+- 캐시 적중 시 JWT 디코드와 users 조회 생략
+- 항목 만료 = min(TTL, 토큰 exp)
+- 프로필/아바타/5점 캐릭터 평가 변경 시 invalidate_user 로 해당 사용자 항목 제거
+- 통계(otaku_score) 변경 시에도 제거: 애니/캐릭터 평가, 일괄 평가, 평가 삭제, 리뷰 작성/삭제
+  (rating_service._update_user_stats 가 커밋 후 호출)
+- 프로세스별 캐시이므로 다른 워커의 변경은 TTL 이내에 반영
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from config import AUTH_USER_CACHE_SIZE, AUTH_USER_CACHE_TTL
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (user, user_id, expires_at)
+_tokens_by_user: Dict[int, Set[str]] = {}
+
+
+def _remove(token: str):
+    entry = _entries.pop(token, None)
+    if entry is None:
+        return
+    tokens = _tokens_by_user.get(entry[1])
+    if tokens is not None:
+        tokens.discard(token)
+        if not tokens:
+            del _tokens_by_user[entry[1]]
+
+
+def get_cached_user(token: str):
+    """캐시된 사용자 (없거나 만료되면 None)"""
+    if AUTH_USER_CACHE_TTL <= 0:
+        return None
+
+    with _lock:
+        entry = _entries.get(token)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            _remove(token)
+            return None
+        _entries.move_to_end(token)
+        return entry[0]
+
+
+def cache_user(token: str, user, token_exp: Optional[float] = None):
+    """
+    사용자 캐시 저장
+    token_exp: JWT exp (epoch 초) - 토큰 만료 이후에는 캐시에서 제공하지 않음
+    """
+    if AUTH_USER_CACHE_TTL <= 0:
+        return
+
+    ttl = AUTH_USER_CACHE_TTL
+    if token_exp is not None:
+        ttl = min(ttl, token_exp - time.time())
+    if ttl <= 0:
+        return
+
+    with _lock:
+        _remove(token)
+        _entries[token] = (user, user.id, time.monotonic() + ttl)
+        _tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(_entries) > AUTH_USER_CACHE_SIZE:
+            _remove(next(iter(_entries)))
+
+
+def invalidate_user(user_id: int):
+    """사용자 정보 변경 시 해당 사용자의 모든 토큰 항목 제거"""
+    with _lock:
+        for token in list(_tokens_by_user.get(user_id, ())):
+            _remove(token)
+
+
+def clear_user_cache():
+    with _lock:
+        _entries.clear()
+        _tokens_by_user.clear()
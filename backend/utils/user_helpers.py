@@ -37,7 +37,11 @@ def set_default_avatar(user_dict: dict, db: Database) -> dict:
     avatar_url이 없으면 5점 캐릭터 이미지로 설정
     """
     if not user_dict.get('avatar_url'):
-        character_avatar = get_user_avatar_url(user_dict['id'], db)
+        # users.character_avatar_url (트리거로 유지)이 있으면 재계산하지 않음
+        if 'character_avatar_url' in user_dict:
+            character_avatar = user_dict['character_avatar_url']
+        else:
+            character_avatar = get_user_avatar_url(user_dict['id'], db)
         if character_avatar:
             user_dict['avatar_url'] = character_avatar
 
@@ -131,6 +131,12 @@ const ActivityCard = forwardRef(({
         return;
       }
 
+      // Feed responses already include the bookmark state (no per-card request)
+      if (typeof activity.user_bookmarked === 'boolean') {
+        setBookmarked(activity.user_bookmarked);
+        return;
+      }
+
       try {
         const isBookmarked = await bookmarkService.checkBookmark(activity.id);
         setBookmarked(isBookmarked);
@@ -143,7 +149,7 @@ const ActivityCard = forwardRef(({
     };
 
     fetchBookmarkStatus();
-  }, [activity.id, user]);
+  }, [activity.id, activity.user_bookmarked, user]);
 
   // Hooks
   const { liked, likesCount, toggleLike } = useActivityLike(
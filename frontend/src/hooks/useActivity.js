@@ -249,6 +249,7 @@ export function useActivityPagination(filters = {}, pageSize = 50, skip = false)
   const [loading, setLoading] = useState(!skip);
   const [loadingMore, setLoadingMore] = useState(false);
   const [nextPage, setNextPage] = useState(2);
+  const [nextCursor, setNextCursor] = useState(null);
 
   const isResettingRef = useRef(false);
   const loadingRef = useRef(false);
@@ -286,11 +287,13 @@ export function useActivityPagination(filters = {}, pageSize = 50, skip = false)
       setAllActivities(data.items);
       setHasMore(data.items.length === pageSize * 2);
       setNextPage(2);
+      setNextCursor(data.next_cursor || null);
       isResettingRef.current = false;
     } catch (err) {
       console.error('[useActivityPagination] Initial load failed:', err);
       setAllActivities([]);
       setHasMore(false);
+      setNextCursor(null);
       isResettingRef.current = false;
     } finally {
       setLoading(false);
@@ -309,10 +312,12 @@ export function useActivityPagination(filters = {}, pageSize = 50, skip = false)
     setLoadingMore(true);
 
     try {
+      // 다음 페이지는 keyset 커서로 (새 활동이 추가돼도 중복/누락 없음), 커서가 없을 때만 offset
       const data = await activityService.getActivities({
         ...filters,
         limit: pageSize,
-        offset: nextPage * pageSize
+        offset: nextPage * pageSize,
+        cursor: nextCursor
       });
 
       console.log('[useActivityPagination] Loaded page:', nextPage, 'count:', data.items.length);
@@ -320,12 +325,13 @@ export function useActivityPagination(filters = {}, pageSize = 50, skip = false)
       setAllActivities(prev => [...prev, ...data.items]);
       setHasMore(data.items.length === pageSize);
       setNextPage(prev => prev + 1);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       console.error('[useActivityPagination] loadMore failed:', err);
     } finally {
       setLoadingMore(false);
     }
-  }, [loadingMore, hasMore, loading, nextPage, pageSize, filters]);
+  }, [loadingMore, hasMore, loading, nextPage, nextCursor, pageSize, filters]);
 
   // 필터 변경 감지 및 리로드
   useEffect(() => {
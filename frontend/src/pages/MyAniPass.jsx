@@ -118,6 +118,7 @@ export default function MyAniPass() {
   // 피드 관련 상태
   const [userActivities, setUserActivities] = useState([]);
   const [feedOffset, setFeedOffset] = useState(0);
+  const [feedCursor, setFeedCursor] = useState(null); // 다음 페이지 keyset 커서 (없으면 offset)
   const [hasMoreFeed, setHasMoreFeed] = useState(true);
   const [loadingMoreFeed, setLoadingMoreFeed] = useState(false);
   const [activityLikes, setActivityLikes] = useState({});
@@ -454,6 +455,7 @@ export default function MyAniPass() {
           // Restore cached feed activities
           setUserActivities(cachedData.userActivities || []);
           setFeedOffset(10);
+          setFeedCursor(null);
           setHasMoreFeed(cachedData.userActivities && cachedData.userActivities.length === 10);
           const likesState = {};
           const commentsState = {};
@@ -531,31 +533,21 @@ export default function MyAniPass() {
       }
 
       if (activeTab === 'anipass') {
-        const [
-          statsData,
-          genreData,
-          watchTimeData,
-          ratingDist,
-          yearDist,
-          formatDist,
-          episodeDist,
-          ratingStat,
-          studioDist,
-          seasonDist,
-          genreCombo
-        ] = await Promise.all([
+        // 통계 분포는 analytics 한 번의 요청으로 (서버에서 평가 목록을 한 번 읽어 계산 + 캐시)
+        const [statsData, analytics] = await Promise.all([
           isOwnProfile ? userService.getStats() : userService.getUserStats(userId),
-          isOwnProfile ? userService.getGenrePreferences().catch(() => []) : userService.getUserGenrePreferences(userId).catch(() => []),
-          isOwnProfile ? userService.getWatchTime().catch(() => ({ total_minutes: 0 })) : userService.getUserWatchTime(userId).catch(() => ({ total_minutes: 0 })),
-          isOwnProfile ? userService.getRatingDistribution().catch(() => []) : userService.getUserRatingDistribution(userId).catch(() => []),
-          isOwnProfile ? userService.getYearDistribution().catch(() => []) : userService.getUserYearDistribution(userId).catch(() => []),
-          isOwnProfile ? userService.getFormatDistribution().catch(() => []) : userService.getUserFormatDistribution(userId).catch(() => []),
-          isOwnProfile ? userService.getEpisodeLengthDistribution().catch(() => []) : userService.getUserEpisodeLengthDistribution(userId).catch(() => []),
-          isOwnProfile ? userService.getRatingStats().catch(() => null) : userService.getUserRatingStats(userId).catch(() => null),
-          isOwnProfile ? userService.getStudioStats().catch(() => []) : userService.getUserStudioStats(userId).catch(() => []),
-          isOwnProfile ? userService.getSeasonStats().catch(() => []) : userService.getUserSeasonStats(userId).catch(() => []),
-          isOwnProfile ? userService.getGenreCombinations().catch(() => []) : userService.getUserGenreCombinations(userId).catch(() => []),
+          isOwnProfile ? userService.getAnalytics().catch(() => ({})) : userService.getUserAnalytics(userId).catch(() => ({})),
         ]);
+        const genreData = analytics.genre_preferences || [];
+        const watchTimeData = analytics.watch_time || { total_minutes: 0 };
+        const ratingDist = analytics.rating_distribution || [];
+        const yearDist = analytics.year_distribution || [];
+        const formatDist = analytics.format_distribution || [];
+        const episodeDist = analytics.episode_length_distribution || [];
+        const ratingStat = analytics.rating_stats || null;
+        const studioDist = analytics.studio_stats || [];
+        const seasonDist = analytics.season_stats || [];
+        const genreCombo = analytics.genre_combinations || [];
 
         // Ensure average_rating is always available from the start
         // If not in stats, calculate it from ratingStats
@@ -702,9 +694,10 @@ export default function MyAniPass() {
             }
           }
 
-          const feedData = await feedService.getUserFeed(targetUserId, 10, 0);
+          const { items: feedData, nextCursor } = await feedService.getUserFeedPage(targetUserId, 10);
           setUserActivities(feedData || []);
           setFeedOffset(10);
+          setFeedCursor(nextCursor);
           setHasMoreFeed(feedData && feedData.length === 10);
 
           // Initialize likes and comments state
@@ -739,6 +732,7 @@ export default function MyAniPass() {
           console.error('Failed to load feed:', error);
           setUserActivities([]);
           setFeedOffset(0);
+          setFeedCursor(null);
           setHasMoreFeed(false);
           setLoadedTabs(prev => ({ ...prev, feed: true }));
         }
@@ -764,6 +758,7 @@ export default function MyAniPass() {
     if (userId !== undefined) {
       setUserActivities([]);
       setFeedOffset(0);
+      setFeedCursor(null);
       setHasMoreFeed(true);
       setLoadedTabs({
         anipass: false,
@@ -891,11 +886,15 @@ export default function MyAniPass() {
     try {
       setLoadingMoreFeed(true);
       const targetUserId = userId || user?.id;
-      const feedData = await feedService.getUserFeed(targetUserId, 50, feedOffset);
+      const { items: feedData, nextCursor } = await feedService.getUserFeedPage(targetUserId, 50, {
+        cursor: feedCursor,
+        offset: feedOffset
+      });
 
       if (feedData && feedData.length > 0) {
         setUserActivities(prev => [...prev, ...feedData]);
         setFeedOffset(prev => prev + feedData.length);
+        setFeedCursor(nextCursor);
         setHasMoreFeed(feedData.length === 50);
 
         // Add likes and comments state for new activities
@@ -919,7 +918,7 @@ export default function MyAniPass() {
     } finally {
       setLoadingMoreFeed(false);
     }
-  }, [loadingMoreFeed, hasMoreFeed, userId, user?.id, feedOffset]);
+  }, [loadingMoreFeed, hasMoreFeed, userId, user?.id, feedOffset, feedCursor]);
 
   // Keep ref updated with latest loadMoreFeed
   loadMoreFeedRef.current = loadMoreFeed;
@@ -1167,9 +1166,10 @@ export default function MyAniPass() {
       setNewPostContent('');
       // Reload feed data (최신 10개만)
       const targetUserId = userId || user?.id;
-      const feedData = await feedService.getUserFeed(targetUserId, 10, 0);
+      const { items: feedData, nextCursor } = await feedService.getUserFeedPage(targetUserId, 10);
       setUserActivities(feedData || []);
       setFeedOffset(10);
+      setFeedCursor(nextCursor);
       setHasMoreFeed(feedData && feedData.length === 10);
 
       // Reinitialize likes and comments state
@@ -15,7 +15,8 @@ export const activityService = {
    * @param {number} filters.itemId - Filter by item (anime_id or character_id)
    * @param {boolean} filters.followingOnly - Show only followed users
    * @param {number} filters.limit - Results per page
-   * @param {number} filters.offset - Pagination offset
+   * @param {number} filters.offset - Pagination offset (ignored when cursor is given)
+   * @param {string} filters.cursor - Keyset cursor from the previous page's next_cursor
    */
   async getActivities({
     activityType = null,
@@ -23,7 +24,8 @@ export const activityService = {
     itemId = null,
     followingOnly = false,
     limit = 50,
-    offset = 0
+    offset = 0,
+    cursor = null
   } = {}) {
     const params = new URLSearchParams();
 
@@ -32,7 +34,11 @@ export const activityService = {
     if (itemId) params.append('item_id', itemId);
     if (followingOnly) params.append('following_only', 'true');
     params.append('limit', limit);
-    params.append('offset', offset);
+    if (cursor) {
+      params.append('cursor', cursor);
+    } else {
+      params.append('offset', offset);
+    }
 
     console.log('[activityService] Fetching activities:', {
       activityType,
@@ -41,6 +47,7 @@ export const activityService = {
       followingOnly,
       limit,
       offset,
+      cursor,
       url: `/api/activities?${params}`
     });
 
@@ -49,6 +56,7 @@ export const activityService = {
     console.log('[activityService] Received activities:', {
       count: response.data.items?.length || 0,
       total: response.data.total,
+      nextCursor: response.data.next_cursor,
       firstItem: response.data.items?.[0] ? {
         id: response.data.items[0].id,
         username: response.data.items[0].username,
@@ -1,5 +1,11 @@
 import api from './api';
 
+// 다음 페이지 keyset 커서는 X-Next-Cursor 응답 헤더 (마지막 페이지면 없음)
+const feedPage = (response) => ({
+  items: response.data,
+  nextCursor: response.headers['x-next-cursor'] || null
+});
+
 export const feedService = {
   // Get global feed
   async getFeed(limit = 50, offset = 0, followingOnly = false) {
@@ -17,4 +23,16 @@ export const feedService = {
     });
     return response.data;
   },
+
+  // Get user feed page - cursor가 있으면 offset 대신 keyset 페이지네이션
+  async getUserFeedPage(userId, limit = 50, { cursor = null, offset = 0 } = {}) {
+    const params = { user_id: userId, limit };
+    if (cursor) {
+      params.cursor = cursor;
+    } else {
+      params.offset = offset;
+    }
+    const response = await api.get('/api/feed/', { params });
+    return feedPage(response);
+  },
 };
@@ -232,4 +232,16 @@ export const userService = {
     const response = await api.get('/api/users/me/genre-radar');
     return response.data;
   },
+
+  // Get all profile analytics in one request (genre, rating, year, format, studio, ... distributions)
+  async getAnalytics() {
+    const response = await api.get('/api/users/me/analytics');
+    return response.data;
+  },
+
+  // Get other user's profile analytics
+  async getUserAnalytics(userId) {
+    const response = await api.get(`/api/users/${userId}/analytics`);
+    return response.data;
+  },
 };